@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import heapq
 import threading
+import time
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -17,6 +18,7 @@ class PrioritizedMessage:
     sequence: int  # monotonic counter for FIFO within same priority
     topic: str = field(compare=False)
     message: Any = field(compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
 
 
 class PriorityMessageQueue:
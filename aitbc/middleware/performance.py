@@ -1,7 +1,13 @@
 """
 Performance logging middleware for tracking request timing
+
+Besides logging, request durations are aggregated per method and route
+template into fixed-size latency histograms (see
+:class:`aitbc.profiling.LatencyHistogram`), exported on the default Prometheus
+registry as the ``http_request_duration_quantiles_seconds`` summary.
 """
 
+import threading
 import time
 from collections.abc import Awaitable, Callable
 
@@ -9,6 +15,7 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from aitbc.aitbc_logging import get_logger
+from aitbc.profiling import LatencyCollector, LatencyHistogram, register_latency_collector
 
 logger = get_logger(__name__)
 
@@ -25,6 +32,47 @@ _QUIET_PATHS = frozenset(
 # Threshold (ms) above which a request is logged at WARNING (slow request).
 _SLOW_REQUEST_MS = 1000.0
 
+# Label for requests no route matched (404s, probes); raw paths would make label cardinality unbounded.
+_UNMATCHED_ROUTE = "<unmatched>"
+
+# The client chooses the method, so anything outside the standard set shares one label;
+# otherwise made-up methods would each get a histogram.
+_STANDARD_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+_OTHER_METHOD = "OTHER"
+
+# (method, route template) -> request durations
+_route_latencies: dict[tuple[str, str], LatencyHistogram] = {}
+_route_latencies_lock = threading.Lock()
+
+
+def _record_route_latency(method: str, route: str, duration: float) -> None:
+    key = (method if method in _STANDARD_METHODS else _OTHER_METHOD, route)
+    histogram = _route_latencies.get(key)
+    if histogram is None:
+        with _route_latencies_lock:
+            histogram = _route_latencies.setdefault(key, LatencyHistogram())
+    histogram.record(duration)
+
+
+def _route_template(request: Request) -> str:
+    """Path template of the route that handled ``request`` (set on the scope by the router)."""
+    route = (getattr(request, "scope", None) or {}).get("route")
+    return getattr(route, "path", None) or _UNMATCHED_ROUTE
+
+
+def get_route_latencies() -> dict[tuple[str, str], LatencyHistogram]:
+    """Request duration histograms by (method, route template)."""
+    return dict(_route_latencies)
+
+
+ROUTE_LATENCY_COLLECTOR = LatencyCollector(
+    "http_request_duration_quantiles_seconds",
+    "HTTP request latency quantiles by route template",
+    ("method", "route"),
+    lambda: list(_route_latencies.items()),
+)
+register_latency_collector(ROUTE_LATENCY_COLLECTOR)
+
 
 class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log request performance metrics"""
@@ -36,6 +84,8 @@ class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
         duration_ms = round(duration * 1000, 2)
 
         path = request.url.path
+        _record_route_latency(request.method, _route_template(request), duration)
+
         is_quiet = path in _QUIET_PATHS or path.startswith("/v1/miners/poll")
         status = response.status_code
 
@@ -2,10 +2,12 @@
 Parallel processing utilities for AITBC.
 
 Provides dependency graph analysis and a parallel executor for
-parallel transaction validation in the blockchain node.
+parallel transaction validation in the blockchain node, and a process-pool
+verifier for batches of signatures.
 """
 
 from .dependency_graph import DependencyGraph
 from .executor import ParallelExecutor
+from .signatures import BatchSignatureVerifier, SignatureCheck, verify_signature_checks
 
-__all__ = ["DependencyGraph", "ParallelExecutor"]
+__all__ = ["BatchSignatureVerifier", "DependencyGraph", "ParallelExecutor", "SignatureCheck", "verify_signature_checks"]
@@ -0,0 +1,115 @@
+"""
+Batched secp256k1 signature verification on a process pool.
+
+Signature recovery in ``eth_keys`` is CPU-bound Python, so a thread pool
+(``ParallelExecutor``) cannot spread it over cores: the GIL serialises it. This
+module fans batches of checks out to worker processes instead and returns the
+results in input order.
+
+A check is ``(expected_address, msg_hash, signature)``: AITBC signatures are
+verified by recovering the signer and comparing addresses (see
+``aitbc.crypto.signature_recovery``), so the expected address stands in for a
+public key. A check that cannot be verified at all -- a malformed signature, or one
+that is not even a string -- verifies as False, like every other caller of
+``verify_signature`` that wants a plain boolean.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from aitbc.aitbc_logging import get_logger
+
+logger = get_logger(__name__)
+
+# (expected signer address, 32-byte message hash, signature)
+SignatureCheck = tuple[str, bytes, str]
+
+
+def verify_signature_checks(checks: Sequence[SignatureCheck]) -> list[bool]:
+    """Verify ``checks`` in the calling process. Runs in the pool workers."""
+    from aitbc.crypto.signature_recovery import verify_signature
+
+    results: list[bool] = []
+    for address, msg_hash, signature in checks:
+        try:
+            results.append(verify_signature(msg_hash, signature, address))
+        except Exception:
+            # SignatureMalformed, or a TypeError for a signature from an untrusted peer
+            # that is not a string: either way the check fails rather than the batch.
+            results.append(False)
+    return results
+
+
+class BatchSignatureVerifier:
+    """Verifies batches of signatures across worker processes, preserving order.
+
+    Batches smaller than ``min_batch`` are verified inline by :meth:`verify`:
+    below that, shipping the work to another process costs more than it saves.
+    :meth:`verify_async` always uses the pool, since its point is keeping the
+    event loop free. With ``max_workers=1`` everything runs inline.
+
+    Usage::
+
+        verifier = BatchSignatureVerifier(max_workers=8)
+        results = verifier.verify([(address, msg_hash, signature), ...])
+        verifier.close()
+    """
+
+    def __init__(self, max_workers: int | None = None, min_batch: int = 32) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._min_batch = min_batch
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Lazy-init the process pool."""
+        if self._executor is None:
+            # spawn, not fork: the node forks from a process running an event loop and threads.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("BatchSignatureVerifier initialized with %d worker processes", self._max_workers)
+        return self._executor
+
+    def _chunks(self, checks: Sequence[SignatureCheck]) -> list[Sequence[SignatureCheck]]:
+        # A few chunks per worker, so one slow chunk does not leave the other cores idle.
+        size = max(1, -(-len(checks) // (self._max_workers * 4)))
+        return [checks[start : start + size] for start in range(0, len(checks), size)]
+
+    def verify(self, checks: Sequence[SignatureCheck]) -> list[bool]:
+        """Verify ``checks``; ``result[i]`` is the outcome of ``checks[i]``."""
+        if self._max_workers <= 1 or len(checks) < self._min_batch:
+            return verify_signature_checks(checks)
+        try:
+            chunk_results = self._get_executor().map(verify_signature_checks, self._chunks(checks))
+            return [result for chunk in chunk_results for result in chunk]
+        except BrokenProcessPool:
+            logger.warning("Signature verification pool died; verifying %d signatures inline", len(checks))
+            self._executor = None
+            return verify_signature_checks(checks)
+
+    async def verify_async(self, checks: Sequence[SignatureCheck]) -> list[bool]:
+        """Verify ``checks`` without blocking the event loop."""
+        if not checks:
+            return []
+        loop = asyncio.get_running_loop()
+        executor: Executor | None = None if self._max_workers <= 1 else self._get_executor()
+        try:
+            chunk_results = await asyncio.gather(
+                *(loop.run_in_executor(executor, verify_signature_checks, chunk) for chunk in self._chunks(checks))
+            )
+        except BrokenProcessPool:
+            logger.warning("Signature verification pool died; verifying %d signatures inline", len(checks))
+            self._executor = None
+            return verify_signature_checks(checks)
+        return [result for chunk in chunk_results for result in chunk]
+
+    def close(self) -> None:
+        """Shut down the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            logger.info("BatchSignatureVerifier shut down")
@@ -1,23 +1,36 @@
 """
 Performance profiling utilities for AITBC
 Provides profiling hooks for performance bottleneck identification
+
+Execution times are kept in fixed-size log-linear (HDR-style) histograms, so
+hot code can stay instrumented in a long-running process at constant memory.
+The histograms of the global profiler are exported on the default Prometheus
+registry as the ``aitbc_function_duration_seconds`` summary.
 """
 
 import cProfile
 import functools
 import io
 import pstats
+import threading
 import time
-from collections import defaultdict
-from collections.abc import Callable
+from array import array
+from collections.abc import Callable, Iterable
 from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Any, overload
 
+from prometheus_client import REGISTRY
+from prometheus_client.core import Metric
+from prometheus_client.registry import Collector
+
 from .aitbc_logging import get_logger
 
 logger = get_logger(__name__)
 
+# Quantiles reported by get_stats and exported to Prometheus.
+QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
 
 @dataclass
 class ProfilingResult:
@@ -29,6 +42,184 @@ class ProfilingResult:
     avg_time: float
     max_time: float
     min_time: float
+    p50_time: float = 0.0
+    p95_time: float = 0.0
+    p99_time: float = 0.0
+    p999_time: float = 0.0
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations with a fixed number of buckets.
+
+    Durations are counted in nanoseconds. Below ``2 ** (precision_bits + 1)`` ns
+    every value has its own bucket; above, each power of two is split into
+    ``2 ** precision_bits`` equal buckets, so a quantile is within
+    ``2 ** -precision_bits`` (1.6% by default) of the true value. Durations
+    past ``max_seconds`` land in the top bucket. Count, sum, min and max are
+    exact.
+
+    Histograms with the same precision and range can be merged, e.g. to
+    combine the workers of one service.
+    """
+
+    __slots__ = ("_precision_bits", "_max_ns", "_counts", "_count", "_sum", "_sum_error", "_min", "_max", "_lock")
+
+    def __init__(self, precision_bits: int = 6, max_seconds: float = 3600.0) -> None:
+        self._precision_bits = precision_bits
+        self._max_ns = max(int(max_seconds * 1e9), 1 << (precision_bits + 1))
+        self._counts = array("Q", bytes(8 * (self._bucket(self._max_ns) + 1)))
+        self._count = 0
+        # Neumaier-compensated running sum, so the total matches sum() of the samples.
+        self._sum = 0.0
+        self._sum_error = 0.0
+        self._min = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def _bucket(self, ns: int) -> int:
+        sub_buckets = 1 << self._precision_bits
+        if ns < 2 * sub_buckets:
+            return ns
+        shift = ns.bit_length() - self._precision_bits - 1
+        return shift * sub_buckets + (ns >> shift)
+
+    def _bucket_value(self, index: int) -> float:
+        """Midpoint, in seconds, of the values counted in bucket ``index``."""
+        sub_buckets = 1 << self._precision_bits
+        if index < 2 * sub_buckets:
+            return index / 1e9
+        shift, mantissa = divmod(index, sub_buckets)
+        shift -= 1
+        low = (mantissa + sub_buckets) << shift
+        return (low + ((1 << shift) - 1) / 2) / 1e9
+
+    def record(self, seconds: float) -> None:
+        """Count one duration."""
+        ns = min(max(int(seconds * 1e9), 0), self._max_ns)
+        index = self._bucket(ns)
+        with self._lock:
+            self._counts[index] += 1
+            if self._count == 0 or seconds < self._min:
+                self._min = seconds
+            if self._count == 0 or seconds > self._max:
+                self._max = seconds
+            self._count += 1
+            total = self._sum + seconds
+            if abs(self._sum) >= abs(seconds):
+                self._sum_error += (self._sum - total) + seconds
+            else:
+                self._sum_error += (seconds - total) + self._sum
+            self._sum = total
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the counts of ``other``, which must have the same precision and range."""
+        if other._precision_bits != self._precision_bits or other._max_ns != self._max_ns:
+            raise ValueError("cannot merge histograms with different precision or range")
+        with other._lock:
+            counts = array("Q", other._counts)
+            count, total, error, low, high = other._count, other._sum, other._sum_error, other._min, other._max
+        if not count:
+            return
+        with self._lock:
+            for index, value in enumerate(counts):
+                if value:
+                    self._counts[index] += value
+            self._min = low if self._count == 0 else min(self._min, low)
+            self._max = high if self._count == 0 else max(self._max, high)
+            self._count += count
+            self._sum += total
+            self._sum_error += error
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._sum + self._sum_error
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> list[float]:
+        """Durations (seconds) at each of ``quantiles`` (ascending, 0-1), in one pass over the buckets."""
+        wanted = list(quantiles)
+        with self._lock:
+            count, low, high = self._count, self._min, self._max
+            counts = array("Q", self._counts) if count else None
+        if counts is None:
+            return [0.0] * len(wanted)
+        results: list[float] = []
+        targets = iter(wanted)
+        target = next(targets, None)
+        seen = 0
+        for index, value in enumerate(counts):
+            if not value:
+                continue
+            seen += value
+            # The top bucket also holds everything past the range; only max describes it.
+            value_at = high if index == len(counts) - 1 else min(max(self._bucket_value(index), low), high)
+            while target is not None and seen >= max(1, target * count):
+                results.append(value_at)
+                target = next(targets, None)
+            if target is None:
+                break
+        results.extend([high] * (len(wanted) - len(results)))
+        return results
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles((q,))[0]
+
+
+def _summary_metric(
+    name: str, documentation: str, label_names: tuple[str, ...], series: Iterable[tuple[tuple[str, ...], LatencyHistogram]]
+) -> Metric:
+    """A Prometheus summary (quantiles, _sum, _count) with one series per histogram."""
+    metric = Metric(name, documentation, "summary")
+    for label_values, histogram in series:
+        labels = dict(zip(label_names, label_values, strict=True))
+        for quantile, value in zip(QUANTILES, histogram.quantiles(), strict=True):
+            metric.add_sample(name, {**labels, "quantile": str(quantile)}, value)
+        metric.add_sample(f"{name}_sum", labels, histogram.total)
+        metric.add_sample(f"{name}_count", labels, histogram.count)
+    return metric
+
+
+class LatencyCollector(Collector):
+    """Exports a set of latency histograms as one Prometheus summary family."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        series: Callable[[], Iterable[tuple[tuple[str, ...], LatencyHistogram]]],
+    ) -> None:
+        self._name = name
+        self._documentation = documentation
+        self._label_names = label_names
+        self._series = series
+
+    def collect(self) -> Iterable[Metric]:
+        yield _summary_metric(self._name, self._documentation, self._label_names, self._series())
+
+
+def register_latency_collector(collector: LatencyCollector) -> None:
+    """Register ``collector`` on the default Prometheus registry, once."""
+    try:
+        REGISTRY.register(collector)
+    except ValueError:
+        # Already registered, e.g. when the module is re-imported under another name.
+        logger.debug("Latency collector %s already registered", collector._name)
 
 
 class PerformanceProfiler:
@@ -39,7 +230,8 @@ class PerformanceProfiler:
 
     def __init__(self):
         """Initialize performance profiler"""
-        self._stats: dict[str, list] = defaultdict(list)
+        self._stats: dict[str, LatencyHistogram] = {}
+        self._stats_lock = threading.Lock()
         self._enabled = True
 
     def enable(self) -> None:
@@ -61,7 +253,11 @@ class PerformanceProfiler:
             execution_time: Execution time in seconds
         """
         if self._enabled:
-            self._stats[function_name].append(execution_time)
+            histogram = self._stats.get(function_name)
+            if histogram is None:
+                with self._stats_lock:
+                    histogram = self._stats.setdefault(function_name, LatencyHistogram())
+            histogram.record(execution_time)
 
     @overload
     def get_stats(self, function_name: str) -> ProfilingResult: ...
@@ -78,21 +274,30 @@ class PerformanceProfiler:
             ProfilingResult or dictionary of results
         """
         if function_name:
-            times = self._stats.get(function_name, [])
-            if not times:
+            histogram = self._stats.get(function_name)
+            if histogram is None or not histogram.count:
                 return ProfilingResult(
                     function_name=function_name, total_time=0, call_count=0, avg_time=0, max_time=0, min_time=0
                 )
+            p50, p95, p99, p999 = histogram.quantiles(QUANTILES)
             return ProfilingResult(
                 function_name=function_name,
-                total_time=sum(times),
-                call_count=len(times),
-                avg_time=sum(times) / len(times),
-                max_time=max(times),
-                min_time=min(times),
+                total_time=histogram.total,
+                call_count=histogram.count,
+                avg_time=histogram.total / histogram.count,
+                max_time=histogram.max,
+                min_time=histogram.min,
+                p50_time=p50,
+                p95_time=p95,
+                p99_time=p99,
+                p999_time=p999,
             )
         else:
-            return {name: self.get_stats(name) for name in self._stats}
+            return {name: self.get_stats(name) for name in list(self._stats)}
+
+    def histograms(self) -> list[tuple[str, LatencyHistogram]]:
+        """(function name, histogram) of every profiled function."""
+        return list(self._stats.items())
 
     def clear_stats(self) -> None:
         """Clear all profiling statistics"""
@@ -120,10 +325,21 @@ class PerformanceProfiler:
         logger.info("  Avg time: %ss", stat.avg_time)
         logger.info("  Max time: %ss", stat.max_time)
         logger.info("  Min time: %ss", stat.min_time)
+        logger.info(
+            "  p50/p95/p99/p999: %ss / %ss / %ss / %ss", stat.p50_time, stat.p95_time, stat.p99_time, stat.p999_time
+        )
 
 
 _global_profiler = PerformanceProfiler()
 
+FUNCTION_LATENCY_COLLECTOR = LatencyCollector(
+    "aitbc_function_duration_seconds",
+    "Execution time of profiled functions and code blocks",
+    ("function",),
+    lambda: (((name,), histogram) for name, histogram in _global_profiler.histograms()),
+)
+register_latency_collector(FUNCTION_LATENCY_COLLECTOR)
+
 
 def profile_function(profiler: PerformanceProfiler | None = None):
     """
@@ -0,0 +1,650 @@
+"""Explorer index — follows the chain head and keeps pre-aggregated rollups for analytics.
+
+The analytics and non-empty-block endpoints used to open a fresh connection to
+the node's ``chain.db`` per request and aggregate the whole transaction table
+(``GROUP BY DATE(created_at)``, ``COUNT(DISTINCT ...)``, a JSON parse of every
+marketplace payload, one transaction query per block). Those requests now read
+from the explorer's own SQLite database instead:
+
+- ``block`` / ``tx``: every indexed block and transaction; non-empty blocks
+  have their own partial index;
+- ``daily_type_stats``: transaction count and volume per day and type;
+- ``address_stats``: per address, what it sent and everything it took part in,
+  ordered by sent count for the top-addresses leaderboard;
+- ``provider_stats``: marketplace offers per provider;
+- ``chain_totals``: network-wide counters.
+
+:class:`ChainIndexer` pulls new blocks through the node's ``/rpc/blocks-range``
+and applies each batch in one write transaction. When the node's chain no
+longer extends the indexed tip, indexed blocks are rolled back (rollups
+included) from the top until it does. Reads go through a small pool of
+read-only connections, so they never wait on the writer (WAL mode).
+
+An endpoint only answers from the index once the indexer has caught up with
+the head in this process (:meth:`ExplorerIndex.is_ready`); until then it keeps
+reading ``chain.db`` directly. It goes back to ``chain.db`` if the index falls
+more than ``EXPLORER_INDEXER_MAX_LAG_BLOCKS`` behind the head or the indexer
+task stops. A failing step is logged and retried with backoff rather than
+ending the task.
+"""
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+import httpx
+
+from aitbc.aitbc_logging import get_logger
+from aitbc.async_tasks import create_task_with_logging
+
+from chain_client import BLOCKCHAIN_RPC_URLS, DEFAULT_CHAIN
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "INDEXER_ENABLED",
+    "ChainIndexer",
+    "ExplorerIndex",
+    "get_explorer_index",
+    "start_indexer",
+    "stop_indexer",
+]
+
+INDEXER_ENABLED = os.getenv("EXPLORER_INDEXER_ENABLED", "true").lower() in ("1", "true", "yes")
+INDEX_DB_PATH = Path(os.getenv("EXPLORER_INDEX_DB", "/var/lib/aitbc/data/explorer/index.db"))
+INDEXER_POLL_SECONDS = float(os.getenv("EXPLORER_INDEXER_POLL_SECONDS", "2"))
+INDEXER_BATCH_BLOCKS = int(os.getenv("EXPLORER_INDEXER_BATCH_BLOCKS", "200"))
+INDEX_READ_CONNECTIONS = int(os.getenv("EXPLORER_INDEX_READ_CONNECTIONS", "4"))
+# Blocks the index may trail the head by and still serve reads.
+INDEXER_MAX_LAG_BLOCKS = int(os.getenv("EXPLORER_INDEXER_MAX_LAG_BLOCKS", "20"))
+# Upper bound on the wait between retries after failed steps.
+INDEXER_MAX_BACKOFF_SECONDS = float(os.getenv("EXPLORER_INDEXER_MAX_BACKOFF_SECONDS", "60"))
+
+# Senders that mint rather than spend; kept off the top-addresses leaderboard.
+MINT_SENDERS = ("faucet", "0x0000000000000000000000000000000000000000")
+# Transaction types whose values count towards the network's total AIT.
+VALUE_TYPES = ("TRANSFER", "GPU_MARKETPLACE")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexer_state (
+    chain_id TEXT PRIMARY KEY,
+    height INTEGER NOT NULL,
+    block_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS block (
+    chain_id TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    proposer TEXT,
+    timestamp TEXT,
+    tx_count INTEGER NOT NULL,
+    state_root TEXT,
+    PRIMARY KEY (chain_id, height)
+);
+CREATE INDEX IF NOT EXISTS ix_block_non_empty ON block (chain_id, height DESC) WHERE tx_count > 0;
+CREATE TABLE IF NOT EXISTS tx (
+    chain_id TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    block_height INTEGER NOT NULL,
+    sender TEXT,
+    recipient TEXT,
+    payload TEXT,
+    type TEXT,
+    status TEXT,
+    created_at TEXT,
+    value REAL,
+    fee REAL,
+    nonce INTEGER,
+    provider_id TEXT,
+    PRIMARY KEY (chain_id, tx_hash)
+);
+CREATE INDEX IF NOT EXISTS ix_tx_block ON tx (chain_id, block_height);
+CREATE TABLE IF NOT EXISTS daily_type_stats (
+    chain_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    type TEXT NOT NULL,
+    tx_count INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (chain_id, day, type)
+);
+CREATE TABLE IF NOT EXISTS address_stats (
+    chain_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    sent_count INTEGER NOT NULL,
+    sent_volume REAL NOT NULL,
+    tx_count INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    gpu_offers INTEGER NOT NULL,
+    first_seen TEXT,
+    PRIMARY KEY (chain_id, address)
+);
+CREATE INDEX IF NOT EXISTS ix_address_top ON address_stats (chain_id, sent_count DESC) WHERE sent_count > 0;
+CREATE TABLE IF NOT EXISTS provider_stats (
+    chain_id TEXT NOT NULL,
+    provider_id TEXT NOT NULL,
+    offers INTEGER NOT NULL,
+    PRIMARY KEY (chain_id, provider_id)
+);
+CREATE TABLE IF NOT EXISTS chain_totals (
+    chain_id TEXT PRIMARY KEY,
+    total_transactions INTEGER NOT NULL,
+    total_ait REAL NOT NULL,
+    gpu_offers INTEGER NOT NULL,
+    unique_senders INTEGER NOT NULL,
+    unique_providers INTEGER NOT NULL
+);
+"""
+
+_TX_COLUMNS = "tx_hash, sender, recipient, payload, type, status, created_at, value, fee, nonce"
+
+
+def _db_datetime(value: Any) -> str | None:
+    """An RPC ISO timestamp in the ``YYYY-MM-DD HH:MM:SS.ffffff`` (naive UTC) form chain.db stores."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return str(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UTC).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _provider_id(tx_type: str | None, payload: Any) -> str | None:
+    """Provider a GPU_MARKETPLACE transaction advertises, if any."""
+    if tx_type != "GPU_MARKETPLACE" or not isinstance(payload, dict):
+        return None
+    provider = payload.get("provider_node_id") or payload.get("node_id")
+    return str(provider) if provider else None
+
+
+def _tx_row(chain_id: str, height: int, tx: dict[str, Any]) -> tuple[Any, ...]:
+    payload = tx.get("payload")
+    return (
+        chain_id,
+        tx.get("tx_hash"),
+        height,
+        tx.get("sender"),
+        tx.get("recipient"),
+        payload if isinstance(payload, str) or payload is None else json.dumps(payload),
+        tx.get("type"),
+        tx.get("status"),
+        _db_datetime(tx.get("created_at")),
+        _number(tx.get("value")),
+        _number(tx.get("fee")),
+        tx.get("nonce"),
+        _provider_id(tx.get("type"), payload),
+    )
+
+
+class ExplorerIndex:
+    """The explorer's own database: one writer connection plus a pool of read-only ones."""
+
+    def __init__(self, path: Path = INDEX_DB_PATH, read_connections: int = INDEX_READ_CONNECTIONS) -> None:
+        self.path = Path(path)
+        self._read_connections = max(1, read_connections)
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._opened_readers: list[aiosqlite.Connection] = []
+        self._ready: set[str] = set()
+
+    async def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = await aiosqlite.connect(str(self.path))
+        await self._writer.execute("PRAGMA journal_mode=WAL")
+        await self._writer.execute("PRAGMA synchronous=NORMAL")
+        await self._writer.executescript(_SCHEMA)
+        await self._writer.commit()
+        for _ in range(self._read_connections):
+            reader = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._opened_readers.append(reader)
+            self._readers.put_nowait(reader)
+
+    async def close(self) -> None:
+        for reader in self._opened_readers:
+            await reader.close()
+        self._opened_readers.clear()
+        self._readers = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+        self._ready.clear()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    def is_ready(self, chain_id: str | None) -> bool:
+        """Whether reads for ``chain_id`` can be answered from the index (it has caught up with the head)."""
+        return bool(self._opened_readers) and (chain_id or DEFAULT_CHAIN) in self._ready
+
+    def mark_ready(self, chain_id: str) -> None:
+        self._ready.add(chain_id)
+
+    def mark_unready(self, chain_id: str) -> None:
+        self._ready.discard(chain_id)
+
+    @property
+    def _db(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            raise RuntimeError("explorer index is not open")
+        return self._writer
+
+    # --- Writes (indexer only) ---
+
+    async def tip(self, chain_id: str) -> tuple[int, str] | None:
+        """(height, hash) of the highest indexed block, or None before the first one."""
+        async with self._db.execute(
+            "SELECT height, block_hash FROM indexer_state WHERE chain_id = ?", (chain_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
+    async def apply_blocks(self, chain_id: str, blocks: list[dict[str, Any]]) -> None:
+        """Index consecutive ``blocks`` (blocks-range entries) on top of the tip, in one transaction."""
+        if not blocks:
+            return
+        db = self._db
+        try:
+            tx_rows: list[tuple[Any, ...]] = []
+            for block in blocks:
+                height = int(block["height"])
+                rows = [_tx_row(chain_id, height, tx) for tx in block.get("transactions") or []]
+                await db.execute(
+                    "INSERT OR REPLACE INTO block (chain_id, height, hash, proposer, timestamp, tx_count, state_root) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        chain_id,
+                        height,
+                        block["hash"],
+                        block.get("proposer"),
+                        _db_datetime(block.get("timestamp")),
+                        len(rows),
+                        block.get("state_root"),
+                    ),
+                )
+                tx_rows.extend(rows)
+            await db.executemany(
+                "INSERT OR REPLACE INTO tx (chain_id, tx_hash, block_height, sender, recipient, payload, type, status, "
+                "created_at, value, fee, nonce, provider_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                tx_rows,
+            )
+            await self._rollup(chain_id, tx_rows, sign=1)
+            last = blocks[-1]
+            await db.execute(
+                "INSERT OR REPLACE INTO indexer_state (chain_id, height, block_hash) VALUES (?, ?, ?)",
+                (chain_id, int(last["height"]), last["hash"]),
+            )
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+
+    async def rollback_tip(self, chain_id: str) -> int | None:
+        """Un-index the highest indexed block and its rollups; returns the new tip height (None when empty)."""
+        db = self._db
+        tip = await self.tip(chain_id)
+        if tip is None:
+            return None
+        height = tip[0]
+        try:
+            async with db.execute(
+                "SELECT chain_id, tx_hash, block_height, sender, recipient, payload, type, status, created_at, value, fee, "
+                "nonce, provider_id FROM tx WHERE chain_id = ? AND block_height = ?",
+                (chain_id, height),
+            ) as cursor:
+                tx_rows = [tuple(row) for row in await cursor.fetchall()]
+            await self._rollup(chain_id, tx_rows, sign=-1)
+            await db.execute("DELETE FROM tx WHERE chain_id = ? AND block_height = ?", (chain_id, height))
+            await db.execute("DELETE FROM block WHERE chain_id = ? AND height = ?", (chain_id, height))
+            async with db.execute(
+                "SELECT height, hash FROM block WHERE chain_id = ? ORDER BY height DESC LIMIT 1", (chain_id,)
+            ) as cursor:
+                parent = await cursor.fetchone()
+            if parent is None:
+                await db.execute("DELETE FROM indexer_state WHERE chain_id = ?", (chain_id,))
+            else:
+                await db.execute(
+                    "UPDATE indexer_state SET height = ?, block_hash = ? WHERE chain_id = ?", (parent[0], parent[1], chain_id)
+                )
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+        return parent[0] if parent is not None else None
+
+    async def _rollup(self, chain_id: str, tx_rows: list[tuple[Any, ...]], sign: int) -> None:
+        """Add (``sign=1``) or subtract (``sign=-1``) ``tx_rows`` to every rollup table."""
+        if not tx_rows:
+            return
+        daily: dict[tuple[str, str], list[float]] = {}
+        addresses: dict[str, list[Any]] = {}
+        providers: dict[str, int] = {}
+        total_ait = 0.0
+        gpu_offers = 0
+        for _, _, _, sender, recipient, _, tx_type, _, created_at, value, _, _, provider_id in tx_rows:
+            value = value or 0.0
+            day = (created_at or "")[:10]
+            stats = daily.setdefault((day, tx_type or ""), [0, 0.0])
+            stats[0] += 1
+            stats[1] += value
+            if tx_type in VALUE_TYPES:
+                total_ait += value
+            is_offer = tx_type == "GPU_MARKETPLACE"
+            gpu_offers += is_offer
+            for address in {sender, recipient} - {None}:
+                # [sent_count, sent_volume, tx_count, volume, gpu_offers, first_seen]
+                entry = addresses.setdefault(address, [0, 0.0, 0, 0.0, 0, created_at])
+                if address == sender:
+                    entry[0] += 1
+                    entry[1] += value
+                entry[2] += 1
+                entry[3] += value
+                entry[4] += is_offer
+                if created_at and (entry[5] is None or created_at < entry[5]):
+                    entry[5] = created_at
+            if provider_id:
+                providers[provider_id] = providers.get(provider_id, 0) + 1
+
+        db = self._db
+        await db.executemany(
+            "INSERT INTO daily_type_stats (chain_id, day, type, tx_count, volume) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (chain_id, day, type) DO UPDATE SET "
+            "tx_count = tx_count + excluded.tx_count, volume = volume + excluded.volume",
+            [(chain_id, day, tx_type, sign * count, sign * volume) for (day, tx_type), (count, volume) in daily.items()],
+        )
+        await db.executemany(
+            "INSERT INTO address_stats (chain_id, address, sent_count, sent_volume, tx_count, volume, gpu_offers, first_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (chain_id, address) DO UPDATE SET "
+            "sent_count = sent_count + excluded.sent_count, sent_volume = sent_volume + excluded.sent_volume, "
+            "tx_count = tx_count + excluded.tx_count, volume = volume + excluded.volume, "
+            "gpu_offers = gpu_offers + excluded.gpu_offers, "
+            "first_seen = COALESCE(MIN(first_seen, excluded.first_seen), first_seen, excluded.first_seen)",
+            [
+                (chain_id, address, sign * e[0], sign * e[1], sign * e[2], sign * e[3], sign * e[4], e[5])
+                for address, e in addresses.items()
+            ],
+        )
+        await db.executemany(
+            "INSERT INTO provider_stats (chain_id, provider_id, offers) VALUES (?, ?, ?) "
+            "ON CONFLICT (chain_id, provider_id) DO UPDATE SET offers = offers + excluded.offers",
+            [(chain_id, provider_id, sign * offers) for provider_id, offers in providers.items()],
+        )
+        if sign < 0:
+            # Rolled back below the first appearance: the rows describe nothing any more.
+            await db.execute("DELETE FROM daily_type_stats WHERE chain_id = ? AND tx_count <= 0", (chain_id,))
+            await db.execute("DELETE FROM address_stats WHERE chain_id = ? AND tx_count <= 0", (chain_id,))
+            await db.execute("DELETE FROM provider_stats WHERE chain_id = ? AND offers <= 0", (chain_id,))
+        await db.execute(
+            "INSERT INTO chain_totals (chain_id, total_transactions, total_ait, gpu_offers, unique_senders, unique_providers) "
+            "VALUES (?, ?, ?, ?, 0, 0) ON CONFLICT (chain_id) DO UPDATE SET "
+            "total_transactions = total_transactions + excluded.total_transactions, "
+            "total_ait = total_ait + excluded.total_ait, gpu_offers = gpu_offers + excluded.gpu_offers",
+            (chain_id, sign * len(tx_rows), sign * total_ait, sign * gpu_offers),
+        )
+        await db.execute(
+            "UPDATE chain_totals SET "
+            "unique_senders = (SELECT COUNT(*) FROM address_stats WHERE chain_id = ?1 AND sent_count > 0), "
+            "unique_providers = (SELECT COUNT(*) FROM provider_stats WHERE chain_id = ?1) "
+            "WHERE chain_id = ?1",
+            (chain_id,),
+        )
+
+    # --- Reads (pooled, read-only) ---
+
+    async def activity(self, chain_id: str, days: int) -> list[tuple[str, str, int]]:
+        """(day, type, count) for the last ``days`` calendar days, oldest first."""
+        async with self.reader() as conn:
+            async with conn.execute(
+                "SELECT day, type, tx_count FROM daily_type_stats WHERE chain_id = ? AND day >= date('now', ?) ORDER BY day",
+                (chain_id, f"-{int(days)} days"),
+            ) as cursor:
+                return [tuple(row) for row in await cursor.fetchall()]  # type: ignore[misc]
+
+    async def network_stats(self, chain_id: str) -> dict[str, Any]:
+        async with self.reader() as conn:
+            async with conn.execute(
+                "SELECT total_ait, gpu_offers, unique_senders, unique_providers, total_transactions "
+                "FROM chain_totals WHERE chain_id = ?",
+                (chain_id,),
+            ) as cursor:
+                row = await cursor.fetchone()
+        total_ait, active_offers, unique_nodes, unique_providers, total_transactions = row or (0.0, 0, 0, 0, 0)
+        return {
+            "total_ait": round(total_ait, 2),
+            "active_offers": active_offers,
+            "unique_nodes": unique_nodes,
+            "unique_providers": unique_providers,
+            "total_transactions": total_transactions,
+        }
+
+    async def top_addresses(self, chain_id: str, limit: int) -> list[dict[str, Any]]:
+        """Senders by number of transactions sent, minting senders excluded."""
+        async with self.reader() as conn:
+            async with conn.execute(
+                "SELECT address, sent_count, sent_volume FROM address_stats "
+                "WHERE chain_id = ? AND sent_count > 0 AND address NOT IN (?, ?) "
+                "ORDER BY sent_count DESC LIMIT ?",
+                (chain_id, *MINT_SENDERS, limit),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [
+            {"address": address, "transaction_count": count, "volume": round(volume, 2)} for address, count, volume in rows
+        ]
+
+    async def address_activity(self, chain_id: str, address: str) -> tuple[int, int, float, str | None]:
+        """(transactions, GPU offers, volume, first seen) of everything ``address`` sent or received."""
+        async with self.reader() as conn:
+            async with conn.execute(
+                "SELECT tx_count, gpu_offers, volume, first_seen FROM address_stats WHERE chain_id = ? AND address = ?",
+                (chain_id, address),
+            ) as cursor:
+                row = await cursor.fetchone()
+        return (row[0], row[1], row[2], row[3]) if row else (0, 0, 0.0, None)
+
+    async def non_empty_blocks(self, chain_id: str, limit: int, offset: int) -> list[dict[str, Any]]:
+        """Newest blocks that carry transactions, each with its transactions (two queries in all)."""
+        async with self.reader() as conn:
+            async with conn.execute(
+                "SELECT height, hash, proposer, timestamp, tx_count, state_root FROM block "
+                "WHERE chain_id = ? AND tx_count > 0 ORDER BY height DESC LIMIT ? OFFSET ?",
+                (chain_id, limit, offset),
+            ) as cursor:
+                block_rows = await cursor.fetchall()
+            if not block_rows:
+                return []
+            heights = [row[0] for row in block_rows]
+            async with conn.execute(
+                f"SELECT block_height, {_TX_COLUMNS} FROM tx "  # nosec B608 - placeholders only
+                f"WHERE chain_id = ? AND block_height IN ({', '.join('?' * len(heights))}) "
+                "ORDER BY block_height, created_at",
+                (chain_id, *heights),
+            ) as cursor:
+                tx_rows = await cursor.fetchall()
+        transactions: dict[int, list[dict[str, Any]]] = {}
+        for height, *tx in tx_rows:
+            transactions.setdefault(height, []).append(transaction_entry(tuple(tx)))
+        return [
+            {
+                "height": height,
+                "hash": block_hash,
+                "proposer": proposer,
+                "timestamp": timestamp,
+                "txCount": tx_count,
+                "stateRoot": state_root,
+                "transactions": transactions.get(height, []),
+            }
+            for height, block_hash, proposer, timestamp, tx_count, state_root in block_rows
+        ]
+
+
+def transaction_entry(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Explorer shape of a ``tx_hash, sender, recipient, payload, type, status, created_at, value, fee, nonce`` row."""
+    tx_hash, sender, recipient, payload, tx_type, status, created_at, value, fee, nonce = row
+    return {
+        "tx_hash": tx_hash,
+        "sender": sender,
+        "recipient": recipient,
+        "payload": payload,
+        "amount": value,
+        "fee": fee,
+        "nonce": nonce,
+        "type": tx_type,
+        "status": status,
+        "created_at": created_at,
+    }
+
+
+class ChainIndexer:
+    """Follows one chain's head over RPC and feeds new blocks into an :class:`ExplorerIndex`."""
+
+    def __init__(
+        self,
+        index: ExplorerIndex,
+        chain_id: str = DEFAULT_CHAIN,
+        rpc_url: str | None = None,
+        batch_blocks: int = INDEXER_BATCH_BLOCKS,
+        poll_seconds: float = INDEXER_POLL_SECONDS,
+        client: httpx.AsyncClient | None = None,
+        max_lag_blocks: int = INDEXER_MAX_LAG_BLOCKS,
+        max_backoff_seconds: float = INDEXER_MAX_BACKOFF_SECONDS,
+    ) -> None:
+        self.index = index
+        self.chain_id = chain_id
+        self.rpc_url = rpc_url or BLOCKCHAIN_RPC_URLS.get(chain_id, BLOCKCHAIN_RPC_URLS[DEFAULT_CHAIN])
+        self.batch_blocks = max(1, batch_blocks)
+        self.poll_seconds = poll_seconds
+        self.max_lag_blocks = max(0, max_lag_blocks)
+        self.max_backoff_seconds = max_backoff_seconds
+        self._client = client or httpx.AsyncClient(timeout=30.0)
+
+    async def run(self) -> None:
+        """Index until cancelled: catch up in batches, then poll the head."""
+        failures = 0
+        try:
+            while True:
+                try:
+                    behind = await self.step()
+                except Exception:
+                    # RPC errors, but also a locked or full index database: keep
+                    # following the chain rather than leave a frozen index behind.
+                    failures += 1
+                    delay = min(self.poll_seconds * 2 ** (failures - 1), self.max_backoff_seconds)
+                    logger.warning(
+                        "Explorer indexer step failed for %s (attempt %d); retrying in %.1fs",
+                        self.chain_id,
+                        failures,
+                        delay,
+                        exc_info=True,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                if not behind:
+                    await asyncio.sleep(self.poll_seconds)
+        finally:
+            # Nothing keeps the index current any more; endpoints go back to chain.db.
+            self.index.mark_unready(self.chain_id)
+            await self._client.aclose()
+
+    async def step(self) -> bool:
+        """Index (or un-index) one batch; returns True while there is more to do right away."""
+        response = await self._client.get(f"{self.rpc_url}/rpc/head", params={"chain_id": self.chain_id})
+        if response.status_code == 404:
+            # The node has no blocks yet.
+            self.index.mark_ready(self.chain_id)
+            return False
+        response.raise_for_status()
+        head = response.json()
+        head_height = int(head["height"])
+        tip = await self.index.tip(self.chain_id)
+        if tip is None or head_height - tip[0] > self.max_lag_blocks:
+            self.index.mark_unready(self.chain_id)
+
+        if tip is not None and (tip[0] > head_height or (tip[0] == head_height and tip[1] != head.get("hash"))):
+            # The node's chain was rewritten under the indexed tip.
+            await self.index.rollback_tip(self.chain_id)
+            return True
+        if tip is not None and tip[0] == head_height:
+            self.index.mark_ready(self.chain_id)
+            return False
+
+        start = tip[0] + 1 if tip is not None else 0
+        end = min(head_height, start + self.batch_blocks - 1)
+        response = await self._client.get(
+            f"{self.rpc_url}/rpc/blocks-range",
+            params={"start": start, "end": end, "include_tx": True, "chain_id": self.chain_id},
+        )
+        response.raise_for_status()
+        blocks = sorted(response.json().get("blocks") or [], key=lambda block: int(block["height"]))
+        if not blocks:
+            return False
+        if tip is not None and (int(blocks[0]["height"]) != start or blocks[0].get("parent_hash") != tip[1]):
+            await self.index.rollback_tip(self.chain_id)
+            return True
+        # Only a gap-free run of blocks extends the tip.
+        consecutive = [blocks[0]]
+        for block in blocks[1:]:
+            previous = consecutive[-1]
+            if int(block["height"]) != int(previous["height"]) + 1 or block.get("parent_hash") != previous["hash"]:
+                break
+            consecutive.append(block)
+        await self.index.apply_blocks(self.chain_id, consecutive)
+        if int(consecutive[-1]["height"]) < head_height:
+            return True
+        self.index.mark_ready(self.chain_id)
+        return False
+
+
+_index: ExplorerIndex | None = None
+_task: asyncio.Task[None] | None = None
+
+
+def get_explorer_index() -> ExplorerIndex | None:
+    """The running explorer index, or None when the indexer is disabled or not started."""
+    return _index
+
+
+async def start_indexer() -> None:
+    """Open the index and start following the default chain in the background."""
+    global _index, _task
+    if _index is not None:
+        return
+    index = ExplorerIndex()
+    await index.open()
+    _index = index
+    _task = create_task_with_logging(ChainIndexer(index).run(), name="explorer-indexer")
+    logger.info("Explorer indexer following %s into %s", DEFAULT_CHAIN, index.path)
+
+
+async def stop_indexer() -> None:
+    global _index, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    if _index is not None:
+        await _index.close()
+        _index = None
@@ -4,6 +4,9 @@ AITBC Blockchain Explorer API
 Agent-first API for blockchain data access
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import httpx
 import uvicorn
 from fastapi import FastAPI
@@ -15,6 +18,7 @@ configure_logging(level="INFO", service_name="blockchain-explorer", to_file=True
 logger = get_logger(__name__)
 
 from chain_client import BLOCKCHAIN_RPC_URLS, DEFAULT_CHAIN  # noqa: E402
+from indexer import INDEXER_ENABLED, start_indexer, stop_indexer  # noqa: E402
 from routers.analytics import router as analytics_router  # noqa: E402
 from routers.blocks import router as blocks_router  # noqa: E402
 from routers.chains import router as chains_router  # noqa: E402
@@ -22,7 +26,20 @@ from routers.export import router as export_router  # noqa: E402
 from routers.search import router as search_router  # noqa: E402
 from routers.transactions import router as transactions_router  # noqa: E402
 
-app = FastAPI(title="AITBC Blockchain Explorer API", version="2.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if INDEXER_ENABLED:
+        try:
+            await start_indexer()
+        except Exception:
+            # Analytics keep reading chain.db directly without the index.
+            logger.exception("Could not start the explorer indexer")
+    yield
+    await stop_indexer()
+
+
+app = FastAPI(title="AITBC Blockchain Explorer API", version="2.0.0", lifespan=lifespan)
 
 app.include_router(chains_router)
 app.include_router(analytics_router)
@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException
 from aitbc.aitbc_logging import get_logger
 
 from chain_client import BLOCKCHAIN_RPC_URLS, DEFAULT_CHAIN, USE_DATA_LAYER, get_data_layer
+from indexer import get_explorer_index
 
 logger = get_logger(__name__)
 
@@ -26,6 +27,12 @@ def _chain_db_path() -> Path | None:
     return chain_db_path if chain_db_path.exists() else None
 
 
+def _ready_index(chain_id: str | None) -> Any:
+    """The explorer index when it can answer for ``chain_id``, else None (read chain.db instead)."""
+    index = get_explorer_index()
+    return index if index is not None and index.is_ready(chain_id) else None
+
+
 @router.get("/api/analytics/activity")
 async def api_activity_timeline(
     chain_id: str | None = DEFAULT_CHAIN,
@@ -33,35 +40,40 @@ async def api_activity_timeline(
 ) -> dict[str, Any]:
     """Get daily transaction counts for activity timeline chart"""
     try:
-        chain_db_path = _chain_db_path()
-        if chain_db_path is None:
-            return {"labels": [], "datasets": []}
-
-        async with aiosqlite.connect(str(chain_db_path)) as conn:
-            cursor = await conn.cursor()
-
-            # Get daily transaction counts for the last N days
-            await cursor.execute(
-                """
-                SELECT DATE(created_at) as day, type, COUNT(*) as count
-                FROM "transaction"
-                WHERE created_at >= datetime('now', ?)
-                GROUP BY DATE(created_at), type
-                ORDER BY day
-                """,
-                (f"-{int(days)} days",),
-            )
-
-            # Organize by day and type
-            data: dict[str, dict[str, int]] = {}
-            tx_types: set[str] = set()
-            rows = await cursor.fetchall()
-            for row in rows:
-                day, tx_type, count = row
-                if day not in data:
-                    data[day] = {}
-                data[day][tx_type] = count
-                tx_types.add(tx_type)
+        index = _ready_index(chain_id)
+        if index is not None:
+            # Pre-aggregated per day, so the window covers whole calendar days.
+            rows = await index.activity(chain_id or DEFAULT_CHAIN, days)
+        else:
+            chain_db_path = _chain_db_path()
+            if chain_db_path is None:
+                return {"labels": [], "datasets": []}
+
+            async with aiosqlite.connect(str(chain_db_path)) as conn:
+                cursor = await conn.cursor()
+
+                # Get daily transaction counts for the last N days
+                await cursor.execute(
+                    """
+                    SELECT DATE(created_at) as day, type, COUNT(*) as count
+                    FROM "transaction"
+                    WHERE created_at >= datetime('now', ?)
+                    GROUP BY DATE(created_at), type
+                    ORDER BY day
+                    """,
+                    (f"-{int(days)} days",),
+                )
+                rows = await cursor.fetchall()
+
+        # Organize by day and type
+        data: dict[str, dict[str, int]] = {}
+        tx_types: set[str] = set()
+        for row in rows:
+            day, tx_type, count = row
+            if day not in data:
+                data[day] = {}
+            data[day][tx_type] = count
+            tx_types.add(tx_type)
 
         labels = sorted(data.keys())
         type_colors = {
@@ -92,6 +104,10 @@ async def api_activity_timeline(
 async def api_network_stats(chain_id: str | None = DEFAULT_CHAIN) -> dict[str, Any]:
     """Get aggregate network stats: total AIT, active offers, unique nodes/providers"""
     try:
+        index = _ready_index(chain_id)
+        if index is not None:
+            return await index.network_stats(chain_id or DEFAULT_CHAIN)  # type: ignore[no-any-return]
+
         chain_db_path = _chain_db_path()
         if chain_db_path is None:
             return {"total_ait": 0, "active_offers": 0, "unique_nodes": 0, "unique_providers": 0, "total_transactions": 0}
@@ -164,6 +180,10 @@ async def api_top_addresses(
 ) -> dict[str, Any]:
     """Get top addresses by transaction count and AIT volume"""
     try:
+        index = _ready_index(chain_id)
+        if index is not None:
+            return {"addresses": await index.top_addresses(chain_id or DEFAULT_CHAIN, limit)}
+
         chain_db_path = _chain_db_path()
         if chain_db_path is None:
             return {"addresses": []}
@@ -208,47 +228,53 @@ async def api_top_addresses(
 async def api_provider_reputation(provider_id: str, chain_id: str | None = DEFAULT_CHAIN) -> dict[str, Any]:
     """Compute provider reputation score from blockchain history"""
     try:
-        chain_db_path = _chain_db_path()
-        if chain_db_path is None:
-            return {"provider_id": provider_id, "score": 0, "level": "New", "transactions": 0, "days_active": 0}
-
-        async with aiosqlite.connect(str(chain_db_path)) as conn:
-            cursor = await conn.cursor()
-
-            # Find all transactions related to this provider
-            await cursor.execute(
-                """
-                SELECT type, value, created_at, payload
-                FROM "transaction"
-                WHERE sender = ? OR recipient = ?
-                ORDER BY created_at ASC
-            """,
-                (provider_id, provider_id),
+        index = _ready_index(chain_id)
+        if index is not None:
+            confirmed_count, gpu_offers, total_volume, first_tx_date = await index.address_activity(
+                chain_id or DEFAULT_CHAIN, provider_id
             )
+        else:
+            chain_db_path = _chain_db_path()
+            if chain_db_path is None:
+                return {"provider_id": provider_id, "score": 0, "level": "New", "transactions": 0, "days_active": 0}
+
+            async with aiosqlite.connect(str(chain_db_path)) as conn:
+                cursor = await conn.cursor()
+
+                # Find all transactions related to this provider
+                await cursor.execute(
+                    """
+                    SELECT type, value, created_at, payload
+                    FROM "transaction"
+                    WHERE sender = ? OR recipient = ?
+                    ORDER BY created_at ASC
+                """,
+                    (provider_id, provider_id),
+                )
 
-            txs = await cursor.fetchall()
+                txs = await cursor.fetchall()
 
-        gpu_offers = 0
-        total_volume = 0.0
-        first_tx_date = None
-        confirmed_count = 0
+            gpu_offers = 0
+            total_volume = 0.0
+            first_tx_date = None
+            confirmed_count = 0
 
-        for tx in txs:
-            tx_type, tx_value, created_at, payload = tx
-            if first_tx_date is None:
-                first_tx_date = created_at
-            if tx_type == "GPU_MARKETPLACE":
-                gpu_offers += 1
-            try:
-                total_volume += float(tx_value or 0)
-            except Exception:
-                pass
-            confirmed_count += 1
+            for tx in txs:
+                tx_type, tx_value, created_at, payload = tx
+                if first_tx_date is None:
+                    first_tx_date = created_at
+                if tx_type == "GPU_MARKETPLACE":
+                    gpu_offers += 1
+                try:
+                    total_volume += float(tx_value or 0)
+                except Exception:
+                    pass
+                confirmed_count += 1
 
         days_active = 0
         if first_tx_date:
             try:
-                first_dt = datetime.strptime(first_tx_date, "%Y-%m-%d %H:%M:%S")
+                first_dt = datetime.fromisoformat(first_tx_date)
                 days_active = (datetime.utcnow() - first_dt).days
             except Exception:
                 pass
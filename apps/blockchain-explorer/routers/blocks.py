@@ -17,6 +17,7 @@ from chain_client import (
     get_latest_blocks,
     normalize_block,
 )
+from indexer import get_explorer_index, transaction_entry
 from .common import like_pattern
 from validation import validate_tx_hash
 
@@ -44,6 +45,10 @@ async def api_non_empty_blocks(
 ) -> dict[str, Any]:
     """API endpoint for non-empty blocks (blocks with transactions)"""
     try:
+        index = get_explorer_index()
+        if index is not None and index.is_ready(chain_id):
+            return {"blocks": await index.non_empty_blocks(chain_id or DEFAULT_CHAIN, limit, offset)}
+
         chain_db_path = Path("/var/lib/aitbc/data/ait-hub.aitbc.bubuit.net/chain.db")
         if not chain_db_path.exists():
             chain_db_path = Path("/var/lib/aitbc/data/chain.db")
@@ -72,42 +77,27 @@ async def api_non_empty_blocks(
             """,
                 (max_height, limit, offset),
             )
+            block_rows = await cursor.fetchall()
+            if not block_rows:
+                return {"blocks": []}
 
-            blocks = []
-            rows = await cursor.fetchall()
-            for row in rows:
-                height, block_hash, proposer, timestamp, tx_count, state_root = row
-
-                # Get transactions for this block
-                await cursor.execute(
-                    """
-                    SELECT tx_hash, sender, recipient, payload, type, status, created_at, value, fee, nonce
-                    FROM "transaction"
-                    WHERE block_height = ?
-                    ORDER BY created_at
-                """,
-                    (height,),
-                )
-
-                transactions = []
-                tx_rows = await cursor.fetchall()
-                for tx_row in tx_rows:
-                    tx_hash, sender, recipient, payload, tx_type, status, created_at, value, fee, nonce = tx_row
-                    transactions.append(
-                        {
-                            "tx_hash": tx_hash,
-                            "sender": sender,
-                            "recipient": recipient,
-                            "payload": payload,
-                            "amount": value,
-                            "fee": fee,
-                            "nonce": nonce,
-                            "type": tx_type,
-                            "status": status,
-                            "created_at": created_at,
-                        }
-                    )
+            # Transactions of the whole page in one query
+            heights = [block_row[0] for block_row in block_rows]
+            await cursor.execute(
+                f"""
+                SELECT block_height, tx_hash, sender, recipient, payload, type, status, created_at, value, fee, nonce
+                FROM "transaction"
+                WHERE block_height IN ({", ".join("?" * len(heights))})
+                ORDER BY block_height, created_at
+            """,  # nosec B608 - placeholders only
+                heights,
+            )
+            transactions: dict[int, list[dict[str, Any]]] = {}
+            for tx_height, *tx_row in await cursor.fetchall():
+                transactions.setdefault(tx_height, []).append(transaction_entry(tuple(tx_row)))
 
+            blocks = []
+            for height, block_hash, proposer, timestamp, tx_count, state_root in block_rows:
                 blocks.append(
                     {
                         "height": height,
@@ -116,7 +106,7 @@ async def api_non_empty_blocks(
                         "timestamp": timestamp,
                         "txCount": tx_count,
                         "stateRoot": state_root,
-                        "transactions": transactions,
+                        "transactions": transactions.get(height, []),
                     }
                 )
 
@@ -0,0 +1,231 @@
+"""Tests for the explorer indexer: rollups built from blocks-range pages, reorg rollback and index-backed endpoints."""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+import pytest
+
+import indexer
+from indexer import ChainIndexer, ExplorerIndex
+
+CHAIN = "test-chain"
+TODAY = datetime.now(UTC).strftime("%Y-%m-%d")
+
+
+def _tx(tx_hash: str, sender: str, recipient: str, value: int, tx_type: str = "TRANSFER", **payload: Any) -> dict[str, Any]:
+    return {
+        "tx_hash": tx_hash,
+        "sender": sender,
+        "recipient": recipient,
+        "payload": payload,
+        "value": value,
+        "fee": 1,
+        "nonce": 0,
+        "type": tx_type,
+        "status": "confirmed",
+        "created_at": f"{TODAY}T12:00:00",
+    }
+
+
+class FakeNode:
+    """Serves /rpc/head and /rpc/blocks-range from an in-memory list of blocks."""
+
+    def __init__(self) -> None:
+        self.blocks: list[dict[str, Any]] = []
+        self.range_requests = 0
+
+    def append(self, *transactions: dict[str, Any], fork: str = "") -> None:
+        height = len(self.blocks)
+        self.blocks.append(
+            {
+                "height": height,
+                "hash": f"0x{fork}{height:04d}",
+                "parent_hash": self.blocks[-1]["hash"] if self.blocks else "0x00",
+                "proposer": "node-1",
+                "timestamp": f"{TODAY}T12:00:00",
+                "tx_count": len(transactions),
+                "state_root": None,
+                "transactions": list(transactions),
+            }
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/rpc/head":
+            if not self.blocks:
+                return httpx.Response(404, json={"detail": "no blocks yet"})
+            head = self.blocks[-1]
+            return httpx.Response(200, json={"height": head["height"], "hash": head["hash"]})
+        self.range_requests += 1
+        start, end = int(request.url.params["start"]), int(request.url.params["end"])
+        page = [block for block in self.blocks if start <= block["height"] <= end]
+        return httpx.Response(200, json={"success": True, "blocks": page, "count": len(page)})
+
+
+@pytest.fixture
+async def index(tmp_path):
+    explorer_index = ExplorerIndex(tmp_path / "index.db", read_connections=2)
+    await explorer_index.open()
+    yield explorer_index
+    await explorer_index.close()
+
+
+def _indexer(index: ExplorerIndex, node: FakeNode) -> ChainIndexer:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(node.handle))
+    return ChainIndexer(index, chain_id=CHAIN, rpc_url="http://node", batch_blocks=2, client=client)
+
+
+async def _catch_up(chain_indexer: ChainIndexer) -> None:
+    for _ in range(50):
+        if not await chain_indexer.step():
+            return
+    raise AssertionError("indexer did not catch up")
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_the_chain(index):
+    node = FakeNode()
+    node.append()
+    node.append(_tx("0xa1", "alice", "bob", 10), _tx("0xa2", "faucet", "alice", 100, "FAUCET"))
+    node.append()
+    node.append(_tx("0xa3", "alice", "carol", 5, "GPU_MARKETPLACE", provider_node_id="prov-1"))
+    node.append(_tx("0xa4", "bob", "alice", 2))
+
+    chain_indexer = _indexer(index, node)
+    assert not index.is_ready(CHAIN)
+    await _catch_up(chain_indexer)
+
+    assert index.is_ready(CHAIN)
+    assert node.range_requests == 3
+    assert await index.tip(CHAIN) == (4, "0x0004")
+    assert await index.network_stats(CHAIN) == {
+        "total_ait": 17.0,
+        "active_offers": 1,
+        "unique_nodes": 3,
+        "unique_providers": 1,
+        "total_transactions": 4,
+    }
+    assert await index.top_addresses(CHAIN, 10) == [
+        {"address": "alice", "transaction_count": 2, "volume": 15.0},
+        {"address": "bob", "transaction_count": 1, "volume": 2.0},
+    ]
+    assert sorted(await index.activity(CHAIN, 7)) == [
+        (TODAY, "FAUCET", 1),
+        (TODAY, "GPU_MARKETPLACE", 1),
+        (TODAY, "TRANSFER", 2),
+    ]
+    transactions, gpu_offers, volume, first_seen = await index.address_activity(CHAIN, "alice")
+    assert (transactions, gpu_offers, volume) == (4, 1, 117.0)
+    assert first_seen.startswith(f"{TODAY} 12:00:00")
+
+    blocks = await index.non_empty_blocks(CHAIN, limit=10, offset=0)
+    assert [block["height"] for block in blocks] == [4, 3, 1]
+    assert [tx["tx_hash"] for tx in blocks[2]["transactions"]] == ["0xa1", "0xa2"]
+    assert blocks[1]["transactions"][0]["payload"] == '{"provider_node_id": "prov-1"}'
+    assert [block["height"] for block in await index.non_empty_blocks(CHAIN, limit=1, offset=1)] == [3]
+
+
+@pytest.mark.asyncio
+async def test_a_rewritten_chain_is_rolled_back_and_reindexed(index):
+    node = FakeNode()
+    node.append()
+    node.append(_tx("0xb1", "alice", "bob", 10))
+    node.append(_tx("0xb2", "carol", "dave", 7, "GPU_MARKETPLACE", node_id="prov-2"))
+    chain_indexer = _indexer(index, node)
+    await _catch_up(chain_indexer)
+
+    # The node replaces block 2 and extends its own branch.
+    del node.blocks[2:]
+    node.append(_tx("0xc1", "alice", "erin", 3), fork="f")
+    node.append(fork="f")
+    await _catch_up(chain_indexer)
+
+    assert await index.tip(CHAIN) == (3, "0xf0003")
+    assert await index.network_stats(CHAIN) == {
+        "total_ait": 13.0,
+        "active_offers": 0,
+        "unique_nodes": 1,
+        "unique_providers": 0,
+        "total_transactions": 2,
+    }
+    assert await index.address_activity(CHAIN, "carol") == (0, 0, 0.0, None)
+    assert [block["height"] for block in await index.non_empty_blocks(CHAIN, 10, 0)] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_endpoints_answer_from_a_ready_index(index, monkeypatch):
+    from routers import analytics, blocks
+
+    node = FakeNode()
+    node.append(_tx("0xd1", "alice", "bob", 4))
+    await _catch_up(_indexer(index, node))
+    monkeypatch.setattr(indexer, "_index", index)
+
+    stats = await analytics.api_network_stats(chain_id=CHAIN)
+    timeline = await analytics.api_activity_timeline(chain_id=CHAIN, days=7)
+    reputation = await analytics.api_provider_reputation("alice", chain_id=CHAIN)
+    non_empty = await blocks.api_non_empty_blocks(chain_id=CHAIN, limit=5, offset=0)
+
+    assert stats["total_transactions"] == 1
+    assert timeline["labels"] == [TODAY] and timeline["datasets"][0]["data"] == [1]
+    assert reputation["transactions"] == 1 and reputation["total_volume"] == 4.0
+    assert non_empty["blocks"][0]["txCount"] == 1
+
+
+@pytest.mark.asyncio
+async def test_index_stops_serving_once_it_falls_behind(index):
+    node = FakeNode()
+    for _ in range(3):
+        node.append()
+    chain_indexer = _indexer(index, node)
+    chain_indexer.max_lag_blocks = 2
+    await _catch_up(chain_indexer)
+    assert index.is_ready(CHAIN)
+
+    node.append()
+    node.append()
+    # Two blocks behind is within the allowed lag; three is not.
+    chain_indexer.batch_blocks = 1
+    assert await chain_indexer.step()
+    assert index.is_ready(CHAIN)
+    for _ in range(3):
+        node.append()
+    assert await chain_indexer.step()
+    assert not index.is_ready(CHAIN)
+    await _catch_up(chain_indexer)
+    assert index.is_ready(CHAIN)
+
+
+@pytest.mark.asyncio
+async def test_run_survives_index_errors_and_clears_readiness_on_exit(index, monkeypatch):
+    import asyncio
+    import sqlite3
+
+    node = FakeNode()
+    node.append()
+    chain_indexer = _indexer(index, node)
+    chain_indexer.poll_seconds = 0.01
+    apply_blocks = index.apply_blocks
+    failures = 0
+
+    async def locked_twice(chain_id, blocks):
+        nonlocal failures
+        if failures < 2:
+            failures += 1
+            raise sqlite3.OperationalError("database is locked")
+        await apply_blocks(chain_id, blocks)
+
+    monkeypatch.setattr(index, "apply_blocks", locked_twice)
+    task = asyncio.create_task(chain_indexer.run())
+    for _ in range(200):
+        if index.is_ready(CHAIN):
+            break
+        await asyncio.sleep(0.01)
+    assert failures == 2
+    assert index.is_ready(CHAIN)
+    assert await index.tip(CHAIN) == (0, "0x0000")
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not index.is_ready(CHAIN)
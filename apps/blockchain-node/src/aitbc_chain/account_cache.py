@@ -0,0 +1,223 @@
+"""
+Process-wide cache of account balances and nonces.
+
+RPC account lookups, mempool admission checks and the balance tracker all used
+to read ``account`` rows from SQLite on every call. They now go through
+:func:`get_account_cache`, a bounded LRU of ``(balance, nonce)`` keyed by
+``(chain_id, address)``.
+
+Coherence rules:
+
+* Writers report what they touch. ORM flushes of :class:`Account` are picked up
+  by a session event; raw ``UPDATE account`` statements (the state transition,
+  ``apply_deltas_to_db``) and bulk deletes call :meth:`AccountCache.touch`.
+  Touched entries are dropped when the session commits *or* rolls back --
+  sessions share one SQLite connection, so another reader may have cached a
+  value that was never committed.
+* Block commit is write-through: the proposer and chain sync call
+  :meth:`AccountCache.refresh` after committing, which reloads the block's
+  accounts in one query, so the next RPC read of a hot account is a hit.
+* Writes by other processes (a separate sync or proposer service) are caught by
+  ``PRAGMA data_version``, which changes whenever another connection commits;
+  the whole cache is then dropped.
+* Reads inside a session that has touched the account go to the database, so
+  uncommitted writes are never cached.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any
+from weakref import WeakSet
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from .config import settings
+from .metrics import metrics_registry
+from .models import Account
+
+# (balance, nonce) of one account.
+AccountState = tuple[int, int]
+
+# session.info keys: touched (chain_id, address) pairs, and chains touched as a whole.
+_TOUCHED = "account_cache_touched"
+_TOUCHED_CHAINS = "account_cache_touched_chains"
+# Pooled-connection info key: PRAGMA data_version last seen on that connection.
+_DATA_VERSION = "account_cache_data_version"
+# Addresses per IN (...) on refresh; below SQLite's bound-parameter limit.
+_REFRESH_CHUNK = 500
+
+# Every cache in the process; the session events below keep all of them coherent.
+_caches: WeakSet[AccountCache] = WeakSet()
+
+
+class AccountCache:
+    """Bounded LRU of account state, kept coherent with the database (see module docstring)."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], AccountState] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        _caches.add(self)
+
+    # -- reads ----------------------------------------------------------------
+
+    def lookup(self, session: Session, chain_id: str, address: str) -> AccountState | None:
+        """Return ``(balance, nonce)`` for the account, or None if it does not exist."""
+        key = (chain_id, address)
+        cacheable = self._cacheable(session, key)
+        if cacheable:
+            with self._lock:
+                state = self._entries.get(key)
+                if state is not None:
+                    self._entries.move_to_end(key)
+                    self._record(hit=True)
+                    return state
+                self._record(hit=False)
+        row = session.execute(
+            select(Account.balance, Account.nonce).where(Account.chain_id == chain_id, Account.address == address)
+        ).first()
+        if row is None:
+            return None
+        state = (int(row[0]), int(row[1]))
+        if cacheable:
+            self._store({key: state})
+        return state
+
+    def refresh(self, session: Session, chain_id: str, addresses: Iterable[str]) -> None:
+        """Reload committed state for ``addresses`` into the cache (write-through on block commit)."""
+        if not self._cacheable(session, None):
+            return
+        pending = sorted(set(addresses))
+        loaded: dict[tuple[str, str], AccountState] = {}
+        for start in range(0, len(pending), _REFRESH_CHUNK):
+            chunk = pending[start : start + _REFRESH_CHUNK]
+            rows = session.execute(
+                select(Account.address, Account.balance, Account.nonce).where(
+                    Account.chain_id == chain_id,
+                    Account.address.in_(chunk),  # type: ignore[attr-defined]
+                )
+            ).all()
+            loaded.update({(chain_id, address): (int(balance), int(nonce)) for address, balance, nonce in rows})
+        with self._lock:
+            for address in pending:
+                self._entries.pop((chain_id, address), None)
+        self._store(loaded)
+
+    # -- writes ---------------------------------------------------------------
+
+    def touch(self, session: Session, chain_id: str, addresses: Iterable[str] | None = None) -> None:
+        """Record that ``session`` wrote these accounts (or, with None, the whole chain)."""
+        if addresses is None:
+            session.info.setdefault(_TOUCHED_CHAINS, set()).add(chain_id)
+            self.invalidate(chain_id)
+            return
+        keys = {(chain_id, address) for address in addresses}
+        session.info.setdefault(_TOUCHED, set()).update(keys)
+        self._discard(keys)
+
+    def invalidate(self, chain_id: str | None = None, addresses: Iterable[str] | None = None) -> None:
+        """Drop entries for ``addresses`` of ``chain_id``, a whole chain, or (no arguments) everything."""
+        with self._lock:
+            if chain_id is None:
+                self._entries.clear()
+            elif addresses is None:
+                for key in [key for key in self._entries if key[0] == chain_id]:
+                    del self._entries[key]
+            else:
+                for address in addresses:
+                    self._entries.pop((chain_id, address), None)
+            metrics_registry.set_gauge("account_cache_entries", len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every entry and the hit/miss counts."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def _discard(self, keys: Iterable[tuple[str, str]], chains: Iterable[str] = ()) -> None:
+        for chain_id in chains:
+            self.invalidate(chain_id)
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            metrics_registry.set_gauge("account_cache_entries", len(self._entries))
+
+    # -- internals ------------------------------------------------------------
+
+    def _cacheable(self, session: Session, key: tuple[str, str] | None) -> bool:
+        if self.max_entries <= 0 or session.get_bind().dialect.name != "sqlite":
+            return False
+        if key is not None and (
+            key in session.info.get(_TOUCHED, ()) or key[0] in session.info.get(_TOUCHED_CHAINS, ())
+        ):
+            return False
+        # data_version changes when *another* connection commits. The value is kept on the pooled
+        # DBAPI connection; one we have not seen before may have missed commits, so it counts
+        # as changed too.
+        info = session.connection().connection.info
+        version = session.execute(text("PRAGMA data_version")).scalar()
+        previous = info.get(_DATA_VERSION)
+        info[_DATA_VERSION] = version
+        if previous != version and self._entries:
+            # Another connection committed: we cannot tell which accounts it wrote.
+            self.invalidate()
+            metrics_registry.increment("account_cache_external_invalidations_total")
+        return True
+
+    def _store(self, states: dict[tuple[str, str], AccountState]) -> None:
+        with self._lock:
+            for key, state in states.items():
+                self._entries[key] = state
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics_registry.increment("account_cache_evictions_total")
+            metrics_registry.set_gauge("account_cache_entries", len(self._entries))
+
+    def _record(self, *, hit: bool) -> None:
+        if hit:
+            self._hits += 1
+            metrics_registry.increment("account_cache_hits_total")
+        else:
+            self._misses += 1
+            metrics_registry.increment("account_cache_misses_total")
+        metrics_registry.set_gauge("account_cache_hit_ratio", self._hits / (self._hits + self._misses))
+
+
+# Singleton instance shared across the node process.
+account_cache = AccountCache(max_entries=settings.account_cache_size)
+
+
+def get_account_cache() -> AccountCache:
+    """Return the process-wide :class:`AccountCache` singleton."""
+    return account_cache
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _track_account_flush(session: OrmSession, flush_context: Any) -> None:
+    keys = {
+        (obj.chain_id, obj.address)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Account)
+    }
+    if keys:
+        session.info.setdefault(_TOUCHED, set()).update(keys)
+        for cache in list(_caches):
+            cache._discard(keys)
+
+
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_rollback")
+def _end_of_transaction(session: OrmSession) -> None:
+    keys: set[tuple[str, str]] = session.info.pop(_TOUCHED, set())
+    chains: set[str] = session.info.pop(_TOUCHED_CHAINS, set())
+    if keys or chains:
+        for cache in list(_caches):
+            cache._discard(keys, chains)
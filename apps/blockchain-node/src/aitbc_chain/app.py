@@ -27,6 +27,7 @@ from .rpc.escrow_routes import router as escrow_router
 from .rpc.router import router as rpc_router
 from .rpc.utils import set_poa_proposer
 from .rpc.websocket import router as websocket_router
+from .signature_verifier import close_signature_verifier
 
 from aitbc.aitbc_logging import configure_logging
 from aitbc.async_tasks import create_task_with_logging
@@ -238,6 +239,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
                 _app_logger.warning("Failed to stop PoA proposer during shutdown: %s", exc)
         await gossip_broker.shutdown()
         await lease_tracker.stop()
+        close_signature_verifier()
         _app_logger.info("Blockchain node stopped")
 
 
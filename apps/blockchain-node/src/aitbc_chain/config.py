@@ -147,6 +147,8 @@ class ChainSettings(BaseSettings):
     mempool_db_url: str = ""  # PostgreSQL URL for mempool (set via MEMPOOL_DB_URL env var - no hardcoded credentials)
     mempool_max_size: int = 10_000
     mempool_eviction_interval: int = 60  # seconds
+    mempool_max_nonce_gap: int = 64  # Furthest a nonce may run ahead of the account at admission
+    mempool_parked_ttl_seconds: int = 600  # Future-nonce transactions parked longer than this are dropped
 
     # Circuit breaker
     circuit_breaker_threshold: int = 5  # failures before opening
@@ -281,6 +283,15 @@ class ChainSettings(BaseSettings):
     min_bulk_sync_interval: int = 60  # minimum seconds between bulk sync attempts
     min_bulk_sync_batch_size: int = 20  # minimum batch size for dynamic bulk sync
     max_bulk_sync_batch_size: int = 200  # maximum batch size for dynamic bulk sync
+    # Verify bulk-synced state once per batch: compare the incremental state root after the
+    # batch with its last block's root, bisecting to the first divergent block on mismatch.
+    # Off by default: bulk sync then imports without state-root validation, as before.
+    bulk_sync_checkpoint_verification: bool = False
+    bulk_sync_prefetch_depth: int = 4  # batches buffered between bulk sync fetch, decode and import stages
+    bulk_import_blocks_per_commit: int = 500  # blocks written per SQLite transaction by ChainSync.import_blocks
+    chain_export_page_size: int = 1000  # rows per query and per compressed chunk of the streaming chain export
+    chain_import_records_per_commit: int = 1000  # records per SQLite transaction of the streaming chain import
+    account_cache_size: int = 10000  # accounts kept by the in-memory balance/nonce cache (0 disables it)
 
     # Periodic pull sync settings (for followers)
     periodic_sync_enabled: bool = True  # enable periodic pull sync from default peer
@@ -483,17 +494,24 @@ class ChainSettings(BaseSettings):
     parallel_tx_validation: bool = False  # Feature flag — default off for safety
     parallel_workers: int = 4  # Thread pool size for parallel tx validation
     conflict_threshold: float = 0.5  # Fall back to sequential if >50% of txs conflict
+    # Transaction signatures of imported blocks and RPC submissions are verified on a
+    # process pool (the GIL serialises them on threads). 0 workers = one per CPU;
+    # 1 = verify inline. Blocks with fewer signed txs than the minimum verify inline.
+    signature_verify_workers: int = 0
+    signature_verify_min_batch: int = 32
 
     # Gossip protocol (v0.6.2). Protocol version advertises the message
     # format capabilities of this node. v1 = legacy (pre-v0.6.2, no
     # priority/batching). v2 = optimized (priority queue + batching).
+    # v3 = v2 plus length-prefixed binary frames on the P2P TCP transport
+    # (needs msgpack; nodes without it advertise v2).
     # GOSSIP_BACKWARD_COMPAT=true keeps accepting v1 peers (with a
     # deprecation log) for one release cycle. GOSSIP_LEGACY_PEER_TIMEOUT
     # is the seconds before disconnecting a v1 peer that never upgrades.
     # GOSSIP_MESSAGE_BATCH_SIZE is the max messages per batched gossip
     # frame (1 = no batching). GOSSIP_PRIORITY_ENABLED toggles the
     # PriorityMessageQueue routing in the broker (default off).
-    gossip_protocol_version: int = 2  # Protocol version (1=legacy, 2=optimized)
+    gossip_protocol_version: int = 3  # Protocol version (1=legacy, 2=optimized, 3=binary frames)
     gossip_backward_compat: bool = True  # Accept v1 peers with deprecation
     gossip_legacy_peer_timeout: int = 3600  # Seconds before disconnecting v1 peers
     gossip_message_batch_size: int = 10  # Max messages per batched gossip frame
@@ -527,6 +545,35 @@ class ChainSettings(BaseSettings):
     # P2P_TO_RPC_PORT_OFFSET (default 2).
     p2p_to_rpc_port_offset: int = 2  # RPC port = P2P port + offset (8200 -> 8202)
 
+    # P2P transaction gossip. New mempool transactions are announced to peers as batches
+    # of hashes (tx_inv); peers fetch only the ones they do not know (get_txs -> txs).
+    # Announcements are batched for P2P_TX_INV_INTERVAL seconds, up to
+    # P2P_TX_INV_BATCH_SIZE hashes per message. Hashes seen are remembered for
+    # P2P_TX_SEEN_TTL seconds, at most P2P_TX_SEEN_MAX of them. A requested transaction
+    # not delivered within P2P_TX_REQUEST_TIMEOUT seconds is requested again from
+    # another peer that announced it; at most P2P_TX_REQUEST_MAX requests are pending.
+    p2p_tx_inv_interval: float = 0.1
+    p2p_tx_inv_batch_size: int = 1000
+    p2p_tx_announce_queue_max: int = 50_000  # new-tx notifications buffered for announcing
+    p2p_tx_seen_ttl: float = 600.0
+    p2p_tx_seen_max: int = 200_000
+    p2p_tx_request_timeout: float = 2.0
+    p2p_tx_request_max: int = 50_000
+
+    # P2P binary frames (protocol v3). Frame bodies larger than
+    # P2P_FRAME_COMPRESS_THRESHOLD bytes are zlib-compressed when network
+    # compression is enabled. A peer announcing a frame larger than
+    # P2P_MAX_FRAME_BYTES is disconnected.
+    p2p_frame_compress_threshold: int = 1024
+    p2p_max_frame_bytes: int = 32 * 1024 * 1024
+
+    # Per-peer outbound queues. Each connected peer has its own send queue and
+    # writer task, so a slow peer cannot hold up the others. A peer with more than
+    # P2P_PEER_SEND_QUEUE_MAX messages queued, or whose socket does not drain for
+    # P2P_PEER_SEND_TIMEOUT seconds, is disconnected.
+    p2p_peer_send_queue_max: int = 10_000
+    p2p_peer_send_timeout: float = 30.0
+
     # Redis Configuration (Hub persistence)
     redis_url: str = "redis://localhost:6379"  # Redis connection URL
 
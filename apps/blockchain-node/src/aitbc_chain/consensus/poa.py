@@ -2,7 +2,7 @@ import asyncio
 import hashlib
 import json
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Collection
 from contextlib import AbstractContextManager
 from datetime import UTC, datetime
 from pathlib import Path
@@ -15,6 +15,7 @@ from aitbc.async_tasks import create_task_with_logging
 from aitbc.network import SharedHttpClient
 from aitbc.parallel import DependencyGraph, ParallelExecutor
 
+from ..account_cache import get_account_cache
 from ..config import ProposerConfig, settings
 from ..gossip import gossip_broker
 from ..lease_tracker import lease_tracker
@@ -30,7 +31,7 @@ from ..state.pure_state_transition import (
     compute_state_delta,
     extract_read_write_sets,
 )
-from ..state.state_root_utils import compute_state_root_full as _compute_state_root
+from ..state.state_root_utils import compute_state_root as _compute_state_root
 from ..state.state_transition import get_state_transition
 
 logger = get_logger(__name__)
@@ -362,7 +363,12 @@ class PoAProposer:
             timestamp = datetime.now(UTC)
             max_txs = self._config.max_txs_per_block
             max_bytes = self._config.max_block_size_bytes
-            pending_txs = mempool.drain(max_txs, max_bytes, self._config.chain_id)
+            pending_txs = mempool.drain(
+                max_txs,
+                max_bytes,
+                self._config.chain_id,
+                account_nonces=lambda senders: self._load_sender_nonces(session, senders),
+            )
             self._logger.info("[PROPOSE] drained %s txs from mempool, chain=%s", len(pending_txs), self._config.chain_id)
             # Batch-fetch all unique sender and recipient accounts in one query
             # (eliminates the per-tx session.get() round-trips).
@@ -528,11 +534,9 @@ class PoAProposer:
                 )
                 return False
             block_hash = self._compute_block_hash(next_height, parent_hash, timestamp, processed_txs)
-            # Compute state root from the full account state. The previous
-            # "incremental" approach created a fresh trie per call but only
-            # populated it with changed accounts — producing a wrong root that
-            # excluded all other accounts. Since the trie is not persisted across
-            # blocks, a full recompute is the only correct option.
+            # The persistent trie applies every account written since the previous
+            # block's root (tracked by triggers on `account`, so raw SQL updates in
+            # the state transition are included) and commits with this block.
             state_root = _compute_state_root(session, self._config.chain_id)
             # v0.7.5: Select the proposer for this block. In multi-validator
             # consensus the proposer is chosen by MultiValidatorPoA; otherwise the
@@ -579,6 +583,9 @@ class PoAProposer:
             )
             session.add(block)
             session.commit()
+            # Write the block's accounts through to the account cache, so RPC and
+            # admission reads of the accounts just used stay in memory.
+            get_account_cache().refresh(session, self._config.chain_id, changed_addresses)
             # Invalidate the in-process block header cache for the new block
             # so stale entries are not served by rpc/blocks.py.
             from ..block_cache import get_block_header_cache
@@ -885,6 +892,27 @@ class PoAProposer:
         session.commit()
         self._logger.info("Created %s accounts from genesis allocations", created)
 
+    def _load_sender_nonces(self, session: Session, senders: Collection[str]) -> dict[str, int]:
+        """Map each pending sender (as written in the tx) to its account nonce.
+
+        Used by the mempool to offer only the next executable nonce per sender.
+        Senders without an account are left out, so their transactions still
+        reach the normal "sender account not found" handling.
+        """
+        canonical = {sender: _to_ait_address(sender) for sender in senders}
+        addresses = list(set(canonical.values()))
+        nonces: dict[str, int] = {}
+        # Chunked to stay under SQLite's bound-parameter limit on large pools.
+        for start in range(0, len(addresses), 500):
+            rows = session.execute(
+                select(Account.address, Account.nonce).where(
+                    Account.chain_id == self._config.chain_id,
+                    Account.address.in_(addresses[start : start + 500]),  # type: ignore[attr-defined]
+                )
+            ).all()
+            nonces.update({row[0]: row[1] or 0 for row in rows})
+        return {sender: nonces[address] for sender, address in canonical.items() if address in nonces}
+
     def _process_txs_parallel(
         self,
         session: Session,
@@ -37,7 +37,9 @@ from .base_models import (  # noqa: F401
 from .config import settings
 from .mempool import MempoolEntry  # noqa: F401
 from .metadata import chain_metadata
+from .payload_index import TransactionPayloadField, ensure_payload_index  # noqa: F401
 from .state.gpu_resources import EdgeNodeRegistration, GPUAllocation, GPURegistration  # noqa: F401
+from .state.persistent_trie import StateTrieDirty, StateTrieNode, StateTrieRoot, ensure_state_trie_triggers  # noqa: F401
 
 # Database encryption key (in production, this should come from HSM or secure key storage)
 _DB_ENCRYPTION_KEY = os.environ.get("AITBC_DB_KEY", "default_encryption_key_change_in_production")
@@ -397,6 +399,13 @@ def init_db(chain_id: str = "") -> None:
     # Add missing columns to existing tables (create_all only creates new tables)
     _migrate_existing_columns(engine)
 
+    # Databases created before the persistent state trie and the payload index have
+    # neither set of triggers; `create_all` only adds them together with a new table.
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            ensure_state_trie_triggers(conn)
+            ensure_payload_index(conn)
+
     # Ensure bond escrow and burn accounts exist for this chain.
     with session_scope(resolved_chain_id) as session:
         ensure_bond_accounts(session, resolved_chain_id)
@@ -265,10 +265,11 @@ class GossipBroker:
         self._priority_enabled: bool = settings.gossip_priority_enabled
         self._priority_queue: PriorityMessageQueue | None = None
         self._priority_task: asyncio.Task[None] | None = None
+        # Set on enqueue, cleared by the drain when the queue runs dry; created with the drain task.
+        self._priority_ready: asyncio.Event | None = None
         self._seen_messages: OrderedDict[str, float] = OrderedDict()
         self._dedup_max_size: int = 10000
         self._dedup_ttl: float = 300.0
-        self._dedup_lock: asyncio.Lock = asyncio.Lock()
         if self._priority_enabled:
             self._priority_queue = PriorityMessageQueue()
             # _start_priority_drain() is deferred to first start()/publish()
@@ -289,24 +290,26 @@ class GossipBroker:
         digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
         return f"{topic}:{digest}"
 
-    async def _is_duplicate(self, message_id: str) -> bool:
-        """Return True if ``message_id`` was seen recently, otherwise record it."""
+    def _is_duplicate(self, message_id: str) -> bool:
+        """Return True if ``message_id`` was seen recently, otherwise record it.
+
+        Runs without awaiting, so it is atomic on the event loop and needs no lock.
+        """
         now = time.monotonic()
-        async with self._dedup_lock:
-            # Evict expired entries (oldest first since OrderedDict preserves insertion order).
-            ttl = self._dedup_ttl
-            seen = self._seen_messages
-            while seen:
-                oldest_id, oldest_ts = next(iter(seen.items()))
-                if now - oldest_ts <= ttl:
-                    break
-                seen.pop(oldest_id, None)
-            if message_id in seen:
-                return True
-            seen[message_id] = now
-            if len(seen) > self._dedup_max_size:
-                seen.popitem(last=False)
-            return False
+        # Evict expired entries (oldest first since OrderedDict preserves insertion order).
+        ttl = self._dedup_ttl
+        seen = self._seen_messages
+        while seen:
+            oldest_id, oldest_ts = next(iter(seen.items()))
+            if now - oldest_ts <= ttl:
+                break
+            seen.pop(oldest_id, None)
+        if message_id in seen:
+            return True
+        seen[message_id] = now
+        if len(seen) > self._dedup_max_size:
+            seen.popitem(last=False)
+        return False
 
     def clear_dedup_cache(self) -> None:
         """Clear the seen-message cache (used for testing/cleanup)."""
@@ -326,6 +329,7 @@ class GossipBroker:
 
     def _start_priority_drain(self) -> None:
         """Start the background task that drains the priority queue."""
+        ready = self._priority_ready = asyncio.Event()
 
         async def _drain() -> None:
             batch_size = settings.gossip_message_batch_size
@@ -335,18 +339,47 @@ class GossipBroker:
                 try:
                     messages: list[PrioritizedMessage] = self._priority_queue.get_batch(max_count=batch_size)
                     if not messages:
-                        await asyncio.sleep(0.001)
+                        # Sleep until publish() enqueues again; nothing runs between the
+                        # empty read and clear(), so a wake-up cannot be lost.
+                        ready.clear()
+                        await ready.wait()
                         continue
-                    for msg in messages:
-                        await self._backend.publish(msg.topic, msg.message)
+                    await self._publish_prioritized(messages)
                 except asyncio.CancelledError:
                     break
                 except Exception:
                     # Avoid crashing the drain loop on transient backend errors
-                    await asyncio.sleep(0.001)
+                    metrics_registry.increment("gossip_priority_publish_errors_total")
 
         self._priority_task = create_task_with_logging(_drain(), name="gossip-priority-drain")
 
+    async def _publish_prioritized(self, messages: list[PrioritizedMessage]) -> None:
+        """Publish a drained batch, one ``publish_batch`` call per topic.
+
+        A topic maps to a single priority, so grouping by topic in order of first
+        appearance keeps higher-priority topics first.
+        """
+        now = time.monotonic()
+        metrics_registry.observe("gossip_priority_batch_size", float(len(messages)))
+        by_topic: dict[str, list[Any]] = {}
+        for msg in messages:
+            metrics_registry.observe("gossip_priority_queue_latency_seconds", now - msg.enqueued_at)
+            by_topic.setdefault(msg.topic, []).append(msg.message)
+        for topic, topic_messages in by_topic.items():
+            if len(topic_messages) == 1:
+                await self._backend.publish(topic, topic_messages[0])
+            else:
+                await self._backend.publish_batch(topic, topic_messages)
+
+    def _enqueue_prioritized(self, topic: str, message: Any) -> None:
+        if self._priority_queue is None:
+            raise RuntimeError("Priority queue not initialized")
+        if not self._priority_queue.put(topic, message, self._priority_for_topic(topic)):
+            metrics_registry.increment("gossip_priority_dropped_total")
+            return
+        if self._priority_ready is not None:
+            self._priority_ready.set()
+
     async def publish(self, topic: str, message: Any) -> None:
         if not self._started:
             await self._backend.start()
@@ -354,12 +387,11 @@ class GossipBroker:
         if self._priority_enabled and self._priority_task is None:
             self._start_priority_drain()
         message_id = self._compute_message_id(topic, message)
-        if await self._is_duplicate(message_id):
+        if self._is_duplicate(message_id):
             metrics_registry.increment("gossip_dedup_skipped_total")
             return
         if self._priority_enabled and self._priority_queue is not None:
-            priority = self._priority_for_topic(topic)
-            self._priority_queue.put(topic, message, priority)
+            self._enqueue_prioritized(topic, message)
             return
         await self._backend.publish(topic, message)
 
@@ -372,7 +404,7 @@ class GossipBroker:
         unique: list[Any] = []
         for message in messages:
             message_id = self._compute_message_id(topic, message)
-            if await self._is_duplicate(message_id):
+            if self._is_duplicate(message_id):
                 metrics_registry.increment("gossip_dedup_skipped_total")
                 continue
             unique.append(message)
@@ -400,6 +432,7 @@ class GossipBroker:
             with suppress(asyncio.CancelledError):
                 await self._priority_task
             self._priority_task = None
+            self._priority_ready = None
         await self._backend.shutdown()
 
 
@@ -17,6 +17,7 @@ from .gossip import create_backend, gossip_broker
 from .lease_tracker import lease_tracker
 from .logger import get_logger
 from .mempool import init_mempool
+from .signature_verifier import close_signature_verifier
 from .subscription_client import SubscriptionClient
 from .sync import ChainSync
 
@@ -721,6 +722,7 @@ class BlockchainNode:
         self._proposers.clear()
         await gossip_broker.shutdown()
         await lease_tracker.stop()
+        close_signature_verifier()
 
 
 @asynccontextmanager
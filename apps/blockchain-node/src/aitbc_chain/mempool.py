@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import json
 import time
 from dataclasses import dataclass
 from threading import Lock, RLock
+from collections.abc import Callable, Collection, Mapping
 from typing import Any, cast
 
 from sqlalchemy import Column, Float, Index, Integer, MetaData, Text, delete, func
@@ -16,6 +18,32 @@ from .metrics import metrics_registry
 
 mempool_metadata = MetaData()
 
+# Called with (chain_id, tx_hash, tx) for every transaction newly added to this process's
+# mempool, after the mempool lock is released and possibly from a worker thread. The P2P
+# service announces new transactions from here instead of polling the pool.
+TxListener = Callable[[str, str, dict[str, Any]], None]
+_tx_listeners: list[TxListener] = []
+
+
+def add_tx_listener(listener: TxListener) -> None:
+    """Register ``listener`` for transactions added to any mempool of this process."""
+    _tx_listeners.append(listener)
+
+
+def remove_tx_listener(listener: TxListener) -> None:
+    """Unregister a listener added with :func:`add_tx_listener`; unknown listeners are ignored."""
+    if listener in _tx_listeners:
+        _tx_listeners.remove(listener)
+
+
+def _notify_tx_listeners(chain_id: str, added: list[tuple[str, dict[str, Any]]]) -> None:
+    for listener in list(_tx_listeners):
+        for tx_hash, tx in added:
+            try:
+                listener(chain_id, tx_hash, tx)
+            except Exception:
+                metrics_registry.increment("mempool_tx_listener_errors_total")
+
 
 class MempoolEntry(ChainBase, table=True):
     __tablename__ = "mempool"
@@ -51,23 +79,228 @@ def _estimate_size(tx: dict[str, Any]) -> int:
     return len(json.dumps(tx, separators=(",", ":")).encode())
 
 
+# Resolves the current account nonce for a batch of sender addresses, as
+# written in the transactions' ``from`` field. Senders left out of the result
+# are treated as executable.
+NonceLookup = Callable[[Collection[str]], Mapping[str, int]]
+
+
+def _sender_nonce(tx: dict[str, Any]) -> tuple[str, int] | None:
+    """Return ``(sender, nonce)`` for a nonce-ordered transaction, else None.
+
+    Transactions without a ``from`` address or an integer ``nonce`` are not
+    sequenced per sender and are always eligible for drain.
+    """
+    sender = tx.get("from")
+    nonce = tx.get("nonce")
+    if not isinstance(sender, str) or not sender or not isinstance(nonce, int) or isinstance(nonce, bool):
+        return None
+    return sender, nonce
+
+
+class _ChainPool:
+    """Pending transactions for one chain, indexed for fee-priority access.
+
+    ``by_hash`` is the source of truth. The heaps are indexes over it and use
+    lazy deletion: an entry whose hash is no longer in ``by_hash`` is discarded
+    when it reaches the top. ``_compact`` rebuilds a heap once stale entries
+    outnumber live ones, so heap size stays O(live transactions).
+
+    Transactions that carry a sender and nonce are also queued per sender in
+    nonce order. Only the head of each sender's queue sits in the fee-priority
+    heap; the next nonce is promoted when the head leaves the pool, so drain
+    can never offer nonce N+1 ahead of nonce N.
+    """
+
+    __slots__ = ("by_hash", "_priority", "_eviction", "_queues", "_queued")
+
+    def __init__(self) -> None:
+        self.by_hash: dict[str, PendingTransaction] = {}
+        # Max-fee first via negated fee; tx_hash breaks ties deterministically
+        # so every validator drains the same order.
+        self._priority: list[tuple[int, str]] = []
+        # Lowest fee, then oldest, is evicted first.
+        self._eviction: list[tuple[int, float, str]] = []
+        # sender -> heap of (nonce, -fee, tx_hash); a replacement at the same
+        # nonce with a higher fee sorts ahead of the original.
+        self._queues: dict[str, list[tuple[int, int, str]]] = {}
+        self._queued: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_hash)
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self.by_hash
+
+    def senders(self) -> list[str]:
+        return list(self._queues)
+
+    def push(self, entry: PendingTransaction) -> None:
+        self.by_hash[entry.tx_hash] = entry
+        heapq.heappush(self._eviction, (entry.fee, entry.received_at, entry.tx_hash))
+        key = _sender_nonce(entry.content)
+        if key is None:
+            heapq.heappush(self._priority, (-entry.fee, entry.tx_hash))
+            return
+        sender, nonce = key
+        queue = self._queues.setdefault(sender, [])
+        heapq.heappush(queue, (nonce, -entry.fee, entry.tx_hash))
+        self._queued[sender] = self._queued.get(sender, 0) + 1
+        if self._head(sender) == entry.tx_hash:
+            heapq.heappush(self._priority, (-entry.fee, entry.tx_hash))
+
+    def discard(self, tx_hash: str) -> PendingTransaction | None:
+        entry = self.by_hash.get(tx_hash)
+        if entry is not None:
+            self._remove(entry)
+            self._compact()
+        return entry
+
+    def pop_lowest_fee(self) -> PendingTransaction | None:
+        while self._eviction:
+            _, _, tx_hash = heapq.heappop(self._eviction)
+            entry = self.by_hash.get(tx_hash)
+            if entry is not None:
+                self._remove(entry)
+                self._compact()
+                return entry
+        return None
+
+    def take(
+        self,
+        max_count: int,
+        max_bytes: int,
+        account_nonces: Mapping[str, int] | None = None,
+        parked_ttl: float | None = None,
+    ) -> tuple[list[PendingTransaction], list[PendingTransaction], list[PendingTransaction]]:
+        """Remove and return the highest-fee executable transactions that fit the limits.
+
+        With ``account_nonces`` a sender's head is executable only when its
+        nonce equals the account nonce; a higher nonce is parked until the gap
+        is filled, and a lower nonce can never apply and is dropped. Senders
+        missing from the mapping are not checked. A parked head received more
+        than ``parked_ttl`` seconds ago is expired, which promotes the sender's
+        next nonce so a stale run is cleared in one pass. A transaction too
+        large for the remaining byte budget is skipped, not dropped.
+
+        Returns ``(taken, dropped, expired)``.
+        """
+        result: list[PendingTransaction] = []
+        dropped: list[PendingTransaction] = []
+        expired: list[PendingTransaction] = []
+        skipped: list[tuple[int, str]] = []
+        expected = dict(account_nonces) if account_nonces is not None else {}
+        cutoff = time.time() - parked_ttl if parked_ttl is not None else None
+        total_bytes = 0
+        while self._priority and len(result) < max_count:
+            key = heapq.heappop(self._priority)
+            entry = self.by_hash.get(key[1])
+            if entry is None:
+                continue
+            sender_nonce = _sender_nonce(entry.content)
+            if sender_nonce is not None:
+                sender, nonce = sender_nonce
+                if self._head(sender) != entry.tx_hash:
+                    continue  # superseded as head; the live head has its own entry
+                if sender in expected and nonce != expected[sender]:
+                    if nonce < expected[sender]:
+                        self._remove(entry)
+                        dropped.append(entry)
+                    elif cutoff is not None and entry.received_at < cutoff:
+                        self._remove(entry)
+                        expired.append(entry)
+                    else:
+                        skipped.append(key)
+                    continue
+            if total_bytes + entry.size_bytes > max_bytes:
+                skipped.append(key)
+                continue
+            self._remove(entry)
+            result.append(entry)
+            total_bytes += entry.size_bytes
+            if sender_nonce is not None:
+                expected[sender_nonce[0]] = sender_nonce[1] + 1
+        for key in skipped:
+            heapq.heappush(self._priority, key)
+        self._compact()
+        return result, dropped, expired
+
+    def top(self, limit: int) -> list[PendingTransaction]:
+        """Return up to ``limit`` transactions by fee without removing them."""
+        keys = heapq.nsmallest(limit, ((-entry.fee, tx_hash) for tx_hash, entry in self.by_hash.items()))
+        return [self.by_hash[tx_hash] for _, tx_hash in keys]
+
+    def _head(self, sender: str) -> str | None:
+        queue = self._queues.get(sender)
+        while queue:
+            tx_hash = queue[0][2]
+            if tx_hash in self.by_hash:
+                return tx_hash
+            heapq.heappop(queue)
+        return None
+
+    def _remove(self, entry: PendingTransaction) -> None:
+        """Delete ``entry`` and promote its sender's next nonce if it was the head."""
+        key = _sender_nonce(entry.content)
+        was_head = key is not None and self._head(key[0]) == entry.tx_hash
+        del self.by_hash[entry.tx_hash]
+        if key is None:
+            return
+        sender = key[0]
+        remaining = self._queued[sender] - 1
+        if remaining == 0:
+            del self._queues[sender]
+            del self._queued[sender]
+            return
+        self._queued[sender] = remaining
+        queue = self._queues[sender]
+        if len(queue) > 2 * remaining + 16:
+            queue[:] = [item for item in queue if item[2] in self.by_hash]
+            heapq.heapify(queue)
+        if was_head:
+            next_hash = self._head(sender)
+            if next_hash is not None:
+                heapq.heappush(self._priority, (-self.by_hash[next_hash].fee, next_hash))
+
+    def _compact(self) -> None:
+        live = len(self.by_hash)
+        if len(self._priority) > 2 * live + 64:
+            heads = {h for h in (self._head(sender) for sender in self._queues) if h is not None}
+            self._priority = [
+                (-entry.fee, tx_hash)
+                for tx_hash, entry in self.by_hash.items()
+                if tx_hash in heads or _sender_nonce(entry.content) is None
+            ]
+            heapq.heapify(self._priority)
+        if len(self._eviction) > 2 * live + 64:
+            self._eviction = [(entry.fee, entry.received_at, tx_hash) for tx_hash, entry in self.by_hash.items()]
+            heapq.heapify(self._eviction)
+
+
 class InMemoryMempool:
-    """In-memory mempool with fee-based prioritization and size limits."""
+    """In-memory mempool with fee-based prioritization and size limits.
+
+    Each chain keeps a :class:`_ChainPool` with a fee-priority heap for drain,
+    a min-fee heap for eviction and a nonce-ordered queue per sender, so add,
+    drain and evict are O(log n) per transaction. The pool-wide size is a
+    running counter rather than a sum over chains.
+    """
 
     def __init__(self, max_size: int = 10_000, min_fee: int = 0, chain_id: str | None = None) -> None:
         from .config import settings
 
         self._lock = Lock()
-        self._transactions: dict[str, dict[str, PendingTransaction]] = {}
+        self._transactions: dict[str, _ChainPool] = {}
+        self._size = 0
         self._max_size = max_size
         self._min_fee = min_fee
         self.chain_id = chain_id or settings.chain_id
 
-    def _get_chain_transactions(self, chain_id: str) -> dict[str, PendingTransaction]:
-        return self._transactions.setdefault(chain_id, {})
-
-    def _total_size(self) -> int:
-        return sum(len(chain_txs) for chain_txs in self._transactions.values())
+    def _get_chain_transactions(self, chain_id: str) -> _ChainPool:
+        pool = self._transactions.get(chain_id)
+        if pool is None:
+            pool = self._transactions[chain_id] = _ChainPool()
+        return pool
 
     def add(self, tx: dict[str, Any], chain_id: str | None = None) -> str:
         from .config import settings
@@ -87,9 +320,11 @@ class InMemoryMempool:
                 return tx_hash  # duplicate
             if len(chain_transactions) >= self._max_size:
                 self._evict_lowest_fee(chain_id)
-            chain_transactions[tx_hash] = entry
-            metrics_registry.set_gauge("mempool_size", float(self._total_size()))
+            chain_transactions.push(entry)
+            self._size += 1
+            metrics_registry.set_gauge("mempool_size", float(self._size))
             metrics_registry.increment(f"mempool_tx_added_total_{chain_id}")
+        _notify_tx_listeners(chain_id, [(tx_hash, tx)])
         return tx_hash
 
     def list_transactions(self, chain_id: str | None = None) -> list[PendingTransaction]:
@@ -98,32 +333,52 @@ class InMemoryMempool:
         if chain_id is None:
             chain_id = settings.chain_id
         with self._lock:
-            return list(self._get_chain_transactions(chain_id).values())
+            return list(self._get_chain_transactions(chain_id).by_hash.values())
 
-    def drain(self, max_count: int, max_bytes: int, chain_id: str | None = None) -> list[PendingTransaction]:
+    def get_transactions(self, tx_hashes: Collection[str], chain_id: str | None = None) -> list[dict[str, Any]]:
+        """Contents of the pending transactions among ``tx_hashes``; unknown hashes are skipped."""
         from .config import settings
 
         if chain_id is None:
             chain_id = settings.chain_id
-        """Drain transactions for block inclusion, prioritized by fee (highest first)."""
         with self._lock:
-            chain_transactions = self._get_chain_transactions(chain_id)
-            sorted_txs = sorted(chain_transactions.values(), key=lambda t: (-t.fee, t.tx_hash))
-            result: list[PendingTransaction] = []
-            total_bytes = 0
-            for tx in sorted_txs:
-                if len(result) >= max_count:
-                    break
-                if total_bytes + tx.size_bytes > max_bytes:
-                    continue
-                result.append(tx)
-                total_bytes += tx.size_bytes
-
-            for tx in result:
-                del chain_transactions[tx.tx_hash]
+            by_hash = self._get_chain_transactions(chain_id).by_hash
+            return [by_hash[tx_hash].content for tx_hash in tx_hashes if tx_hash in by_hash]
+
+    def drain(
+        self,
+        max_count: int,
+        max_bytes: int,
+        chain_id: str | None = None,
+        account_nonces: NonceLookup | None = None,
+    ) -> list[PendingTransaction]:
+        """Drain transactions for block inclusion, prioritized by fee (highest first).
+
+        Each sender's transactions come out in nonce order. With
+        ``account_nonces``, future-nonce transactions stay parked for up to
+        ``mempool_parked_ttl_seconds`` and already-used nonces are dropped;
+        see :meth:`_ChainPool.take`.
+        """
+        from .config import settings
 
-            metrics_registry.set_gauge("mempool_size", float(self._total_size()))
+        if chain_id is None:
+            chain_id = settings.chain_id
+        nonces: Mapping[str, int] | None = None
+        if account_nonces is not None:
+            # Resolved outside the lock so a slow account lookup never blocks add().
+            with self._lock:
+                senders = self._get_chain_transactions(chain_id).senders()
+            nonces = account_nonces(senders) if senders else {}
+        with self._lock:
+            pool = self._get_chain_transactions(chain_id)
+            result, dropped, expired = pool.take(max_count, max_bytes, nonces, settings.mempool_parked_ttl_seconds)
+            self._size -= len(result) + len(dropped) + len(expired)
+            metrics_registry.set_gauge("mempool_size", float(self._size))
             metrics_registry.increment(f"mempool_tx_drained_total_{chain_id}", float(len(result)))
+            if dropped:
+                metrics_registry.increment(f"mempool_stale_nonce_dropped_total_{chain_id}", float(len(dropped)))
+            if expired:
+                metrics_registry.increment(f"mempool_parked_expired_total_{chain_id}", float(len(expired)))
             return result
 
     def remove(self, tx_hash: str, chain_id: str | None = None) -> bool:
@@ -132,9 +387,10 @@ class InMemoryMempool:
         if chain_id is None:
             chain_id = settings.chain_id
         with self._lock:
-            removed = self._get_chain_transactions(chain_id).pop(tx_hash, None) is not None
+            removed = self._get_chain_transactions(chain_id).discard(tx_hash) is not None
             if removed:
-                metrics_registry.set_gauge("mempool_size", float(self._total_size()))
+                self._size -= 1
+                metrics_registry.set_gauge("mempool_size", float(self._size))
             return removed
 
     def size(self, chain_id: str | None = None) -> int:
@@ -153,19 +409,14 @@ class InMemoryMempool:
             chain_id = settings.chain_id
 
         with self._lock:
-            # Get transactions sorted by fee (highest first) and tx_hash (deterministic tiebreaker)
-            sorted_txs = sorted(self._get_chain_transactions(chain_id).values(), key=lambda t: (-t.fee, t.tx_hash))
-
-            # Return only the content, limited by the limit parameter
-            return [tx.content for tx in sorted_txs[:limit]]
+            # Sorted by fee (highest first) and tx_hash (deterministic tiebreaker)
+            return [tx.content for tx in self._get_chain_transactions(chain_id).top(limit)]
 
     def _evict_lowest_fee(self, chain_id: str) -> None:
         """Evict the lowest-fee transaction to make room."""
-        chain_transactions = self._get_chain_transactions(chain_id)
-        if not chain_transactions:
+        if self._get_chain_transactions(chain_id).pop_lowest_fee() is None:
             return
-        lowest = min(chain_transactions.values(), key=lambda t: (t.fee, t.received_at, t.tx_hash))
-        del chain_transactions[lowest.tx_hash]
+        self._size -= 1
         metrics_registry.increment(f"mempool_evictions_total_{chain_id}")
 
 
@@ -256,6 +507,8 @@ class DatabaseMempool:
                     session.commit()
                 metrics_registry.increment(f"mempool_tx_added_total_{chain_id}")
             self._update_gauge(chain_id)
+        if commit:
+            _notify_tx_listeners(chain_id, [(tx_hash, tx)])
         return tx_hash
 
     def batch_add(self, transactions: list[dict[str, Any]], chain_id: str | None = None) -> list[str]:
@@ -274,6 +527,7 @@ class DatabaseMempool:
             tx_hashes.append(compute_tx_hash(tx))
 
         hashes: list[str] = []
+        added: list[tuple[str, dict[str, Any]]] = []
         with self._lock:
             with Session(self._engine) as session:
                 # Batch query: fetch all existing hashes in one query (N+1 → 1)
@@ -330,9 +584,11 @@ class DatabaseMempool:
                     current_count += 1
                     existing_hashes.add(tx_hash)
                     hashes.append(tx_hash)
+                    added.append((tx_hash, tx))
                     metrics_registry.increment(f"mempool_tx_added_total_{chain_id}")
                 session.commit()
             self._update_gauge(chain_id)
+        _notify_tx_listeners(chain_id, added)
         return hashes
 
     def list_transactions(self, chain_id: str | None = None) -> list[PendingTransaction]:
@@ -354,29 +610,45 @@ class DatabaseMempool:
             for e in entries
         ]
 
-    def drain(self, max_count: int, max_bytes: int, chain_id: str | None = None) -> list[PendingTransaction]:
+    def get_transactions(self, tx_hashes: Collection[str], chain_id: str | None = None) -> list[dict[str, Any]]:
+        """Contents of the pending transactions among ``tx_hashes``; unknown hashes are skipped."""
         from .config import settings
 
         if chain_id is None:
             chain_id = settings.chain_id
+        if not tx_hashes:
+            return []
         with self._lock:
             with Session(self._engine) as session:
-                entries = session.exec(
-                    select(MempoolEntry)
-                    .where(MempoolEntry.chain_id == chain_id)
-                    .order_by(cast(Any, MempoolEntry.fee).desc(), cast(Any, MempoolEntry.tx_hash).asc())
+                contents = session.exec(
+                    select(MempoolEntry.content).where(
+                        MempoolEntry.chain_id == chain_id,
+                        MempoolEntry.tx_hash.in_(list(tx_hashes)),  # type: ignore[attr-defined]
+                    )
                 ).all()
+        return [json.loads(content) for content in contents]
+
+    def drain(
+        self,
+        max_count: int,
+        max_bytes: int,
+        chain_id: str | None = None,
+        account_nonces: NonceLookup | None = None,
+    ) -> list[PendingTransaction]:
+        """Drain transactions for block inclusion; same ordering rules as :meth:`InMemoryMempool.drain`."""
+        from .config import settings
 
-                result: list[PendingTransaction] = []
-                total_bytes = 0
-                hashes_to_remove: list[str] = []
+        if chain_id is None:
+            chain_id = settings.chain_id
+        with self._lock:
+            with Session(self._engine) as session:
+                entries = session.exec(select(MempoolEntry).where(MempoolEntry.chain_id == chain_id)).all()
 
+                # Index the rows the same way the in-memory pool does so both
+                # backends apply identical fee, nonce and byte-budget rules.
+                pool = _ChainPool()
                 for e in entries:
-                    if len(result) >= max_count:
-                        break
-                    if total_bytes + e.size_bytes > max_bytes:
-                        continue
-                    result.append(
+                    pool.push(
                         PendingTransaction(
                             tx_hash=e.tx_hash,
                             content=json.loads(e.content),
@@ -385,8 +657,12 @@ class DatabaseMempool:
                             received_at=e.received_at,
                         )
                     )
-                    total_bytes += e.size_bytes
-                    hashes_to_remove.append(e.tx_hash)
+                nonces: Mapping[str, int] | None = None
+                if account_nonces is not None:
+                    senders = pool.senders()
+                    nonces = account_nonces(senders) if senders else {}
+                result, dropped, expired = pool.take(max_count, max_bytes, nonces, settings.mempool_parked_ttl_seconds)
+                hashes_to_remove = [tx.tx_hash for tx in (*result, *dropped, *expired)]
 
                 if hashes_to_remove:
                     session.exec(
@@ -398,6 +674,10 @@ class DatabaseMempool:
                     session.commit()
 
                 metrics_registry.increment(f"mempool_tx_drained_total_{chain_id}", float(len(result)))
+                if dropped:
+                    metrics_registry.increment(f"mempool_stale_nonce_dropped_total_{chain_id}", float(len(dropped)))
+                if expired:
+                    metrics_registry.increment(f"mempool_parked_expired_total_{chain_id}", float(len(expired)))
             self._update_gauge(chain_id)
             return result
 
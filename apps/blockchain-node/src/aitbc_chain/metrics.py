@@ -38,6 +38,16 @@ rpc_request_duration = Histogram(
 
 rpc_requests_total = Counter("blockchain_rpc_requests_total", "Total RPC requests", ["method", "status"])
 
+# P2P Metrics; series are labelled by peer and removed when the peer disconnects
+peer_queue_depth = Gauge("p2p_peer_queue_depth", "Messages queued for a peer connection", ["peer"])
+
+peer_send_latency = Histogram(
+    "p2p_peer_send_latency_seconds",
+    "Time from enqueue to socket drain for a peer connection",
+    ["peer"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
 # Legacy MetricsRegistry for backward compatibility
 from dataclasses import dataclass  # noqa: E402
 from threading import Lock  # noqa: E402
@@ -0,0 +1,101 @@
+"""
+Length-prefixed binary frames for the P2P TCP protocol (protocol v3).
+
+Protocol v1/v2 peers exchange newline-delimited JSON, base64-wrapping the gzip
+output when compression is on (see ``compression.py``) so it stays newline-free.
+Once both sides of a connection advertise ``FRAMED_PROTOCOL_VERSION`` in the
+handshake, every later message is sent as a frame instead::
+
+    +----------------------+---------+----------------------+
+    | body length (uint32) | flags   | body (length bytes)  |
+    +----------------------+---------+----------------------+
+
+The body is msgpack, zlib-compressed when it is larger than the sender's
+threshold and compression actually shrinks it (``FLAG_ZLIB``). Messages msgpack
+cannot represent (integers beyond 64 bits) are sent as compact JSON
+(``FLAG_JSON``). The handshake itself is always a newline-delimited line, so
+a peer can be asked for its version before either side knows how to frame.
+
+msgpack is optional: without it the node does not advertise v3 and stays on
+newline-delimited messages (see :func:`framing_available`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    _MSGPACK_AVAILABLE = False
+
+# First protocol version that switches to binary frames after the handshake.
+FRAMED_PROTOCOL_VERSION = 3
+
+# body length (big-endian uint32), flags (uint8)
+FRAME_HEADER = struct.Struct("!IB")
+
+FLAG_ZLIB = 0x01  # body is zlib-compressed
+FLAG_JSON = 0x02  # body is JSON rather than msgpack
+_KNOWN_FLAGS = FLAG_ZLIB | FLAG_JSON
+
+
+class FrameError(ValueError):
+    """A frame could not be decoded; the stream cannot be resynchronised."""
+
+
+def framing_available() -> bool:
+    """Whether this process can encode and decode v3 frames."""
+    return _MSGPACK_AVAILABLE
+
+
+def encode_frame(message: Any, compress_threshold: int | None = 1024) -> bytes:
+    """Serialize *message* to one frame (header included).
+
+    Bodies larger than *compress_threshold* bytes are zlib-compressed when that
+    makes them smaller. ``None`` disables compression.
+    """
+    flags = 0
+    try:
+        body = msgpack.packb(message, use_bin_type=True)
+    except (TypeError, OverflowError, ValueError):
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        flags |= FLAG_JSON
+    if compress_threshold is not None and len(body) > compress_threshold:
+        compressed = zlib.compress(body)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= FLAG_ZLIB
+    return FRAME_HEADER.pack(len(body), flags) + body
+
+
+def decode_frame_body(flags: int, body: bytes) -> Any:
+    """Decode the body of a frame whose header carried *flags*."""
+    if flags & ~_KNOWN_FLAGS:
+        raise FrameError(f"unknown frame flags 0x{flags:02x}")
+    try:
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        if flags & FLAG_JSON:
+            return json.loads(body)
+        return msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise FrameError(f"undecodable frame body: {e}") from e
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int) -> Any:
+    """Read and decode one frame from *reader*.
+
+    Raises ``asyncio.IncompleteReadError`` at end of stream and
+    :class:`FrameError` for frames over *max_size* bytes or undecodable bodies.
+    """
+    length, flags = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > max_size:
+        raise FrameError(f"frame of {length} bytes exceeds the {max_size}-byte limit")
+    return decode_frame_body(flags, await reader.readexactly(length))
@@ -0,0 +1,153 @@
+"""
+Per-peer outbound queues for the P2P TCP transport.
+
+Every established peer connection gets a :class:`PeerOutbox`: a bounded
+priority queue of already-encoded messages and a writer task that drains it.
+Senders enqueue and return immediately, so one slow peer only ever backs up
+its own queue. Blocks overtake transactions, which overtake status traffic
+(priorities from :class:`aitbc.gossip.PriorityMessageQueue`).
+
+A peer whose queue overflows, or whose socket does not drain within the send
+timeout, is disconnected via the ``on_stalled`` callback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Callable
+from typing import Any
+
+from aitbc.aitbc_logging import get_logger
+from aitbc.async_tasks import create_task_with_logging
+from aitbc.gossip import PriorityMessageQueue
+
+from ..metrics import metrics_registry, peer_queue_depth, peer_send_latency
+
+logger = get_logger(__name__)
+
+# Messages written to the socket between drains.
+_WRITE_BATCH = 64
+
+_MESSAGE_PRIORITIES = {
+    "block": PriorityMessageQueue.PRIORITY_BLOCK,
+    "new_block": PriorityMessageQueue.PRIORITY_BLOCK,
+    "blocks": PriorityMessageQueue.PRIORITY_BLOCK,
+    "block_header": PriorityMessageQueue.PRIORITY_BLOCK_HEADER,
+    "tx_inv": PriorityMessageQueue.PRIORITY_TRANSACTION,
+    "get_txs": PriorityMessageQueue.PRIORITY_TRANSACTION,
+    "txs": PriorityMessageQueue.PRIORITY_TRANSACTION,
+    "new_transaction": PriorityMessageQueue.PRIORITY_TRANSACTION,
+    "gpu_provider_query": PriorityMessageQueue.PRIORITY_DISCOVERY,
+    "gpu_provider_response": PriorityMessageQueue.PRIORITY_DISCOVERY,
+}
+
+
+def message_priority(message: dict[str, Any]) -> int:
+    """Send priority of a P2P message (lower goes first); unknown types are status traffic."""
+    return _MESSAGE_PRIORITIES.get(message.get("type", ""), PriorityMessageQueue.PRIORITY_STATUS)
+
+
+class PeerOutbox:
+    """Bounded, prioritised send queue and writer task for one peer connection."""
+
+    def __init__(
+        self,
+        peer_id: str,
+        writer: asyncio.StreamWriter,
+        max_messages: int,
+        send_timeout: float,
+        on_stalled: Callable[[PeerOutbox, str], None],
+    ) -> None:
+        self.peer_id = peer_id
+        self.writer = writer
+        self._max_messages = max_messages
+        self._send_timeout = send_timeout
+        self._on_stalled = on_stalled
+        # (priority, sequence, enqueued_at, data); sequence keeps each lane FIFO.
+        self._heap: list[tuple[int, int, float, bytes]] = []
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = create_task_with_logging(self._run(), name=f"p2p-outbox-{self.peer_id}")
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def enqueue(self, data: bytes, priority: int) -> bool:
+        """Queue encoded ``data``; False if the outbox is closed or full (the peer is then dropped)."""
+        if self._closed:
+            return False
+        if len(self._heap) >= self._max_messages:
+            metrics_registry.increment("p2p_peer_queue_overflows_total")
+            self._stall(f"send queue full ({self._max_messages} messages)")
+            return False
+        heapq.heappush(self._heap, (priority, next(self._sequence), time.perf_counter(), data))
+        peer_queue_depth.labels(peer=self.peer_id).set(len(self._heap))
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    async def join(self) -> None:
+        """Wait until everything queued so far has been written and drained."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the writer task and drop anything still queued."""
+        self._closed = True
+        self._heap.clear()
+        self._idle.set()
+        for metric in (peer_queue_depth, peer_send_latency):
+            try:
+                metric.remove(self.peer_id)
+            except KeyError:
+                pass
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def _stall(self, reason: str) -> None:
+        if self._closed:
+            return
+        logger.warning("Disconnecting slow peer %s: %s", self.peer_id, reason)
+        self.close()
+        self._on_stalled(self, reason)
+
+    async def _run(self) -> None:
+        try:
+            while not self._closed:
+                if not self._heap:
+                    self._idle.set()
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                # Write a batch in priority order, then drain once; anything queued
+                # meanwhile (a block behind a tx backlog) competes for the next batch.
+                sent: list[float] = []
+                while self._heap and len(sent) < _WRITE_BATCH:
+                    _, _, enqueued_at, data = heapq.heappop(self._heap)
+                    self.writer.write(data)
+                    sent.append(enqueued_at)
+                peer_queue_depth.labels(peer=self.peer_id).set(len(self._heap))
+                try:
+                    await asyncio.wait_for(self.writer.drain(), timeout=self._send_timeout)
+                except TimeoutError:
+                    metrics_registry.increment("p2p_peer_send_timeouts_total")
+                    self._stall(f"socket did not drain within {self._send_timeout:.0f}s")
+                    return
+                except (ConnectionError, RuntimeError) as e:
+                    self._stall(f"send failed: {e}")
+                    return
+                now = time.perf_counter()
+                latency = peer_send_latency.labels(peer=self.peer_id)
+                for enqueued_at in sent:
+                    metrics_registry.observe("p2p_peer_send_latency_seconds", now - enqueued_at)
+                    latency.observe(now - enqueued_at)
+        except asyncio.CancelledError:
+            pass
@@ -6,19 +6,27 @@ Handles decentralized peer-to-peer mesh communication between blockchain nodes
 import asyncio
 import json
 import os
-from collections.abc import Callable
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
 from typing import Any
 
 from aitbc.aitbc_logging import get_logger
 from aitbc.async_tasks import create_task_with_logging
 
 from .config import settings
-from .mempool import compute_tx_hash
+from .mempool import add_tx_listener, compute_tx_hash, remove_tx_listener
+from .metrics import metrics_registry
+from .network.framing import FRAMED_PROTOCOL_VERSION, FrameError, encode_frame, framing_available, read_frame
 from .network.hub_manager import HubManager
 from .network.island_manager import IslandManager
+from .network.outbox import PeerOutbox, message_priority
 from .network.nat_traversal import NATTraversalService
 
 logger = get_logger("aitbc_chain.p2p_network")
+
+# Peers below this version get full transactions pushed instead of hash inventories.
+TX_INV_PROTOCOL_VERSION = 2
 _p2p_service_instance = None
 
 
@@ -33,6 +41,104 @@ def set_p2p_network(service: Any) -> None:
     _p2p_service_instance = service
 
 
+class RecentKeys:
+    """Fixed-size, time-windowed set of recently seen keys.
+
+    Same scheme as the gossip broker's dedup cache: entries are kept in insertion
+    order, expire after ``ttl`` seconds, and the oldest are dropped beyond
+    ``max_size``, so memory stays bounded however long the node runs.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._seen: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._expire(time.monotonic())
+        return key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, key: Hashable) -> bool:
+        """Record ``key``; return True if it was not already present."""
+        now = time.monotonic()
+        self._expire(now)
+        if key in self._seen:
+            return False
+        self._seen[key] = now
+        if len(self._seen) > self._max_size:
+            self._seen.popitem(last=False)
+        return True
+
+    def _expire(self, now: float) -> None:
+        seen = self._seen
+        while seen:
+            oldest_key, oldest_ts = next(iter(seen.items()))
+            if now - oldest_ts <= self._ttl:
+                break
+            seen.pop(oldest_key, None)
+
+
+class PendingRequests:
+    """Keys requested from a peer whose reply has not arrived yet.
+
+    Each request also remembers the other peers that offered the same key. Once
+    ``timeout`` seconds pass without :meth:`resolve`, :meth:`due` hands the key to
+    the next of those peers; a key with none left is forgotten, so a later offer
+    requests it again. At most ``max_size`` keys are pending at once.
+    """
+
+    # Alternate peers remembered per key.
+    MAX_ALTERNATES = 4
+
+    def __init__(self, max_size: int, timeout: float) -> None:
+        self._max_size = max_size
+        self._timeout = timeout
+        # Insertion order is deadline order: every deadline is now + timeout and a
+        # retried key is re-inserted at the end.
+        self._pending: dict[Hashable, tuple[float, list[Any]]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def offer(self, key: Hashable, peer: Any) -> bool:
+        """Record that ``peer`` has ``key``; return True if it should be requested from ``peer`` now."""
+        pending = self._pending.get(key)
+        if pending is not None:
+            if len(pending[1]) < self.MAX_ALTERNATES and peer not in pending[1]:
+                pending[1].append(peer)
+            return False
+        if len(self._pending) >= self._max_size:
+            return False
+        self._pending[key] = (time.monotonic() + self._timeout, [])
+        return True
+
+    def resolve(self, key: Hashable) -> None:
+        """Forget ``key`` once its reply has arrived."""
+        self._pending.pop(key, None)
+
+    def due(self, alive: Callable[[Any], bool]) -> list[tuple[Any, Any]]:
+        """Return ``(key, peer)`` pairs to request again, moving each timed-out key to its next live peer."""
+        now = time.monotonic()
+        retries: list[tuple[Any, Any]] = []
+        while self._pending:
+            key, (deadline, alternates) = next(iter(self._pending.items()))
+            if deadline > now:
+                break
+            del self._pending[key]
+            peer = next((p for p in alternates if alive(p)), None)
+            if peer is not None:
+                alternates = alternates[alternates.index(peer) + 1 :]
+                self._pending[key] = (now + self._timeout, alternates)
+                retries.append((key, peer))
+        return retries
+
+
 class P2PNetworkService:
     def __init__(
         self,
@@ -76,12 +182,28 @@ class P2PNetworkService:
         self._background_tasks: list[asyncio.Task[Any]] = []
         # v0.6.2: Protocol versioning — track peers operating in legacy mode
         self._protocol_version: int = settings.gossip_protocol_version
+        if self._protocol_version >= FRAMED_PROTOCOL_VERSION and not framing_available():
+            logger.warning("msgpack is not installed; advertising P2P protocol v2 (newline-delimited messages)")
+            self._protocol_version = FRAMED_PROTOCOL_VERSION - 1
         self._legacy_peers: set[str] = set()  # peer_ids with protocol_version < 2
+        # Connections that switched to length-prefixed binary frames after the handshake.
+        self._framed_writers: set[asyncio.StreamWriter] = set()
+        # Outbound queue and writer task of every peer past the handshake.
+        self._outboxes: dict[asyncio.StreamWriter, PeerOutbox] = {}
         # v0.6.2: Peer capability exchange — callback invoked when a peer connects
         # with (peer_id, rpc_url, block_range). Set by the sync layer to register
         # peers with the PeerCapabilityTracker. Optional; if None, capability
         # exchange still works but peers are not registered with the tracker.
         self._peer_capability_callback: Callable[[str, str, tuple[int, int]], None] | None = None
+        # Transaction gossip: hashes announced or received recently, hashes requested
+        # from a peer and not delivered yet, and new mempool transactions waiting to be
+        # announced, as (chain_id, tx_hash, tx).
+        self.seen_txs = RecentKeys(settings.p2p_tx_seen_max, settings.p2p_tx_seen_ttl)
+        self.requested_txs = PendingRequests(settings.p2p_tx_request_max, settings.p2p_tx_request_timeout)
+        self._tx_announcements: asyncio.Queue[tuple[str, str, dict[str, Any]]] = asyncio.Queue(
+            maxsize=settings.p2p_tx_announce_queue_max
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     def set_peer_capability_callback(self, callback: Callable[[str, str, tuple[int, int]], None]) -> None:
         """Set callback called when a peer's capability is discovered.
@@ -130,8 +252,12 @@ class P2PNetworkService:
         self._background_tasks.append(dial_task)
         ping_task = create_task_with_logging(self._ping_peers_loop(), name="p2p_ping_peers_loop")
         self._background_tasks.append(ping_task)
-        mempool_task = create_task_with_logging(self._mempool_sync_loop(), name="p2p_mempool_sync_loop")
-        self._background_tasks.append(mempool_task)
+        self._loop = asyncio.get_running_loop()
+        add_tx_listener(self._on_mempool_tx)
+        announce_task = create_task_with_logging(self._tx_announce_loop(), name="p2p_tx_announce_loop")
+        self._background_tasks.append(announce_task)
+        retry_task = create_task_with_logging(self._tx_request_retry_loop(), name="p2p_tx_request_retry_loop")
+        self._background_tasks.append(retry_task)
         try:
             await self._stop_event.wait()
         finally:
@@ -140,8 +266,12 @@ class P2PNetworkService:
     async def stop(self) -> None:
         """Stop P2P network service"""
         logger.info("Stopping P2P network service")
+        remove_tx_listener(self._on_mempool_tx)
         for task in self._background_tasks:
             task.cancel()
+        for outbox in self._outboxes.values():
+            outbox.close()
+        self._outboxes.clear()
         for writer in self.active_connections.values():
             writer.close()
             try:
@@ -154,75 +284,186 @@ class P2PNetworkService:
             self._server.close()
             await self._server.wait_closed()
 
-    async def _send_message(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
-        """Serialize and send a newline-delimited JSON message (compressed when enabled)."""
+    def _encode_message(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> bytes:
+        """Serialize a message in the format negotiated with the peer behind ``writer``."""
+        if writer in self._framed_writers:
+            threshold = settings.p2p_frame_compress_threshold if settings.network_compression_enabled else None
+            return encode_frame(message, threshold)
         from .network.compression import encode_payload
 
-        payload = (encode_payload(message)).encode() + b"\n"
-        writer.write(payload)
+        return (encode_payload(message)).encode() + b"\n"
+
+    async def _send_message(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        """Send a message as a binary frame (v3 peers) or a newline-delimited JSON line.
+
+        Peers past the handshake have an outbox: the message is queued there and
+        this returns without waiting for the peer's socket.
+        """
+        outbox = self._outboxes.get(writer)
+        if outbox is not None:
+            outbox.enqueue(self._encode_message(writer, message), message_priority(message))
+            return
+        writer.write(self._encode_message(writer, message))
         await writer.drain()
 
-    async def broadcast_to_peers(self, message: dict[str, Any]) -> None:
-        """Broadcast a message to all connected peers"""
-        writers = list(self.active_connections.values())
+    async def _fan_out(self, writers: list[asyncio.StreamWriter], message: dict[str, Any]) -> None:
+        """Queue one message to many peers, encoding it once per wire format."""
+        priority = message_priority(message)
+        encoded: dict[bool, bytes] = {}
         for writer in writers:
+            framed = writer in self._framed_writers
+            if framed not in encoded:
+                encoded[framed] = self._encode_message(writer, message)
             try:
-                await self._send_message(writer, message)
+                outbox = self._outboxes.get(writer)
+                if outbox is not None:
+                    outbox.enqueue(encoded[framed], priority)
+                else:
+                    writer.write(encoded[framed])
+                    await writer.drain()
             except Exception as e:
-                logger.debug("Failed to broadcast to peer: %s", e)
+                logger.debug("Failed to send %s to peer: %s", message.get("type"), e)
+
+    def _open_outbox(self, peer_id: str, writer: asyncio.StreamWriter) -> None:
+        outbox = PeerOutbox(
+            peer_id,
+            writer,
+            max_messages=settings.p2p_peer_send_queue_max,
+            send_timeout=settings.p2p_peer_send_timeout,
+            on_stalled=self._on_peer_stalled,
+        )
+        self._outboxes[writer] = outbox
+        outbox.start()
+
+    def _on_peer_stalled(self, outbox: PeerOutbox, reason: str) -> None:
+        """Drop a peer that cannot keep up; its read loop then cleans up the connection."""
+        metrics_registry.increment("p2p_slow_peers_disconnected_total")
+        outbox.writer.close()
+
+    def _is_legacy_version(self, peer_protocol_version: int) -> bool:
+        return peer_protocol_version < min(self._protocol_version, TX_INV_PROTOCOL_VERSION)
+
+    def _negotiates_framing(self, peer_protocol_version: int) -> bool:
+        return min(self._protocol_version, peer_protocol_version) >= FRAMED_PROTOCOL_VERSION
+
+    async def broadcast_to_peers(self, message: dict[str, Any]) -> None:
+        """Broadcast a message to all connected peers"""
+        await self._fan_out(list(self.active_connections.values()), message)
 
     async def _ping_peers_loop(self) -> None:
         """Periodically ping active peers to keep connections healthy"""
         while not self._stop_event.is_set():
             try:
-                writers = list(self.active_connections.items())
-                for peer_id, writer in writers:
-                    try:
-                        await self._send_message(writer, {"type": "ping", "node_id": self.node_id})
-                    except Exception as e:
-                        logger.debug("Failed to ping %s: %s", peer_id, e)
+                await self._fan_out(list(self.active_connections.values()), {"type": "ping", "node_id": self.node_id})
             except Exception as e:
                 logger.error("Error in ping loop: %s", e)
             await asyncio.sleep(10)
 
-    async def _mempool_sync_loop(self) -> None:
-        """Periodically check local mempool and broadcast new transactions to peers"""
-        self.seen_txs: set[tuple[str, str]] = set()
+    def _on_mempool_tx(self, chain_id: str, tx_hash: str, tx: dict[str, Any]) -> None:
+        """Mempool listener: queue a new transaction for announcing. Safe from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._queue_announcement, (chain_id, tx_hash, tx))
+
+    def _queue_announcement(self, item: tuple[str, str, dict[str, Any]]) -> None:
+        try:
+            self._tx_announcements.put_nowait(item)
+        except asyncio.QueueFull:
+            metrics_registry.increment("p2p_tx_announcements_dropped_total")
+
+    async def _tx_announce_loop(self) -> None:
+        """Announce new mempool transactions to peers in batches of hashes."""
+        while not self._stop_event.is_set():
+            batch = [await self._tx_announcements.get()]
+            # Let announcements accumulate briefly so peers get one inventory, not one per tx.
+            await asyncio.sleep(settings.p2p_tx_inv_interval)
+            while len(batch) < settings.p2p_tx_inv_batch_size and not self._tx_announcements.empty():
+                batch.append(self._tx_announcements.get_nowait())
+            try:
+                await self._announce_transactions(batch)
+            except Exception as e:
+                logger.error("Error announcing transactions: %s", e)
+
+    async def _announce_transactions(self, batch: list[tuple[str, str, dict[str, Any]]]) -> None:
+        """Send ``tx_inv`` hash inventories to peers; legacy (v1) peers still get full transactions."""
+        by_chain: dict[str, list[str]] = {}
+        for chain_id, tx_hash, _tx in batch:
+            self.seen_txs.add((chain_id, tx_hash))
+            by_chain.setdefault(chain_id, []).append(tx_hash)
+        peers = list(self.active_connections.items())
+        legacy = [writer for peer_id, writer in peers if peer_id in self._legacy_peers]
+        current = [writer for peer_id, writer in peers if peer_id not in self._legacy_peers]
+        if legacy:
+            for _chain_id, _tx_hash, tx in batch:
+                await self._fan_out(legacy, {"type": "new_transaction", "tx": tx})
+        if current:
+            for chain_id, hashes in by_chain.items():
+                await self._fan_out(current, {"type": "tx_inv", "chain_id": chain_id, "hashes": hashes})
+        metrics_registry.increment("p2p_tx_announced_total", float(len(batch)))
+
+    async def _handle_tx_inv(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        """Request the announced transactions this node has not seen or requested yet.
+
+        A hash counts as seen only once its body arrives; until then the announcing
+        peer is kept as a fallback for :meth:`_retry_tx_requests`.
+        """
+        chain_id = message.get("chain_id") or settings.chain_id
+        hashes = message.get("hashes") or []
+        wanted = [
+            tx_hash
+            for tx_hash in hashes[: settings.p2p_tx_inv_batch_size]
+            if (chain_id, tx_hash) not in self.seen_txs and self.requested_txs.offer((chain_id, tx_hash), writer)
+        ]
+        if wanted:
+            await self._send_message(writer, {"type": "get_txs", "chain_id": chain_id, "hashes": wanted})
+            metrics_registry.increment("p2p_tx_requested_total", float(len(wanted)))
+
+    async def _tx_request_retry_loop(self) -> None:
+        """Re-request transactions a peer announced but did not deliver in time."""
         while not self._stop_event.is_set():
+            await asyncio.sleep(settings.p2p_tx_request_timeout / 2)
             try:
-                from .mempool import get_mempool as get_mempool_instance
-
-                mempool = get_mempool_instance()
-                txs_to_broadcast = []
-                if hasattr(mempool, "_transactions"):
-                    with mempool._lock:
-                        for chain_id, chain_transactions in mempool._transactions.items():
-                            for tx_hash, pending_tx in chain_transactions.items():
-                                seen_key = (chain_id, tx_hash)
-                                if seen_key not in self.seen_txs:
-                                    self.seen_txs.add(seen_key)
-                                    txs_to_broadcast.append(pending_tx.content)
-                elif hasattr(mempool, "_conn"):
-                    with mempool._lock:
-                        cursor = mempool._conn.execute("SELECT chain_id, tx_hash, content FROM mempool")
-                        for row in cursor.fetchall():
-                            chain_id = row[0]
-                            tx_hash = row[1]
-                            seen_key = (chain_id, tx_hash)
-                            if seen_key not in self.seen_txs:
-                                self.seen_txs.add(seen_key)
-                                import json
-
-                                txs_to_broadcast.append(json.loads(row[2]))
-                logger.debug("Mempool sync loop iteration. txs_to_broadcast: %s", len(txs_to_broadcast))
-                for tx in txs_to_broadcast:
-                    msg = {"type": "new_transaction", "tx": tx}
-                    writers = list(self.active_connections.values())
-                    for writer in writers:
-                        await self._send_message(writer, msg)
+                await self._retry_tx_requests()
             except Exception as e:
-                logger.error("Error in mempool sync loop: %s", e)
-            await asyncio.sleep(1)
+                logger.error("Error re-requesting transactions: %s", e)
+
+    async def _retry_tx_requests(self) -> None:
+        """Ask the next announcing peer for every request past its timeout."""
+        connected = set(self.active_connections.values())
+        by_peer: dict[tuple[Any, str], list[str]] = {}
+        for (chain_id, tx_hash), writer in self.requested_txs.due(connected.__contains__):
+            by_peer.setdefault((writer, chain_id), []).append(tx_hash)
+        for (writer, chain_id), hashes in by_peer.items():
+            await self._send_message(writer, {"type": "get_txs", "chain_id": chain_id, "hashes": hashes})
+            metrics_registry.increment("p2p_tx_rerequested_total", float(len(hashes)))
+
+    async def _handle_get_txs(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        """Answer a peer's ``get_txs`` with the requested transactions still in the mempool."""
+        from .mempool import get_mempool as get_mempool_instance
+
+        chain_id = message.get("chain_id") or settings.chain_id
+        hashes = (message.get("hashes") or [])[: settings.p2p_tx_inv_batch_size]
+        txs = get_mempool_instance().get_transactions(hashes, chain_id=chain_id)
+        if txs:
+            await self._send_message(writer, {"type": "txs", "chain_id": chain_id, "txs": txs})
+
+    def _accept_peer_transaction(self, tx_data: dict[str, Any], chain_id: str | None) -> None:
+        """Add a transaction received from a peer to the mempool.
+
+        The mempool notifies :meth:`_on_mempool_tx` if the transaction is new, which
+        announces it to the other peers; nothing is forwarded from here.
+        """
+        from .mempool import get_mempool as get_mempool_instance
+
+        try:
+            chain_id = chain_id or tx_data.get("chain_id", settings.chain_id)
+            key = (chain_id, compute_tx_hash(tx_data))
+            self.seen_txs.add(key)
+            self.requested_txs.resolve(key)
+            get_mempool_instance().add(tx_data, chain_id=chain_id)
+        except ValueError as e:
+            logger.debug("P2P tx rejected by mempool: %s", e)
+        except Exception as e:
+            logger.error("P2P tx handling error: %s", e)
 
     async def _dial_peers_loop(self) -> None:
         """Background loop to continually try connecting to disconnected initial peers"""
@@ -354,7 +595,7 @@ class P2PNetworkService:
                 logger.info("Peer %s public endpoint: %s:%s", peer_node_id, peer_public_address, peer_public_port)
             logger.info("Handshake accepted from node %s at %s", peer_node_id, addr)
             # v0.6.2: Track legacy peers (protocol_version < 2)
-            if peer_protocol_version < self._protocol_version:
+            if self._is_legacy_version(peer_protocol_version):
                 self._legacy_peers.add(peer_node_id)
                 logger.info(
                     "Peer %s using legacy protocol v%s (local v%s) — batching/prioritization disabled",
@@ -410,7 +651,12 @@ class P2PNetworkService:
                 "block_height": self._get_block_height(),
                 "block_range": [0, self._get_block_height()],  # [min_height, max_height]
             }
-            await self._send_message(writer, reply_handshake)
+            # The reply is still a line; anything queued after it must already be framed.
+            writer.write(self._encode_message(writer, reply_handshake))
+            if self._negotiates_framing(peer_protocol_version):
+                self._framed_writers.add(writer)
+            self._open_outbox(peer_node_id, writer)
+            await writer.drain()
             await self._listen_to_stream(reader, writer, (remote_ip, peer_listen_port), outbound=False, peer_id=peer_node_id)
         except TimeoutError:
             logger.warning("Timeout waiting for handshake from %s", addr)
@@ -431,13 +677,24 @@ class P2PNetworkService:
         addr = endpoint
         try:
             while not self._stop_event.is_set():
-                data = await reader.readline()
-                if not data:
-                    break
+                framed = writer in self._framed_writers
+                if framed:
+                    try:
+                        message = await read_frame(reader, settings.p2p_max_frame_bytes)
+                    except asyncio.IncompleteReadError:
+                        break
+                    except FrameError as e:
+                        logger.warning("Invalid frame from %s: %s. Closing.", addr, e)
+                        break
+                else:
+                    data = await reader.readline()
+                    if not data:
+                        break
                 try:
-                    from .network.compression import decode_payload
+                    if not framed:
+                        from .network.compression import decode_payload
 
-                    message = decode_payload(data.decode().strip())
+                        message = decode_payload(data.decode().strip())
                     msg_type = message.get("type")
                     if outbound and peer_id is None:
                         if msg_type == "handshake":
@@ -452,7 +709,7 @@ class P2PNetworkService:
                                 logger.warning("Invalid handshake reply from %s. Closing.", addr)
                                 break
                             # v0.6.2: Track legacy peers
-                            if peer_protocol_version < self._protocol_version:
+                            if self._is_legacy_version(peer_protocol_version):
                                 self._legacy_peers.add(peer_id)
                                 logger.info(
                                     "Peer %s using legacy protocol v%s — batching/prioritization disabled",
@@ -471,6 +728,9 @@ class P2PNetworkService:
                                 logger.info("Already connected to node %s. Closing duplicate outbound.", peer_id)
                                 break
                             self.active_connections[peer_id] = writer
+                            if self._negotiates_framing(peer_protocol_version):
+                                self._framed_writers.add(writer)
+                            self._open_outbox(peer_id, writer)
                             # v0.6.2: Register peer capability with the sync layer (if callback set)
                             if self._peer_capability_callback and peer_block_height > 0:
                                 peer_public_address = message.get("public_address")
@@ -539,31 +799,18 @@ class P2PNetworkService:
                         if not hasattr(self, "_gpu_provider_responses"):
                             self._gpu_provider_responses = {}
                         self._gpu_provider_responses[peer_id] = message
+                    elif msg_type == "tx_inv":
+                        await self._handle_tx_inv(writer, message)
+                    elif msg_type == "get_txs":
+                        await self._handle_get_txs(writer, message)
+                    elif msg_type == "txs":
+                        for tx_data in message.get("txs") or []:
+                            self._accept_peer_transaction(tx_data, message.get("chain_id"))
                     elif msg_type == "new_transaction":
+                        # Full-transaction push from a legacy (v1) peer.
                         tx_data = message.get("tx")
                         if tx_data:
-                            try:
-                                tx_hash = compute_tx_hash(tx_data)
-                                chain_id = tx_data.get("chain_id", settings.chain_id)
-                                if not hasattr(self, "seen_txs"):
-                                    self.seen_txs = set()
-                                seen_key = (chain_id, tx_hash)
-                                if seen_key not in self.seen_txs:
-                                    logger.info("Received new P2P transaction: %s", tx_hash)
-                                    self.seen_txs.add(seen_key)
-                                    from .mempool import get_mempool as get_mempool_instance
-
-                                    mempool = get_mempool_instance()
-                                    mempool.add(tx_data, chain_id=chain_id)
-                                    forward_msg = {"type": "new_transaction", "tx": tx_data}
-                                    writers = list(self.active_connections.values())
-                                    for w in writers:
-                                        if w != writer:
-                                            await self._send_message(w, forward_msg)
-                            except ValueError as e:
-                                logger.debug("P2P tx rejected by mempool: %s", e)
-                            except Exception as e:
-                                logger.error("P2P tx handling error: %s", e)
+                            self._accept_peer_transaction(tx_data, None)
                     else:
                         logger.info("Received %s from %s: %s", msg_type, peer_id, message)
                 except json.JSONDecodeError:
@@ -578,6 +825,10 @@ class P2PNetworkService:
                 del self.active_connections[peer_id]
             # v0.6.2: Clean up legacy peer tracking on disconnect
             self._legacy_peers.discard(peer_id)
+            self._framed_writers.discard(writer)
+            outbox = self._outboxes.pop(writer, None)
+            if outbox is not None:
+                outbox.close()
             if endpoint in self.connected_endpoints:
                 self.connected_endpoints.remove(endpoint)
             writer.close()
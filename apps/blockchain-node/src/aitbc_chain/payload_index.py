@@ -0,0 +1,108 @@
+"""Indexed copies of the transaction payload fields that queries filter on.
+
+`transaction.payload` is a JSON column, so filtering on ``island_id``, ``pair``,
+``status`` or an order reference used to mean loading every transaction of the
+chain and inspecting each payload in Python. This module keeps those fields in
+``transaction_payload_field``, one row per (transaction, field), indexed by
+(chain, field, value):
+
+* SQLite triggers on ``transaction`` extract the fields on insert, re-extract
+  them when the payload changes and drop them with the transaction, so every
+  writer -- ORM flushes, bulk inserts, chain imports -- is covered without
+  callers having to know about the table.
+* Only string values are indexed. Filters are compared with the query's string
+  parameters, which never matched a numeric or nested payload value anyway.
+* `ensure_payload_index` adds the triggers to databases whose transaction table
+  predates this module and back-fills the rows they would have written.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import DDL, Index, Select, event, text
+from sqlmodel import Field, Session, select
+
+from .logger import get_logger
+from .metadata import ChainBase
+from .models import Transaction
+
+logger = get_logger(__name__)
+
+# Payload keys copied into the index. `order_id` filters match any of the last three.
+INDEXED_PAYLOAD_FIELDS = ("island_id", "pair", "status", "order_id", "offer_id", "bid_id")
+ORDER_REFERENCE_FIELDS = ("order_id", "offer_id", "bid_id")
+
+
+class TransactionPayloadField(ChainBase, table=True):
+    __tablename__ = "transaction_payload_field"
+    __table_args__ = (Index("idx_tx_payload_field_lookup", "chain_id", "field", "value", "tx_id"),)
+
+    tx_id: int = Field(primary_key=True)
+    field: str = Field(primary_key=True)
+    chain_id: str
+    value: str
+
+
+_TRIGGER_NAMES = ("trg_tx_payload_insert", "trg_tx_payload_update", "trg_tx_payload_delete")
+
+_FIELD_LIST = ", ".join(f"'{name}'" for name in INDEXED_PAYLOAD_FIELDS)
+
+# json_each() raises on malformed JSON, which inside a trigger would fail the insert of the
+# transaction itself; an invalid payload indexes nothing instead.
+_EXTRACT_SQL = (
+    "INSERT OR REPLACE INTO transaction_payload_field (tx_id, field, chain_id, value) "
+    "SELECT {row}.id, j.key, {row}.chain_id, j.value "
+    "FROM {tables}json_each(CASE WHEN json_valid({row}.payload) THEN {row}.payload ELSE '{{}}' END) AS j "
+    "WHERE j.type = 'text' AND j.key IN (" + _FIELD_LIST + ")"
+)
+
+_TRIGGER_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tx_payload_insert AFTER INSERT ON "transaction"
+    BEGIN
+        {_EXTRACT_SQL.format(row="NEW", tables="")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tx_payload_update AFTER UPDATE OF id, chain_id, payload ON "transaction"
+    BEGIN
+        DELETE FROM transaction_payload_field WHERE tx_id = OLD.id;
+        {_EXTRACT_SQL.format(row="NEW", tables="")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tx_payload_delete AFTER DELETE ON "transaction"
+    BEGIN
+        DELETE FROM transaction_payload_field WHERE tx_id = OLD.id;
+    END
+    """,
+)
+
+# Fresh databases get the triggers from `create_all`; `ensure_payload_index` adds them to
+# databases whose transaction table predates this module.
+for _sql in _TRIGGER_SQL:
+    event.listen(Transaction.__table__, "after_create", DDL(_sql).execute_if(dialect="sqlite"))  # type: ignore[attr-defined]
+
+
+def ensure_payload_index(session_or_conn: Session | object) -> None:
+    """Install the payload-index triggers if missing and back-fill existing rows (SQLite only)."""
+    execute = session_or_conn.execute  # type: ignore[attr-defined]
+    placeholders = ", ".join(f"'{name}'" for name in _TRIGGER_NAMES)
+    installed = execute(
+        text(f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})")
+    ).scalar()
+    if installed == len(_TRIGGER_NAMES):
+        return
+    for sql in _TRIGGER_SQL:
+        execute(text(sql))
+    # Rows written before the triggers existed; INSERT OR REPLACE makes a re-run harmless.
+    execute(text(_EXTRACT_SQL.format(row="tx", tables='"transaction" AS tx, ')))
+    logger.info("Back-filled transaction payload index")
+
+
+def payload_match(chain_id: str, fields: tuple[str, ...], value: str) -> Select[tuple[int]]:
+    """Ids of the chain's transactions whose payload has ``value`` under any of ``fields``."""
+    return select(TransactionPayloadField.tx_id).where(
+        TransactionPayloadField.chain_id == chain_id,
+        TransactionPayloadField.field.in_(fields),  # type: ignore[attr-defined]
+        TransactionPayloadField.value == value,
+    )
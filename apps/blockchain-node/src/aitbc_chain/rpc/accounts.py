@@ -14,6 +14,7 @@ from sqlmodel import select
 from aitbc.rate_limiting import rate_limit
 from aitbc.caching import RedisCache
 
+from ..account_cache import get_account_cache
 from ..config import settings
 from ..database import session_scope
 from ..logger import get_logger
@@ -34,17 +35,12 @@ async def get_account(request: Request, address: str, chain_id: str | None = Non
     canonical = canonical_address(address)
     body = canonical.removeprefix("0x")
     address = f"ait1{body}" if canonical.startswith("0x") and len(body) == 40 else address
-    cache_key = f"account_balance:{chain_id}:{address.lower()}"
-    cached = _cache.get(cache_key)
-    if cached is not None:
-        return cached  # type: ignore[no-any-return]
     with session_scope(chain_id) as session:
-        account = session.exec(select(Account).where(Account.address == address).where(Account.chain_id == chain_id)).first()
-        if not account:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
-        result = {"address": account.address, "balance": account.balance, "nonce": account.nonce, "chain_id": account.chain_id}
-        _cache.set(cache_key, result, ttl=ACCOUNT_CACHE_TTL)
-        return result
+        state = get_account_cache().lookup(session, chain_id, address)
+    if state is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    balance, nonce = state
+    return {"address": address, "balance": balance, "nonce": nonce, "chain_id": chain_id}
 
 
 @rate_limit(rate=200, per=60)
@@ -271,11 +267,9 @@ async def get_state_snapshot(request: Request, chain_id: str | None = None) -> d
     chain_id = get_chain_id(chain_id)
     with session_scope(chain_id) as session:
         accounts = session.exec(select(Account).where(Account.chain_id == chain_id)).all()
-        from ..state.merkle_patricia_trie import StateManager
+        from ..state.persistent_trie import compute_state_root
 
-        state_manager = StateManager()
-        account_dict = {acc.address: acc for acc in accounts}
-        state_root = state_manager.compute_state_root(account_dict)
+        state_root = compute_state_root(session, chain_id, persist=False)
         return {
             "chain_id": chain_id,
             "account_count": len(accounts),
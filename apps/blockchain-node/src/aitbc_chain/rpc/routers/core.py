@@ -6,6 +6,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func
 from sqlmodel import select
 
@@ -28,7 +29,7 @@ from ..accounts import (
 from ..blocks import get_block, get_blocks_range, get_genesis_allocations, get_head, import_block
 from ..chains import ChainActionRequest, ChainActionResponse, list_chains, start_chain, stop_chain
 from ..gossip import GetLogsRequest, GetLogsResponse, get_logs
-from ..sync import export_chain, force_sync, get_sync_config, import_chain
+from ..sync import export_chain, export_chain_stream, force_sync, get_sync_config, import_chain, import_chain_stream
 from ..transactions import (
     TransactionRequest,
     query_transactions,
@@ -228,9 +229,12 @@ async def query_transactions_route(
     limit: int | None = 100,
     chain_id: str | None = None,
     address: str | None = None,
+    after: str | None = None,
 ) -> list[dict[str, Any]]:
-    """Query transactions with optional filters"""
-    return await query_transactions(request, transaction_type, island_id, pair, status, order_id, limit, chain_id, address)  # type: ignore[no-any-return]
+    """Query transactions with optional filters; page with ``after=<cursor of the last result>``"""
+    return await query_transactions(  # type: ignore[no-any-return]
+        request, transaction_type, island_id, pair, status, order_id, limit, chain_id, address, after
+    )
 
 
 @router.get("/transaction/{tx_hash}", summary="Get one transaction by hash")
@@ -314,6 +318,29 @@ async def import_chain_route(request: Request, import_data: dict) -> dict[str, A
     return await import_chain(request, import_data)  # type: ignore[no-any-return]
 
 
+@router.get("/export-chain/stream", summary="Stream chain state as gzip-compressed NDJSON")
+@rate_limit(rate=20, per=60)
+async def export_chain_stream_route(request: Request, chain_id: str | None = None) -> StreamingResponse:
+    """Stream full chain state page by page, for chains too large for /export-chain"""
+    return await export_chain_stream(request, chain_id)  # type: ignore[no-any-return]
+
+
+@router.post("/import-chain/stream", summary="Import a streamed chain export")
+@rate_limit(rate=50, per=60)
+async def import_chain_stream_route(
+    request: Request,
+    sha256: str,
+    chain_id: str | None = None,
+    offset: int = 0,
+    admin_address: str | None = None,
+    admin_signature: str | None = None,
+) -> dict[str, Any]:
+    """Import a gzip-compressed NDJSON chain export from the request body, resumable at ``offset``"""
+    return await import_chain_stream(  # type: ignore[no-any-return]
+        request, sha256, chain_id, offset, admin_address, admin_signature
+    )
+
+
 @router.post("/force-sync", summary="Force reorg to specified peer")
 @rate_limit(rate=50, per=60)
 async def force_sync_route(request: Request, peer_data: dict) -> dict[str, Any]:
@@ -3,17 +3,24 @@ Sync-related RPC endpoints.
 """
 
 import asyncio
+import gzip
+import hashlib
 import json
+import tempfile
+import zlib
+from collections.abc import AsyncIterator, Iterator
 from datetime import UTC, datetime
-from typing import Any, cast
+from typing import IO, Any, cast
 from urllib.parse import urlparse
 
 from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import asc, text
 from sqlmodel import Session, delete, select
 
 from aitbc.rate_limiting import rate_limit
 
+from ..account_cache import get_account_cache
 from ..config import settings
 from ..database import session_scope
 from ..logger import get_logger
@@ -24,6 +31,13 @@ _logger = get_logger(__name__)
 _last_import_time = 0
 _import_lock = asyncio.Lock()
 
+# Streaming export: gzip-compressed NDJSON, one record per line. A "header" record comes
+# first and an "end" record carrying the record counts last; a stream without its end
+# record was cut short and is rejected by the importer before it changes anything.
+EXPORT_STREAM_FORMAT = "aitbc-chain-export"
+EXPORT_STREAM_VERSION = 1
+_STREAM_RECORD_TYPES = ("block", "account", "transaction")
+
 
 def _serialize_optional_timestamp(value: Any) -> str | None:
     if value is None:
@@ -92,6 +106,43 @@ def _dedupe_import_blocks(blocks: list[dict[str, Any]], chain_id: str) -> list[d
     return [latest_by_height[height] for height in sorted(latest_by_height)]
 
 
+def _block_record(block: Block) -> dict[str, Any]:
+    return {
+        "chain_id": block.chain_id,
+        "height": block.height,
+        "hash": block.hash,
+        "parent_hash": block.parent_hash,
+        "proposer": block.proposer,
+        "timestamp": block.timestamp.isoformat() if block.timestamp else None,
+        "state_root": block.state_root,
+        "tx_count": block.tx_count,
+        "block_metadata": block.block_metadata,
+    }
+
+
+def _account_record(account: Account) -> dict[str, Any]:
+    return {"chain_id": account.chain_id, "address": account.address, "balance": account.balance, "nonce": account.nonce}
+
+
+def _transaction_record(tx: Transaction) -> dict[str, Any]:
+    return {
+        "id": tx.id,
+        "chain_id": tx.chain_id,
+        "tx_hash": tx.tx_hash,
+        "block_height": tx.block_height,
+        "sender": tx.sender,
+        "recipient": tx.recipient,
+        "payload": tx.payload,
+        "value": tx.value,
+        "fee": tx.fee,
+        "nonce": tx.nonce,
+        "timestamp": _serialize_optional_timestamp(tx.timestamp),
+        "status": tx.status,
+        "created_at": tx.created_at.isoformat() if tx.created_at else None,
+        "tx_metadata": tx.tx_metadata,
+    }
+
+
 @rate_limit(rate=200, per=60)
 async def export_chain(request: Request, chain_id: str | None = None) -> dict[str, Any]:
     """Export full chain state as JSON for manual synchronization"""
@@ -113,42 +164,9 @@ async def export_chain(request: Request, chain_id: str | None = None) -> dict[st
                 "block_count": len(blocks),
                 "account_count": len(accounts),
                 "transaction_count": len(transactions),
-                "blocks": [
-                    {
-                        "chain_id": b.chain_id,
-                        "height": b.height,
-                        "hash": b.hash,
-                        "parent_hash": b.parent_hash,
-                        "proposer": b.proposer,
-                        "timestamp": b.timestamp.isoformat() if b.timestamp else None,
-                        "state_root": b.state_root,
-                        "tx_count": b.tx_count,
-                        "block_metadata": b.block_metadata,
-                    }
-                    for b in blocks
-                ],
-                "accounts": [
-                    {"chain_id": a.chain_id, "address": a.address, "balance": a.balance, "nonce": a.nonce} for a in accounts
-                ],
-                "transactions": [
-                    {
-                        "id": t.id,
-                        "chain_id": t.chain_id,
-                        "tx_hash": t.tx_hash,
-                        "block_height": t.block_height,
-                        "sender": t.sender,
-                        "recipient": t.recipient,
-                        "payload": t.payload,
-                        "value": t.value,
-                        "fee": t.fee,
-                        "nonce": t.nonce,
-                        "timestamp": _serialize_optional_timestamp(t.timestamp),
-                        "status": t.status,
-                        "created_at": t.created_at.isoformat() if t.created_at else None,
-                        "tx_metadata": t.tx_metadata,
-                    }
-                    for t in transactions
-                ],
+                "blocks": [_block_record(b) for b in blocks],
+                "accounts": [_account_record(a) for a in accounts],
+                "transactions": [_transaction_record(t) for t in transactions],
             }
             return {"success": True, "export_data": export_data, "export_size_bytes": len(json.dumps(export_data))}
     except HTTPException:
@@ -160,6 +178,121 @@ async def export_chain(request: Request, chain_id: str | None = None) -> dict[st
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+def _export_pages(chain_id: str, page_size: int) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Yield ``(record type, records)`` pages of blocks, then accounts, then transactions.
+
+    Each page is its own short keyset query (height, address, id) rather than a slice of
+    one long-lived cursor: the node shares a single SQLite connection, and a cursor held
+    open between chunks of a slow download would pin it for every other request.
+    """
+    after_height = -1
+    while True:
+        with session_scope() as session:
+            rows = list(
+                session.execute(
+                    select(Block)
+                    .where(Block.chain_id == chain_id, Block.height > after_height)
+                    .order_by(asc(text("height")), text("id DESC"))
+                    .limit(page_size)
+                )
+                .scalars()
+                .all()
+            )
+            page = []
+            for block in rows:
+                if block.height == after_height:
+                    continue  # older duplicate of a height already exported
+                after_height = block.height
+                page.append(_block_record(block))
+        if page:
+            yield "block", page
+        if len(rows) < page_size:
+            break
+
+    after_address = ""
+    while True:
+        with session_scope() as session:
+            accounts = list(
+                session.execute(
+                    select(Account)
+                    .where(Account.chain_id == chain_id, Account.address > after_address)
+                    .order_by(Account.address)
+                    .limit(page_size)
+                )
+                .scalars()
+                .all()
+            )
+            page = [_account_record(a) for a in accounts]
+        if page:
+            after_address = page[-1]["address"]
+            yield "account", page
+        if len(page) < page_size:
+            break
+
+    after_id = 0
+    while True:
+        with session_scope() as session:
+            transactions = list(
+                session.execute(
+                    select(Transaction)
+                    .where(Transaction.chain_id == chain_id, Transaction.id > after_id)  # type: ignore[operator]
+                    .order_by(asc(text("id")))
+                    .limit(page_size)
+                )
+                .scalars()
+                .all()
+            )
+            page = [_transaction_record(t) for t in transactions]
+        if page:
+            after_id = page[-1]["id"]
+            yield "transaction", page
+        if len(page) < page_size:
+            break
+
+
+async def _export_stream(chain_id: str, page_size: int) -> AsyncIterator[bytes]:
+    """Encode the export pages as NDJSON in one gzip member, flushed after every page.
+
+    Each flush ends a self-contained compressed chunk, so the client receives data as it
+    is read instead of after the whole chain, and the body saved to disk is a plain
+    ``.ndjson.gz`` file.
+    """
+    compressor = zlib.compressobj(wbits=31)  # 16 + 15: gzip container
+
+    def _chunk(records: list[dict[str, Any]]) -> bytes:
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        return compressor.compress(lines.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    header = {
+        "type": "header",
+        "format": EXPORT_STREAM_FORMAT,
+        "version": EXPORT_STREAM_VERSION,
+        "chain_id": chain_id,
+        "export_timestamp": datetime.now().isoformat(),
+    }
+    yield _chunk([header])
+    counts = dict.fromkeys(_STREAM_RECORD_TYPES, 0)
+    for record_type, records in _export_pages(chain_id, page_size):
+        counts[record_type] += len(records)
+        yield _chunk([{"type": record_type, **record} for record in records])
+        await asyncio.sleep(0)
+    trailer = {"type": "end", **{f"{name}_count": count for name, count in counts.items()}}
+    yield _chunk([trailer]) + compressor.flush()
+    _logger.info("Streamed chain export for %s: %s", chain_id, counts)
+
+
+@rate_limit(rate=20, per=60)
+async def export_chain_stream(request: Request, chain_id: str | None = None) -> StreamingResponse:
+    """Stream full chain state as gzip-compressed NDJSON, page by page"""
+    chain_id = get_chain_id(chain_id)
+    page_size = max(1, settings.chain_export_page_size)
+    return StreamingResponse(
+        _export_stream(chain_id, page_size),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{chain_id}.ndjson.gz"'},
+    )
+
+
 def _build_import_objects(
     unique_blocks: list[dict[str, Any]],
     accounts: list[dict[str, Any]],
@@ -265,6 +398,7 @@ def _import_chain_data(import_data: dict[str, Any]) -> dict[str, Any]:
         session.execute(delete(Transaction).where(Transaction.chain_id == chain_id))  # type: ignore[arg-type]
         if new_accounts:
             _logger.info("Clearing existing accounts for chain %s", chain_id)
+            get_account_cache().touch(session, chain_id)
             session.execute(delete(Account).where(Account.chain_id == chain_id))  # type: ignore[arg-type]
         _logger.info("Clearing existing blocks for chain %s", chain_id)
         session.execute(delete(Block).where(Block.chain_id == chain_id))  # type: ignore[arg-type]
@@ -305,6 +439,201 @@ async def import_chain(request: Request, import_data: dict[str, Any]) -> dict[st
             raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+def _build_stream_objects(
+    chain_id: str, records: list[tuple[str, dict[str, Any]]]
+) -> tuple[list[Block], list[Account], list[Transaction]]:
+    grouped: dict[str, list[dict[str, Any]]] = {name: [] for name in _STREAM_RECORD_TYPES}
+    for record_type, record in records:
+        grouped[record_type].append(record)
+    unique_blocks = _dedupe_import_blocks(grouped["block"], chain_id)
+    return _build_import_objects(unique_blocks, grouped["account"], grouped["transaction"], chain_id)
+
+
+def _write_stream_records(chain_id: str, records: list[tuple[str, dict[str, Any]]], *, replace_chain: bool) -> None:
+    """Validate and commit one chunk of a streamed import in its own transaction.
+
+    The first chunk of an import from offset 0 also clears the chain. Later chunks replace
+    any stored row with the same height, address or hash, so re-sending records after a
+    failed upload (resuming from an earlier offset) is harmless.
+    """
+    new_blocks, new_accounts, new_transactions = _build_stream_objects(chain_id, records)
+    with session_scope() as session:
+        if replace_chain:
+            _logger.info("Clearing chain %s for streamed import", chain_id)
+            session.execute(delete(Transaction).where(Transaction.chain_id == chain_id))  # type: ignore[arg-type]
+            get_account_cache().touch(session, chain_id)
+            session.execute(delete(Account).where(Account.chain_id == chain_id))  # type: ignore[arg-type]
+            session.execute(delete(Block).where(Block.chain_id == chain_id))  # type: ignore[arg-type]
+        else:
+            if new_blocks:
+                heights = [b.height for b in new_blocks]
+                session.execute(delete(Block).where(Block.chain_id == chain_id, Block.height.in_(heights)))  # type: ignore[arg-type,attr-defined]
+            if new_accounts:
+                addresses = [a.address for a in new_accounts]
+                get_account_cache().touch(session, chain_id, addresses)
+                session.execute(delete(Account).where(Account.chain_id == chain_id, Account.address.in_(addresses)))  # type: ignore[arg-type,attr-defined]
+            if new_transactions:
+                hashes = [t.tx_hash for t in new_transactions]
+                session.execute(
+                    delete(Transaction).where(Transaction.chain_id == chain_id, Transaction.tx_hash.in_(hashes))  # type: ignore[arg-type,attr-defined]
+                )
+        session.add_all(new_blocks)
+        session.add_all(new_accounts)
+        session.add_all(new_transactions)
+        session.commit()
+
+
+def _stream_records(stream: IO[bytes], chain_id: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield the data records of a streamed export, checking its framing as it goes.
+
+    The header is checked before the first record is yielded; the end record and its
+    counts are checked once the last one has been, so a caller only knows the stream is
+    whole when the iterator is exhausted without raising.
+    """
+    counts = dict.fromkeys(_STREAM_RECORD_TYPES, 0)
+    header: dict[str, Any] | None = None
+    trailer: dict[str, Any] | None = None
+    with gzip.open(stream, "rt", encoding="utf-8") as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop("type", None)
+            if header is None:
+                if record_type != "header" or record.get("format") != EXPORT_STREAM_FORMAT:
+                    raise HTTPException(status_code=400, detail="Not a chain export stream")
+                if record.get("chain_id") != chain_id:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Stream is for chain '{record.get('chain_id')}', not '{chain_id}'",
+                    )
+                header = record
+                continue
+            if record_type == "end":
+                trailer = record
+                break
+            if record_type not in counts:
+                raise HTTPException(status_code=400, detail=f"Unknown record type: {record_type}")
+            if record_type != "block" and not counts["block"]:
+                raise HTTPException(status_code=400, detail="No blocks to import")
+            counts[record_type] += 1
+            yield record_type, record
+    if header is None:
+        raise HTTPException(status_code=400, detail="Not a chain export stream")
+    if trailer is None:
+        raise HTTPException(status_code=400, detail="Chain export stream is truncated")
+    if not counts["block"]:
+        raise HTTPException(status_code=400, detail="No blocks to import")
+    for name, count in counts.items():
+        if trailer.get(f"{name}_count") != count:
+            raise HTTPException(status_code=400, detail=f"Expected {trailer.get(f'{name}_count')} {name} records, got {count}")
+
+
+async def _import_chain_stream_data(stream: IO[bytes], chain_id: str, offset: int) -> dict[str, Any]:
+    """Apply a streamed export chunk by chunk. Caller is responsible for admin auth.
+
+    The whole stream is read and validated first -- framing, counts and every record --
+    so a truncated or malformed stream is rejected before the chain is touched. Only then
+    is it read again and committed in chunks.
+
+    ``offset`` is the number of data records already imported by an earlier, interrupted
+    upload of the same stream; they are skipped. Errors carry ``next_offset``, the offset
+    to resume from once the cause is fixed.
+    """
+    per_commit = max(1, settings.chain_import_records_per_commit)
+    counts = dict.fromkeys(_STREAM_RECORD_TYPES, 0)
+    applied = offset
+    pending: list[tuple[str, dict[str, Any]]] = []
+
+    def _flush() -> None:
+        nonlocal applied, pending
+        _write_stream_records(chain_id, pending, replace_chain=applied == 0)
+        applied += len(pending)
+        pending = []
+
+    try:
+        for record_type, record in _stream_records(stream, chain_id):
+            counts[record_type] += 1
+            pending.append((record_type, record))
+            if len(pending) >= per_commit:
+                _build_stream_objects(chain_id, pending)
+                pending = []
+                await asyncio.sleep(0)
+        _build_stream_objects(chain_id, pending)
+        pending = []
+
+        stream.seek(0)
+        for position, record in enumerate(_stream_records(stream, chain_id), start=1):
+            if position <= offset:
+                continue
+            pending.append(record)
+            if len(pending) >= per_commit:
+                _flush()
+                await asyncio.sleep(0)
+        if pending:
+            _flush()
+    except HTTPException as exc:
+        raise HTTPException(status_code=exc.status_code, detail={"message": exc.detail, "next_offset": applied}) from exc
+    except (OSError, EOFError, UnicodeDecodeError, ValueError) as exc:
+        # BadGzipFile is an OSError and JSONDecodeError a ValueError.
+        raise HTTPException(
+            status_code=400, detail={"message": f"Malformed chain export stream: {exc}", "next_offset": applied}
+        ) from exc
+    except Exception as exc:
+        _logger.exception("Streamed chain import failed after %s records", applied)
+        raise HTTPException(status_code=500, detail={"message": "Internal server error", "next_offset": applied}) from exc
+
+    return {
+        "success": True,
+        "chain_id": chain_id,
+        "imported_blocks": counts["block"],
+        "imported_accounts": counts["account"],
+        "imported_transactions": counts["transaction"],
+        "resumed_from": offset,
+        "next_offset": applied,
+        "message": f"Successfully imported {counts['block']} blocks",
+    }
+
+
+@rate_limit(rate=50, per=60)
+async def import_chain_stream(
+    request: Request,
+    sha256: str,
+    chain_id: str | None = None,
+    offset: int = 0,
+    admin_address: str | None = None,
+    admin_signature: str | None = None,
+) -> dict[str, Any]:
+    """Import a streamed chain export from the request body (admin only).
+
+    The admin signs ``action``, ``admin_address``, ``chain_id``, ``offset`` and the SHA-256
+    of the uploaded body. The body is spooled to a temporary file while it is hashed, and
+    nothing is applied unless the digest matches the signed one.
+    """
+    chain_id = get_chain_id(chain_id)
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+    signed = {
+        "action": "import-chain-stream",
+        "admin_address": admin_address,
+        "chain_id": chain_id,
+        "offset": offset,
+        "sha256": sha256,
+    }
+    if not verify_admin_signature(signed, admin_address, admin_signature):
+        raise HTTPException(status_code=403, detail="Invalid or unauthorized admin signature")
+    with tempfile.TemporaryFile() as spool:
+        digest = hashlib.sha256()
+        async for chunk in request.stream():
+            digest.update(chunk)
+            spool.write(chunk)
+        if digest.hexdigest() != sha256.lower().removeprefix("0x"):
+            raise HTTPException(status_code=400, detail="Request body does not match the signed sha256")
+        spool.seek(0)
+        async with _import_lock:
+            return await _import_chain_stream_data(spool, chain_id, offset)
+
+
 @rate_limit(rate=50, per=60)
 async def force_sync(request: Request, peer_data: dict[str, Any]) -> dict[str, Any]:
     """Force blockchain reorganization to sync with specified peer"""
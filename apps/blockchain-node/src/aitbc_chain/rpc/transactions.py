@@ -8,15 +8,20 @@ from typing import Any
 
 from fastapi import HTTPException, Request, status
 from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import and_, or_
 from sqlmodel import select
 
 from aitbc.rate_limiting import rate_limit
 
+from ..account_cache import get_account_cache
 from ..base_models import Bond, _to_ait_address
+from ..config import settings
 from ..database import session_scope
 from ..logger import get_logger
-from ..models import Account, Transaction
-from .utils import get_chain_id, normalize_transaction_data, verify_transaction_signature
+from ..models import Transaction
+from ..payload_index import ORDER_REFERENCE_FIELDS, payload_match
+from ..signature_verifier import verify_transaction_signatures_async
+from .utils import get_chain_id, normalize_transaction_data
 
 _logger = get_logger(__name__)
 
@@ -68,19 +73,29 @@ def _validate_transaction_admission(tx_data: dict[str, Any], mempool: Any) -> No
     compute_tx_hash(tx_data)
 
     with session_scope() as session:
-        sender_account = session.get(Account, (chain_id, tx_data["from"]))
-        if sender_account is None:
+        sender_state = get_account_cache().lookup(session, chain_id, tx_data["from"])
+        if sender_state is None:
             raise ValueError(f"sender account not found on chain '{chain_id}'")
+        balance, nonce = sender_state
 
         total_cost = tx_data["amount"] + tx_data["fee"]
-        if sender_account.balance < total_cost:
+        if balance < total_cost:
             raise ValueError(
-                f"insufficient balance for sender '{tx_data['from']}' on chain '{chain_id}': has {sender_account.balance}, needs {total_cost}"
+                f"insufficient balance for sender '{tx_data['from']}' on chain '{chain_id}': has {balance}, needs {total_cost}"
             )
 
-        if tx_data["nonce"] != sender_account.nonce:
+        # A nonce ahead of the account is admitted and parked in the mempool's
+        # per-sender queue until the gap is filled, up to mempool_max_nonce_gap
+        # ahead so one sender cannot park txs that may never execute; a used
+        # nonce can never apply.
+        if tx_data["nonce"] < nonce:
             raise ValueError(
-                f"invalid nonce for sender '{tx_data['from']}' on chain '{chain_id}': expected {sender_account.nonce}, got {tx_data['nonce']}"
+                f"invalid nonce for sender '{tx_data['from']}' on chain '{chain_id}': expected at least {nonce}, got {tx_data['nonce']}"
+            )
+        max_nonce = nonce + settings.mempool_max_nonce_gap
+        if tx_data["nonce"] > max_nonce:
+            raise ValueError(
+                f"invalid nonce for sender '{tx_data['from']}' on chain '{chain_id}': expected at most {max_nonce}, got {tx_data['nonce']}"
             )
 
 
@@ -110,8 +125,10 @@ async def submit_transaction(request: Request, tx_data: TransactionRequest) -> d
             "signature": tx_data.sig,
         }
 
-        # Verify transaction signature (Bug 4: signature was never verified)
-        if not verify_transaction_signature(tx_data_dict, tx_data.sig, tx_data.sender):
+        # Verify transaction signature (Bug 4: signature was never verified), on the
+        # signature pool so concurrent submissions use every core, not the event loop.
+        [signature_valid] = await verify_transaction_signatures_async([(tx_data_dict, tx_data.sig, tx_data.sender)])
+        if not signature_valid:
             raise HTTPException(status_code=403, detail="Invalid transaction signature")
 
         tx_data_dict = normalize_transaction_data(tx_data_dict, chain_id)
@@ -212,7 +229,8 @@ async def submit_marketplace_transaction(request: Request, tx_data: dict[str, An
                 raise HTTPException(status_code=400, detail="Sender required")
             tx_for_verify = {k: v for k, v in tx_data.items() if k not in ("signature", "sig")}
             tx_for_verify["signature"] = signature
-            if not verify_transaction_signature(tx_for_verify, signature, sender):
+            [signature_valid] = await verify_transaction_signatures_async([(tx_for_verify, signature, sender)])
+            if not signature_valid:
                 raise HTTPException(status_code=403, detail="Invalid transaction signature")
 
         # Normalize transaction data
@@ -234,6 +252,21 @@ async def submit_marketplace_transaction(request: Request, tx_data: dict[str, An
         raise HTTPException(status_code=400, detail=f"Failed to submit marketplace transaction: {str(e)}") from e
 
 
+def _transaction_cursor(tx: Transaction) -> str:
+    """Opaque keyset position of ``tx`` in (block_height, id) order; unconfirmed rows sort first."""
+    return f"{'' if tx.block_height is None else tx.block_height}:{tx.id}"
+
+
+def _parse_transaction_cursor(cursor: str) -> tuple[int | None, int]:
+    height, sep, tx_id = cursor.partition(":")
+    try:
+        if not sep:
+            raise ValueError(cursor)
+        return (int(height) if height else None), int(tx_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}") from exc
+
+
 @rate_limit(rate=200, per=60)
 async def query_transactions(
     request: Request,
@@ -245,11 +278,15 @@ async def query_transactions(
     limit: int | None = 100,
     chain_id: str | None = None,
     address: str | None = None,
+    after: str | None = None,
 ) -> list[dict[str, Any]]:
-    """Query transactions with optional filters"""
-    resolved_chain_id = get_chain_id(chain_id)
+    """Query transactions with optional filters, in (block_height, id) order.
 
-    _logger.info(f"Query transactions - resolved_chain_id: {resolved_chain_id}")
+    Payload filters are answered from the indexed ``transaction_payload_field`` table (see
+    `payload_index`), so nothing is filtered in Python. Every result carries a ``cursor``;
+    pass the last one back as ``after`` to fetch the next page.
+    """
+    resolved_chain_id = get_chain_id(chain_id)
 
     with session_scope() as session:
         query = select(Transaction).where(Transaction.chain_id == resolved_chain_id)
@@ -257,63 +294,52 @@ async def query_transactions(
             from ..base_models import address_spellings
             spellings = address_spellings(address)
             query = query.where((Transaction.sender.in_(spellings)) | (Transaction.recipient.in_(spellings)))
-
-        _logger.info(f"Query: {query}")
-
-        # Apply filters based on payload fields
-        transactions = session.exec(query).all()
-
-        _logger.info(f"Found {len(transactions)} transactions for chain {resolved_chain_id}")
-
-        results = []
-        for tx in transactions:
-            # Filter by transaction type in transaction type field (not payload)
-            if transaction_type and tx.type != transaction_type:
-                continue
-
-            # Filter by island_id in payload
-            if island_id and tx.payload.get("island_id") != island_id:
-                continue
-
-            # Filter by pair in payload
-            if pair and tx.payload.get("pair") != pair:
-                continue
-
-            # Filter by status in payload
-            if status and tx.payload.get("status") != status:
-                continue
-
-            # Filter by order_id in payload
-            if (
-                order_id
-                and tx.payload.get("order_id") != order_id
-                and tx.payload.get("offer_id") != order_id
-                and tx.payload.get("bid_id") != order_id
-            ):
-                continue
-
-            results.append(
-                {
-                    "transaction_id": tx.id,
-                    "tx_hash": tx.tx_hash,
-                    "sender": tx.sender,
-                    "recipient": tx.recipient,
-                    "payload": tx.payload,
-                    "type": tx.type,
-                    "status": tx.status,
-                    "created_at": tx.created_at.isoformat(),
-                    "timestamp": tx.timestamp,
-                    "nonce": tx.nonce,
-                    "value": tx.value,
-                    "fee": tx.fee,
-                }
-            )
-
-        # Apply limit
+        if transaction_type:
+            query = query.where(Transaction.type == transaction_type)
+        for fields, value in (
+            (("island_id",), island_id),
+            (("pair",), pair),
+            (("status",), status),
+            (ORDER_REFERENCE_FIELDS, order_id),
+        ):
+            if value:
+                query = query.where(Transaction.id.in_(payload_match(resolved_chain_id, fields, value)))  # type: ignore[union-attr]
+        if after:
+            after_height, after_id = _parse_transaction_cursor(after)
+            if after_height is None:
+                query = query.where(or_(Transaction.block_height.is_not(None), Transaction.id > after_id))  # type: ignore[union-attr,operator]
+            else:
+                query = query.where(
+                    or_(
+                        Transaction.block_height > after_height,  # type: ignore[operator]
+                        and_(Transaction.block_height == after_height, Transaction.id > after_id),  # type: ignore[operator]
+                    )
+                )
+        query = query.order_by(Transaction.block_height, Transaction.id)  # type: ignore[arg-type]
         if limit:
-            results = results[:limit]
-
-        _logger.info(f"Returning {len(results)} transactions after filtering")
+            query = query.limit(limit)
+
+        results = [
+            {
+                "transaction_id": tx.id,
+                "tx_hash": tx.tx_hash,
+                "block_height": tx.block_height,
+                "sender": tx.sender,
+                "recipient": tx.recipient,
+                "payload": tx.payload,
+                "type": tx.type,
+                "status": tx.status,
+                "created_at": tx.created_at.isoformat(),
+                "timestamp": tx.timestamp,
+                "nonce": tx.nonce,
+                "value": tx.value,
+                "fee": tx.fee,
+                "cursor": _transaction_cursor(tx),
+            }
+            for tx in session.exec(query).all()
+        ]
+
+        _logger.info("Returning %s transactions for chain %s", len(results), resolved_chain_id)
 
         return results
 
@@ -15,34 +15,40 @@ _logger = get_logger(__name__)
 _poa_proposers: dict[str, Any] = {}
 
 
+def transaction_message_hash(tx_data: dict[str, Any]) -> bytes:
+    """Return the keccak256 digest a transaction's signature covers.
+
+    The message is the canonical JSON of the tx fields without the signature field.
+    ``value`` is excluded only when ``amount`` is also present, because in that case
+    it is the internal alias added by ``normalize_transaction_data`` after the client
+    has already signed. If the client sent ``value`` directly (e.g. CLI transfers),
+    it must stay in the signed message.
+    """
+    from eth_utils import keccak
+
+    has_amount = "amount" in tx_data
+    tx_without_sig = {k: v for k, v in tx_data.items() if k != "signature" and not (has_amount and k == "value")}
+    message = json.dumps(tx_without_sig, sort_keys=True, separators=(",", ":")).encode()
+    return bytes(keccak(message))
+
+
 def verify_transaction_signature(tx_data: dict[str, Any], signature: str, sender: str) -> bool:
     """Verify that a transaction was signed by the claimed sender.
 
     Uses Ethereum-style signature recovery (secp256k1) to recover the
     signer's address from the signature and compare it to the sender field.
 
-    The signed message is the keccak256 hash of the canonical JSON encoding
-    of the transaction fields (excluding the signature field itself).
+    The signed message is :func:`transaction_message_hash` of ``tx_data``. To verify
+    many transactions at once, use ``signature_verifier.verify_transaction_signatures``.
     """
     if not signature or not sender:
         return False
 
-    # Build the message that was signed: canonical JSON of tx fields without the
-    # signature field. ``value`` is excluded only when ``amount`` is also present,
-    # because in that case it is the internal alias added by ``normalize_transaction_data``
-    # after the client has already signed. If the client sent ``value`` directly (e.g.
-    # CLI transfers), it must stay in the signed message.
-    has_amount = "amount" in tx_data
-    tx_without_sig = {k: v for k, v in tx_data.items() if k != "signature" and not (has_amount and k == "value")}
-    message = json.dumps(tx_without_sig, sort_keys=True, separators=(",", ":")).encode()
-
     try:
-        from eth_utils import keccak
-
         from aitbc.crypto.signature_recovery import SignatureMalformed, verify_signature
 
         try:
-            return verify_signature(keccak(message), signature, sender)
+            return verify_signature(transaction_message_hash(tx_data), signature, sender)
         except SignatureMalformed as e:
             # V23-04: distinguishable from a recovered-wrong-address False below.
             _logger.warning("Malformed transaction signature (encoding fault): %s", e)
@@ -56,19 +62,11 @@ def sign_transaction_data(tx_data: dict[str, Any], private_key: str) -> str:
     """Sign a transaction dict with a secp256k1 private key.
 
     Produces the same 65-byte hex signature that ``verify_transaction_signature``
-    expects. The signed message is the keccak256 hash of the canonical JSON
-    encoding of the transaction fields, excluding the ``signature`` field and the
-    internal ``value`` alias when ``amount`` is present.
+    expects, over :func:`transaction_message_hash` of ``tx_data``.
     """
-    import json
-
     from eth_keys import keys
-    from eth_utils import keccak
 
-    has_amount = "amount" in tx_data
-    tx_without_sig = {k: v for k, v in tx_data.items() if k != "signature" and not (has_amount and k == "value")}
-    message = json.dumps(tx_without_sig, sort_keys=True, separators=(",", ":")).encode()
-    msg_hash = keccak(message)
+    msg_hash = transaction_message_hash(tx_data)
     pk_hex = private_key.removeprefix("0x")
     pk = keys.PrivateKey(bytes.fromhex(pk_hex))
     sig = pk.sign_msg_hash(msg_hash)
@@ -20,6 +20,7 @@ from typing import Any
 from sqlmodel import Session, select
 from sqlmodel import func as sql_func
 
+from ..account_cache import get_account_cache
 from ..base_models import address_spellings
 from ..logger import get_logger
 from ..models import Account, CrossChainTransfer, Stake, Transaction
@@ -237,8 +238,8 @@ class BalanceTracker:
     def get_balance(self, address: str, chain_id: str) -> int | None:
         """Get current balance for an address"""
         with self._session_factory() as session:
-            account = session.get(Account, (chain_id, address))
-            return account.balance if account else None
+            state = get_account_cache().lookup(session, chain_id, address)
+            return state[0] if state else None
 
     def get_balance_breakdown(self, address: str, chain_id: str) -> dict[str, Any]:
         """
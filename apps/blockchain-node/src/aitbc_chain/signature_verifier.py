@@ -0,0 +1,73 @@
+"""
+Module-level singleton for the transaction signature verification pool.
+
+Used by ``sync_block_import.py`` (every signed transaction of an imported block
+in one batch) and ``rpc/transactions.py`` (submissions, off the event loop), both
+through :func:`verify_transaction_signatures`. The worker processes start on first
+use, and ``close_signature_verifier`` stops them at shutdown.
+"""
+
+from typing import Any
+
+from aitbc.parallel import BatchSignatureVerifier
+
+from .config import settings
+from .logger import get_logger
+from .rpc.utils import transaction_message_hash
+
+_logger = get_logger(__name__)
+
+# Singleton instance shared across the node process.
+signature_verifier = BatchSignatureVerifier(
+    max_workers=settings.signature_verify_workers or None,
+    min_batch=settings.signature_verify_min_batch,
+)
+
+
+def get_signature_verifier() -> BatchSignatureVerifier:
+    """Return the process-wide :class:`BatchSignatureVerifier` singleton."""
+    return signature_verifier
+
+
+def close_signature_verifier() -> None:
+    """Stop the verifier's worker processes, if they were started."""
+    signature_verifier.close()
+
+
+def verify_transaction_signatures(items: list[tuple[dict[str, Any], str, str]]) -> list[bool]:
+    """Verify ``(tx_data, signature, sender)`` items on the signature pool, in order.
+
+    Same outcome per item as ``rpc.utils.verify_transaction_signature``.
+    """
+    checks, positions = _signature_checks(items)
+    results = [False] * len(items)
+    for position, valid in zip(positions, signature_verifier.verify(checks), strict=True):
+        results[position] = valid
+    return results
+
+
+async def verify_transaction_signatures_async(items: list[tuple[dict[str, Any], str, str]]) -> list[bool]:
+    """:func:`verify_transaction_signatures` off the event loop."""
+    checks, positions = _signature_checks(items)
+    results = [False] * len(items)
+    for position, valid in zip(positions, await signature_verifier.verify_async(checks), strict=True):
+        results[position] = valid
+    return results
+
+
+def _signature_checks(items: list[tuple[dict[str, Any], str, str]]) -> tuple[list[tuple[str, bytes, str]], list[int]]:
+    """Pool checks for the items that can verify, with their positions; the rest stay False."""
+    checks: list[tuple[str, bytes, str]] = []
+    positions: list[int] = []
+    for position, (tx_data, signature, sender) in enumerate(items):
+        # Peers and clients can send any JSON here; only strings can be signatures.
+        if not signature or not sender or not isinstance(signature, str) or not isinstance(sender, str):
+            continue
+        try:
+            msg_hash = transaction_message_hash(tx_data)
+        except Exception as e:
+            _logger.warning("Signature verification failed: %s", e)
+            continue
+        checks.append((sender, msg_hash, signature))
+        positions.append(position)
+    return checks, positions
@@ -8,29 +8,38 @@ providing cryptographic verification of account state changes.
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..models import Account
 
 
+# Nodes are immutable and every update path-copies, so a node's hash can never
+# change once computed. ``_hash`` caches it on first use; a node whose ``_hash``
+# is still None is new since the last hash pass (dirty) and only those nodes are
+# re-hashed when the root is next requested.
+
+
 @dataclass(frozen=True)
 class LeafNode:
     path: tuple[int, ...]
     value: bytes
+    _hash: bytes | None = field(default=None, init=False, repr=False, compare=False)
 
 
 @dataclass(frozen=True)
 class ExtensionNode:
     path: tuple[int, ...]
     child: TrieNode
+    _hash: bytes | None = field(default=None, init=False, repr=False, compare=False)
 
 
 @dataclass(frozen=True)
 class BranchNode:
     children: tuple[TrieNode | None, ...]
     value: bytes | None = None
+    _hash: bytes | None = field(default=None, init=False, repr=False, compare=False)
 
 
 TrieNode = LeafNode | ExtensionNode | BranchNode
@@ -47,8 +56,13 @@ class MerklePatriciaTrie:
     - Compact representation of sparse data
     """
 
-    def __init__(self) -> None:
-        self._root: TrieNode | None = None
+    def __init__(self, root: TrieNode | None = None) -> None:
+        self._root: TrieNode | None = root
+
+    @property
+    def root_node(self) -> TrieNode | None:
+        """The current root node; share it with ``MerklePatriciaTrie(root)`` to fork a version."""
+        return self._root
 
     def get(self, key: bytes) -> bytes | None:
         """Get value by key from the trie."""
@@ -289,7 +303,12 @@ class MerklePatriciaTrie:
         return ExtensionNode((index,), child)
 
     def _hash_node(self, node: TrieNode) -> bytes:
-        return hashlib.sha256(self._encode_node(node)).digest()
+        cached = node._hash
+        if cached is not None:
+            return cached
+        digest = hashlib.sha256(self._encode_node(node)).digest()
+        object.__setattr__(node, "_hash", digest)
+        return digest
 
     def _encode_node(self, node: TrieNode) -> bytes:
         if isinstance(node, LeafNode):
@@ -0,0 +1,462 @@
+"""Long-lived, incrementally updated state trie per chain.
+
+`StateManager.compute_state_root` builds a fresh trie from every account, so its
+cost grows with the number of accounts on the chain rather than with the number
+a block touched. This module keeps the trie between blocks instead:
+
+* Every write to ``account`` is recorded in ``state_trie_dirty`` by SQLite
+  triggers. Raw ``UPDATE account`` statements in the state transition, ORM
+  flushes, staking and bond handlers are all covered without callers having to
+  report what they changed.
+* ``state_trie_root`` holds the root hash of the trie as of the last committed
+  state-root computation. Applying the dirty addresses to that version gives the
+  current root in O(k log n) node updates, and only the new nodes on those paths
+  are hashed (see the ``_hash`` cache on the trie nodes).
+* New nodes go to ``state_trie_node`` keyed by hash, so a restarted node loads
+  the committed version from disk rather than rebuilding it from accounts. Only
+  nodes reachable from the stored root are read, and nodes the new version no
+  longer reaches are deleted when it is stored, so the table tracks current
+  state rather than total history.
+
+All writes happen in the caller's session, so they commit or roll back with the
+block that produced them. Versions are cached in memory by root hash, which is
+safe across databases and chains: a root hash determines the trie's contents.
+Anything unexpected -- a non-SQLite database, missing triggers, a root whose
+nodes are not on disk -- falls back to a full rebuild, which re-seeds the store.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from threading import Lock
+
+from sqlalchemy import DDL, Column, LargeBinary, delete, event, text
+from sqlmodel import Field, Session, select
+
+from ..logger import get_logger
+from ..metadata import ChainBase
+from ..metrics import metrics_registry
+from ..models import Account
+from .merkle_patricia_trie import BranchNode, ExtensionNode, LeafNode, MerklePatriciaTrie, StateManager, TrieNode
+
+logger = get_logger(__name__)
+
+EMPTY_ROOT = b"\x00" * 32
+
+# Addresses per IN (...) when re-reading dirty accounts; below SQLite's bound-parameter limit.
+_LOOKUP_CHUNK = 500
+# Trie versions kept in memory. Versions share every unchanged subtree, so each
+# extra one costs roughly the nodes its block touched.
+_MAX_CACHED_VERSIONS = 8
+
+# (balance, nonce) of one account.
+AccountState = tuple[int, int]
+
+
+class StateTrieNode(ChainBase, table=True):
+    __tablename__ = "state_trie_node"
+
+    chain_id: str = Field(primary_key=True)
+    node_hash: str = Field(primary_key=True)
+    encoded: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+
+class StateTrieRoot(ChainBase, table=True):
+    __tablename__ = "state_trie_root"
+
+    chain_id: str = Field(primary_key=True)
+    root_hash: str
+
+
+class StateTrieDirty(ChainBase, table=True):
+    __tablename__ = "state_trie_dirty"
+
+    chain_id: str = Field(primary_key=True)
+    address: str = Field(primary_key=True)
+
+
+_TRIGGER_NAMES = ("trg_account_trie_insert", "trg_account_trie_update", "trg_account_trie_delete")
+
+_TRIGGER_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_account_trie_insert AFTER INSERT ON account
+    BEGIN
+        INSERT OR IGNORE INTO state_trie_dirty (chain_id, address) VALUES (NEW.chain_id, NEW.address);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_account_trie_update AFTER UPDATE OF chain_id, address, balance, nonce ON account
+    BEGIN
+        INSERT OR IGNORE INTO state_trie_dirty (chain_id, address) VALUES (OLD.chain_id, OLD.address);
+        INSERT OR IGNORE INTO state_trie_dirty (chain_id, address) VALUES (NEW.chain_id, NEW.address);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_account_trie_delete AFTER DELETE ON account
+    BEGIN
+        INSERT OR IGNORE INTO state_trie_dirty (chain_id, address) VALUES (OLD.chain_id, OLD.address);
+    END
+    """,
+)
+
+# Fresh databases get the triggers from `create_all`; `ensure_state_trie_triggers`
+# adds them to databases whose account table predates this module.
+for _sql in _TRIGGER_SQL:
+    event.listen(Account.__table__, "after_create", DDL(_sql).execute_if(dialect="sqlite"))  # type: ignore[attr-defined]
+
+
+def ensure_state_trie_triggers(session_or_conn: Session | object) -> None:
+    """Install the account dirty-tracking triggers if they are missing (SQLite only)."""
+    execute = session_or_conn.execute  # type: ignore[attr-defined]
+    for sql in _TRIGGER_SQL:
+        execute(text(sql))
+
+
+_versions: OrderedDict[bytes, TrieNode | None] = OrderedDict()
+_versions_lock = Lock()
+
+
+def _remember(root_hash: bytes, root: TrieNode | None) -> None:
+    with _versions_lock:
+        _versions[root_hash] = root
+        _versions.move_to_end(root_hash)
+        while len(_versions) > _MAX_CACHED_VERSIONS:
+            _versions.popitem(last=False)
+
+
+def _cached(root_hash: bytes) -> tuple[bool, TrieNode | None]:
+    with _versions_lock:
+        if root_hash in _versions:
+            _versions.move_to_end(root_hash)
+            return True, _versions[root_hash]
+    return False, None
+
+
+def clear_cache() -> None:
+    """Drop every in-memory trie version (the next computation reloads from disk)."""
+    with _versions_lock:
+        _versions.clear()
+
+
+def _tracking_enabled(session: Session) -> bool:
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    placeholders = ", ".join(f"'{name}'" for name in _TRIGGER_NAMES)
+    rows = session.execute(
+        text(f"SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})")
+    ).all()
+    if len(rows) != len(_TRIGGER_NAMES):
+        return False
+    tables = session.execute(
+        text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('state_trie_node', 'state_trie_root', 'state_trie_dirty')"
+        )
+    ).all()
+    return len(tables) == 3
+
+
+def _dirty_nodes(root: TrieNode | None) -> list[TrieNode]:
+    """Nodes not yet hashed, i.e. created since the version they were forked from."""
+    dirty: list[TrieNode] = []
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if node._hash is not None:
+            continue  # hashed nodes only have hashed descendants
+        dirty.append(node)
+        if isinstance(node, ExtensionNode):
+            stack.append(node.child)
+        elif isinstance(node, BranchNode):
+            stack.extend(child for child in node.children if child is not None)
+    return dirty
+
+
+def _load_version(session: Session, chain_id: str, root_hash: bytes) -> tuple[bool, TrieNode | None]:
+    """Rebuild the trie for ``root_hash`` from the node table; (False, None) if any node is missing.
+
+    Nodes are fetched level by level from the root, so only the version's own
+    nodes are read however many other rows the table holds.
+    """
+    if root_hash == EMPTY_ROOT:
+        return True, None
+    encoded_by_hash: dict[bytes, bytes] = {}
+    frontier = [root_hash]
+    while frontier:
+        next_level: list[bytes] = []
+        for start in range(0, len(frontier), _LOOKUP_CHUNK):
+            chunk = [node_hash.hex() for node_hash in frontier[start : start + _LOOKUP_CHUNK]]
+            rows = session.execute(
+                select(StateTrieNode.node_hash, StateTrieNode.encoded).where(
+                    StateTrieNode.chain_id == chain_id,
+                    StateTrieNode.node_hash.in_(chunk),  # type: ignore[attr-defined]
+                )
+            ).all()
+            for node_hash, encoded in rows:
+                encoded_by_hash[bytes.fromhex(node_hash)] = encoded
+                next_level.extend(_child_hashes(encoded))
+        # A missing node simply has no row; `build` reports it below.
+        frontier = [node_hash for node_hash in dict.fromkeys(next_level) if node_hash not in encoded_by_hash]
+    decoder = MerklePatriciaTrie()
+
+    def build(node_hash: bytes) -> TrieNode | None:
+        encoded = encoded_by_hash.get(node_hash)
+        if encoded is None:
+            return None
+        node_type, path, value, child_hashes = decoder._decode_node(encoded)
+        node: TrieNode
+        if node_type == b"L":
+            node = LeafNode(path, value or b"")
+        elif node_type == b"E":
+            if child_hashes[0] is None:
+                return None
+            child = build(child_hashes[0])
+            if child is None:
+                return None
+            node = ExtensionNode(path, child)
+        elif node_type == b"B":
+            children: list[TrieNode | None] = []
+            for child_hash in child_hashes:
+                if child_hash is None:
+                    children.append(None)
+                    continue
+                child = build(child_hash)
+                if child is None:
+                    return None
+                children.append(child)
+            node = BranchNode(tuple(children), value)
+        else:
+            return None
+        object.__setattr__(node, "_hash", node_hash)
+        return node
+
+    root = build(root_hash)
+    return (root is not None), root
+
+
+def _child_hashes(encoded: bytes) -> list[bytes]:
+    if encoded[:1] == b"L":
+        return []
+    _, _, _, child_hashes = MerklePatriciaTrie()._decode_node(encoded)
+    return [child_hash for child_hash in child_hashes if child_hash is not None]
+
+
+def _children(node: TrieNode) -> list[TrieNode]:
+    if isinstance(node, ExtensionNode):
+        return [node.child]
+    if isinstance(node, BranchNode):
+        return [child for child in node.children if child is not None]
+    return []
+
+
+def _stale_hashes(previous: TrieNode | None, new_nodes: list[TrieNode]) -> set[bytes]:
+    """Hashes of ``previous`` that the version made of ``new_nodes`` no longer reaches.
+
+    The new version shares every subtree it did not touch with ``previous``, and
+    those shared subtrees hang directly off its new nodes. Walking ``previous``
+    and stopping at any of them visits only the paths a block rewrote.
+    """
+    retained: set[bytes] = set()
+    for node in new_nodes:
+        retained.add(node._hash)  # type: ignore[arg-type]
+        retained.update(child._hash for child in _children(node))  # type: ignore[misc]
+    stale: set[bytes] = set()
+    stack = [previous] if previous is not None else []
+    while stack:
+        node = stack.pop()
+        if node._hash in retained:
+            continue
+        stale.add(node._hash)  # type: ignore[arg-type]
+        stack.extend(_children(node))
+    return stale
+
+
+def _unreachable_hashes(session: Session, chain_id: str, root: TrieNode | None) -> set[bytes]:
+    """Every stored hash for ``chain_id`` that ``root`` does not reach (a full sweep)."""
+    reachable: set[bytes] = set()
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        reachable.add(node._hash)  # type: ignore[arg-type]
+        stack.extend(_children(node))
+    stored = session.execute(select(StateTrieNode.node_hash).where(StateTrieNode.chain_id == chain_id)).scalars()
+    return {node_hash for node_hash in map(bytes.fromhex, stored) if node_hash not in reachable}
+
+
+def _delete_nodes(session: Session, chain_id: str, hashes: set[bytes]) -> None:
+    ordered = sorted(node_hash.hex() for node_hash in hashes)
+    for start in range(0, len(ordered), _LOOKUP_CHUNK):
+        session.execute(
+            delete(StateTrieNode).where(
+                StateTrieNode.chain_id == chain_id,
+                StateTrieNode.node_hash.in_(ordered[start : start + _LOOKUP_CHUNK]),  # type: ignore[attr-defined]
+            )
+        )
+
+
+def _full_rebuild(session: Session, chain_id: str) -> MerklePatriciaTrie:
+    metrics_registry.increment("state_trie_full_rebuilds_total")
+    state_manager = StateManager()
+    trie = MerklePatriciaTrie()
+    rows = session.execute(select(Account.address, Account.balance, Account.nonce).where(Account.chain_id == chain_id)).all()
+    for address, balance, nonce in sorted(rows):
+        trie.put(state_manager._encode_address(address), state_manager._encode_account(balance, nonce))
+    return trie
+
+
+def _read_accounts(session: Session, chain_id: str, addresses: list[str]) -> dict[str, AccountState | None]:
+    current: dict[str, AccountState | None] = dict.fromkeys(addresses)
+    for start in range(0, len(addresses), _LOOKUP_CHUNK):
+        chunk = addresses[start : start + _LOOKUP_CHUNK]
+        rows = session.execute(
+            select(Account.address, Account.balance, Account.nonce).where(
+                Account.chain_id == chain_id,
+                Account.address.in_(chunk),  # type: ignore[attr-defined]
+            )
+        ).all()
+        current.update({row[0]: (row[1], row[2]) for row in rows})
+    return current
+
+
+def apply_account_changes(trie: MerklePatriciaTrie, changes: Mapping[str, AccountState | None]) -> None:
+    """Write ``changes`` (address -> (balance, nonce), or None for a deleted account) into ``trie``."""
+    state_manager = StateManager()
+    for address in sorted(changes):
+        key = state_manager._encode_address(address)
+        state = changes[address]
+        if state is None:
+            trie.delete(key)
+        else:
+            trie.put(key, state_manager._encode_account(*state))
+
+
+def account_state(trie: MerklePatriciaTrie, address: str) -> AccountState | None:
+    """Return (balance, nonce) for ``address`` in ``trie``, or None if it has no entry."""
+    state_manager = StateManager()
+    value = trie.get(state_manager._encode_address(address))
+    return state_manager._decode_account(value) if value is not None else None
+
+
+def committed_trie(session: Session, chain_id: str) -> MerklePatriciaTrie | None:
+    """Return the trie as of the last stored root, or None if it cannot be used.
+
+    None means dirty tracking is unavailable, no root has been stored yet, or the
+    stored root's nodes are not all on disk. The returned trie is a fork: updating
+    it does not affect the stored version.
+    """
+    if not _tracking_enabled(session):
+        return None
+    # Not `session.get`: the root row is written with raw SQL, so an identity-mapped
+    # instance from earlier in this session could be stale.
+    stored = session.execute(select(StateTrieRoot.root_hash).where(StateTrieRoot.chain_id == chain_id)).scalar()
+    if stored is None:
+        return None
+    committed_hash = bytes.fromhex(stored)
+    found, root = _cached(committed_hash)
+    if not found:
+        found, root = _load_version(session, chain_id, committed_hash)
+        if not found:
+            logger.warning("State trie nodes for root 0x%s missing on chain %s; rebuilding", stored, chain_id)
+            return None
+        _remember(committed_hash, root)
+    return MerklePatriciaTrie(root)
+
+
+def take_dirty_accounts(session: Session, chain_id: str) -> dict[str, AccountState | None]:
+    """Return the current state of every account written since the last call, and forget them.
+
+    Lets a caller attribute account writes to the block that made them. The caller
+    then owns those changes: until it stores a trie that includes them, the stored
+    root no longer describes the account table, so callers withdraw it first (see
+    `withdraw_root`).
+    """
+    session.flush()
+    addresses = list(
+        session.execute(select(StateTrieDirty.address).where(StateTrieDirty.chain_id == chain_id)).scalars().all()
+    )
+    if not addresses:
+        return {}
+    session.execute(text("DELETE FROM state_trie_dirty WHERE chain_id = :chain_id"), {"chain_id": chain_id})
+    return _read_accounts(session, chain_id, addresses)
+
+
+def withdraw_root(session: Session, chain_id: str) -> None:
+    """Forget the stored root so the next computation rebuilds instead of trusting it."""
+    session.execute(text("DELETE FROM state_trie_root WHERE chain_id = :chain_id"), {"chain_id": chain_id})
+
+
+def store_trie(
+    session: Session, chain_id: str, trie: MerklePatriciaTrie, *, replaces: MerklePatriciaTrie | None = None
+) -> bytes:
+    """Make ``trie`` the stored version for ``chain_id`` and return its root.
+
+    ``trie`` must describe the account table as ``session`` sees it: the dirty set
+    is cleared. Writes go through ``session`` and take effect when it commits.
+
+    Nodes the new version no longer reaches are deleted. ``replaces`` is the stored
+    version ``trie`` was forked from; with it only the rewritten paths are visited,
+    without it (or if ``trie`` was hashed before being stored, which hides its new
+    nodes) every stored node of the chain is checked.
+    """
+    new_nodes = _dirty_nodes(trie.root_node)
+    root_hash = trie.get_root()
+    if replaces is not None and replaces.get_root() == root_hash:
+        stale: set[bytes] = set()
+    elif replaces is not None and new_nodes:
+        stale = _stale_hashes(replaces.root_node, new_nodes)
+    else:
+        stale = _unreachable_hashes(session, chain_id, trie.root_node)
+    if stale:
+        _delete_nodes(session, chain_id, stale)
+    if new_nodes:
+        session.execute(
+            text("INSERT OR IGNORE INTO state_trie_node (chain_id, node_hash, encoded) VALUES (:chain_id, :node_hash, :encoded)"),
+            [
+                {"chain_id": chain_id, "node_hash": node._hash.hex(), "encoded": trie._encode_node(node)}  # type: ignore[union-attr]
+                for node in new_nodes
+            ],
+        )
+    session.execute(
+        text(
+            "INSERT INTO state_trie_root (chain_id, root_hash) VALUES (:chain_id, :root_hash) "
+            "ON CONFLICT (chain_id) DO UPDATE SET root_hash = excluded.root_hash"
+        ),
+        {"chain_id": chain_id, "root_hash": root_hash.hex()},
+    )
+    session.execute(text("DELETE FROM state_trie_dirty WHERE chain_id = :chain_id"), {"chain_id": chain_id})
+    _remember(root_hash, trie.root_node)
+    metrics_registry.increment("state_trie_nodes_written_total", float(len(new_nodes)))
+    metrics_registry.increment("state_trie_nodes_pruned_total", float(len(stale)))
+    return root_hash
+
+
+def compute_state_root(session: Session, chain_id: str, *, persist: bool = True) -> bytes:
+    """Return the state root for ``chain_id`` as seen by ``session``.
+
+    Equal to ``StateManager().compute_state_root`` over every account of the
+    chain, but computed from the last committed trie plus the accounts written
+    since. With ``persist`` the new nodes, the root pointer and the cleared
+    dirty set are written through ``session`` and take effect when the caller
+    commits; read-only callers pass ``persist=False``.
+    """
+    # Unflushed ORM changes would not have fired the triggers yet.
+    session.flush()
+    if not _tracking_enabled(session):
+        return _full_rebuild(session, chain_id).get_root()
+
+    dirty = list(
+        session.execute(select(StateTrieDirty.address).where(StateTrieDirty.chain_id == chain_id)).scalars().all()
+    )
+    trie = committed_trie(session, chain_id)
+    base = MerklePatriciaTrie(trie.root_node) if trie is not None else None
+    if trie is None:
+        trie = _full_rebuild(session, chain_id)
+    else:
+        apply_account_changes(trie, _read_accounts(session, chain_id, dirty))
+    metrics_registry.observe("state_trie_dirty_accounts", float(len(dirty)))
+
+    if not persist:
+        return trie.get_root()
+    return store_trie(session, chain_id, trie, replaces=base)
@@ -22,6 +22,7 @@ from typing import Any
 from sqlmodel import Session, select
 from sqlalchemy import text
 
+from ..account_cache import get_account_cache
 from ..base_models import _to_ait_address
 from ..models import Account, Receipt
 
@@ -325,6 +326,9 @@ def apply_deltas_to_db(
     successful = [d for d in deltas if d.success]
     if not successful:
         return
+    get_account_cache().touch(
+        session, chain_id, {d.sender for d in successful} | {d.recipient for d in successful if d.recipient}
+    )
 
     # Batch UPDATE sender balances and nonces
     for delta in successful:
@@ -9,11 +9,27 @@ from sqlmodel import Session, select
 
 from ..logger import get_logger
 from ..models import Account
+from . import persistent_trie
 from .merkle_patricia_trie import StateManager
 
 logger = get_logger(__name__)
 
 
+def compute_state_root(session: Session, chain_id: str, *, persist: bool = True) -> str | None:
+    """Compute state root from the persistent trie, updating only accounts written since the last root.
+
+    Same result as `compute_state_root_full`. With ``persist`` (block proposal and
+    import) the updated trie is written through ``session`` and becomes the new
+    baseline when the caller commits; read-only checks pass ``persist=False``.
+    """
+    try:
+        root = persistent_trie.compute_state_root(session, chain_id, persist=persist)
+        return "0x" + root.hex()
+    except Exception as e:
+        logger.warning("Failed to compute state root (persistent trie): %s", e)
+        return None
+
+
 def compute_state_root_full(session: Session, chain_id: str) -> str | None:
     """Compute state root from current account state (full recompute).
 
@@ -8,6 +8,7 @@ to ensure they only occur through validated transactions.
 from __future__ import annotations
 
 import os
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -15,6 +16,7 @@ from eth_utils import keccak
 from sqlalchemy import text
 from sqlmodel import Session, select
 
+from ..account_cache import get_account_cache
 from ..logger import get_logger
 from ..base_models import Bond, _to_ait_address
 from aitbc.crypto.signature_recovery import canonical_address
@@ -89,7 +91,14 @@ class StateTransition:
         self._processed_nonces: dict[str, int] = {}
         self._processed_tx_hashes: set[str] = set()
 
-    def validate_transaction(self, session: Session, chain_id: str, tx_data: dict[str, Any], tx_hash: str) -> tuple[bool, str]:
+    def validate_transaction(
+        self,
+        session: Session,
+        chain_id: str,
+        tx_data: dict[str, Any],
+        tx_hash: str,
+        signature_verified: bool | None = None,
+    ) -> tuple[bool, str]:
         """
         Validate a transaction before applying state changes.
 
@@ -98,6 +107,9 @@ class StateTransition:
             chain_id: Chain identifier
             tx_data: Transaction data
             tx_hash: Transaction hash
+            signature_verified: Outcome of a batch signature check already run on
+                ``tx_data`` (see ``signature_verifier.verify_transaction_signatures``);
+                None verifies the signature here
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -128,7 +140,9 @@ class StateTransition:
         sender_addr = _to_ait_address(tx_data.get("from") or "")
         signature = tx_data.get("signature")
         if signature and sender_addr:
-            if not verify_transaction_signature(tx_data, signature, sender_addr):
+            if signature_verified is None:
+                signature_verified = verify_transaction_signature(tx_data, signature, sender_addr)
+            if not signature_verified:
                 return (False, f"Invalid signature for transaction {tx_hash}")
         sender_account = session.get(Account, (chain_id, sender_addr))
         if not sender_account:
@@ -184,7 +198,14 @@ class StateTransition:
                 return (False, f"Receipt {receipt_id} has invalid coordinator attestations")
         return (True, "Transaction validated successfully")
 
-    def apply_transaction(self, session: Session, chain_id: str, tx_data: dict[str, Any], tx_hash: str) -> tuple[bool, str]:
+    def apply_transaction(
+        self,
+        session: Session,
+        chain_id: str,
+        tx_data: dict[str, Any],
+        tx_hash: str,
+        signature_verified: bool | None = None,
+    ) -> tuple[bool, str]:
         """
         Apply a validated transaction to update state.
 
@@ -193,12 +214,13 @@ class StateTransition:
             chain_id: Chain identifier
             tx_data: Transaction data
             tx_hash: Transaction hash
+            signature_verified: See :meth:`validate_transaction`
 
         Returns:
             Tuple of (success, error_message)
         """
         logger.info("apply_transaction called for tx %s, tx_data keys: %s", tx_hash, list(tx_data.keys()))
-        is_valid, error_msg = self.validate_transaction(session, chain_id, tx_data, tx_hash)
+        is_valid, error_msg = self.validate_transaction(session, chain_id, tx_data, tx_hash, signature_verified)
         if not is_valid:
             return (False, error_msg)
         sender_addr = _to_ait_address(tx_data.get("from") or "")
@@ -232,6 +254,7 @@ class StateTransition:
             if total_cost > _MAX_INT64:
                 raise ValueError(f"Transaction total_cost overflow: {total_cost}")
             session.get(Account, (chain_id, recipient_addr))
+        get_account_cache().touch(session, chain_id, [addr for addr in (sender_addr, recipient_addr) if addr])
         logger.info("Updating sender balance: %s -= %s", sender_addr, total_cost)
         session.execute(
             text(
@@ -269,7 +292,6 @@ class StateTransition:
         if _cache and _cache.is_available():
             for addr in [sender_addr, recipient_addr]:
                 if addr:
-                    _cache.delete(f"account_balance:{chain_id}:{addr.lower()}")
                     _cache.delete(f"account_details:{chain_id}:{addr.lower()}")
         logger.info(
             "Applied transaction %s: %s -> %s, value=%s, fee=%s, type=%s",
@@ -644,6 +666,10 @@ class StateTransition:
             logger.error("GPU allocation error: %s", e)
             return (False, str(e))
 
+    def forget_transactions(self, tx_hashes: Iterable[str]) -> None:
+        """Drop replay-protection entries for transactions whose writes were rolled back."""
+        self._processed_tx_hashes.difference_update(tx_hashes)
+
     def reset(self) -> None:
         """Reset the state transition validator (for testing)."""
         self._processed_nonces.clear()
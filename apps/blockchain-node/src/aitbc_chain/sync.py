@@ -22,9 +22,10 @@ from .sync_block_import import BlockImportMixin
 from .sync_bulk import BulkSyncMixin
 from .sync_divergence import DivergenceMixin
 from .sync_state import StateSyncMixin
-from .sync_validator import ImportResult, ProposerSignatureValidator
+from .sync_validator import BulkImportResult, ImportResult, ProposerSignatureValidator
 
 __all__ = [
+    "BulkImportResult",
     "ChainSync",
     "ImportResult",
     "ProposerSignatureValidator",
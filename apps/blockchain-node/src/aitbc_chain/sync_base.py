@@ -13,7 +13,7 @@ from sqlmodel import Session
 from aitbc.sync import PeerCapabilityTracker
 
 from .base_models import Block
-from .sync_validator import ImportResult, ProposerSignatureValidator
+from .sync_validator import BulkImportResult, ImportResult, ProposerSignatureValidator
 
 if TYPE_CHECKING:
     # Imported for typing only: sync_divergence imports SyncBase from here at runtime.
@@ -53,6 +53,12 @@ class SyncBase(Protocol):
         transactions: list[dict[str, Any]] | None = None,
         skip_state_root_validation: bool = False,
     ) -> ImportResult: ...
+    def import_blocks(
+        self,
+        blocks: list[dict[str, Any]],
+        skip_state_root_validation: bool = False,
+        blocks_per_commit: int | None = None,
+    ) -> BulkImportResult: ...
 
     def _validate_genesis_metadata(self, block_data: dict[str, Any], session: Session) -> tuple[bool, str]: ...
     def _append_block(
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import time
+from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import insert, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
 from aitbc.parallel import DependencyGraph, ParallelExecutor
 
+from .account_cache import get_account_cache
 from .base_models import Account, Block, _to_ait_address
 from .base_models import Transaction as ChainTransaction
 from .config import settings
 from .logger import get_logger
 from .metrics import metrics_registry
+from .signature_verifier import verify_transaction_signatures
 from .state import state_root_utils
 from .state.pure_state_transition import (
     StateDelta,
@@ -25,10 +29,61 @@ from .state.pure_state_transition import (
 )
 from .state.state_transition import get_state_transition
 from .sync_base import SyncBase
-from .sync_validator import ImportResult
+from .sync_validator import BulkImportResult, ImportResult
 
 logger = get_logger(__name__)
 
+_RENAMED_TX_FIELDS = (("from", "sender"), ("to", "recipient"), ("amount", "value"))
+
+
+def normalize_transactions(transactions: list[dict[str, Any]], chain_id: str) -> list[dict[str, Any]]:
+    """Normalize transaction data from blocks-range to the signed transaction shape.
+
+    Transaction model dumps use sender/recipient/value/tx_hash; the state transition
+    expects from/to/amount/fee/nonce/type/chain_id/signature/payload. Transactions
+    already in that shape are returned as they are, so normalizing twice is cheap.
+    """
+    normalized = []
+    for raw_tx in transactions:
+        if "signature" in raw_tx and "chain_id" in raw_tx and not any(
+            new_key not in raw_tx and old_key in raw_tx for new_key, old_key in _RENAMED_TX_FIELDS
+        ):
+            normalized.append(raw_tx)
+            continue
+        norm = dict(raw_tx)
+        if "from" not in norm and "sender" in norm:
+            norm["from"] = norm["sender"]
+        if "to" not in norm and "recipient" in norm:
+            norm["to"] = norm["recipient"]
+        if "amount" not in norm and "value" in norm:
+            norm["amount"] = norm["value"]
+        if "signature" not in norm:
+            norm["signature"] = ""
+        if "chain_id" not in norm:
+            norm["chain_id"] = chain_id
+        normalized.append(norm)
+    return normalized
+
+
+def _block_addresses(transactions: list[dict[str, Any]]) -> set[str]:
+    """Accounts a block's transactions may have written."""
+    return {_to_ait_address(tx.get(key) or "") for tx in transactions for key in ("from", "to")} - {""}
+
+
+def _group_addresses(group: list[dict[str, Any]]) -> set[str]:
+    return {address for block in group for address in _block_addresses(block.get("transactions") or [])}
+
+
+def _verify_signatures(transactions: list[dict[str, Any]]) -> list[bool]:
+    """Check every transaction signature in one batch on the signature pool.
+
+    ``result[i]`` is what ``StateTransition.validate_transaction`` would conclude
+    for ``transactions[i]``; it is passed back as ``signature_verified``.
+    """
+    return verify_transaction_signatures(
+        [(tx, tx.get("signature") or "", _to_ait_address(tx.get("from") or "")) for tx in transactions]
+    )
+
 
 class BlockImportMixin(SyncBase):
     """Import a single block, append it, and resolve chain forks."""
@@ -156,54 +211,13 @@ class BlockImportMixin(SyncBase):
             transactions: Optional list of transactions
             skip_state_root_validation: Skip state root validation (for bulk import)
         """
-        from datetime import UTC, datetime
-
         block_hash = block_data["hash"]
 
-        # Normalize transaction data from blocks-range (Transaction model dumps use
-        # sender/recipient/value/tx_hash) to the signed transaction shape the state
-        # transition expects (from/to/amount/fee/nonce/type/chain_id/signature/payload).
         if transactions:
-            normalized = []
-            for raw_tx in transactions:
-                norm = dict(raw_tx)
-                if "from" not in norm and "sender" in norm:
-                    norm["from"] = norm["sender"]
-                if "to" not in norm and "recipient" in norm:
-                    norm["to"] = norm["recipient"]
-                if "amount" not in norm and "value" in norm:
-                    norm["amount"] = norm["value"]
-                if "signature" not in norm:
-                    norm["signature"] = ""
-                if "chain_id" not in norm:
-                    norm["chain_id"] = self._chain_id
-                normalized.append(norm)
-            transactions = normalized
+            transactions = normalize_transactions(transactions, self._chain_id)
 
-        timestamp_str = block_data.get("timestamp", "")
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now(UTC)
-        except (ValueError, TypeError):
-            timestamp = datetime.now(UTC)
-        tx_count = block_data.get("tx_count", 0)
-        if transactions:
-            tx_count = len(transactions)
-        block = Block(
-            chain_id=self._chain_id,
-            height=block_data["height"],
-            hash=block_data["hash"],
-            parent_hash=block_data["parent_hash"],
-            proposer=block_data.get("proposer", "unknown"),
-            timestamp=timestamp,
-            tx_count=tx_count,
-            state_root=block_data.get("state_root"),
-            # Persist the signature this block was just validated against. Dropping
-            # it made the check single-use: the block verified once on the way in and
-            # was then stored unsigned, so this node could never re-serve proof of who
-            # proposed it. One sync hop stripped authorship from the whole chain.
-            signature=block_data.get("signature", ""),
-            block_metadata=block_data.get("block_metadata"),
-        )
+        block = self._build_block(block_data, transactions)
+        tx_count = block.tx_count
         session.add(block)
         if transactions:
             # Parallel transaction validation path (v0.6.1).
@@ -323,7 +337,8 @@ class BlockImportMixin(SyncBase):
             if not parallel_applied:
                 # Sequential path (fallback when parallel_tx_validation is off
                 # or the conflict rate exceeds the threshold).
-                for tx_data in transactions:
+                signatures_valid = _verify_signatures(transactions)
+                for tx_data, signature_valid in zip(transactions, signatures_valid, strict=True):
                     sender_addr = _to_ait_address(tx_data.get("from", ""))
                     recipient_addr = _to_ait_address(tx_data.get("to", ""))
                     int(tx_data.get("amount", 0) or 0)
@@ -340,7 +355,9 @@ class BlockImportMixin(SyncBase):
                         session.add(recipient_acct)
                         session.flush()
                     state_transition = get_state_transition()
-                    success, error_msg = state_transition.apply_transaction(session, self._chain_id, tx_data, tx_hash)
+                    success, error_msg = state_transition.apply_transaction(
+                        session, self._chain_id, tx_data, tx_hash, signature_valid
+                    )
                     if not success:
                         logger.warning("[SYNC] Failed to apply transaction %s: %s", tx_hash, error_msg)
                     tx_type = tx_data.get("type", "TRANSFER")
@@ -365,13 +382,11 @@ class BlockImportMixin(SyncBase):
                     session.add(db_tx)
         if block_data.get("state_root") and (not skip_state_root_validation):
             session.flush()
-            # Compute state root from the full account state. The previous
-            # "incremental" approach created a fresh trie per call but only
-            # populated it with accounts touched in this block — producing an
-            # empty trie (root=0x00..00) for blocks with no transactions and a
-            # wrong root for blocks with transactions. Since the trie is not
-            # persisted across blocks, a full recompute is the only correct option.
-            computed_hex = state_root_utils.compute_state_root_full(session, self._chain_id)
+            # The persistent trie starts from the root committed with the previous
+            # block and applies every account written since (tracked by triggers on
+            # `account`), so the result equals a full recompute without reloading
+            # every account. A rejected block rolls the trie update back with it.
+            computed_hex = state_root_utils.compute_state_root(session, self._chain_id)
             computed_root = bytes.fromhex(computed_hex.replace("0x", "")) if computed_hex else None
             try:
                 expected_root = bytes.fromhex(str(block_data.get("state_root")).replace("0x", ""))
@@ -411,6 +426,8 @@ class BlockImportMixin(SyncBase):
                     reason=f"State root mismatch: expected {expected_root.hex()}, computed {computed_root.hex()}",  # type: ignore[union-attr]
                 )
         session.commit()
+        if transactions:
+            get_account_cache().refresh(session, self._chain_id, _block_addresses(transactions))
         self._reset_rejection_counter(self._chain_id)
         metrics_registry.increment("sync_blocks_accepted_total")
         metrics_registry.set_gauge("sync_chain_height", float(block_data["height"]))
@@ -427,6 +444,229 @@ class BlockImportMixin(SyncBase):
             accepted=True, height=block_data["height"], block_hash=block_data["hash"], reason="Appended to chain"
         )
 
+    def _build_block(self, block_data: dict[str, Any], transactions: list[dict[str, Any]] | None) -> Block:
+        timestamp_str = block_data.get("timestamp", "")
+        try:
+            timestamp = datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now(UTC)
+        except (ValueError, TypeError):
+            timestamp = datetime.now(UTC)
+        tx_count = block_data.get("tx_count", 0)
+        if transactions:
+            tx_count = len(transactions)
+        return Block(
+            chain_id=self._chain_id,
+            height=block_data["height"],
+            hash=block_data["hash"],
+            parent_hash=block_data["parent_hash"],
+            proposer=block_data.get("proposer", "unknown"),
+            timestamp=timestamp,
+            tx_count=tx_count,
+            state_root=block_data.get("state_root"),
+            # Persist the signature this block was just validated against. Dropping
+            # it made the check single-use: the block verified once on the way in and
+            # was then stored unsigned, so this node could never re-serve proof of who
+            # proposed it. One sync hop stripped authorship from the whole chain.
+            signature=block_data.get("signature", ""),
+            block_metadata=block_data.get("block_metadata"),
+        )
+
+    def import_blocks(
+        self,
+        blocks: list[dict[str, Any]],
+        skip_state_root_validation: bool = False,
+        blocks_per_commit: int | None = None,
+    ) -> BulkImportResult:
+        """Append consecutive blocks to the chain tip, many per database transaction.
+
+        For catch-up, where `import_block`'s commit per block and ORM overhead
+        dominate. Blocks are written in groups of ``blocks_per_commit`` (default
+        ``settings.bulk_import_blocks_per_commit``): each group's `Block` and
+        `Transaction` rows go in with one executemany INSERT each, accounts a
+        transaction needs are created with a bulk INSERT ... ON CONFLICT DO NOTHING,
+        and the group commits once. Transactions go through the state transition
+        exactly as on the sequential `import_block` path, so state is identical.
+
+        Blocks must extend the tip in order; forks and duplicates are refused
+        rather than resolved (use `import_block` for those). The first invalid
+        block -- bad link, signature, duplicate or state root -- rolls its group
+        back; the blocks before it in that group are then rewritten and committed,
+        and nothing after it is attempted.
+        """
+        limit = max(1, blocks_per_commit or getattr(settings, "bulk_import_blocks_per_commit", 500))
+        imported = 0
+        height = -1
+        for start in range(0, len(blocks), limit):
+            group = blocks[start : start + limit]
+            accepted, rejected = self._import_block_group(group, skip_state_root_validation)
+            imported += accepted
+            if accepted:
+                height = group[accepted - 1]["height"]
+            if rejected is not None:
+                return BulkImportResult(imported=imported, height=height, rejected=rejected)
+        return BulkImportResult(imported=imported, height=height)
+
+    def _import_block_group(
+        self, group: list[dict[str, Any]], skip_state_root_validation: bool
+    ) -> tuple[int, ImportResult | None]:
+        start = time.perf_counter()
+        metrics_registry.increment("sync_blocks_received_total", float(len(group)))
+        written: list[str] = []
+        with self._session_factory() as session:
+            failure = self._write_block_group(session, group, skip_state_root_validation, written)
+            if failure is None:
+                session.commit()
+                get_account_cache().refresh(session, self._chain_id, _group_addresses(group))
+                accepted, rejected = len(group), None
+            else:
+                session.rollback()
+                get_state_transition().forget_transactions(written)
+                accepted, rejected = failure
+        if rejected is not None and accepted:
+            # No savepoints (pysqlite's are unreliable), so the valid prefix is
+            # written again from scratch in a fresh transaction.
+            written.clear()
+            with self._session_factory() as session:
+                if self._write_block_group(session, group[:accepted], skip_state_root_validation, written) is None:
+                    session.commit()
+                    get_account_cache().refresh(session, self._chain_id, _group_addresses(group[:accepted]))
+                else:
+                    session.rollback()
+                    get_state_transition().forget_transactions(written)
+                    accepted = 0
+        if accepted:
+            self._reset_rejection_counter(self._chain_id)
+            metrics_registry.increment("sync_blocks_accepted_total", float(accepted))
+            metrics_registry.set_gauge("sync_chain_height", float(group[accepted - 1]["height"]))
+            metrics_registry.observe("sync_bulk_commit_blocks", float(accepted))
+            metrics_registry.observe("sync_bulk_commit_seconds", time.perf_counter() - start)
+        if rejected is not None:
+            metrics_registry.increment("sync_blocks_rejected_total")
+        return accepted, rejected
+
+    def _write_block_group(
+        self,
+        session: Session,
+        group: list[dict[str, Any]],
+        skip_state_root_validation: bool,
+        written: list[str],
+    ) -> tuple[int, ImportResult] | None:
+        """Write ``group`` in ``session`` without committing.
+
+        Returns None on success, or (index, rejection) for the first invalid block.
+        ``written`` collects the hashes of transactions applied, for rollback.
+        """
+        head = session.exec(
+            select(Block).where(Block.chain_id == self._chain_id).order_by(text("height DESC")).limit(1)
+        ).first()
+        tip_height, tip_hash = (head.height, head.hash) if head else (-1, "0x00")
+        existing_tx_hashes = set(
+            session.exec(
+                select(ChainTransaction.tx_hash).where(
+                    ChainTransaction.chain_id == self._chain_id,
+                    ChainTransaction.tx_hash.in_(  # type: ignore[attr-defined]
+                        [tx.get("tx_hash", "") for block_data in group for tx in block_data.get("transactions") or []]
+                    ),
+                )
+            ).all()
+        )
+        state_transition = get_state_transition()
+        # Normalise the whole group up front so its signatures verify in one batch.
+        group_transactions = [normalize_transactions(b.get("transactions") or [], self._chain_id) for b in group]
+        signatures_valid = iter(_verify_signatures([tx for txs in group_transactions for tx in txs]))
+        block_rows: list[dict[str, Any]] = []
+        tx_rows: list[dict[str, Any]] = []
+        for index, block_data in enumerate(group):
+            height = block_data.get("height", -1)
+            block_hash = block_data.get("hash", "")
+
+            def reject(
+                reason: str, diverged: bool = False, *, index: int = index, height: int = height, block_hash: str = block_hash
+            ) -> tuple[int, ImportResult]:
+                logger.warning("Bulk import rejected block at height %s: %s", height, reason)
+                return index, ImportResult(
+                    accepted=False, height=height, block_hash=block_hash, reason=reason, diverged=diverged
+                )
+
+            if height != tip_height + 1:
+                return reject(f"Block does not extend our tip (our height: {tip_height}, received: {height})")
+            if block_data.get("parent_hash", "") != tip_hash:
+                return reject(
+                    f"Divergent chain: parent {block_data.get('parent_hash', '')[:16]}... is not our head "
+                    f"{tip_hash[:16]}... at height {tip_height}",
+                    diverged=head is not None or index > 0,
+                )
+            if self._validate_signatures:
+                valid, reason = self._validator.validate_block_signature(block_data)
+                if not valid:
+                    return reject(reason)
+            if height == 0 and block_data.get("block_metadata"):
+                valid, reason = self._validate_genesis_metadata(block_data, session)
+                if not valid:
+                    metrics_registry.increment("sync_state_root_rejected_total")
+                    return reject(reason)
+
+            transactions = group_transactions[index]
+            tx_hashes = [tx.get("tx_hash", "") for tx in transactions]
+            duplicates = existing_tx_hashes.intersection(tx_hashes)
+            if duplicates or len(set(tx_hashes)) != len(tx_hashes):
+                return reject(f"Duplicate transaction in block: {sorted(duplicates)[:1] or 'repeated within block'}")
+            existing_tx_hashes.update(tx_hashes)
+
+            if transactions:
+                # The sequential path creates a zero account for every sender and
+                # recipient before applying the transaction; do it for the block at once.
+                addresses = {_to_ait_address(tx.get(key, "")) for tx in transactions for key in ("from", "to")}
+                now = datetime.now(UTC)
+                session.execute(
+                    sqlite_insert(Account).on_conflict_do_nothing(),
+                    [
+                        {"chain_id": self._chain_id, "address": address, "balance": 0, "nonce": 0, "updated_at": now}
+                        for address in sorted(addresses)
+                    ],
+                )
+            for tx_data in transactions:
+                tx_hash = tx_data.get("tx_hash", "")
+                success, error_msg = state_transition.apply_transaction(
+                    session, self._chain_id, tx_data, tx_hash, next(signatures_valid)
+                )
+                if success:
+                    written.append(tx_hash)
+                else:
+                    logger.warning("[SYNC] Failed to apply transaction %s: %s", tx_hash, error_msg)
+                tx_type = (tx_data.get("type") or "TRANSFER").upper()
+                tx_rows.append(
+                    ChainTransaction(
+                        chain_id=self._chain_id,
+                        tx_hash=tx_hash,
+                        block_height=height,
+                        # Raw, not canonicalised: these are signed (V23-65).
+                        sender=tx_data.get("from", ""),
+                        recipient=tx_data.get("to", ""),
+                        payload=tx_data.get("payload", {}),
+                        type=tx_type,
+                        value=tx_data.get("value", tx_data.get("amount", 0)),
+                        fee=tx_data.get("fee", 0),
+                        nonce=tx_data.get("nonce", 0),
+                        status="confirmed",
+                    ).model_dump(exclude={"id"})
+                )
+            block_rows.append(self._build_block(block_data, transactions).model_dump(exclude={"id"}))
+
+            if block_data.get("state_root") and not skip_state_root_validation:
+                computed_hex = state_root_utils.compute_state_root(session, self._chain_id)
+                expected_hex = str(block_data["state_root"]).lower().removeprefix("0x")
+                if computed_hex is None or computed_hex.removeprefix("0x") != expected_hex:
+                    metrics_registry.increment("sync_state_root_rejected_total")
+                    self._track_rejection(self._chain_id)
+                    return reject(f"State root mismatch: expected {block_data['state_root']}, computed {computed_hex}")
+            tip_height, tip_hash = height, block_hash
+
+        if block_rows:
+            session.execute(insert(Block), block_rows)
+        if tx_rows:
+            session.execute(insert(ChainTransaction), tx_rows)
+        return None
+
     def _resolve_fork(
         self, session: Session, block_data: dict[str, Any], transactions: list[dict[str, Any]] | None, our_head: Block
     ) -> ImportResult:
@@ -3,22 +3,91 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from sqlalchemy import text
 from sqlmodel import select
 
-from .base_models import Block
+from .base_models import Account, Block
+from .base_models import Transaction as ChainTransaction
 from .config import settings
 from .logger import get_logger
 from .metrics import metrics_registry
+from .state import persistent_trie
+from .state.merkle_patricia_trie import MerklePatriciaTrie
+from .state.persistent_trie import AccountState
 from .sync_base import SyncBase
+from .sync_block_import import normalize_transactions
 from .sync_divergence import clear_divergence, report_divergence
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class _FetchedBatch:
+    start: int
+    end: int
+    parts: list[bytes]  # raw blocks-range bodies, one per peer sub-range
+    partial_ok: bool = False  # fetched from the sync source itself; nothing to refetch from
+
+
+@dataclass
+class _DecodedBatch:
+    start: int
+    end: int
+    blocks: list[dict[str, Any]]
+
+
+def _blocks_from_payload(data: Any) -> list[dict[str, Any]]:
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and "blocks" in data:
+        return data["blocks"]  # type: ignore[no-any-return]
+    logger.error("Unexpected blocks-range response", extra={"data": data})
+    return []
+
+
+def _decode_batch(batch: _FetchedBatch, chain_id: str) -> list[dict[str, Any]] | None:
+    """Decode, merge and normalise one fetched batch.
+
+    Parts are merged by height and deduplicated by hash. Returns None when peers
+    disagree on a height, or (unless ``batch.partial_ok``) when the merged blocks do
+    not cover the batch -- the caller then refetches it from the sync source.
+    """
+    by_height: dict[int, dict[str, Any]] = {}
+    for raw in batch.parts:
+        try:
+            blocks = _blocks_from_payload(json.loads(raw))
+        except ValueError as e:
+            logger.error("Undecodable blocks-range response", extra={"start": batch.start, "end": batch.end, "error": str(e)})
+            continue
+        for block in blocks:
+            height = block.get("height", -1)
+            existing = by_height.get(height)
+            if existing is not None and existing.get("hash", "") != block.get("hash", ""):
+                return None
+            by_height.setdefault(height, block)
+    merged = [by_height[height] for height in sorted(by_height)]
+    if not batch.partial_ok and len(merged) != batch.end - batch.start + 1:
+        return None
+    for block in merged:
+        if block.get("transactions"):
+            block["transactions"] = normalize_transactions(block["transactions"], chain_id)
+    return merged
+
+
+def _record_stage(stage: str, blocks: int, seconds: float) -> None:
+    """Per-stage throughput, so the slowest pipeline stage is visible."""
+    metrics_registry.increment(f"sync_pipeline_{stage}_blocks_total", float(blocks))
+    metrics_registry.observe(f"sync_pipeline_{stage}_seconds", seconds)
+    if seconds > 0:
+        metrics_registry.set_gauge(f"sync_pipeline_{stage}_blocks_per_second", blocks / seconds)
+
+
 class BulkSyncMixin(SyncBase):
     """Fetch and import blocks in bulk from remote peers."""
 
@@ -111,23 +180,20 @@ class BulkSyncMixin(SyncBase):
     async def fetch_blocks_range(self, start: int, end: int, source_url: str) -> list[dict[str, Any]]:
         """Fetch a range of blocks from a source RPC."""
         try:
-            resp = await self._client.get(
-                f"{source_url}/rpc/blocks-range",
-                params={"start": start, "end": end, "chain_id": self._chain_id},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if isinstance(data, list):
-                return data
-            elif isinstance(data, dict) and "blocks" in data:
-                return data["blocks"]  # type: ignore[no-any-return]
-            else:
-                logger.error("Unexpected blocks-range response", extra={"data": data})
-                return []
+            return _blocks_from_payload(json.loads(await self._fetch_blocks_raw(start, end, source_url)))
         except Exception as e:
             logger.error("Failed to fetch blocks range", extra={"start": start, "end": end, "error": str(e)})
             return []
 
+    async def _fetch_blocks_raw(self, start: int, end: int, source_url: str) -> bytes:
+        """Fetch the undecoded blocks-range response body; decoding is left to the caller."""
+        resp = await self._client.get(
+            f"{source_url}/rpc/blocks-range",
+            params={"start": start, "end": end, "chain_id": self._chain_id},
+        )
+        resp.raise_for_status()
+        return resp.content
+
     async def bulk_import_from(self, source_url: str) -> int:
         """Import blocks from a remote source via RPC."""
         self._logger.info("Starting bulk import from source: %s", source_url)
@@ -228,114 +294,312 @@ class BulkSyncMixin(SyncBase):
     async def _sequential_bulk_import(
         self, start_height: int, end_height: int, source_url: str, batch_size: int, poll_interval: float
     ) -> int:
-        """Fetch blocks sequentially from a single peer (existing path)."""
-        imported = 0
-        current = start_height
-        while current <= end_height:
-            batch_end = min(current + batch_size - 1, end_height)
-            batch = await self.fetch_blocks_range(current, batch_end, source_url)
-            if not batch:
-                logger.warning("No blocks returned for range", extra={"start": current, "end": batch_end})
-                break
-            for block_data in batch:
-                result = self.import_block(
-                    block_data, transactions=block_data.get("transactions"), skip_state_root_validation=True
-                )
-                if result.accepted:
-                    imported += 1
-                    logger.info(
-                        "Block imported via pull sync",
-                        extra={
-                            "height": block_data.get("height"),
-                            "hash": block_data.get("hash"),
-                            "sync_mode": "pull",
-                            "progress": f"{imported}/{end_height - start_height + 1}",
-                        },
-                    )
-                else:
-                    logger.warning(
-                        "Block import failed during bulk at height %s: %s",
-                        block_data.get("height"),
-                        result.reason,
-                        extra={"height": block_data.get("height"), "reason": result.reason},
-                    )
-                    return imported
-            current = batch_end + 1
-            await asyncio.sleep(poll_interval)
-        return imported
+        """Fetch blocks from a single peer through the import pipeline."""
+        return await self._pipelined_bulk_import(
+            start_height, end_height, batch_size, poll_interval, lambda start, end: [(source_url, (start, end))], source_url
+        )
 
     async def _parallel_bulk_import(
         self, start_height: int, end_height: int, source_url: str, batch_size: int, poll_interval: float
     ) -> int:
-        """Fetch blocks in parallel from multiple peers."""
-        max_peers = getattr(settings, "sync_parallel_max_peers", 4)
-        timeout = getattr(settings, "sync_parallel_timeout", 30.0)
+        """Fetch blocks from multiple peers through the import pipeline.
 
-        # Select peers for the range
-        assignments = self._peer_tracker.select_peers_for_range(start_height, end_height, max_peers=max_peers)
-        if not assignments:
+        Each batch is split across the peers `PeerCapabilityTracker` assigns for it;
+        a batch whose parts conflict or leave gaps is refetched from ``source_url``.
+        """
+        max_peers = getattr(settings, "sync_parallel_max_peers", 4)
+        if not self._peer_tracker.select_peers_for_range(start_height, end_height, max_peers=max_peers):
             # No peers available, fall back to sequential
             return await self._sequential_bulk_import(start_height, end_height, source_url, batch_size, poll_interval)
 
-        self._logger.info("Parallel sync: %d peers for range %d-%d", len(assignments), start_height, end_height)
+        self._logger.info("Parallel sync: up to %d peers for range %d-%d", max_peers, start_height, end_height)
+
+        def assign(start: int, end: int) -> list[tuple[str, tuple[int, int]]]:
+            return self._peer_tracker.select_peers_for_range(start, end, max_peers=max_peers) or [(source_url, (start, end))]
+
+        return await self._pipelined_bulk_import(start_height, end_height, batch_size, poll_interval, assign, source_url)
+
+    async def _pipelined_bulk_import(
+        self,
+        start_height: int,
+        end_height: int,
+        batch_size: int,
+        poll_interval: float,
+        assign: Callable[[int, int], list[tuple[str, tuple[int, int]]]],
+        source_url: str,
+    ) -> int:
+        """Fetch, decode and import batches as three concurrent stages.
+
+        Fetching is network-bound, decoding (JSON and transaction normalisation)
+        runs in a worker thread, and importing stays on the event loop thread,
+        which owns the database connection. Bounded queues between the stages
+        (``bulk_sync_prefetch_depth`` batches each) let the fetcher run ahead of
+        the importer without buffering the whole range. The fetcher still waits
+        ``poll_interval`` between requests, but that wait now overlaps with
+        importing instead of adding to it.
+        """
+        depth = max(1, getattr(settings, "bulk_sync_prefetch_depth", 4))
+        fetched: asyncio.Queue[_FetchedBatch | None] = asyncio.Queue(maxsize=depth)
+        decoded: asyncio.Queue[_DecodedBatch | None] = asyncio.Queue(maxsize=depth)
+
+        # A stage that fails ends the pipeline like an exhausted range would. The end
+        # marker is not sent from `finally`: a stage cancelled while blocked on a full
+        # queue would block again there.
+        async def fetch_stage() -> None:
+            current = start_height
+            try:
+                while current <= end_height:
+                    batch_end = min(current + batch_size - 1, end_height)
+                    assignments = assign(current, batch_end)
+                    started = time.perf_counter()
+                    parts = await self._fetch_assigned(assignments)
+                    _record_stage("fetch", batch_end - current + 1, time.perf_counter() - started)
+                    single_source = [peer_id for peer_id, _ in assignments] == [source_url]
+                    await fetched.put(_FetchedBatch(current, batch_end, parts, partial_ok=single_source))
+                    current = batch_end + 1
+                    if current <= end_height:
+                        await asyncio.sleep(poll_interval)
+            except Exception as e:
+                self._logger.error("Bulk sync fetch stage failed: %s", e)
+            await fetched.put(None)
+
+        async def decode_stage() -> None:
+            try:
+                while (batch := await fetched.get()) is not None:
+                    started = time.perf_counter()
+                    blocks = await asyncio.to_thread(_decode_batch, batch, self._chain_id)
+                    if blocks is None:
+                        self._logger.warning(
+                            "Batch %d-%d conflicting or incomplete across peers, refetching from %s",
+                            batch.start,
+                            batch.end,
+                            source_url,
+                        )
+                        parts = await self._fetch_assigned([(source_url, (batch.start, batch.end))])
+                        retry = _FetchedBatch(batch.start, batch.end, parts, partial_ok=True)
+                        blocks = await asyncio.to_thread(_decode_batch, retry, self._chain_id) or []
+                    _record_stage("decode", len(blocks), time.perf_counter() - started)
+                    await decoded.put(_DecodedBatch(batch.start, batch.end, blocks))
+            except Exception as e:
+                self._logger.error("Bulk sync decode stage failed: %s", e)
+            await decoded.put(None)
+
+        stages = [asyncio.create_task(fetch_stage()), asyncio.create_task(decode_stage())]
+        imported = 0
+        try:
+            while (batch := await decoded.get()) is not None:
+                if not batch.blocks:
+                    logger.warning("No blocks returned for range", extra={"start": batch.start, "end": batch.end})
+                    break
+                started = time.perf_counter()
+                accepted, complete = await self._import_decoded_batch(batch.blocks, imported, end_height - start_height + 1)
+                imported += accepted
+                _record_stage("import", accepted, time.perf_counter() - started)
+                if not complete:
+                    break
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        return imported
+
+    async def _fetch_assigned(self, assignments: list[tuple[str, tuple[int, int]]]) -> list[bytes]:
+        """Fetch each (peer, sub-range) concurrently; failed peers contribute nothing."""
+        timeout = getattr(settings, "sync_parallel_timeout", 30.0)
 
-        # Fetch from each peer in parallel
-        async def fetch_from_peer(peer_id: str, sub_range: tuple[int, int]) -> list[dict[str, Any]]:
+        async def fetch_from_peer(peer_id: str, sub_range: tuple[int, int]) -> bytes | None:
             try:
                 # In v0.6.2, peer_id IS the URL
-                blocks = await asyncio.wait_for(
-                    self.fetch_blocks_range(sub_range[0], sub_range[1], peer_id),
-                    timeout=timeout,
-                )
-                self._peer_tracker.record_success(peer_id, len(blocks))
-                return blocks
+                raw = await asyncio.wait_for(self._fetch_blocks_raw(sub_range[0], sub_range[1], peer_id), timeout=timeout)
+                self._peer_tracker.record_success(peer_id, sub_range[1] - sub_range[0] + 1)
+                return raw
             except Exception as e:
                 self._logger.warning("Peer %s failed: %s", peer_id, e)
                 self._peer_tracker.record_failure(peer_id, str(e))
-                return []
-
-        results = await asyncio.gather(*[fetch_from_peer(pid, sr) for pid, sr in assignments])
-
-        # Merge results: concatenate, sort by height, deduplicate by hash
-        all_blocks: list[dict[str, Any]] = []
-        for blocks in results:
-            all_blocks.extend(blocks)
-        all_blocks.sort(key=lambda b: b.get("height", 0))
-
-        # Deduplicate by hash (keep first occurrence)
-        seen_hashes: set[str] = set()
-        unique_blocks: list[dict[str, Any]] = []
-        for block in all_blocks:
-            h = block.get("hash", "")
-            if h and h not in seen_hashes:
-                seen_hashes.add(h)
-                unique_blocks.append(block)
-
-        # Check for conflicts (same height, different hash)
-        height_map: dict[int, str] = {}
-        conflicts: list[int] = []
-        for block in unique_blocks:
-            h = block.get("height", -1)
-            hash_val = block.get("hash", "")
-            if h in height_map and height_map[h] != hash_val:
-                conflicts.append(h)
-            else:
-                height_map[h] = hash_val
-
-        if conflicts:
-            self._logger.warning("Block conflicts at heights %s, falling back to sequential", conflicts)
-            return await self._sequential_bulk_import(start_height, end_height, source_url, batch_size, poll_interval)
+                return None
 
-        # Import merged block list
-        imported = 0
-        for block_data in unique_blocks:
-            result = self.import_block(
-                block_data, transactions=block_data.get("transactions"), skip_state_root_validation=True
+        results = await asyncio.gather(*[fetch_from_peer(peer_id, sub_range) for peer_id, sub_range in assignments])
+        return [raw for raw in results if raw is not None]
+
+    async def _import_decoded_batch(self, blocks: list[dict[str, Any]], imported: int, total: int) -> tuple[int, bool]:
+        """Import one decoded batch; returns (blocks imported, whether all of them were).
+
+        Batches go through `import_blocks`, which commits many blocks per
+        transaction; checkpoint verification journals per block and so imports
+        them one at a time.
+        """
+        if getattr(settings, "bulk_sync_checkpoint_verification", False):
+            return self._import_checkpointed_batch(blocks)
+        result = self.import_blocks(blocks, skip_state_root_validation=True)
+        if result.imported:
+            logger.info(
+                "Blocks imported via pull sync",
+                extra={
+                    "height": result.height,
+                    "sync_mode": "pull",
+                    "progress": f"{imported + result.imported}/{total}",
+                },
+            )
+        if result.rejected is not None:
+            logger.warning(
+                "Block import failed during bulk at height %s: %s",
+                result.rejected.height,
+                result.rejected.reason,
+                extra={"height": result.rejected.height, "reason": result.rejected.reason},
             )
-            if result.accepted:
-                imported += 1
-            else:
+            return result.imported, False
+        return result.imported, True
+
+    def _import_checkpointed_batch(self, blocks: list[dict[str, Any]]) -> tuple[int, bool]:
+        """Import ``blocks`` and verify their state once, at the batch boundary.
+
+        Blocks are imported without per-block state-root validation, but the
+        accounts each one writes are journalled (from the persistent trie's dirty
+        set). After the batch one incremental root is computed and compared with
+        the last block's ``state_root``. On a mismatch the journal is bisected to
+        find the first block whose root diverges; accounts are restored to the
+        state after the block before it and the divergent blocks are removed, so
+        the node is left at its last verified block.
+
+        Returns (blocks kept, whether every block was imported and verified).
+        """
+        with self._session_factory() as session:
+            # Fold any writes made outside a checkpoint into the stored trie first,
+            # so the base is exactly the state before this batch.
+            persistent_trie.compute_state_root(session, self._chain_id)
+            base = persistent_trie.committed_trie(session, self._chain_id)
+            if base is not None:
+                # The journal owns account writes until the batch is verified. Without
+                # a stored root, a crash mid-batch costs one full rebuild instead of
+                # leaving a stale root for the next block to build on.
+                persistent_trie.withdraw_root(session, self._chain_id)
+            session.commit()
+        if base is None:
+            self._logger.warning("Checkpoint verification needs SQLite dirty tracking; importing batch unverified")
+            return self._import_unverified_batch(blocks)
+
+        journal: list[tuple[dict[str, Any], dict[str, AccountState | None]]] = []
+        complete = True
+        for block_data in blocks:
+            result = self.import_block(block_data, transactions=block_data.get("transactions"), skip_state_root_validation=True)
+            if not result.accepted:
                 self._logger.warning("Block import failed at height %s: %s", block_data.get("height"), result.reason)
-                return imported
+                complete = False
+                break
+            with self._session_factory() as session:
+                changes = persistent_trie.take_dirty_accounts(session, self._chain_id)
+                session.commit()
+            journal.append((block_data, changes))
 
-        return imported
+        checked = [index for index, (block_data, _) in enumerate(journal) if block_data.get("state_root")]
+        if checked:
+            last = checked[-1]
+            computed = self._trie_after(base, journal, last).get_root()
+            if computed != _expected_root(journal[last][0]):
+                # Roots are assumed to stay wrong once they diverge, so the first
+                # divergent block is the lowest checked one whose root mismatches.
+                lo, hi = -1, len(checked) - 1
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    index = checked[mid]
+                    if self._trie_after(base, journal, index).get_root() == _expected_root(journal[index][0]):
+                        lo = mid
+                    else:
+                        hi = mid
+                divergent = checked[hi]
+                self._rollback_to_checkpoint(base, journal, divergent)
+                return divergent, False
+
+        with self._session_factory() as session:
+            persistent_trie.store_trie(
+                session, self._chain_id, self._trie_after(base, journal, len(journal) - 1), replaces=base
+            )
+            session.commit()
+        if checked:
+            metrics_registry.increment("sync_checkpoints_verified_total")
+            metrics_registry.observe("sync_checkpoint_blocks", float(checked[-1] + 1))
+        return len(journal), complete
+
+    def _import_unverified_batch(self, blocks: list[dict[str, Any]]) -> tuple[int, bool]:
+        imported = 0
+        for block_data in blocks:
+            result = self.import_block(block_data, transactions=block_data.get("transactions"), skip_state_root_validation=True)
+            if not result.accepted:
+                self._logger.warning("Block import failed at height %s: %s", block_data.get("height"), result.reason)
+                return imported, False
+            imported += 1
+        return imported, True
+
+    @staticmethod
+    def _trie_after(
+        base: MerklePatriciaTrie, journal: list[tuple[dict[str, Any], dict[str, AccountState | None]]], index: int
+    ) -> MerklePatriciaTrie:
+        """The trie after ``journal[index]``, forked from ``base`` (which is left untouched)."""
+        merged: dict[str, AccountState | None] = {}
+        for _, changes in journal[: index + 1]:
+            merged.update(changes)
+        trie = MerklePatriciaTrie(base.root_node)
+        persistent_trie.apply_account_changes(trie, merged)
+        return trie
+
+    def _rollback_to_checkpoint(
+        self,
+        base: MerklePatriciaTrie,
+        journal: list[tuple[dict[str, Any], dict[str, AccountState | None]]],
+        divergent: int,
+    ) -> None:
+        """Undo ``journal[divergent:]``: restore the accounts it wrote and remove its blocks.
+
+        Only account state is restored; like `_resolve_fork`, rows in other tables
+        written by the removed blocks' transactions are left to a resync.
+        """
+        block_data = journal[divergent][0]
+        height = block_data.get("height", -1)
+        good = self._trie_after(base, journal, divergent - 1) if divergent > 0 else MerklePatriciaTrie(base.root_node)
+        computed = self._trie_after(base, journal, divergent).get_root()
+        touched: set[str] = set()
+        for _, changes in journal[divergent:]:
+            touched.update(changes)
+        with self._session_factory() as session:
+            for address in sorted(touched):
+                state = persistent_trie.account_state(good, address)
+                account = session.get(Account, (self._chain_id, address))
+                if state is None:
+                    if account is not None:
+                        session.delete(account)
+                    continue
+                if account is None:
+                    account = Account(chain_id=self._chain_id, address=address)
+                account.balance, account.nonce = state
+                session.add(account)
+            for old_block in session.exec(
+                select(Block).where(Block.chain_id == self._chain_id).where(Block.height >= height)
+            ).all():
+                for tx in session.exec(
+                    select(ChainTransaction)
+                    .where(ChainTransaction.chain_id == self._chain_id)
+                    .where(ChainTransaction.block_height == old_block.height)
+                ).all():
+                    session.delete(tx)
+                session.delete(old_block)
+            session.flush()
+            persistent_trie.store_trie(session, self._chain_id, good, replaces=base)
+            session.commit()
+        metrics_registry.increment("sync_state_root_rejected_total")
+        metrics_registry.increment("sync_checkpoint_mismatches_total")
+        self._track_rejection(self._chain_id)
+        logger.error(
+            "[SYNC] State root mismatch at height %s: expected %s, computed %s - rolled back %s blocks to last verified state",
+            height,
+            block_data.get("state_root"),
+            computed.hex(),
+            len(journal) - divergent,
+        )
+
+
+def _expected_root(block_data: dict[str, Any]) -> bytes | None:
+    try:
+        root = bytes.fromhex(str(block_data.get("state_root", "")).removeprefix("0x"))
+    except ValueError:
+        return None
+    return root if len(root) == 32 else None
@@ -95,9 +95,9 @@ class StateSyncMixin(SyncBase):
                     updated += 1
             session.commit()
 
-        # Verify state root matches now — full recompute (all accounts synced)
+        # Verify state root matches now (all accounts synced)
         with self._session_factory() as session:
-            computed_hex = state_root_utils.compute_state_root_full(session, self._chain_id)
+            computed_hex = state_root_utils.compute_state_root(session, self._chain_id, persist=False)
             if computed_hex is None:
                 computed_hex = "0x" + "\x00" * 32
 
@@ -214,7 +214,7 @@ class StateSyncMixin(SyncBase):
 
         # Verify state root
         with self._session_factory() as session:
-            computed_hex = state_root_utils.compute_state_root_full(session, self._chain_id)
+            computed_hex = state_root_utils.compute_state_root(session, self._chain_id, persist=False)
             if computed_hex is None:
                 computed_hex = "0x" + "\x00" * 32
 
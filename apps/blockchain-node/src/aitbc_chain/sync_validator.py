@@ -24,6 +24,15 @@ class ImportResult:
     diverged: bool = False
 
 
+@dataclass
+class BulkImportResult:
+    """Outcome of `BlockImportMixin.import_blocks`."""
+
+    imported: int
+    height: int  # height of the last block imported, -1 if none was
+    rejected: ImportResult | None = None  # the first block refused; later blocks were not tried
+
+
 class ProposerSignatureValidator:
     """Validates proposer signatures on imported blocks."""
 
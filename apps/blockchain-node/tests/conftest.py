@@ -210,7 +210,6 @@ async def _set_backend_and_capture(backend):
     _gossip_broker._app_loop = _captured_loop
     # Recreate locks inside the captured loop to avoid loop mismatch when tests publish cross-thread.
     _gossip_broker._lock = _aiocapture_module.Lock()
-    _gossip_broker._dedup_lock = _aiocapture_module.Lock()
     return await _original_set_backend(backend)
 
 
@@ -0,0 +1,119 @@
+"""The account cache must never serve a balance or nonce the database does not hold.
+
+Every case writes through one of the paths the node uses -- ORM flushes, the raw
+``UPDATE account`` statements of the state transition, rollbacks, another
+connection -- and checks that the next lookup agrees with a direct read.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine
+
+from aitbc_chain.account_cache import AccountCache
+from aitbc_chain.base_models import Account
+from aitbc_chain.metadata import chain_metadata
+from aitbc_chain.metrics import metrics_registry
+
+CHAIN = "test-chain"
+ALICE = "ait1" + "a" * 40
+BOB = "ait1" + "b" * 40
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'chain.db'}")
+    chain_metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Account(chain_id=CHAIN, address=ALICE, balance=1000, nonce=0))
+        session.add(Account(chain_id=CHAIN, address=BOB, balance=50, nonce=3))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def cache():
+    metrics_registry.reset()
+    return AccountCache(max_entries=100)
+
+
+def test_repeated_lookups_hit_memory_and_report_hit_ratio(engine, cache) -> None:
+    with Session(engine) as session:
+        assert cache.lookup(session, CHAIN, ALICE) == (1000, 0)
+        assert cache.lookup(session, CHAIN, ALICE) == (1000, 0)
+        assert cache.lookup(session, CHAIN, ALICE) == (1000, 0)
+        assert cache.lookup(session, CHAIN, "ait1" + "f" * 40) is None
+    assert metrics_registry._counters["account_cache_hits_total"] == 2
+    assert metrics_registry._counters["account_cache_misses_total"] == 2
+    assert metrics_registry._gauges["account_cache_hit_ratio"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = AccountCache(max_entries=1)
+    engine = create_engine("sqlite://")
+    chain_metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Account(chain_id=CHAIN, address=ALICE, balance=1, nonce=0))
+        session.add(Account(chain_id=CHAIN, address=BOB, balance=2, nonce=0))
+        session.commit()
+        cache.lookup(session, CHAIN, ALICE)
+        cache.lookup(session, CHAIN, BOB)
+        assert list(cache._entries) == [(CHAIN, BOB)]
+
+
+def test_raw_sql_update_is_invisible_until_commit_then_served_fresh(engine, cache) -> None:
+    with Session(engine) as reader:
+        assert cache.lookup(reader, CHAIN, ALICE) == (1000, 0)
+    with Session(engine) as writer:
+        cache.touch(writer, CHAIN, [ALICE])
+        writer.execute(
+            text("UPDATE account SET balance = balance - 10, nonce = nonce + 1 WHERE chain_id = :c AND address = :a"),
+            {"c": CHAIN, "a": ALICE},
+        )
+        # The writing session sees its own uncommitted write, and it is not cached.
+        assert cache.lookup(writer, CHAIN, ALICE) == (990, 1)
+        assert (CHAIN, ALICE) not in cache._entries
+        writer.commit()
+    with Session(engine) as reader:
+        assert cache.lookup(reader, CHAIN, ALICE) == (990, 1)
+
+
+def test_orm_write_then_rollback_drops_the_entry(engine, cache) -> None:
+    with Session(engine) as session:
+        cache.lookup(session, CHAIN, BOB)
+        account = session.get(Account, (CHAIN, BOB))
+        account.balance = 0
+        session.add(account)
+        session.flush()
+        assert (CHAIN, BOB) not in cache._entries
+        session.rollback()
+    with Session(engine) as session:
+        assert cache.lookup(session, CHAIN, BOB) == (50, 3)
+
+
+def test_refresh_writes_committed_state_through(engine, cache) -> None:
+    with Session(engine) as session:
+        session.execute(text("UPDATE account SET nonce = 4 WHERE address = :a"), {"a": BOB})
+        session.commit()
+        cache.refresh(session, CHAIN, [ALICE, BOB])
+    assert cache._entries[(CHAIN, BOB)] == (50, 4)
+    with Session(engine) as session:
+        assert cache.lookup(session, CHAIN, BOB) == (50, 4)
+    assert metrics_registry._counters["account_cache_hits_total"] == 1
+
+
+def test_commit_from_another_connection_clears_the_cache(engine, cache) -> None:
+    with Session(engine) as session:
+        assert cache.lookup(session, CHAIN, ALICE) == (1000, 0)
+        # Another process (here: a raw connection the cache knows nothing about) commits.
+        other = engine.raw_connection()
+        try:
+            other.cursor().execute("UPDATE account SET balance = 1 WHERE address = ?", (ALICE,))
+            other.commit()
+        finally:
+            other.close()
+        session.rollback()
+        assert cache.lookup(session, CHAIN, ALICE) == (1, 0)
+    assert metrics_registry._counters["account_cache_external_invalidations_total"] == 1
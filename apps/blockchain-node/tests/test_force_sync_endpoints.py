@@ -451,3 +451,190 @@ async def test_import_chain_preserves_other_chains_on_hash_conflict(isolated_eng
     # chain-a blocks must be untouched — a hash collision on another chain is
     # not a conflict under the (chain_id, hash) uniqueness model.
     assert [block.height for block in chain_a_blocks_after] == [0, 1]
+
+
+def _seed_streamed_chain(engine) -> None:
+    with Session(engine) as session:
+        for height in range(5):
+            session.add(
+                Block(
+                    chain_id="chain-a",
+                    height=height,
+                    hash=_hex(f"stream-block-{height}"),
+                    parent_hash=_hex(f"stream-block-{height - 1}") if height else "0x00",
+                    proposer="node-a",
+                    timestamp=datetime(2026, 1, 1, 0, 0, height),
+                    tx_count=1 if height < 4 else 0,
+                )
+            )
+        for index, address in enumerate(("alice", "bob", "carol")):
+            session.add(Account(chain_id="chain-a", address=address, balance=100 + index, nonce=index))
+        for height in range(4):
+            session.add(
+                Transaction(
+                    chain_id="chain-a",
+                    tx_hash=_hex(f"stream-tx-{height}"),
+                    block_height=height,
+                    sender="alice",
+                    recipient="bob",
+                    payload={"kind": "payment", "n": height},
+                    value=height + 1,
+                    fee=1,
+                    nonce=height,
+                    status="confirmed",
+                    timestamp=f"2026-01-01T00:00:0{height}",
+                )
+            )
+        session.add(Block(chain_id="chain-b", height=0, hash=_hex("other-chain"), parent_hash="0x00", proposer="node-b"))
+        session.commit()
+
+
+def _chain_snapshot(engine, chain_id: str = "chain-a"):
+    with Session(engine) as session:
+        blocks = session.exec(select(Block).where(Block.chain_id == chain_id).order_by(Block.height)).all()
+        accounts = session.exec(select(Account).where(Account.chain_id == chain_id).order_by(Account.address)).all()
+        txs = session.exec(select(Transaction).where(Transaction.chain_id == chain_id).order_by(Transaction.tx_hash)).all()
+        return (
+            [(b.height, b.hash, b.parent_hash, b.timestamp, b.tx_count) for b in blocks],
+            [(a.address, a.balance, a.nonce) for a in accounts],
+            [(t.id, t.tx_hash, t.block_height, t.sender, t.payload, t.value, t.timestamp, t.created_at) for t in txs],
+        )
+
+
+async def _export_chunks(mock_request, chain_id: str = "chain-a") -> list[bytes]:
+    response = await rpc_sync.export_chain_stream(mock_request, chain_id=chain_id)
+    return [chunk async for chunk in response.body_iterator]
+
+
+def _upload_request(body: bytes):
+    async def _stream():
+        for start in range(0, len(body), 100):
+            yield body[start : start + 100]
+
+    request = Mock()
+    request.stream = _stream
+    return request
+
+
+def _stream_auth(admin_signer, body: bytes, offset: int = 0) -> dict:
+    signed = admin_signer(
+        {"action": "import-chain-stream", "chain_id": "chain-a", "offset": offset, "sha256": hashlib.sha256(body).hexdigest()}
+    )
+    return {k: v for k, v in signed.items() if k != "action"}
+
+
+@pytest.mark.asyncio
+async def test_export_chain_stream_flushes_each_page_and_round_trips(isolated_engine, mock_request, admin_signer, monkeypatch):
+    import zlib
+
+    monkeypatch.setattr(settings, "chain_export_page_size", 2)
+    monkeypatch.setattr(settings, "chain_import_records_per_commit", 3)
+    _seed_streamed_chain(isolated_engine)
+    original = _chain_snapshot(isolated_engine)
+
+    chunks = await _export_chunks(mock_request)
+
+    # header, 3 block pages, 2 account pages, 2 transaction pages, end
+    assert len(chunks) == 9
+    decompressor = zlib.decompressobj(wbits=31)
+    text = ""
+    for chunk in chunks:
+        text += decompressor.decompress(chunk).decode()
+        assert text.endswith("\n")  # every chunk carries whole records
+    records = [json.loads(line) for line in text.splitlines()]
+    assert records[0]["type"] == "header" and records[0]["chain_id"] == "chain-a"
+    assert [r["type"] for r in records[1:-1]] == ["block"] * 5 + ["account"] * 3 + ["transaction"] * 4
+    assert records[-1] == {"type": "end", "block_count": 5, "account_count": 3, "transaction_count": 4}
+
+    with Session(isolated_engine) as session:
+        session.add(Block(chain_id="chain-a", height=9, hash=_hex("stale"), parent_hash="0x00", proposer="node-x"))
+        session.commit()
+    body = b"".join(chunks)
+    result = await rpc_sync.import_chain_stream(_upload_request(body), **_stream_auth(admin_signer, body))
+
+    assert (result["imported_blocks"], result["imported_accounts"], result["imported_transactions"]) == (5, 3, 4)
+    assert result["next_offset"] == 12
+    assert _chain_snapshot(isolated_engine) == original
+    assert _chain_snapshot(isolated_engine, "chain-b")[0][0][1] == _hex("other-chain")
+
+
+@pytest.mark.asyncio
+async def test_import_chain_stream_resumes_from_reported_offset(isolated_engine, mock_request, admin_signer, monkeypatch):
+    from fastapi import HTTPException
+
+    monkeypatch.setattr(settings, "chain_import_records_per_commit", 3)
+    _seed_streamed_chain(isolated_engine)
+    original = _chain_snapshot(isolated_engine)
+    body = b"".join(await _export_chunks(mock_request))
+
+    write = rpc_sync._write_stream_records
+    calls = []
+
+    def _fail_second_chunk(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        write(*args, **kwargs)
+
+    monkeypatch.setattr(rpc_sync, "_write_stream_records", _fail_second_chunk)
+    with pytest.raises(HTTPException) as exc_info:
+        await rpc_sync.import_chain_stream(_upload_request(body), **_stream_auth(admin_signer, body))
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail["next_offset"] == 3
+
+    monkeypatch.setattr(rpc_sync, "_write_stream_records", write)
+    result = await rpc_sync.import_chain_stream(_upload_request(body), **_stream_auth(admin_signer, body, offset=3))
+
+    assert (result["resumed_from"], result["next_offset"]) == (3, 12)
+    assert _chain_snapshot(isolated_engine) == original
+
+
+@pytest.mark.asyncio
+async def test_import_chain_stream_rejects_truncated_stream_without_touching_chain(
+    isolated_engine, mock_request, admin_signer, monkeypatch
+):
+    import gzip
+
+    from fastapi import HTTPException
+
+    monkeypatch.setattr(settings, "chain_import_records_per_commit", 3)
+    _seed_streamed_chain(isolated_engine)
+    original = _chain_snapshot(isolated_engine)
+    chunks = await _export_chunks(mock_request)
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines(keepends=True)
+    bad_account = json.loads(lines[-2])
+    del bad_account["sender"]
+
+    bodies = [
+        # Upload cut off mid-stream: the gzip member never ends.
+        b"".join(chunks[:-1]),
+        # A well-formed gzip file that lacks the end record.
+        gzip.compress("".join(lines[:-1]).encode()),
+        # Complete framing, but the last data record is invalid.
+        gzip.compress("".join([*lines[:-2], json.dumps(bad_account) + "\n", lines[-1]]).encode()),
+    ]
+    for body in bodies:
+        with pytest.raises(HTTPException) as exc_info:
+            await rpc_sync.import_chain_stream(_upload_request(body), **_stream_auth(admin_signer, body))
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail["next_offset"] == 0
+        assert _chain_snapshot(isolated_engine) == original
+
+
+@pytest.mark.asyncio
+async def test_import_chain_stream_rejects_body_that_was_not_signed(isolated_engine, mock_request, admin_signer):
+    from fastapi import HTTPException
+
+    _seed_streamed_chain(isolated_engine)
+    original = _chain_snapshot(isolated_engine)
+    body = b"".join(await _export_chunks(mock_request))
+    auth = _stream_auth(admin_signer, body)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await rpc_sync.import_chain_stream(_upload_request(body[:-10] + b"\0" * 10), **auth)
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        await rpc_sync.import_chain_stream(_upload_request(body), **{**auth, "offset": 1})
+    assert exc_info.value.status_code == 403
+    assert _chain_snapshot(isolated_engine) == original
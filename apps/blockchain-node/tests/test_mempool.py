@@ -6,9 +6,11 @@ import pytest
 from aitbc_chain.mempool import (
     DatabaseMempool,
     InMemoryMempool,
+    add_tx_listener,
     compute_tx_hash,
     get_mempool,
     init_mempool,
+    remove_tx_listener,
 )
 from aitbc_chain.metrics import metrics_registry
 
@@ -139,6 +141,28 @@ class TestInMemoryMempool:
         # All same fee
         assert all(t.fee == 10 for t in drained)
 
+    def test_oversized_tx_skipped_by_drain_stays_pending(self):
+        pool = InMemoryMempool()
+        big = pool.add({"sender": "big", "fee": 100, "nonce": 1, "payload": "x" * 200})
+        small = pool.add({"sender": "small", "fee": 1, "nonce": 2})
+        drained = pool.drain(max_count=10, max_bytes=100)
+        assert [t.tx_hash for t in drained] == [small]
+        assert [t.tx_hash for t in pool.list_transactions()] == [big]
+        # Still first in line once the byte budget allows it.
+        assert pool.drain(max_count=10, max_bytes=1_000_000)[0].tx_hash == big
+
+    def test_eviction_ignores_drained_and_removed_txs(self):
+        pool = InMemoryMempool(max_size=3)
+        low = pool.add({"sender": "a", "fee": 1, "nonce": 1})
+        pool.add({"sender": "b", "fee": 2, "nonce": 2})
+        pool.add({"sender": "c", "fee": 3, "nonce": 3})
+        assert pool.remove(low) is True
+        pool.add({"sender": "d", "fee": 4, "nonce": 4})
+        # Pool is full again; the next add must evict fee=2, not the removed fee=1 entry.
+        pool.add({"sender": "e", "fee": 5, "nonce": 5})
+        assert sorted(t.fee for t in pool.list_transactions()) == [3, 4, 5]
+        assert metrics_registry._gauges["mempool_size"] == 3.0
+
     def test_get_pending_same_fee_orders_by_tx_hash(self):
         """get_pending_transactions must also order same-fee txs by tx_hash."""
         pool = InMemoryMempool()
@@ -158,6 +182,76 @@ class TestInMemoryMempool:
         assert actual_hashes == expected_order
 
 
+class TestSenderNonceOrdering:
+    """Per-sender queues: nonce N always drains before N+1, future nonces park."""
+
+    @pytest.fixture(params=["memory", "database"])
+    def pool(self, request, tmp_path):
+        if request.param == "memory":
+            return InMemoryMempool()
+        return DatabaseMempool(f"sqlite:///{tmp_path / 'nonce.db'}")
+
+    def test_lower_nonce_drains_first_despite_lower_fee(self, pool):
+        n1 = pool.add({"from": "alice", "fee": 100, "nonce": 1})
+        n0 = pool.add({"from": "alice", "fee": 1, "nonce": 0})
+        other = pool.add({"from": "bob", "fee": 50, "nonce": 0})
+        drained = [t.tx_hash for t in pool.drain(max_count=10, max_bytes=1_000_000)]
+        assert drained.index(n0) < drained.index(n1)
+        assert set(drained) == {n0, n1, other}
+
+    def test_future_nonce_parked_until_executable(self, pool):
+        parked = pool.add({"from": "alice", "fee": 100, "nonce": 5})
+        ready = pool.add({"from": "bob", "fee": 1, "nonce": 0})
+        nonces = {"alice": 4, "bob": 0}
+        drained = pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: nonces)
+        assert [t.tx_hash for t in drained] == [ready]
+        assert pool.size() == 1
+
+        gap = pool.add({"from": "alice", "fee": 1, "nonce": 4})
+        drained = pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: nonces)
+        assert [t.tx_hash for t in drained] == [gap, parked]
+        assert pool.size() == 0
+
+    def test_used_nonce_dropped(self, pool):
+        pool.add({"from": "alice", "fee": 10, "nonce": 2})
+        current = pool.add({"from": "alice", "fee": 1, "nonce": 3})
+        drained = pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: {"alice": 3})
+        assert [t.tx_hash for t in drained] == [current]
+        assert pool.size() == 0
+        dropped = [v for k, v in metrics_registry._counters.items() if k.startswith("mempool_stale_nonce_dropped_total_")]
+        assert dropped == [1.0]
+
+    def test_parked_past_ttl_expired(self, pool, monkeypatch):
+        from aitbc_chain.config import settings
+
+        monkeypatch.setattr(settings, "mempool_parked_ttl_seconds", 60)
+        pool.add({"from": "alice", "fee": 100, "nonce": 5})
+        pool.add({"from": "alice", "fee": 100, "nonce": 6})
+        pool.add({"from": "bob", "fee": 1, "nonce": 3})
+        nonces = {"alice": 4, "bob": 2}
+        assert pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: nonces) == []
+        assert pool.size() == 3
+
+        later = time.time() + 120
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: nonces) == []
+        assert pool.size() == 0
+        expired = [v for k, v in metrics_registry._counters.items() if k.startswith("mempool_parked_expired_total_")]
+        assert expired == [3.0]
+
+    def test_unknown_sender_not_checked(self, pool):
+        tx_hash = pool.add({"from": "carol", "fee": 1, "nonce": 7})
+        drained = pool.drain(max_count=10, max_bytes=1_000_000, account_nonces=lambda senders: {})
+        assert [t.tx_hash for t in drained] == [tx_hash]
+
+    def test_max_count_cuts_sender_sequence(self, pool):
+        hashes = [pool.add({"from": "alice", "fee": 10, "nonce": n}) for n in range(3)]
+        first = pool.drain(max_count=2, max_bytes=1_000_000, account_nonces=lambda senders: {"alice": 0})
+        assert [t.tx_hash for t in first] == hashes[:2]
+        rest = pool.drain(max_count=2, max_bytes=1_000_000, account_nonces=lambda senders: {"alice": 2})
+        assert [t.tx_hash for t in rest] == hashes[2:]
+
+
 class TestDatabaseMempool:
     @pytest.fixture
     def db_pool(self, tmp_path):
@@ -251,6 +345,47 @@ class TestDatabaseMempool:
         assert len(txs) == 2
 
 
+class TestNewTransactionListeners:
+    """Listeners hear about each transaction once, when it first enters a mempool."""
+
+    @pytest.fixture
+    def heard(self):
+        heard: list[tuple[str, str]] = []
+
+        def listener(chain_id, tx_hash, tx):
+            heard.append((chain_id, tx_hash))
+
+        add_tx_listener(listener)
+        yield heard
+        remove_tx_listener(listener)
+
+    def test_in_memory_add_notifies_once(self, heard):
+        pool = InMemoryMempool()
+        tx = {"sender": "alice", "fee": 1}
+        tx_hash = pool.add(tx, chain_id="c")
+        pool.add(tx, chain_id="c")
+        assert heard == [("c", tx_hash)]
+        assert pool.get_transactions([tx_hash, "0xmissing"], chain_id="c") == [tx]
+
+    def test_database_batch_add_notifies_new_transactions_only(self, heard, tmp_path):
+        pool = DatabaseMempool(f"sqlite:///{tmp_path / 'listen.db'}")
+        first = pool.add({"sender": "alice", "fee": 1}, chain_id="c")
+        hashes = pool.batch_add([{"sender": "alice", "fee": 1}, {"sender": "bob", "fee": 2}], chain_id="c")
+        assert heard == [("c", first), ("c", hashes[1])]
+        assert pool.get_transactions([hashes[1]], chain_id="c") == [{"sender": "bob", "fee": 2}]
+
+    def test_failing_listener_does_not_fail_add(self):
+        def broken(chain_id, tx_hash, tx):
+            raise RuntimeError("boom")
+
+        add_tx_listener(broken)
+        try:
+            InMemoryMempool().add({"sender": "alice", "fee": 1}, chain_id="c")
+        finally:
+            remove_tx_listener(broken)
+        assert metrics_registry._counters["mempool_tx_listener_errors_total"] == 1
+
+
 class TestCircuitBreaker:
     def test_half_open_after_timeout(self):
         from aitbc_chain.consensus import CircuitBreaker
@@ -0,0 +1,81 @@
+"""Scaling benchmarks for the heap-indexed InMemoryMempool.
+
+Drain and add (including eviction once the pool is full) are O(log n) per
+transaction, so their latency should stay roughly flat as the pool grows
+from 1k to 100k pending transactions instead of growing with pool size.
+
+Marked as @pytest.mark.slow so they can be deselected from the default gate.
+Run with: pytest tests/test_mempool_benchmark.py -q -o addopts="" -m slow -s
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from aitbc_chain.mempool import InMemoryMempool
+
+pytestmark = pytest.mark.slow
+
+CHAIN_ID = "bench"
+POOL_SIZES = (1_000, 10_000, 100_000)
+DRAIN_COUNT = 500
+PROBE_COUNT = 500
+
+
+def _make_tx(i: int) -> dict:
+    return {
+        "from": f"ait1sender{i:06d}",
+        "to": f"ait1recipient{i:06d}",
+        "amount": 10,
+        "fee": (i * 7919) % 1000 + 1,
+        "nonce": i,
+        "type": "TRANSFER",
+        "payload": {},
+    }
+
+
+def _filled_pool(n: int) -> InMemoryMempool:
+    pool = InMemoryMempool(max_size=n, chain_id=CHAIN_ID)
+    for i in range(n):
+        pool.add(_make_tx(i), chain_id=CHAIN_ID)
+    return pool
+
+
+def _measure(n: int) -> tuple[float, float]:
+    """Return (add_us_per_tx at capacity, drain_ms for DRAIN_COUNT txs) for a pool of n txs."""
+    pool = _filled_pool(n)
+
+    # Every add at capacity goes through the eviction path.
+    t0 = time.perf_counter()
+    for i in range(n, n + PROBE_COUNT):
+        pool.add(_make_tx(i), chain_id=CHAIN_ID)
+    add_us = (time.perf_counter() - t0) / PROBE_COUNT * 1e6
+    assert pool.size(CHAIN_ID) == n
+
+    t0 = time.perf_counter()
+    drained = pool.drain(DRAIN_COUNT, 10_000_000, chain_id=CHAIN_ID)
+    drain_ms = (time.perf_counter() - t0) * 1000.0
+    assert len(drained) == DRAIN_COUNT
+    return add_us, drain_ms
+
+
+class TestMempoolScaling:
+    def test_add_and_drain_latency_scale_logarithmically(self):
+        results = {n: _measure(n) for n in POOL_SIZES}
+        for n, (add_us, drain_ms) in results.items():
+            print(f"mempool n={n:>7}: add+evict {add_us:8.2f} us/tx, drain({DRAIN_COUNT}) {drain_ms:8.2f} ms")
+
+        small_add, small_drain = results[POOL_SIZES[0]]
+        large_add, large_drain = results[POOL_SIZES[-1]]
+        # 100x more pending txs; a full sort or linear min() scan would scale
+        # these by 100x or more. Log-time heaps should stay well under that.
+        assert large_add <= small_add * 25, f"add latency grew {large_add / small_add:.1f}x from 1k to 100k"
+        assert large_drain <= small_drain * 25, f"drain latency grew {large_drain / small_drain:.1f}x from 1k to 100k"
+
+    def test_drain_order_matches_fee_priority_at_scale(self):
+        pool = _filled_pool(10_000)
+        expected = sorted(pool.list_transactions(CHAIN_ID), key=lambda t: (-t.fee, t.tx_hash))[:DRAIN_COUNT]
+        drained = pool.drain(DRAIN_COUNT, 10_000_000, chain_id=CHAIN_ID)
+        assert [t.tx_hash for t in drained] == [t.tx_hash for t in expected]
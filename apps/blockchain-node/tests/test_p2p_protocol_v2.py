@@ -2,7 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from unittest.mock import patch
 
+import pytest
+
+from aitbc_chain.mempool import add_tx_listener, compute_tx_hash, remove_tx_listener
+from aitbc_chain.network.framing import (
+    FLAG_JSON,
+    FLAG_ZLIB,
+    FRAME_HEADER,
+    FrameError,
+    encode_frame,
+    framing_available,
+    read_frame,
+)
 from aitbc_chain.p2p_network import P2PNetworkService
 
 
@@ -17,8 +32,10 @@ class TestP2PProtocolVersioning:
             node_id="node1",
             chain_id="test-chain",
         )
-        assert service._protocol_version == 2  # settings.gossip_protocol_version
-        assert service.get_protocol_version() == 2
+        # settings.gossip_protocol_version, capped at v2 when msgpack is missing
+        expected = 3 if framing_available() else 2
+        assert service._protocol_version == expected
+        assert service.get_protocol_version() == expected
 
     def test_legacy_peers_set_is_empty_initially(self):
         """No legacy peers tracked initially."""
@@ -59,3 +76,326 @@ class TestP2PProtocolVersioning:
 
 class TestGossipTopicNamespacing:
     """Test gossip topic namespacing for v0.6.3 compatibility (B9)."""
+
+
+class _RecordingWriter:
+    """Stands in for an asyncio.StreamWriter and decodes what the service sends."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.messages: list[dict] = []
+        self.stalled = stalled
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        from aitbc_chain.network.compression import decode_payload
+
+        self.messages.append(decode_payload(data.decode().strip()))
+
+    async def drain(self) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestTransactionInventoryGossip:
+    """New transactions travel as hash inventories; peers fetch only what they lack."""
+
+    @staticmethod
+    def _service() -> P2PNetworkService:
+        return P2PNetworkService(host="127.0.0.1", port=7070, node_id="node1", chain_id="test-chain")
+
+    @staticmethod
+    def _tx(nonce: int) -> dict:
+        return {"from": "ait1sender", "to": "ait1recipient", "amount": 1, "fee": 1, "nonce": nonce, "chain_id": "test-chain"}
+
+    def test_seen_set_is_bounded_and_expires(self, monkeypatch):
+        from aitbc_chain import p2p_network
+
+        seen = p2p_network.RecentKeys(max_size=3, ttl=60.0)
+        assert all(seen.add(key) for key in "abcd")
+        assert not seen.add("d")
+        assert len(seen) == 3 and "a" not in seen
+
+        now = time.monotonic()
+        monkeypatch.setattr(p2p_network.time, "monotonic", lambda: now + 61.0)
+        assert "d" not in seen
+        assert len(seen) == 0
+
+    def test_announcement_sends_hashes_to_v2_peers_and_full_txs_to_legacy_peers(self):
+        service = self._service()
+        v2_peer, legacy_peer = _RecordingWriter(), _RecordingWriter()
+        service.active_connections = {"v2": v2_peer, "legacy": legacy_peer}
+        service._legacy_peers.add("legacy")
+        batch = [("test-chain", compute_tx_hash(tx), tx) for tx in (self._tx(0), self._tx(1))]
+
+        asyncio.run(service._announce_transactions(batch))
+
+        assert v2_peer.messages == [{"type": "tx_inv", "chain_id": "test-chain", "hashes": [h for _, h, _ in batch]}]
+        assert [m["tx"] for m in legacy_peer.messages] == [self._tx(0), self._tx(1)]
+        assert ("test-chain", batch[0][1]) in service.seen_txs
+
+    def test_inventory_requests_only_unseen_hashes_once(self):
+        service = self._service()
+        service.seen_txs.add(("test-chain", "0xknown"))
+        peer, other_peer = _RecordingWriter(), _RecordingWriter()
+        inv = {"type": "tx_inv", "chain_id": "test-chain", "hashes": ["0xknown", "0xnew"]}
+
+        asyncio.run(service._handle_tx_inv(peer, inv))
+        asyncio.run(service._handle_tx_inv(other_peer, inv))
+
+        assert peer.messages == [{"type": "get_txs", "chain_id": "test-chain", "hashes": ["0xnew"]}]
+        assert other_peer.messages == []
+
+    def test_undelivered_request_retried_from_another_announcer(self, monkeypatch):
+        from aitbc_chain import p2p_network
+
+        service = self._service()
+        peer, other_peer, gone_peer = _RecordingWriter(), _RecordingWriter(), _RecordingWriter()
+        service.active_connections = {"peer": peer, "other": other_peer}
+        inv = {"type": "tx_inv", "chain_id": "test-chain", "hashes": ["0xnew"]}
+        for writer in (peer, gone_peer, other_peer):
+            asyncio.run(service._handle_tx_inv(writer, inv))
+
+        assert ("test-chain", "0xnew") not in service.seen_txs
+        asyncio.run(service._retry_tx_requests())
+        assert other_peer.messages == []
+
+        now = time.monotonic()
+        monkeypatch.setattr(p2p_network.time, "monotonic", lambda: now + 60.0)
+        asyncio.run(service._retry_tx_requests())
+        assert other_peer.messages == [{"type": "get_txs", "chain_id": "test-chain", "hashes": ["0xnew"]}]
+        assert gone_peer.messages == []
+
+    def test_delivered_body_marks_hash_seen(self):
+        from aitbc_chain.mempool import InMemoryMempool
+
+        service = self._service()
+        tx = self._tx(0)
+        key = ("test-chain", compute_tx_hash(tx))
+        asyncio.run(service._handle_tx_inv(_RecordingWriter(), {"chain_id": "test-chain", "hashes": [key[1]]}))
+        assert key in service.requested_txs
+
+        with patch("aitbc_chain.mempool.get_mempool", return_value=InMemoryMempool()):
+            service._accept_peer_transaction(tx, "test-chain")
+        assert key in service.seen_txs
+        assert key not in service.requested_txs
+
+    def test_fetch_round_trip_adds_to_mempool_and_queues_announcement(self):
+        from aitbc_chain.mempool import InMemoryMempool
+
+        sender, receiver = self._service(), self._service()
+        sender_pool, receiver_pool = InMemoryMempool(), InMemoryMempool()
+        tx = self._tx(0)
+        tx_hash = sender_pool.add(tx, chain_id="test-chain")
+
+        async def scenario() -> None:
+            receiver._loop = asyncio.get_running_loop()
+            add_tx_listener(receiver._on_mempool_tx)
+            try:
+                reply = _RecordingWriter()
+                with patch("aitbc_chain.mempool.get_mempool", return_value=sender_pool):
+                    await sender._handle_get_txs(reply, {"chain_id": "test-chain", "hashes": [tx_hash, "0xgone"]})
+                assert reply.messages == [{"type": "txs", "chain_id": "test-chain", "txs": [tx]}]
+                with patch("aitbc_chain.mempool.get_mempool", return_value=receiver_pool):
+                    receiver._accept_peer_transaction(reply.messages[0]["txs"][0], "test-chain")
+                await asyncio.sleep(0)
+            finally:
+                remove_tx_listener(receiver._on_mempool_tx)
+
+        asyncio.run(scenario())
+        assert receiver_pool.get_transactions([tx_hash], chain_id="test-chain") == [tx]
+        assert receiver._tx_announcements.get_nowait()[:2] == ("test-chain", tx_hash)
+
+
+def _handshake(node_id: str, protocol_version: int) -> dict:
+    return {
+        "type": "handshake",
+        "node_id": node_id,
+        "listen_port": 7071,
+        "chain_id": "test-chain",
+        "protocol_version": protocol_version,
+    }
+
+
+async def _exchange(service: P2PNetworkService, protocol_version: int, framed: bool) -> tuple[dict, dict]:
+    """Handshake with ``service`` as a peer of ``protocol_version``, then ping it; return (reply, pong)."""
+    from aitbc_chain.network.compression import decode_payload, encode_payload
+
+    server = await asyncio.start_server(service._handle_inbound_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(encode_payload(_handshake("peer", protocol_version)).encode() + b"\n")
+        reply = decode_payload((await reader.readline()).decode().strip())
+        ping = {"type": "ping", "node_id": "peer"}
+        writer.write(encode_frame(ping) if framed else encode_payload(ping).encode() + b"\n")
+        if framed:
+            pong = await asyncio.wait_for(read_frame(reader, 1 << 20), timeout=5)
+        else:
+            pong = decode_payload((await asyncio.wait_for(reader.readline(), timeout=5)).decode().strip())
+        return reply, pong
+    finally:
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+
+async def _read_frame_bytes(data: bytes, max_size: int = 1 << 20):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await read_frame(reader, max_size)
+
+
+class TestBinaryFraming:
+    """v3 peers switch to length-prefixed binary frames after the handshake; older peers keep lines."""
+
+    @staticmethod
+    def _service() -> P2PNetworkService:
+        return P2PNetworkService(host="127.0.0.1", port=7070, node_id="node1", chain_id="test-chain")
+
+    def test_v2_peer_stays_on_newline_messages(self):
+        service = self._service()
+        reply, pong = asyncio.run(_exchange(service, protocol_version=2, framed=False))
+        assert reply["type"] == "handshake" and reply["node_id"] == "node1"
+        assert pong == {"type": "pong", "node_id": "node1"}
+        assert not service._framed_writers
+
+    @pytest.mark.skipif(not framing_available(), reason="msgpack not installed")
+    def test_v3_peer_switches_to_frames_after_the_handshake_line(self):
+        reply, pong = asyncio.run(_exchange(self._service(), protocol_version=3, framed=True))
+        assert reply["protocol_version"] == 3
+        assert pong == {"type": "pong", "node_id": "node1"}
+
+    @pytest.mark.skipif(not framing_available(), reason="msgpack not installed")
+    def test_frame_round_trip_compresses_large_bodies_only(self):
+        small = {"type": "ping", "node_id": "node1"}
+        block = {"type": "block", "transactions": [{"from": "ait1sender", "nonce": n, "payload": "x" * 64} for n in range(50)]}
+
+        for message in (small, block):
+            frame = encode_frame(message, compress_threshold=1024)
+            assert asyncio.run(_read_frame_bytes(frame)) == message
+        assert FRAME_HEADER.unpack(encode_frame(small, 1024)[: FRAME_HEADER.size])[1] == 0
+        assert FRAME_HEADER.unpack(encode_frame(block, 1024)[: FRAME_HEADER.size])[1] == FLAG_ZLIB
+        assert FRAME_HEADER.unpack(encode_frame(block, None)[: FRAME_HEADER.size])[1] == 0
+
+    @pytest.mark.skipif(not framing_available(), reason="msgpack not installed")
+    def test_integers_beyond_64_bits_fall_back_to_json_bodies(self):
+        message = {"type": "txs", "amount": 2**80}
+        frame = encode_frame(message)
+        assert FRAME_HEADER.unpack(frame[: FRAME_HEADER.size])[1] == FLAG_JSON
+        assert asyncio.run(_read_frame_bytes(frame)) == message
+
+    def test_oversized_frame_is_rejected_before_reading_the_body(self):
+        with pytest.raises(FrameError):
+            asyncio.run(_read_frame_bytes(FRAME_HEADER.pack(1 << 30, 0)))
+
+
+class TestPeerOutboxes:
+    """Each peer drains its own queue: slow peers are isolated and blocks go first."""
+
+    @staticmethod
+    def _service() -> P2PNetworkService:
+        return P2PNetworkService(host="127.0.0.1", port=7070, node_id="node1", chain_id="test-chain")
+
+    def test_stalled_peer_does_not_delay_others_and_is_disconnected(self, monkeypatch):
+        from aitbc_chain.metrics import metrics_registry
+        from aitbc_chain.p2p_network import settings
+
+        monkeypatch.setattr(settings, "p2p_peer_send_timeout", 0.05)
+        metrics_registry.reset()
+        service = self._service()
+        fast, slow = _RecordingWriter(), _RecordingWriter(stalled=True)
+
+        async def scenario() -> None:
+            for peer_id, writer in (("fast", fast), ("slow", slow)):
+                service.active_connections[peer_id] = writer
+                service._open_outbox(peer_id, writer)
+            await service.broadcast_to_peers({"type": "block", "height": 7})
+            await asyncio.wait_for(service._outboxes[fast].join(), timeout=1)
+            assert fast.messages == [{"type": "block", "height": 7}]
+            await asyncio.sleep(0.2)
+
+        asyncio.run(scenario())
+        assert slow.closed and not fast.closed
+        assert metrics_registry._counters["p2p_peer_send_timeouts_total"] == 1
+        assert metrics_registry._counters["p2p_slow_peers_disconnected_total"] == 1
+
+    def test_blocks_overtake_queued_transactions(self):
+        service = self._service()
+        writer = _RecordingWriter()
+
+        async def scenario() -> None:
+            service._open_outbox("peer", writer)
+            for n in range(3):
+                await service._send_message(writer, {"type": "tx_inv", "chain_id": "test-chain", "hashes": [f"0x{n}"]})
+            await service._send_message(writer, {"type": "ping", "node_id": "node1"})
+            await service._send_message(writer, {"type": "block", "height": 1})
+            await service._outboxes[writer].join()
+
+        asyncio.run(scenario())
+        assert [m["type"] for m in writer.messages] == ["block", "tx_inv", "tx_inv", "tx_inv", "ping"]
+        assert [m["hashes"] for m in writer.messages[1:4]] == [["0x0"], ["0x1"], ["0x2"]]
+
+    def test_overflowing_queue_disconnects_the_peer(self, monkeypatch):
+        from aitbc_chain.p2p_network import settings
+
+        monkeypatch.setattr(settings, "p2p_peer_send_queue_max", 2)
+        service = self._service()
+        writer = _RecordingWriter()
+
+        async def scenario() -> None:
+            service._open_outbox("peer", writer)
+            outbox = service._outboxes[writer]
+            assert outbox.enqueue(b"{}\n", 3) and outbox.enqueue(b"{}\n", 3)
+            assert not outbox.enqueue(b"{}\n", 3)
+            assert len(outbox) == 0
+
+        asyncio.run(scenario())
+        assert writer.closed
+
+    def test_broadcast_encodes_once_per_wire_format(self):
+        service = self._service()
+        writers = [_RecordingWriter() for _ in range(3)]
+        calls = []
+        encode = service._encode_message
+
+        def counting_encode(writer, message):
+            calls.append(message["type"])
+            return encode(writer, message)
+
+        async def scenario() -> None:
+            for n, writer in enumerate(writers):
+                service.active_connections[f"peer{n}"] = writer
+                service._open_outbox(f"peer{n}", writer)
+            with patch.object(service, "_encode_message", counting_encode):
+                await service.broadcast_to_peers({"type": "block", "height": 1})
+            for writer in writers:
+                await service._outboxes[writer].join()
+
+        asyncio.run(scenario())
+        assert calls == ["block"]
+        assert all(writer.messages == [{"type": "block", "height": 1}] for writer in writers)
+
+    def test_peer_metric_series_removed_when_outbox_closes(self):
+        from prometheus_client import REGISTRY
+
+        service = self._service()
+        writer = _RecordingWriter()
+
+        def depth() -> float | None:
+            return REGISTRY.get_sample_value("p2p_peer_queue_depth", {"peer": "metrics-peer"})
+
+        async def scenario() -> None:
+            service._open_outbox("metrics-peer", writer)
+            await service._send_message(writer, {"type": "block", "height": 1})
+            await service._outboxes[writer].join()
+            assert depth() == 0.0
+            assert REGISTRY.get_sample_value("p2p_peer_send_latency_seconds_count", {"peer": "metrics-peer"}) == 1.0
+            service._outboxes.pop(writer).close()
+
+        asyncio.run(scenario())
+        assert depth() is None
+        assert REGISTRY.get_sample_value("p2p_peer_send_latency_seconds_count", {"peer": "metrics-peer"}) is None
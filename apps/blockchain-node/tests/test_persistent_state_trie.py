@@ -0,0 +1,228 @@
+"""The persistent state trie must always agree with a full recompute.
+
+`persistent_trie.compute_state_root` starts from the root committed with the previous
+block and applies only the accounts written since, as recorded by triggers on `account`.
+A root that differs from `StateManager.compute_state_root` over every account would
+fork the chain, so every case here compares the two.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine, select
+
+from aitbc_chain.base_models import Account
+from aitbc_chain.metadata import chain_metadata
+from aitbc_chain.metrics import metrics_registry
+from aitbc_chain.state import persistent_trie
+from aitbc_chain.state.merkle_patricia_trie import StateManager
+from aitbc_chain.state.persistent_trie import StateTrieDirty, StateTrieRoot
+
+CHAIN = "test-chain"
+
+
+def _address(index: int) -> str:
+    return f"ait1{index:040x}"
+
+
+def _full_root(session: Session, chain_id: str = CHAIN) -> bytes:
+    accounts = session.exec(select(Account).where(Account.chain_id == chain_id)).all()
+    return StateManager().compute_state_root({acc.address: acc for acc in accounts})
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'chain.db'}")
+    chain_metadata.create_all(engine)
+    persistent_trie.clear_cache()
+    yield engine
+    persistent_trie.clear_cache()
+    engine.dispose()
+
+
+def _seed(engine, count: int) -> bytes:
+    with Session(engine) as session:
+        for index in range(count):
+            session.add(Account(chain_id=CHAIN, address=_address(index), balance=index * 10, nonce=0))
+        root = persistent_trie.compute_state_root(session, CHAIN)
+        session.commit()
+    return root
+
+
+def test_first_root_matches_full_recompute_and_clears_dirty_set(engine) -> None:
+    root = _seed(engine, 50)
+    with Session(engine) as session:
+        assert root == _full_root(session)
+        assert session.get(StateTrieRoot, CHAIN).root_hash == root.hex()
+        assert session.exec(select(StateTrieDirty)).all() == []
+
+
+def test_orm_and_raw_sql_updates_are_both_tracked(engine) -> None:
+    _seed(engine, 50)
+    with Session(engine) as session:
+        account = session.get(Account, (CHAIN, _address(3)))
+        account.balance += 7
+        session.add(account)
+        # The state transition debits and credits with raw SQL, bypassing the ORM.
+        session.execute(
+            text("UPDATE account SET nonce = nonce + 1 WHERE chain_id = :chain AND address = :address"),
+            {"chain": CHAIN, "address": _address(9)},
+        )
+        session.add(Account(chain_id=CHAIN, address=_address(500), balance=1, nonce=0))
+        session.delete(session.get(Account, (CHAIN, _address(20))))
+        root = persistent_trie.compute_state_root(session, CHAIN)
+        assert root == _full_root(session)
+        session.commit()
+
+
+def test_successive_blocks_stay_in_step_with_full_recompute(engine) -> None:
+    _seed(engine, 30)
+    for block in range(10):
+        with Session(engine) as session:
+            for index in range(block, 30, 7):
+                account = session.get(Account, (CHAIN, _address(index)))
+                account.balance += block + 1
+                account.nonce += 1
+                session.add(account)
+            root = persistent_trie.compute_state_root(session, CHAIN)
+            assert root == _full_root(session)
+            session.commit()
+
+
+def _node_count(engine) -> int:
+    with Session(engine) as session:
+        return session.execute(text("SELECT COUNT(*) FROM state_trie_node")).scalar_one()
+
+
+def test_superseded_nodes_are_pruned(engine, tmp_path) -> None:
+    _seed(engine, 30)
+    for block in range(20):
+        with Session(engine) as session:
+            for index in range(block % 5, 30, 4):
+                account = session.get(Account, (CHAIN, _address(index)))
+                account.balance += block + 1
+                session.add(account)
+            persistent_trie.compute_state_root(session, CHAIN)
+            session.commit()
+
+    # A database seeded directly with the final accounts holds exactly the nodes
+    # its root reaches; twenty blocks of history must not leave any more than that.
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    chain_metadata.create_all(fresh)
+    with Session(engine) as session, Session(fresh) as fresh_session:
+        for account in session.exec(select(Account)).all():
+            fresh_session.add(Account(chain_id=CHAIN, address=account.address, balance=account.balance, nonce=account.nonce))
+        persistent_trie.compute_state_root(fresh_session, CHAIN)
+        fresh_session.commit()
+    assert _node_count(engine) == _node_count(fresh)
+    fresh.dispose()
+
+    persistent_trie.clear_cache()
+    before = metrics_registry._counters.get("state_trie_full_rebuilds_total", 0.0)
+    with Session(engine) as session:
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+    assert metrics_registry._counters.get("state_trie_full_rebuilds_total", 0.0) == before
+
+
+def test_full_rebuild_sweeps_unreachable_nodes(engine) -> None:
+    _seed(engine, 10)
+    seeded = _node_count(engine)
+    with Session(engine) as session:
+        session.execute(
+            text("INSERT INTO state_trie_node (chain_id, node_hash, encoded) VALUES (:chain, :hash, :encoded)"),
+            {"chain": CHAIN, "hash": "ab" * 32, "encoded": b"L"},
+        )
+        persistent_trie.withdraw_root(session, CHAIN)
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+        session.commit()
+    assert _node_count(engine) == seeded
+
+
+def test_rollback_discards_trie_update(engine) -> None:
+    committed = _seed(engine, 20)
+    with Session(engine) as session:
+        account = session.get(Account, (CHAIN, _address(1)))
+        account.balance = 999
+        session.add(account)
+        assert persistent_trie.compute_state_root(session, CHAIN) != committed
+        session.rollback()
+
+    with Session(engine) as session:
+        assert session.get(StateTrieRoot, CHAIN).root_hash == committed.hex()
+        assert persistent_trie.compute_state_root(session, CHAIN) == committed == _full_root(session)
+
+
+def test_read_only_computation_leaves_baseline_untouched(engine) -> None:
+    committed = _seed(engine, 20)
+    with Session(engine) as session:
+        account = session.get(Account, (CHAIN, _address(2)))
+        account.nonce = 5
+        session.add(account)
+        session.commit()
+
+    with Session(engine) as session:
+        root = persistent_trie.compute_state_root(session, CHAIN, persist=False)
+        assert root == _full_root(session)
+        assert session.get(StateTrieRoot, CHAIN).root_hash == committed.hex()
+        assert len(session.exec(select(StateTrieDirty)).all()) == 1
+
+
+def test_warm_start_loads_committed_trie_from_disk(engine) -> None:
+    _seed(engine, 40)
+    persistent_trie.clear_cache()  # as after a restart
+
+    before = metrics_registry._counters.get("state_trie_full_rebuilds_total", 0.0)
+    with Session(engine) as session:
+        account = session.get(Account, (CHAIN, _address(4)))
+        account.balance = 1
+        session.add(account)
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+    assert metrics_registry._counters.get("state_trie_full_rebuilds_total", 0.0) == before
+
+
+def test_missing_nodes_fall_back_to_full_rebuild(engine) -> None:
+    _seed(engine, 10)
+    persistent_trie.clear_cache()
+    with Session(engine) as session:
+        session.execute(text("DELETE FROM state_trie_node"))
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+
+
+def test_chains_are_tracked_independently(engine) -> None:
+    with Session(engine) as session:
+        for index in range(10):
+            session.add(Account(chain_id=CHAIN, address=_address(index), balance=index, nonce=0))
+            session.add(Account(chain_id="chain-b", address=_address(index), balance=index * 2, nonce=1))
+        persistent_trie.compute_state_root(session, CHAIN)
+        persistent_trie.compute_state_root(session, "chain-b")
+        session.commit()
+
+    with Session(engine) as session:
+        account = session.get(Account, ("chain-b", _address(0)))
+        account.balance = 77
+        session.add(account)
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session, CHAIN)
+        assert persistent_trie.compute_state_root(session, "chain-b") == _full_root(session, "chain-b")
+
+
+def test_triggers_are_added_to_an_existing_account_table(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    chain_metadata.create_all(engine)
+    with engine.begin() as conn:
+        for name in ("trg_account_trie_insert", "trg_account_trie_update", "trg_account_trie_delete"):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+    with Session(engine) as session:
+        session.add(Account(chain_id=CHAIN, address=_address(1), balance=5, nonce=0))
+        # Without triggers the dirty set cannot be trusted, so this is a full recompute.
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+        assert session.get(StateTrieRoot, CHAIN) is None
+        session.commit()
+
+    with engine.begin() as conn:
+        persistent_trie.ensure_state_trie_triggers(conn)
+    with Session(engine) as session:
+        session.add(Account(chain_id=CHAIN, address=_address(2), balance=6, nonce=0))
+        assert persistent_trie.compute_state_root(session, CHAIN) == _full_root(session)
+        assert session.get(StateTrieRoot, CHAIN) is not None
+    engine.dispose()
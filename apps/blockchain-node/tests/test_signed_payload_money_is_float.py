@@ -154,7 +154,8 @@ def test_the_signed_message_is_still_canonical_json():
     `{"payment": 0.5}` with a space signs different bytes from one that emits
     `{"payment":0.5}`.
     """
-    source = inspect.getsource(verify_transaction_signature)
+    assert "transaction_message_hash(tx_data)" in inspect.getsource(verify_transaction_signature)
+    source = inspect.getsource(rpc_utils.transaction_message_hash)
 
     assert "sort_keys=True" in source
     assert 'separators=(",", ":")' in source
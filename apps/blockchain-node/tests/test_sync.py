@@ -1,17 +1,19 @@
 """Tests for chain synchronization, conflict resolution, and signature validation."""
 
 import hashlib
+import json
 from contextlib import contextmanager
 from datetime import UTC, datetime
 
 import pytest
 from aitbc_chain.metrics import metrics_registry
-from aitbc_chain.models import Block, Transaction
+from aitbc_chain.models import Account, Block, Transaction
 from aitbc_chain.sync import ChainSync, ProposerSignatureValidator
 from aitbc_chain.sync import settings as sync_settings
 from sqlmodel import Session, create_engine, select
 
 from aitbc_chain.metadata import chain_metadata
+from aitbc_chain.state.persistent_trie import StateTrieRoot
 
 
 @pytest.fixture(autouse=True)
@@ -401,6 +403,283 @@ class TestChainSyncBulkImport:
             assert stored_block is None
 
 
+class TestCheckpointedBulkImport:
+    """Bulk batches verified once at the boundary, bisected on mismatch."""
+
+    @staticmethod
+    def _credit(height):
+        return f"ait1{height:040x}", height * 100
+
+    def _blocks(self, parent, count, diverge_at=None, unrooted=()):
+        """Blocks 1..count; each credits one new account. From ``diverge_at`` the peer's roots disagree."""
+        from aitbc_chain.state.merkle_patricia_trie import StateManager
+
+        class _Acct:
+            def __init__(self, balance):
+                self.balance, self.nonce = balance, 0
+
+        peer_state = {}
+        blocks = []
+        for h in range(1, count + 1):
+            address, amount = self._credit(h)
+            peer_state[address] = _Acct(amount + (1 if diverge_at is not None and h >= diverge_at else 0))
+            ts = datetime(2026, 1, 1, 0, 0, h)
+            bh = _make_block_hash("test", h, parent["hash"], ts)
+            block = {"height": h, "hash": bh, "parent_hash": parent["hash"], "proposer": "node-a", "timestamp": ts.isoformat()}
+            if h not in unrooted:
+                block["state_root"] = "0x" + StateManager().compute_state_root(dict(peer_state)).hex()
+            blocks.append(block)
+            parent = block
+        return blocks
+
+    def _sync(self, session_factory):
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        import_block = sync.import_block
+
+        def import_and_credit(block_data, **kwargs):
+            # Stands in for a block's transactions: each block writes one account.
+            result = import_block(block_data, **kwargs)
+            if result.accepted:
+                address, amount = self._credit(block_data["height"])
+                with session_factory() as session:
+                    session.add(Account(chain_id="test", address=address, balance=amount, nonce=0))
+                    session.commit()
+            return result
+
+        sync.import_block = import_and_credit
+        return sync
+
+    @staticmethod
+    def _full_root(session_factory):
+        from aitbc_chain.state.merkle_patricia_trie import StateManager
+
+        with session_factory() as session:
+            accounts = session.exec(select(Account).where(Account.chain_id == "test")).all()
+            return StateManager().compute_state_root({acc.address: acc for acc in accounts}).hex()
+
+    def test_matching_batch_is_verified_and_stored(self, session_factory):
+        sync = self._sync(session_factory)
+        genesis = _seed_chain(session_factory, count=1, chain_id="test")[-1]
+        blocks = self._blocks(genesis, 6, unrooted={2, 6})
+
+        assert sync._import_checkpointed_batch(blocks) == (6, True)
+        with session_factory() as session:
+            assert session.get(StateTrieRoot, "test").root_hash == self._full_root(session_factory)
+        assert metrics_registry._counters["sync_checkpoints_verified_total"] == 1
+
+    def test_mismatch_bisects_to_first_divergent_block_and_rolls_back(self, session_factory):
+        sync = self._sync(session_factory)
+        genesis = _seed_chain(session_factory, count=1, chain_id="test")[-1]
+        blocks = self._blocks(genesis, 8, diverge_at=4, unrooted={3})
+
+        assert sync._import_checkpointed_batch(blocks) == (3, False)
+        with session_factory() as session:
+            heights = session.exec(select(Block.height).where(Block.chain_id == "test")).all()
+            assert sorted(heights) == [0, 1, 2, 3]
+            addresses = session.exec(select(Account.address).where(Account.chain_id == "test")).all()
+            assert sorted(addresses) == sorted(self._credit(h)[0] for h in (1, 2, 3))
+            assert session.get(StateTrieRoot, "test").root_hash == self._full_root(session_factory)
+        assert metrics_registry._counters["sync_checkpoint_mismatches_total"] == 1
+
+        # The node resumes from its last verified block.
+        assert sync._import_checkpointed_batch(self._blocks(genesis, 8)[3:]) == (5, True)
+
+
+class _BlocksRangeClient:
+    """Serves /rpc/blocks-range from per-peer block lists and records each request."""
+
+    def __init__(self, chains):
+        self._chains = chains  # peer url -> list of block dicts indexed by height
+        self.requests = []
+
+    async def get(self, url, params=None, **kwargs):
+        peer = url.removesuffix("/rpc/blocks-range")
+        self.requests.append((peer, params["start"], params["end"]))
+        blocks = [b for b in self._chains[peer] if params["start"] <= b["height"] <= params["end"]]
+
+        class _Response:
+            content = json.dumps(blocks).encode()
+
+            def raise_for_status(self):
+                return None
+
+        return _Response()
+
+    async def aclose(self):
+        return None
+
+
+def _remote_chain(count, marker="a"):
+    blocks, parent = [], "0x00"
+    for h in range(count):
+        ts = datetime(2026, 1, 1, 0, h // 60, h % 60)
+        bh = _make_block_hash(f"test-{marker}", h, parent, ts)
+        blocks.append({"height": h, "hash": bh, "parent_hash": parent, "proposer": "node-a", "timestamp": ts.isoformat()})
+        parent = bh
+    return blocks
+
+
+class TestPipelinedBulkImport:
+    async def test_imports_every_batch_and_reports_stage_throughput(self, session_factory):
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        sync._client = _BlocksRangeClient({"http://peer-a": _remote_chain(25)})
+
+        assert await sync._sequential_bulk_import(0, 24, "http://peer-a", 10, 0) == 25
+        assert [r[1:] for r in sync._client.requests] == [(0, 9), (10, 19), (20, 24)]
+        with session_factory() as session:
+            assert len(session.exec(select(Block).where(Block.chain_id == "test")).all()) == 25
+        for stage in ("fetch", "decode", "import"):
+            assert metrics_registry._counters[f"sync_pipeline_{stage}_blocks_total"] == 25
+            assert f"sync_pipeline_{stage}_blocks_per_second" in metrics_registry._gauges
+
+    async def test_stops_at_first_rejected_block(self, session_factory):
+        chain = _remote_chain(12)
+        chain[7]["parent_hash"] = "0xunknown"
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        sync._client = _BlocksRangeClient({"http://peer-a": chain})
+
+        assert await sync._sequential_bulk_import(0, 11, "http://peer-a", 5, 0) == 7
+
+    async def test_conflicting_peers_are_refetched_from_source(self, session_factory, monkeypatch):
+        monkeypatch.setattr(sync_settings, "sync_parallel_max_peers", 2)
+        good = _remote_chain(20)
+        forked = good[:12] + _remote_chain(20, marker="b")[12:]
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        sync._client = _BlocksRangeClient({"http://peer-a": good, "http://peer-b": forked})
+        sync.register_sync_peer("http://peer-a", "http://peer-a", (0, 19))
+        sync.register_sync_peer("http://peer-b", "http://peer-b", (0, 19))
+        # Both peers cover every height, so each batch is split between them.
+        monkeypatch.setattr(
+            sync._peer_tracker,
+            "select_peers_for_range",
+            lambda start, end, max_peers=4: [("http://peer-a", (start, end)), ("http://peer-b", (start, end))],
+        )
+
+        assert await sync._parallel_bulk_import(0, 19, "http://peer-a", 10, 0) == 20
+        with session_factory() as session:
+            head = session.exec(select(Block).where(Block.chain_id == "test", Block.height == 19)).one()
+        assert head.hash == good[19]["hash"]
+        assert ("http://peer-a", 10, 19) in sync._client.requests[-1:]
+
+
+class TestMultiBlockImport:
+    """`import_blocks` must leave exactly the state `import_block` would, many blocks per commit."""
+
+    ALICE = "ait1" + "a1" * 20
+    BOB = "ait1" + "b0" * 20
+    CAROL = "ait1" + "c2" * 20
+
+    @pytest.fixture(autouse=True)
+    def _fresh_replay_set(self):
+        from aitbc_chain.state.state_transition import get_state_transition
+
+        get_state_transition().reset()
+        yield
+        get_state_transition().reset()
+
+    @pytest.fixture
+    def second_factory(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}", echo=False)
+        chain_metadata.create_all(engine)
+
+        @contextmanager
+        def _factory():
+            with Session(engine) as session:
+                yield session
+
+        yield _factory
+        engine.dispose()
+
+    def _prepare(self, factory):
+        genesis = _seed_chain(factory, count=1, chain_id="test")[-1]
+        with factory() as session:
+            session.add(Account(chain_id="test", address=self.ALICE, balance=10_000, nonce=0))
+            session.add(Account(chain_id="test", address=self.CAROL, balance=10_000, nonce=0))
+            session.commit()
+        return genesis
+
+    def _chain(self, genesis, count):
+        blocks, parent = [], genesis
+        for h in range(1, count + 1):
+            ts = datetime(2026, 1, 1, 0, 1, h)
+            bh = _make_block_hash("test", h, parent["hash"], ts)
+            txs = [
+                {"tx_hash": f"0x{h:04x}{i:060x}", "from": sender, "to": self.BOB, "value": 10 * h, "fee": 1, "nonce": h - 1}
+                for i, sender in enumerate((self.ALICE, self.CAROL))
+            ]
+            block = {"height": h, "hash": bh, "parent_hash": parent["hash"], "proposer": "node-a", "timestamp": ts.isoformat(), "transactions": txs}
+            blocks.append(block)
+            parent = block
+        return blocks
+
+    @staticmethod
+    def _snapshot(factory):
+        with factory() as session:
+            accounts = sorted((a.address, a.balance, a.nonce) for a in session.exec(select(Account)).all())
+            blocks = sorted((b.height, b.hash, b.tx_count, b.state_root) for b in session.exec(select(Block)).all())
+            txs = sorted((t.tx_hash, t.block_height, t.value, t.status) for t in session.exec(select(Transaction)).all())
+        return accounts, blocks, txs
+
+    def _reference(self, session_factory, blocks):
+        """Import one block at a time, recording each block's state root as the peer would."""
+        from aitbc_chain.state.state_root_utils import compute_state_root_full
+        from aitbc_chain.state.state_transition import get_state_transition
+
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        for block in blocks:
+            assert sync.import_block(dict(block), transactions=block["transactions"], skip_state_root_validation=True).accepted
+            with session_factory() as session:
+                block["state_root"] = compute_state_root_full(session, "test")
+        # The second node replays the same hashes; its replay set starts empty.
+        get_state_transition().reset()
+
+    def test_matches_single_block_import(self, session_factory, second_factory):
+        blocks = self._chain(self._prepare(session_factory), 7)
+        self._prepare(second_factory)
+        self._reference(session_factory, blocks)
+        sync = ChainSync(second_factory, chain_id="test", validate_signatures=False)
+
+        result = sync.import_blocks(blocks, blocks_per_commit=3)
+
+        assert (result.imported, result.height, result.rejected) == (7, 7, None)
+        assert self._snapshot(second_factory)[0] == self._snapshot(session_factory)[0]
+        assert [b[:3] for b in self._snapshot(second_factory)[1]] == [b[:3] for b in self._snapshot(session_factory)[1]]
+        assert self._snapshot(second_factory)[2] == self._snapshot(session_factory)[2]
+        assert metrics_registry._summaries["sync_bulk_commit_blocks"][0] == 3
+
+    @pytest.mark.parametrize("bad_height, expected_imported", [(5, 4), (6, 5)])
+    def test_first_invalid_block_rolls_back_cleanly(self, session_factory, second_factory, bad_height, expected_imported):
+        blocks = self._chain(self._prepare(session_factory), 8)
+        self._prepare(second_factory)
+        self._reference(session_factory, blocks)
+        blocks[bad_height - 1]["state_root"] = "0x" + "11" * 32
+        sync = ChainSync(second_factory, chain_id="test", validate_signatures=False)
+
+        result = sync.import_blocks(blocks, blocks_per_commit=4)
+
+        assert result.imported == expected_imported
+        assert result.rejected.height == bad_height
+        assert "State root mismatch" in result.rejected.reason
+        accounts, stored_blocks, txs = self._snapshot(second_factory)
+        assert [b[0] for b in stored_blocks] == list(range(expected_imported + 1))
+        assert {t[1] for t in txs} == set(range(1, expected_imported + 1))
+        alice = next(a for a in accounts if a[0] == self.ALICE)
+        assert alice[2] == expected_imported
+
+        # Rolled-back transactions are not remembered as replays.
+        blocks[bad_height - 1]["state_root"] = None
+        assert sync.import_blocks(blocks[expected_imported:]).imported == 8 - expected_imported
+
+    def test_refuses_blocks_that_do_not_extend_the_tip(self, session_factory):
+        blocks = self._chain(self._prepare(session_factory), 3)
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+
+        result = sync.import_blocks(blocks[1:])
+
+        assert result.imported == 0
+        assert "does not extend our tip" in result.rejected.reason
+
+
 class TestChainSyncSignatureValidation:
     def test_untrusted_proposer_rejected_on_import(self, session_factory):
         validator = ProposerSignatureValidator(trusted_proposers=["node-a"])
@@ -552,3 +831,83 @@ class TestSyncMetrics:
         )
         prom = metrics_registry.render_prometheus()
         assert "sync_forks_detected_total" in prom
+
+
+class TestBatchedSignatureVerification:
+    """Imported blocks verify every tx signature in one pool batch, with inline verification's outcome."""
+
+    @pytest.fixture(autouse=True)
+    def _pool_and_fresh_replay_set(self, monkeypatch):
+        from aitbc_chain.signature_verifier import get_signature_verifier
+        from aitbc_chain.state.state_transition import get_state_transition
+
+        # Two workers and no inline threshold, so even a small block goes through the pool.
+        monkeypatch.setattr(get_signature_verifier(), "_max_workers", 2)
+        monkeypatch.setattr(get_signature_verifier(), "_min_batch", 1)
+        get_state_transition().reset()
+        yield
+        get_state_transition().reset()
+
+    def _signed_block(self, session_factory, forged: set[int]):
+        from eth_account import Account as EthAccount
+
+        from aitbc_chain.rpc.utils import sign_transaction_data
+
+        genesis = _seed_chain(session_factory, count=1, chain_id="test")[-1]
+        impostor = EthAccount.create()
+        senders, txs = [], []
+        with session_factory() as session:
+            for i in range(12):
+                signer = EthAccount.create()
+                sender = "ait1" + signer.address[2:].lower()
+                session.add(Account(chain_id="test", address=sender, balance=1_000, nonce=0))
+                tx = {
+                    "tx_hash": f"0x{i:064x}",
+                    "from": sender,
+                    "to": "ait1" + "b0" * 20,
+                    "amount": 5,
+                    "fee": 1,
+                    "nonce": 0,
+                    "type": "TRANSFER",
+                    "payload": {},
+                    "chain_id": "test",
+                }
+                tx["signature"] = sign_transaction_data(tx, (impostor if i in forged else signer).key.hex())
+                senders.append(sender)
+                txs.append(tx)
+            session.commit()
+        ts = datetime(2026, 1, 1, 0, 1, 0)
+        block = {
+            "height": 1,
+            "hash": _make_block_hash("test", 1, genesis["hash"], ts),
+            "parent_hash": genesis["hash"],
+            "proposer": "node-a",
+            "timestamp": ts.isoformat(),
+            "transactions": txs,
+        }
+        return block, senders
+
+    @staticmethod
+    def _nonces(session_factory, senders):
+        with session_factory() as session:
+            return [session.get(Account, ("test", sender)).nonce for sender in senders]
+
+    def test_import_block_skips_forged_transactions(self, session_factory):
+        block, senders = self._signed_block(session_factory, forged={3, 7})
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        assert sync.import_block(block, skip_state_root_validation=True).accepted
+        assert self._nonces(session_factory, senders) == [0 if i in (3, 7) else 1 for i in range(12)]
+
+    def test_import_blocks_skips_forged_transactions(self, session_factory):
+        block, senders = self._signed_block(session_factory, forged={0})
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        assert sync.import_blocks([block], skip_state_root_validation=True).imported == 1
+        assert self._nonces(session_factory, senders) == [0] + [1] * 11
+
+    def test_non_string_signature_rejects_the_transaction_not_the_import(self, session_factory):
+        block, senders = self._signed_block(session_factory, forged=set())
+        block["transactions"][5]["signature"] = {"r": "0x01", "s": "0x02", "v": 27}
+        block["transactions"][6]["signature"] = 12345
+        sync = ChainSync(session_factory, chain_id="test", validate_signatures=False)
+        assert sync.import_block(block, skip_state_root_validation=True).accepted
+        assert self._nonces(session_factory, senders) == [0 if i in (5, 6) else 1 for i in range(12)]
@@ -0,0 +1,47 @@
+"""`_validate_transaction_admission` bounds how far a nonce may run ahead of the account."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+
+from aitbc_chain.config import settings
+from aitbc_chain.rpc import transactions as rpc_transactions
+from aitbc_chain.rpc import utils as rpc_utils
+
+CHAIN = "test-chain"
+
+
+@pytest.fixture(autouse=True)
+def account(monkeypatch):
+    @contextmanager
+    def _session_scope(*args, **kwargs):
+        yield None
+
+    cache = Mock()
+    cache.lookup.return_value = (1_000, 10)
+    monkeypatch.setattr(rpc_transactions, "session_scope", _session_scope)
+    monkeypatch.setattr(rpc_transactions, "get_account_cache", lambda: cache)
+    monkeypatch.setattr(rpc_utils, "get_supported_chains", lambda: [CHAIN])
+    monkeypatch.setattr(settings, "mempool_max_nonce_gap", 4)
+
+
+def _tx(nonce: int) -> dict:
+    return {"chain_id": CHAIN, "from": "alice", "to": "bob", "amount": 1, "fee": 1, "nonce": nonce}
+
+
+@pytest.mark.parametrize("nonce", [10, 12, 14])
+def test_nonce_within_gap_admitted(nonce):
+    rpc_transactions._validate_transaction_admission(_tx(nonce), Mock())
+
+
+def test_used_nonce_rejected():
+    with pytest.raises(ValueError, match="expected at least 10"):
+        rpc_transactions._validate_transaction_admission(_tx(9), Mock())
+
+
+def test_nonce_past_gap_rejected():
+    with pytest.raises(ValueError, match="expected at most 14"):
+        rpc_transactions._validate_transaction_admission(_tx(15), Mock())
@@ -0,0 +1,140 @@
+"""`query_transactions` filters payload fields in SQL and pages by (block_height, id)."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import Session, create_engine, select
+
+from aitbc_chain import payload_index
+from aitbc_chain.metadata import chain_metadata
+from aitbc_chain.models import Transaction
+from aitbc_chain.payload_index import TransactionPayloadField
+from aitbc_chain.rpc import transactions as rpc_transactions
+
+CHAIN = "test-chain"
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'chain.db'}")
+    chain_metadata.create_all(engine)
+
+    @contextmanager
+    def _session_scope(*args, **kwargs):
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(rpc_transactions, "session_scope", _session_scope)
+    yield engine
+    engine.dispose()
+
+
+def _tx(index: int, payload: dict, *, height: int | None = None, chain_id: str = CHAIN, **fields) -> Transaction:
+    return Transaction(
+        chain_id=chain_id,
+        tx_hash=f"0x{index:064x}",
+        block_height=height,
+        sender=fields.pop("sender", "alice"),
+        recipient=fields.pop("recipient", "bob"),
+        payload=payload,
+        **fields,
+    )
+
+
+def _seed(engine) -> None:
+    with Session(engine) as session:
+        session.add_all(
+            [
+                _tx(1, {"island_id": "isl-1", "pair": "AIT/USDC", "status": "open", "order_id": "o-1"}, height=1, type="MARKET"),
+                _tx(2, {"island_id": "isl-2", "pair": "AIT/USDC", "status": "filled", "offer_id": "o-1"}, height=1),
+                _tx(3, {"island_id": "isl-1", "bid_id": "o-1", "status": "open"}, height=2, sender="carol"),
+                _tx(4, {"island_id": 7, "pair": ["AIT", "USDC"], "status": None}, height=3),
+                _tx(5, {"island_id": "isl-1"}, height=None),
+                _tx(6, {"island_id": "isl-1"}, height=2, chain_id="other-chain"),
+            ]
+        )
+        session.commit()
+
+
+async def _query(**kwargs):
+    return await rpc_transactions.query_transactions(Mock(), chain_id=CHAIN, **kwargs)
+
+
+def _hashes(results) -> list[int]:
+    return [int(r["tx_hash"], 16) for r in results]
+
+
+async def test_payload_filters_match_string_values_only(engine) -> None:
+    _seed(engine)
+
+    assert _hashes(await _query(island_id="isl-1")) == [5, 1, 3]
+    assert _hashes(await _query(pair="AIT/USDC", status="open")) == [1]
+    assert _hashes(await _query(order_id="o-1")) == [1, 2, 3]
+    assert _hashes(await _query(order_id="o-1", transaction_type="MARKET")) == [1]
+    assert _hashes(await _query(island_id="isl-1", address="carol")) == [3]
+    assert _hashes(await _query(island_id="7")) == []
+
+
+async def test_keyset_pages_cover_every_row_once(engine) -> None:
+    with Session(engine) as session:
+        for index in range(1, 24):
+            session.add(_tx(index, {"pair": "AIT/USDC"}, height=None if index % 7 == 0 else index // 3))
+        session.commit()
+
+    seen: list[int] = []
+    after = None
+    while True:
+        page = await _query(pair="AIT/USDC", limit=4, after=after)
+        if not page:
+            break
+        seen += _hashes(page)
+        after = page[-1]["cursor"]
+
+    expected = sorted(range(1, 24), key=lambda i: (i % 7 != 0, i // 3 if i % 7 else 0, i))
+    assert seen == expected
+
+
+async def test_invalid_cursor_is_rejected(engine) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        await _query(after="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+def test_index_follows_payload_updates_and_deletes(engine) -> None:
+    _seed(engine)
+    with Session(engine) as session:
+        tx = session.exec(select(Transaction).where(Transaction.tx_hash == f"0x{1:064x}")).one()
+        tx_id = tx.id
+        tx.payload = {"island_id": "isl-9"}
+        session.add(tx)
+        session.delete(session.exec(select(Transaction).where(Transaction.tx_hash == f"0x{2:064x}")).one())
+        session.commit()
+
+        rows = session.exec(select(TransactionPayloadField).where(TransactionPayloadField.chain_id == CHAIN)).all()
+    by_tx = {}
+    for row in rows:
+        by_tx.setdefault(row.tx_id, {})[row.field] = row.value
+    assert by_tx[tx_id] == {"island_id": "isl-9"}
+    assert len(by_tx) == 3  # 1, 3 and 5; 2 is gone and 4 has no string fields
+
+
+def test_existing_database_is_back_filled(engine) -> None:
+    _seed(engine)
+    with engine.begin() as conn:
+        for name in ("trg_tx_payload_insert", "trg_tx_payload_update", "trg_tx_payload_delete"):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        conn.execute(text("DELETE FROM transaction_payload_field"))
+
+    with engine.begin() as conn:
+        payload_index.ensure_payload_index(conn)
+    with Session(engine) as session:
+        assert len(session.exec(select(TransactionPayloadField)).all()) == 13
+        # ...and the triggers are back for new rows.
+        session.add(_tx(50, {"pair": "X/Y"}, height=9))
+        session.commit()
+        assert session.exec(select(TransactionPayloadField).where(TransactionPayloadField.value == "X/Y")).one()
@@ -57,6 +57,73 @@ class TestGossipDedup:
         assert msg_id == msg_id2
 
 
+class _RecordingBackend:
+    """Gossip backend that records publish/publish_batch calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, object]] = []
+
+    async def start(self) -> None:
+        return None
+
+    async def publish(self, topic, message) -> None:
+        self.calls.append(("publish", topic, message))
+
+    async def publish_batch(self, topic, messages) -> None:
+        self.calls.append(("publish_batch", topic, list(messages)))
+
+    async def shutdown(self) -> None:
+        return None
+
+
+class TestGossipPriorityDrain:
+    """The priority drain sleeps until something is enqueued and batches per topic."""
+
+    def test_drain_batches_by_topic_blocks_first_then_idles(self, monkeypatch):
+        import asyncio
+
+        from aitbc_chain.gossip.broker import GossipBroker, settings
+        from aitbc_chain.metrics import metrics_registry
+
+        monkeypatch.setattr(settings, "gossip_priority_enabled", True)
+        metrics_registry.reset()
+        backend = _RecordingBackend()
+        broker = GossipBroker(backend)  # type: ignore[arg-type]
+
+        async def scenario() -> int:
+            for n in range(3):
+                await broker.publish("transactions", {"hash": f"0x{n}"})
+            await broker.publish("blocks", {"hash": "0xblock"})
+            await broker.publish("blocks", {"hash": "0xblock"})  # duplicate, dropped
+            for _ in range(5):
+                await asyncio.sleep(0)
+            polls = []
+            original_get_batch = broker._priority_queue.get_batch
+
+            def counting_get_batch(max_count):
+                polls.append(max_count)
+                return original_get_batch(max_count)
+
+            monkeypatch.setattr(broker._priority_queue, "get_batch", counting_get_batch)
+            await asyncio.sleep(0.05)
+            idle_polls = len(polls)
+            await broker.publish("status", {"id": "late"})
+            for _ in range(5):
+                await asyncio.sleep(0)
+            await broker.shutdown()
+            return idle_polls
+
+        assert asyncio.run(scenario()) == 0
+        assert backend.calls == [
+            ("publish", "blocks", {"hash": "0xblock"}),
+            ("publish_batch", "transactions", [{"hash": "0x0"}, {"hash": "0x1"}, {"hash": "0x2"}]),
+            ("publish", "status", {"id": "late"}),
+        ]
+        assert metrics_registry._summaries["gossip_priority_batch_size"] == (2.0, 5.0)
+        assert metrics_registry._summaries["gossip_priority_queue_latency_seconds"][0] == 5.0
+        assert metrics_registry._counters["gossip_dedup_skipped_total"] == 1
+
+
 # ---------------------------------------------------------------------------
 # B4 — Peer capability exchange
 # ---------------------------------------------------------------------------
@@ -1,9 +1,11 @@
 import os
+from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import update
 from sqlalchemy.orm import Session
@@ -35,6 +37,9 @@ _ZK_REQUIRE_PROOF = os.getenv("COORDINATOR_ZK_REQUIRE", "false").lower() == "tru
 _TEE_THRESHOLD_AIT = float(os.getenv("COORDINATOR_TEE_HIGH_VALUE_THRESHOLD", "10"))
 _TEE_REQUIRE = os.getenv("COORDINATOR_TEE_REQUIRE", "false").lower() == "true"
 
+# Seconds between comments on an idle /miners/stream, so proxies keep it open.
+_STREAM_KEEPALIVE_SECONDS = float(os.getenv("COORDINATOR_MINER_STREAM_KEEPALIVE_SECONDS", "15"))
+
 
 def _zk_required_for(job: Any) -> bool:
     """Return True if this job's payment triggers the ZK-proof gate."""
@@ -238,10 +243,43 @@ async def poll(
     session: Annotated[Session, Depends(get_session)],
     user: MinerDep,
 ) -> AssignedJob | Response:
-    job = MinerService(session).poll(user["sub"], req.max_wait_seconds)
+    """Long-poll: answers with a job as soon as one is assigned, or 204 after ``max_wait_seconds``."""
+    try:
+        job = await MinerService(session).wait_for_job(user["sub"], req.max_wait_seconds)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="miner not registered") from None
     if job is None:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
-    return job  # type: ignore[no-any-return]
+    return job
+
+
+@router.get("/miners/stream", summary="Stream assigned jobs (server-sent events)")
+async def stream_jobs(
+    request: Request,
+    session: Annotated[Session, Depends(get_session)],
+    user: MinerDep,
+) -> StreamingResponse:
+    """Push jobs to the miner as they are assigned, instead of having it poll.
+
+    Every job is an ``event: job`` whose data is the ``AssignedJob`` JSON; it is
+    claimed exactly as ``/miners/poll`` claims it, and results are submitted the
+    usual way. An idle stream gets a comment every ``_STREAM_KEEPALIVE_SECONDS``.
+    """
+    service = MinerService(session)
+    try:
+        service.get(user["sub"])
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="miner not registered") from None
+
+    async def event_stream() -> AsyncGenerator[str]:
+        while not await request.is_disconnected():
+            job = await service.wait_for_job(user["sub"], _STREAM_KEEPALIVE_SECONDS)
+            if job is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: job\ndata: {job.model_dump_json()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @router.post("/miners/{job_id}/result", summary="Submit job result")
@@ -0,0 +1,262 @@
+"""
+Dispatch index for queued jobs.
+
+``JobService.acquire_next_job`` used to load every QUEUED job on each miner poll
+and check each one against the polling miner and against every other online
+miner. Jobs with the same matching constraints get the same answer, so the
+index groups queued jobs into buckets keyed by constraint signature, and a poll
+checks each bucket once instead of each job.
+
+The database stays the source of truth. The index picks up jobs queued by other
+workers incrementally (a ``requested_at`` watermark) and rebuilds itself every
+``_RESYNC_SECONDS``. A claim is a conditional UPDATE, so a stale entry is
+dropped, never assigned twice.
+
+Long-polling miners park on the index's :class:`JobWaiters`, keyed by their
+capability bucket, and are woken as soon as a job they might run is indexed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlmodel import Session, select
+
+from aitbc.aitbc_logging import get_logger
+
+from ..domain import Job, Miner
+
+logger = get_logger(__name__)
+
+_RESYNC_SECONDS = float(os.getenv("COORDINATOR_DISPATCH_RESYNC_SECONDS", "30"))
+# Jobs committed slightly out of requested_at order are still caught by the incremental scan.
+_WATERMARK_OVERLAP = timedelta(seconds=5)
+
+# (region, gpu, min_vram_gb, cuda, models, max_price, min_reputation, bond required)
+ConstraintSignature = tuple[Any, ...]
+
+# (region, names of the GPUs it has) of a parked miner
+CapabilityBucket = tuple[str | None, frozenset[str]]
+
+
+@dataclass(slots=True)
+class QueuedJob:
+    """The fields of a queued job that dispatch needs; quacks like ``Job`` for constraint checks."""
+
+    id: str
+    constraints: dict[str, Any]
+    payment_amount: Decimal | None
+    requested_at: datetime
+    expires_at: datetime | None
+
+    @classmethod
+    def from_job(cls, job: Job) -> QueuedJob:
+        return cls(job.id, job.constraints or {}, job.payment_amount, job.requested_at, job.expires_at)
+
+
+def constraint_signature(job: QueuedJob | Job, bond_required: bool) -> ConstraintSignature:
+    """Key of everything in a job that decides which miners may run it."""
+    constraints = job.constraints or {}
+    models = constraints.get("models")
+    return (
+        constraints.get("region"),
+        constraints.get("gpu"),
+        constraints.get("min_vram_gb"),
+        constraints.get("cuda"),
+        tuple(sorted(models)) if models else None,
+        str(constraints["max_price"]) if constraints.get("max_price") is not None else None,
+        constraints.get("min_reputation"),
+        bond_required,
+    )
+
+
+def capability_bucket(miner: Miner) -> CapabilityBucket:
+    """Key a parked miner is woken by: its region and GPU models."""
+    gpus = (miner.capabilities or {}).get("gpus") or []
+    return miner.region, frozenset(gpu["name"] for gpu in gpus if isinstance(gpu, dict) and gpu.get("name"))
+
+
+class JobWaiters:
+    """Long-polling miners parked until a job they might run is queued.
+
+    A job wakes every bucket its region and GPU constraints admit. The woken
+    poll re-runs the full dispatch decision, so a coarse wake-up costs one
+    wasted attempt, never a wrong assignment. Jobs are queued from the thread
+    pool while waiters live on the event loop, hence ``call_soon_threadsafe``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: dict[CapabilityBucket, dict[asyncio.Future[None], None]] = {}
+
+    def register(self, bucket: CapabilityBucket) -> asyncio.Future[None]:
+        """Park a waiter on ``bucket``; it completes when a matching job is queued."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.setdefault(bucket, {})[future] = None
+        return future
+
+    def unregister(self, bucket: CapabilityBucket, future: asyncio.Future[None]) -> None:
+        with self._lock:
+            waiters = self._waiters.get(bucket)
+            if waiters is not None:
+                waiters.pop(future, None)
+                if not waiters:
+                    del self._waiters[bucket]
+
+    def notify(self, signature: ConstraintSignature) -> int:
+        """Wake the waiters that may be able to run a job with ``signature``; returns how many."""
+        region, gpu = signature[0], signature[1]
+        with self._lock:
+            woken = [
+                future
+                for (bucket_region, gpu_names), waiters in self._waiters.items()
+                if (region is None or region == bucket_region) and (gpu is None or gpu in gpu_names)
+                for future in waiters
+            ]
+        for future in woken:
+            try:
+                future.get_loop().call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The waiter's loop is closed; nothing is listening any more.
+                pass
+        return len(woken)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(waiters) for waiters in self._waiters.values())
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class DispatchIndex:
+    """Queued jobs bucketed by constraint signature.
+
+    Thread-safe: sync endpoints of the coordinator run in a thread pool.
+    """
+
+    def __init__(self, resync_seconds: float = _RESYNC_SECONDS) -> None:
+        self._resync_seconds = resync_seconds
+        self._lock = threading.Lock()
+        self._buckets: dict[ConstraintSignature, dict[str, QueuedJob]] = {}
+        self._unsorted: set[ConstraintSignature] = set()
+        self._signatures: dict[str, ConstraintSignature] = {}
+        self._watermark: datetime | None = None
+        self._synced_at: float | None = None
+        self.waiters = JobWaiters()
+
+    def sync(self, session: Session, bond_required: Callable[[QueuedJob], bool]) -> None:
+        """Bring the index up to date with the database.
+
+        ``bond_required(job)`` decides the bond part of a job's signature.
+        """
+        now = time.monotonic()
+        full = self._synced_at is None or now - self._synced_at >= self._resync_seconds
+        statement = select(Job.id, Job.constraints, Job.payment_amount, Job.requested_at, Job.expires_at).where(
+            Job.state == "QUEUED"
+        )
+        if not full and self._watermark is not None:
+            statement = statement.where(Job.requested_at >= self._watermark - _WATERMARK_OVERLAP)  # type: ignore[operator]
+        rows = session.execute(statement.order_by(Job.requested_at.asc())).all()  # type: ignore[attr-defined]
+        added: set[ConstraintSignature] = set()
+        with self._lock:
+            known = set(self._signatures)
+            if full:
+                self._buckets.clear()
+                self._unsorted.clear()
+                self._signatures.clear()
+                self._synced_at = now
+            for row in rows:
+                queued = QueuedJob(row[0], row[1] or {}, row[2], row[3], row[4])
+                if queued.id not in self._signatures:
+                    signature = self._add_locked(queued, bond_required(queued))
+                    if queued.id not in known:
+                        added.add(signature)
+                if self._watermark is None or queued.requested_at > self._watermark:
+                    self._watermark = queued.requested_at
+        # Jobs queued by another worker: wake miners parked here for them.
+        for signature in added:
+            self.waiters.notify(signature)
+
+    def add(self, job: Job, bond_required: bool) -> None:
+        """Index a job this worker just queued, ahead of the next sync, and wake miners parked for it."""
+        with self._lock:
+            if job.id in self._signatures:
+                return
+            signature = self._add_locked(QueuedJob.from_job(job), bond_required)
+        self.waiters.notify(signature)
+
+    def _add_locked(self, queued: QueuedJob, bond_required: bool) -> ConstraintSignature:
+        signature = constraint_signature(queued, bond_required)
+        bucket = self._buckets.setdefault(signature, {})
+        if bucket:
+            newest = next(reversed(bucket.values()))
+            if _sort_key(queued) < _sort_key(newest):
+                self._unsorted.add(signature)
+        bucket[queued.id] = queued
+        self._signatures[queued.id] = signature
+        return signature
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job that left the QUEUED state (claimed, expired or cancelled)."""
+        with self._lock:
+            signature = self._signatures.pop(job_id, None)
+            if signature is None:
+                return
+            bucket = self._buckets.get(signature)
+            if bucket is not None:
+                bucket.pop(job_id, None)
+                if not bucket:
+                    del self._buckets[signature]
+                    self._unsorted.discard(signature)
+
+    def buckets(self, per_bucket: int = 32) -> list[list[QueuedJob]]:
+        """The oldest ``per_bucket`` jobs of every bucket, buckets ordered by their oldest job."""
+        with self._lock:
+            for signature in self._unsorted:
+                bucket = self._buckets[signature]
+                self._buckets[signature] = {job.id: job for job in sorted(bucket.values(), key=_sort_key)}
+            self._unsorted.clear()
+            snapshot = [list(itertools.islice(bucket.values(), per_bucket)) for bucket in self._buckets.values()]
+        snapshot.sort(key=lambda jobs: _sort_key(jobs[0]))
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def _sort_key(job: QueuedJob) -> tuple[datetime, str]:
+    # SQLite hands back naive UTC datetimes, jobs queued in this worker carry tzinfo.
+    requested_at = job.requested_at or datetime.min
+    if requested_at.tzinfo is not None:
+        requested_at = requested_at.astimezone(UTC).replace(tzinfo=None)
+    return requested_at, job.id
+
+
+# One index per database engine, so separate databases (and test runs) never share entries.
+_indexes: weakref.WeakKeyDictionary[Any, DispatchIndex] = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_dispatch_index(session: Session) -> DispatchIndex:
+    """Return the dispatch index of the database ``session`` is bound to."""
+    bind = session.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = DispatchIndex()
+        return index
@@ -5,6 +5,7 @@ from datetime import UTC, datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
+from sqlalchemy import update
 from sqlmodel import Session, select
 
 from aitbc.aitbc_logging import get_logger
@@ -12,8 +13,9 @@ from aitbc.aitbc_logging import get_logger
 from ....schemas import AssignedJob, Constraints, JobCreate, JobResult, JobView
 from ...payments.services.payments import PaymentService
 from ..domain import Job, JobReceipt, Miner
-from ...reputation.domain.reputation import AgentReputation
 from ....contexts.marketplace.domain.provider_bond import is_provider_eligible
+from ...reputation.services.reputation_snapshot import get_reputation_snapshot
+from .dispatch import QueuedJob, get_dispatch_index
 
 logger = get_logger(__name__)
 
@@ -22,7 +24,7 @@ _BOND_THRESHOLD_AIT = Decimal(os.getenv("COORDINATOR_BOND_HIGH_VALUE_THRESHOLD",
 _BOND_REQUIRE = os.getenv("COORDINATOR_BOND_REQUIRE", "false").lower() == "true"
 
 
-def _bond_required_for(job: Job) -> bool:
+def _bond_required_for(job: Job | QueuedJob) -> bool:
     """Return True if the job requires a performance bond check."""
     constraints = Constraints(**job.constraints) if isinstance(job.constraints, dict) else Constraints()
     if constraints.bond_required:
@@ -67,6 +69,7 @@ class JobService:
         self.session.add(job)
         self.session.commit()
         self.session.refresh(job)
+        get_dispatch_index(self.session).add(job, _bond_required_for(job))
         return job
 
     def get_job(self, job_id: str, client_id: str | None = None) -> Job:
@@ -116,6 +119,7 @@ class JobService:
         self.session.add(job)
         self.session.commit()
         self.session.refresh(job)
+        get_dispatch_index(self.session).discard(job.id)
         return job
 
     def to_view(self, job: Job) -> JobView:
@@ -149,10 +153,14 @@ class JobService:
         return AssignedJob(job_id=job.id, payload=job.payload, constraints=constraints)
 
     def acquire_next_job(self, miner: Miner) -> Job | None:
+        """Claim the oldest queued job ``miner`` may run, or return None.
+
+        Constraint and reputation checks run once per bucket of the dispatch index
+        (jobs with the same constraint signature), not once per job.
+        """
         try:
-            now = datetime.now(UTC)
-            statement = select(Job).where(Job.state == "QUEUED").order_by(Job.requested_at.asc())  # type: ignore[attr-defined]
-            jobs = self.session.scalars(statement).all()
+            index = get_dispatch_index(self.session)
+            index.sync(self.session, _bond_required_for)
 
             # Load the pool of online miners once per dispatch decision so we can
             # route high-reputation jobs to the best available provider.
@@ -161,29 +169,20 @@ class JobService:
             )
             current_reputation = self._get_miner_reputation(miner)
 
-            for job in jobs:
+            for bucket in index.buckets():
                 try:
-                    job = self._ensure_not_expired(job)
-                    if job.state != "QUEUED":
+                    representative = bucket[0]
+                    if not self._satisfies_constraints(representative, miner):
                         continue
-                    if job.expires_at:
-                        expires_at = _to_utc(job.expires_at)
-                        if expires_at and expires_at <= now:
-                            continue
-                    if not self._satisfies_constraints(job, miner):
-                        continue
-                    if self._has_higher_reputation_miner(job, online_miners, miner, current_reputation):
+                    if self._has_higher_reputation_miner(representative, online_miners, miner, current_reputation):
                         # A better-suited, higher-reputation miner is online and
-                        # has capacity. Leave this job for them to pick up.
+                        # has capacity. Leave these jobs for them to pick up.
                         continue
-                    job.state = "RUNNING"
-                    job.assigned_miner_id = miner.id
-                    self.session.add(job)
-                    self.session.commit()
-                    self.session.refresh(job)
-                    return job
+                    job = self._claim_first(bucket, miner)
+                    if job is not None:
+                        return job
                 except Exception as e:
-                    logger.warning("Error checking job %s: %s", job.id, e)
+                    logger.warning("Error checking jobs like %s: %s", bucket[0].id, e)
                     self.session.rollback()
                     continue
             return None
@@ -191,6 +190,57 @@ class JobService:
             logger.error("Error acquiring next job: %s", e)
             raise
 
+    def _claim_first(self, bucket: list[QueuedJob], miner: Miner) -> Job | None:
+        """Atomically assign the oldest still-queued, unexpired job of ``bucket`` to ``miner``."""
+        index = get_dispatch_index(self.session)
+        now = datetime.now(UTC)
+        candidates = []
+        for queued in bucket:
+            expires_at = _to_utc(queued.expires_at)
+            if expires_at and expires_at <= now:
+                self.session.execute(
+                    update(Job)
+                    .where(Job.id == queued.id, Job.state == "QUEUED")  # type: ignore[arg-type]
+                    .values(state="EXPIRED", error="job expired")
+                )
+                self.session.commit()
+                index.discard(queued.id)
+                continue
+            candidates.append(queued.id)
+        while candidates:
+            # SKIP LOCKED lets concurrent polls pass over a row another poll is claiming
+            # (PostgreSQL); SQLite serialises writers and ignores it. The conditional
+            # UPDATE below is what guarantees a job is claimed once.
+            job_id = self.session.execute(
+                select(Job.id)
+                .where(Job.id.in_(candidates), Job.state == "QUEUED")  # type: ignore[attr-defined]
+                .order_by(Job.requested_at.asc())  # type: ignore[attr-defined]
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            # Candidates older than the pick are claimed or locked elsewhere, or no longer queued.
+            passed = candidates[: candidates.index(job_id)] if job_id is not None else candidates
+            for stale_id in passed:
+                index.discard(stale_id)
+            if job_id is None:
+                self.session.rollback()
+                return None
+            claimed = self.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.state == "QUEUED")  # type: ignore[arg-type]
+                .values(state="RUNNING", assigned_miner_id=miner.id)
+            ).rowcount
+            index.discard(job_id)
+            if claimed == 1:
+                self.session.commit()
+                job = self.session.get(Job, job_id)
+                if job is not None:
+                    self.session.refresh(job)
+                return job
+            self.session.rollback()
+            candidates = candidates[candidates.index(job_id) + 1 :]
+        return None
+
     def _ensure_not_expired(self, job: Job) -> Job:
         expires_at = _to_utc(job.expires_at)
         if job.state in {"QUEUED", "RUNNING"} and expires_at and (expires_at <= datetime.now(UTC)):
@@ -201,7 +251,7 @@ class JobService:
             self.session.refresh(job)
         return job
 
-    def _satisfies_constraints(self, job: Job, miner: Miner) -> bool:
+    def _satisfies_constraints(self, job: Job | QueuedJob, miner: Miner) -> bool:
         if not job.constraints:
             return True
         constraints = Constraints(**job.constraints)
@@ -269,16 +319,12 @@ class JobService:
                 except (TypeError, ValueError):
                     pass
 
-        # Prefer the canonical reputation service profile when available.
-        try:
-            reputation = self.session.execute(
-                select(AgentReputation).where(AgentReputation.agent_id == miner.id)
-            ).scalars().first()
-            if reputation and reputation.trust_score is not None:
-                # trust_score is on a 0-1000 scale; normalize to 0-1.
-                return max(0.0, min(1.0, reputation.trust_score / 1000.0))
-        except Exception:
-            logger.debug("Could not load reputation profile for %s", miner.id, exc_info=True)
+        # Prefer the canonical reputation service profile when available (from the shared snapshot).
+        snapshot = get_reputation_snapshot(self.session)
+        snapshot.refresh_if_stale(self.session)
+        profile_score = snapshot.score(miner.id)
+        if profile_score is not None:
+            return profile_score
 
         total = (miner.jobs_completed or 0) + (miner.jobs_failed or 0)
         if total == 0:
@@ -287,7 +333,7 @@ class JobService:
 
     def _has_higher_reputation_miner(
         self,
-        job: Job,
+        job: Job | QueuedJob,
         online_miners: list[Miner],
         current_miner: Miner,
         current_reputation: float,
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import os
+from contextlib import suppress
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
@@ -8,8 +11,16 @@ from sqlmodel import Session, select
 
 from ..domain import Miner
 from ....schemas import AssignedJob, MinerHeartbeat, MinerRegister
+from .dispatch import capability_bucket, get_dispatch_index
 from .jobs import JobService
 
+# Upper bound on how long one long-poll may park, whatever the miner asks for.
+_MAX_POLL_WAIT_SECONDS = float(os.getenv("COORDINATOR_MAX_POLL_WAIT_SECONDS", "60"))
+# Jobs queued by other worker processes do not wake waiters in this one, and a
+# miner at capacity is not woken when it frees a slot; parked polls re-check
+# the database this often to catch both.
+_POLL_RECHECK_SECONDS = float(os.getenv("COORDINATOR_POLL_RECHECK_SECONDS", "5"))
+
 
 class MinerService:
     def __init__(self, session: Session):
@@ -61,7 +72,11 @@ class MinerService:
         self.session.refresh(miner)
         return miner
 
-    def poll(self, miner_id: str, max_wait_seconds: int) -> AssignedJob | None:
+    def poll(self, miner_id: str, max_wait_seconds: int = 0) -> AssignedJob | None:
+        """Claim a job for ``miner_id`` if one is available, without waiting.
+
+        ``max_wait_seconds`` is ignored here; see :meth:`wait_for_job`.
+        """
         miner = self.session.get(Miner, miner_id)
         if miner is None:
             raise KeyError("miner not registered")
@@ -80,6 +95,33 @@ class MinerService:
         self.session.commit()
         return job_service.to_assigned(job)
 
+    async def wait_for_job(self, miner_id: str, max_wait_seconds: float) -> AssignedJob | None:
+        """Long-poll: claim a job for ``miner_id`` as soon as one is queued.
+
+        Returns None once ``max_wait_seconds`` (capped at ``_MAX_POLL_WAIT_SECONDS``)
+        pass without a job. While parked the poll holds no database connection.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, min(float(max_wait_seconds), _MAX_POLL_WAIT_SECONDS))
+        waiters = get_dispatch_index(self.session).waiters
+        while True:
+            bucket = capability_bucket(self.get(miner_id))
+            # Park before looking, so a job queued between the look and the wait still wakes us.
+            waiter = waiters.register(bucket)
+            try:
+                job = self.poll(miner_id)
+                if job is not None:
+                    return job
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                # End the read transaction so the connection goes back to the pool while we wait.
+                self.session.rollback()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(waiter, timeout=min(remaining, _POLL_RECHECK_SECONDS))
+            finally:
+                waiters.unregister(bucket, waiter)
+
     def release(
         self,
         miner_id: str,
@@ -1,5 +1,20 @@
-"""Language services."""
+"""Language services.
 
-from .multi_language import language_detector, quality_assurance, translation_cache, translation_engine
+Submodules are imported on first attribute access, so importing one service
+does not pull in the optional dependencies of the others.
+"""
+
+from importlib import import_module
+from typing import Any
 
 __all__ = ["translation_engine", "translation_cache", "language_detector", "quality_assurance"]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazy load service modules on first access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = import_module(f".multi_language.{name}", __name__)
+    globals()[name] = module
+    return module
@@ -1,20 +1,28 @@
 """
 Multi-Language Service Initialization
 Main entry point for multi-language services
+
+The language detector and quality checker pull in NLP libraries (fasttext,
+polyglot, spacy, nltk) and are imported when the service initializes them, so
+the translation engine and cache can be imported on their own.
 """
 
+from __future__ import annotations
+
 import asyncio
 import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from aitbc.aitbc_logging import get_logger
 
-from .language_detector import LanguageDetector
-from .quality_assurance import TranslationQualityChecker
 from .translation_cache import TranslationCache
 from .translation_engine import TranslationEngine
 
+if TYPE_CHECKING:
+    from .language_detector import LanguageDetector
+    from .quality_assurance import TranslationQualityChecker
+
 logger = get_logger(__name__)
 
 
@@ -88,6 +96,8 @@ class MultiLanguageService:
     async def _initialize_language_detector(self) -> None:
         """Initialize language detector"""
         try:
+            from .language_detector import LanguageDetector
+
             self.language_detector = LanguageDetector(self.config["detection"])
             logger.info("Language detector initialized")
         except Exception as e:
@@ -97,6 +107,8 @@ class MultiLanguageService:
     async def _initialize_quality_checker(self) -> None:
         """Initialize quality checker"""
         try:
+            from .quality_assurance import TranslationQualityChecker
+
             self.quality_checker = TranslationQualityChecker(self.config["quality"])
             logger.info("Quality checker initialized")
         except Exception as e:
@@ -7,7 +7,7 @@ import asyncio
 from datetime import UTC, datetime
 from typing import Annotated, Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, field_validator
 
@@ -16,7 +16,7 @@ from aitbc.aitbc_logging import get_logger
 from .language_detector import DetectionMethod, LanguageDetector
 from .quality_assurance import TranslationQualityChecker
 from .translation_cache import TranslationCache
-from .translation_engine import TranslationEngine, TranslationRequest
+from .translation_engine import TranslationEngine, TranslationRequest, TranslationResponse
 
 logger = get_logger(__name__)
 
@@ -144,10 +144,58 @@ async def get_quality_checker() -> TranslationQualityChecker | None:
 router = APIRouter(prefix="/multi-language", tags=["multi-language"])
 
 
+def _translation_request(request: TranslationAPIRequest) -> TranslationRequest:
+    return TranslationRequest(
+        text=request.text,
+        source_language=request.source_language,
+        target_language=request.target_language,
+        context=request.context,
+        domain=request.domain,
+    )
+
+
+def _cached_response(result: TranslationResponse) -> TranslationAPIResponse:
+    return TranslationAPIResponse(
+        translated_text=result.translated_text,
+        confidence=result.confidence,
+        provider=result.provider.value,
+        processing_time_ms=result.processing_time_ms,
+        source_language=result.source_language,
+        target_language=result.target_language,
+        cached=True,
+    )
+
+
+async def _translate_uncached(
+    request: TranslationAPIRequest, engine: TranslationEngine, quality_checker: TranslationQualityChecker | None
+) -> TranslationAPIResponse:
+    """Translate with the engine after a cache miss; the engine caches the result and coalesces identical requests."""
+    translation_result = await engine.translate(_translation_request(request), use_cache=False)
+    quality_assessment = None
+    if request.quality_check and quality_checker:
+        assessment = await quality_checker.evaluate_translation(
+            request.text, translation_result.translated_text, request.source_language, request.target_language
+        )
+        quality_assessment = {
+            "overall_score": assessment.overall_score,
+            "passed_threshold": assessment.passed_threshold,
+            "recommendations": assessment.recommendations,
+        }
+    return TranslationAPIResponse(
+        translated_text=translation_result.translated_text,
+        confidence=translation_result.confidence,
+        provider=translation_result.provider.value,
+        processing_time_ms=translation_result.processing_time_ms,
+        source_language=translation_result.source_language,
+        target_language=translation_result.target_language,
+        cached=False,
+        quality_assessment=quality_assessment,
+    )
+
+
 @router.post("/translate", response_model=TranslationAPIResponse)
 async def translate_text(
     request: TranslationAPIRequest,
-    background_tasks: BackgroundTasks,
     engine: Annotated[TranslationEngine, Depends(get_translation_engine)],
     cache: Annotated[TranslationCache | None, Depends(get_translation_cache)],
     quality_checker: Annotated[TranslationQualityChecker | None, Depends(get_quality_checker)],
@@ -155,69 +203,14 @@ async def translate_text(
     """
     Translate text between supported languages with caching and quality assessment
     """
-    asyncio.get_event_loop().time()
     try:
-        cached_result = None
         if request.use_cache and cache:
             cached_result = await cache.get(
                 request.text, request.source_language, request.target_language, request.context, request.domain
             )
-        if cached_result:
-            background_tasks.add_task(
-                cache.get if cache else lambda *args: None,
-                request.text,
-                request.source_language,
-                request.target_language,
-                request.context,
-                request.domain,
-            )
-            return TranslationAPIResponse(
-                translated_text=cached_result.translated_text,
-                confidence=cached_result.confidence,
-                provider=cached_result.provider.value,
-                processing_time_ms=cached_result.processing_time_ms,
-                source_language=cached_result.source_language,
-                target_language=cached_result.target_language,
-                cached=True,
-            )
-        translation_request = TranslationRequest(
-            text=request.text,
-            source_language=request.source_language,
-            target_language=request.target_language,
-            context=request.context,
-            domain=request.domain,
-        )
-        translation_result = await engine.translate(translation_request)
-        if cache and translation_result.confidence > 0.8:
-            background_tasks.add_task(
-                cache.set,
-                request.text,
-                request.source_language,
-                request.target_language,
-                translation_result,
-                context=request.context,
-                domain=request.domain,
-            )
-        quality_assessment = None
-        if request.quality_check and quality_checker:
-            assessment = await quality_checker.evaluate_translation(
-                request.text, translation_result.translated_text, request.source_language, request.target_language
-            )
-            quality_assessment = {
-                "overall_score": assessment.overall_score,
-                "passed_threshold": assessment.passed_threshold,
-                "recommendations": assessment.recommendations,
-            }
-        return TranslationAPIResponse(
-            translated_text=translation_result.translated_text,
-            confidence=translation_result.confidence,
-            provider=translation_result.provider.value,
-            processing_time_ms=translation_result.processing_time_ms,
-            source_language=translation_result.source_language,
-            target_language=translation_result.target_language,
-            cached=False,
-            quality_assessment=quality_assessment,
-        )
+            if cached_result:
+                return _cached_response(cached_result)
+        return await _translate_uncached(request, engine, quality_checker)
     except Exception as e:
         logger.error("Translation error: %s", e)
         logger.exception("Unhandled exception")
@@ -228,7 +221,6 @@ async def translate_text(
 @router.post("/translate/batch", response_model=BatchTranslationResponse)
 async def translate_batch(
     request: BatchTranslationRequest,
-    background_tasks: BackgroundTasks,
     engine: Annotated[TranslationEngine, Depends(get_translation_engine)],
     cache: Annotated[TranslationCache | None, Depends(get_translation_cache)],
 ) -> BatchTranslationResponse:
@@ -237,19 +229,30 @@ async def translate_batch(
     """
     start_time = asyncio.get_event_loop().time()
     try:
-        tasks = []
-        for translation_req in request.translations:
-            task = translate_text(translation_req, background_tasks, engine, cache, None)
-            tasks.append(task)
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        cached: list[TranslationResponse | None] = [None] * len(request.translations)
+        if cache:
+            lookups = [i for i, item in enumerate(request.translations) if item.use_cache]
+            found = await cache.get_many([_translation_request(request.translations[i]) for i in lookups])
+            for i, result in zip(lookups, found, strict=True):
+                cached[i] = result
+        misses = [i for i, result in enumerate(cached) if result is None]
+        translated = await asyncio.gather(
+            *(_translate_uncached(request.translations[i], engine, None) for i in misses), return_exceptions=True
+        )
+        results: list[TranslationAPIResponse | BaseException | None] = [
+            _cached_response(result) if result is not None else None for result in cached
+        ]
+        for i, outcome in zip(misses, translated, strict=True):
+            results[i] = outcome
         translations = []
         errors = []
         failed_count = 0
-        for i, result in enumerate(results):
-            if isinstance(result, TranslationAPIResponse):
-                translations.append(result)
+        for i, outcome in enumerate(results):
+            if isinstance(outcome, TranslationAPIResponse):
+                translations.append(outcome)
             else:
-                errors.append(f"Translation {i + 1} failed: {str(result)}")
+                logger.error("Batch translation %d failed: %s", i + 1, outcome)
+                errors.append(f"Translation {i + 1} failed: Internal server error")
                 failed_count += 1
         processing_time = int((asyncio.get_event_loop().time() - start_time) * 1000)
         return BatchTranslationResponse(
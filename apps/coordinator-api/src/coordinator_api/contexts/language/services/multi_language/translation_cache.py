@@ -1,12 +1,20 @@
 """
 Translation Cache Service
 Redis-based caching for translation results to improve performance
+
+Lookups go through an in-process LRU (L1) before Redis (L2), so repeated
+translations are served without a network round trip. Per-entry access
+statistics are counted in process and written to Redis in one pipeline every
+``stats_flush_size`` accessed keys or ``stats_flush_interval`` seconds. An L1
+entry lives at most ``l1_ttl`` seconds, which bounds how long a delete made by
+another process can go unnoticed here.
 """
 
-import hashlib
 import json
 import time
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, replace
 from typing import Any
 
 import redis.asyncio as redis
@@ -15,7 +23,7 @@ from redis.asyncio import Redis
 from aitbc.aitbc_logging import get_logger
 
 from ....language.services.secure_pickle import safe_dumps, safe_loads
-from .translation_engine import TranslationProvider, TranslationResponse
+from .translation_engine import TranslationProvider, TranslationRequest, TranslationResponse, translation_cache_key
 
 logger = get_logger(__name__)
 
@@ -44,7 +52,16 @@ class TranslationCache:
         self.redis: Redis | None = None
         self.default_ttl = self.config.get("default_ttl", 86400)
         self.max_cache_size = self.config.get("max_cache_size", 100000)
-        self.stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        self.l1_max_entries = self.config.get("l1_max_entries", 10000)
+        self.l1_ttl = self.config.get("l1_ttl", 300)
+        self.stats_flush_size = self.config.get("stats_flush_size", 100)
+        self.stats_flush_interval = self.config.get("stats_flush_interval", 10)
+        self.stats = {"hits": 0, "l1_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        # cache key -> (response, monotonic expiry), least recently used first
+        self._l1: OrderedDict[str, tuple[TranslationResponse, float]] = OrderedDict()
+        # cache key -> [accesses not yet written to Redis, last access time]
+        self._pending_access: dict[str, list[float]] = {}
+        self._access_flushed_at = time.monotonic()
 
     async def initialize(self) -> None:
         """Initialize Redis connection"""
@@ -59,18 +76,83 @@ class TranslationCache:
     async def close(self) -> None:
         """Close Redis connection"""
         if self.redis:
+            await self.flush_access_stats()
             await self.redis.close()
 
     def _generate_cache_key(
         self, text: str, source_lang: str, target_lang: str, context: str | None = None, domain: str | None = None
     ) -> str:
         """Generate cache key for translation request"""
-        key_parts = ["translate", source_lang.lower(), target_lang.lower(), hashlib.sha256(text.encode()).hexdigest()]
-        if context:
-            key_parts.append(hashlib.sha256(context.encode()).hexdigest())
-        if domain:
-            key_parts.append(domain.lower())
-        return ":".join(key_parts)
+        return translation_cache_key(text, source_lang, target_lang, context, domain)
+
+    def _l1_get(self, cache_key: str) -> TranslationResponse | None:
+        item = self._l1.get(cache_key)
+        if item is None:
+            return None
+        response, expires_at = item
+        if time.monotonic() >= expires_at:
+            del self._l1[cache_key]
+            return None
+        self._l1.move_to_end(cache_key)
+        # A copy, so a caller adjusting its response cannot change the cached one.
+        return replace(response)
+
+    def _l1_put(self, cache_key: str, response: TranslationResponse, ttl: float | None = None) -> None:
+        if self.l1_max_entries <= 0:
+            return
+        lifetime = self.l1_ttl if ttl is None else min(ttl, self.l1_ttl)
+        self._l1[cache_key] = (replace(response), time.monotonic() + lifetime)
+        self._l1.move_to_end(cache_key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+    def _l1_discard(self, cache_key: str) -> None:
+        self._l1.pop(cache_key, None)
+
+    @staticmethod
+    def _decode_entry(cached_data: bytes) -> TranslationResponse:
+        cache_entry = CacheEntry(**safe_loads(cached_data))
+        return TranslationResponse(
+            translated_text=cache_entry.translated_text,
+            confidence=cache_entry.confidence,
+            provider=TranslationProvider(cache_entry.provider),
+            processing_time_ms=cache_entry.processing_time_ms,
+            source_language=cache_entry.source_language,
+            target_language=cache_entry.target_language,
+        )
+
+    def _note_access(self, cache_key: str) -> None:
+        pending = self._pending_access.get(cache_key)
+        if pending is None:
+            self._pending_access[cache_key] = [1, time.time()]
+        else:
+            pending[0] += 1
+            pending[1] = time.time()
+
+    async def _maybe_flush_access_stats(self) -> None:
+        if (
+            len(self._pending_access) >= self.stats_flush_size
+            or time.monotonic() - self._access_flushed_at >= self.stats_flush_interval
+        ):
+            await self.flush_access_stats()
+
+    async def flush_access_stats(self) -> int:
+        """Write the access counts gathered since the last flush to Redis; returns how many keys were updated."""
+        pending, self._pending_access = self._pending_access, {}
+        self._access_flushed_at = time.monotonic()
+        if not pending or not self.redis:
+            return 0
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for cache_key, (count, last_accessed) in pending.items():
+                stats_key = f"{cache_key}:stats"
+                pipe.hincrby(stats_key, "access_count", int(count))
+                pipe.hset(stats_key, "last_accessed", last_accessed)
+            await pipe.execute()
+            return len(pending)
+        except Exception as e:
+            logger.warning("Failed to flush access stats for %d cache entries: %s", len(pending), e)
+            return 0
 
     async def get(
         self, text: str, source_lang: str, target_lang: str, context: str | None = None, domain: str | None = None
@@ -79,23 +161,22 @@ class TranslationCache:
         if not self.redis:
             return None
         cache_key = self._generate_cache_key(text, source_lang, target_lang, context, domain)
+        response = self._l1_get(cache_key)
+        if response is not None:
+            self.stats["hits"] += 1
+            self.stats["l1_hits"] += 1
+            self._note_access(cache_key)
+            await self._maybe_flush_access_stats()
+            return response
         try:
             cached_data = await self.redis.get(cache_key)
             if cached_data:
-                cache_entry = CacheEntry(**safe_loads(cached_data))
-                cache_entry.access_count += 1
-                cache_entry.last_accessed = time.time()
-                await self.redis.hset(f"{cache_key}:stats", "access_count", cache_entry.access_count)
-                await self.redis.hset(f"{cache_key}:stats", "last_accessed", cache_entry.last_accessed)
+                response = self._decode_entry(cached_data)
+                self._l1_put(cache_key, response)
                 self.stats["hits"] += 1
-                return TranslationResponse(
-                    translated_text=cache_entry.translated_text,
-                    confidence=cache_entry.confidence,
-                    provider=TranslationProvider(cache_entry.provider),
-                    processing_time_ms=cache_entry.processing_time_ms,
-                    source_language=cache_entry.source_language,
-                    target_language=cache_entry.target_language,
-                )
+                self._note_access(cache_key)
+                await self._maybe_flush_access_stats()
+                return response
             self.stats["misses"] += 1
             return None
         except Exception as e:
@@ -103,6 +184,41 @@ class TranslationCache:
             self.stats["misses"] += 1
             return None
 
+    async def get_many(self, requests: Sequence[TranslationRequest]) -> list[TranslationResponse | None]:
+        """Get translations for many requests: L1 first, then one MGET for the rest"""
+        if not self.redis:
+            return [None] * len(requests)
+        keys = [
+            self._generate_cache_key(r.text, r.source_language, r.target_language, r.context, r.domain) for r in requests
+        ]
+        results: list[TranslationResponse | None] = [self._l1_get(key) for key in keys]
+        self.stats["l1_hits"] += sum(result is not None for result in results)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            try:
+                values = await self.redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                logger.error("Cache mget error: %s", e)
+                values = [None] * len(missing)
+            for i, cached_data in zip(missing, values, strict=True):
+                if not cached_data:
+                    continue
+                try:
+                    response = self._decode_entry(cached_data)
+                except Exception as e:
+                    logger.error("Cache get error: %s", e)
+                    continue
+                results[i] = response
+                self._l1_put(keys[i], response)
+        for key, result in zip(keys, results, strict=True):
+            if result is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+                self._note_access(key)
+        await self._maybe_flush_access_stats()
+        return results
+
     async def set(
         self,
         text: str,
@@ -136,7 +252,7 @@ class TranslationCache:
             stats_key = f"{cache_key}:stats"
             pipe.hset(
                 stats_key,
-                {  # type: ignore[arg-type]
+                mapping={
                     "access_count": 1,
                     "last_accessed": cache_entry.last_accessed,
                     "created_at": cache_entry.created_at,
@@ -146,6 +262,7 @@ class TranslationCache:
             )
             pipe.expire(stats_key, ttl)
             await pipe.execute()
+            self._l1_put(cache_key, response, ttl)
             self.stats["sets"] += 1
             return True
         except Exception as e:
@@ -159,6 +276,8 @@ class TranslationCache:
         if not self.redis:
             return False
         cache_key = self._generate_cache_key(text, source_lang, target_lang, context, domain)
+        self._l1_discard(cache_key)
+        self._pending_access.pop(cache_key, None)
         try:
             pipe = self.redis.pipeline()
             pipe.delete(cache_key)
@@ -173,7 +292,10 @@ class TranslationCache:
         """Clear all cache entries for a specific language pair"""
         if not self.redis:
             return 0
-        pattern = f"translate:{source_lang.lower()}:{target_lang.lower()}:*"
+        prefix = f"translate:{source_lang.lower()}:{target_lang.lower()}:"
+        for cache_key in [key for key in self._l1 if key.startswith(prefix)]:
+            self._l1_discard(cache_key)
+        pattern = f"{prefix}*"
         try:
             keys = await self.redis.keys(pattern)
             if keys:
@@ -199,6 +321,8 @@ class TranslationCache:
             memory_human = self._format_bytes(memory_used)
             return {
                 "hits": self.stats["hits"],
+                "l1_hits": self.stats["l1_hits"],
+                "l1_size": len(self._l1),
                 "misses": self.stats["misses"],
                 "sets": self.stats["sets"],
                 "evictions": self.stats["evictions"],
@@ -216,6 +340,7 @@ class TranslationCache:
         """Get most accessed translations"""
         if not self.redis:
             return []
+        await self.flush_access_stats()
         try:
             stats_keys = await self.redis.keys("translate:*:stats")
             if not stats_keys:
@@ -272,6 +397,7 @@ class TranslationCache:
             current_size = await self.redis.dbsize()
             if current_size <= self.max_cache_size:
                 return {"status": "no_optimization_needed", "current_size": current_size}
+            await self.flush_access_stats()
             stats_keys = await self.redis.keys("translate:*:stats")
             if not stats_keys:
                 return {"status": "no_stats_found", "current_size": current_size}
@@ -292,6 +418,7 @@ class TranslationCache:
                     key_str = key.decode() if isinstance(key, bytes) else key
                     keys_to_delete.append(key_str)
                     keys_to_delete.append(key_str.replace(":stats", ""))
+                    self._l1_discard(key_str.replace(":stats", ""))
                 await self.redis.delete(*keys_to_delete)
                 self.stats["evictions"] += len(entries_to_remove)
             new_size = await self.redis.dbsize()
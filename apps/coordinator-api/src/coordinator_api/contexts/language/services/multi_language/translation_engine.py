@@ -1,6 +1,9 @@
 """
 Multi-Language Translation Engine
 Core translation orchestration service for AITBC platform
+
+Provider SDKs are imported when their translator is created, so the engine
+loads without the SDKs of providers that are not configured.
 """
 
 import asyncio
@@ -10,10 +13,6 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
-import deepl
-import google.cloud.translate_v2 as translate
-import openai
-
 from aitbc.aitbc_logging import get_logger
 
 if TYPE_CHECKING:
@@ -38,6 +37,18 @@ class TranslationRequest:
     domain: str | None = None
 
 
+def translation_cache_key(
+    text: str, source_language: str, target_language: str, context: str | None = None, domain: str | None = None
+) -> str:
+    """Cache key of a translation, shared by the engine, the cache and the API layer"""
+    key_parts = ["translate", source_language.lower(), target_language.lower(), hashlib.sha256(text.encode()).hexdigest()]
+    if context:
+        key_parts.append(hashlib.sha256(context.encode()).hexdigest())
+    if domain:
+        key_parts.append(domain.lower())
+    return ":".join(key_parts)
+
+
 @dataclass
 class TranslationResponse:
     translated_text: str
@@ -64,6 +75,8 @@ class OpenAITranslator(BaseTranslator):
     """OpenAI GPT-4 based translation"""
 
     def __init__(self, api_key: str):
+        import openai
+
         self.client = openai.AsyncOpenAI(api_key=api_key)
 
     async def translate(self, request: TranslationRequest) -> TranslationResponse:
@@ -114,6 +127,8 @@ class GoogleTranslator(BaseTranslator):
     """Google Translate API integration"""
 
     def __init__(self, api_key: str):
+        import google.cloud.translate_v2 as translate
+
         self.client = translate.Client(api_key=api_key)
 
     async def translate(self, request: TranslationRequest) -> TranslationResponse:
@@ -169,6 +184,8 @@ class DeepLTranslator(BaseTranslator):
     """DeepL API integration for European languages"""
 
     def __init__(self, api_key: str):
+        import deepl
+
         self.translator = deepl.Translator(api_key)
 
     async def translate(self, request: TranslationRequest) -> TranslationResponse:
@@ -222,6 +239,10 @@ class LocalTranslator(BaseTranslator):
         return ["en", "de", "fr", "es"]
 
 
+class _LeaderCancelled(Exception):
+    """The request running a shared translation was cancelled; a waiting request takes over."""
+
+
 class TranslationEngine:
     """Main translation orchestration engine"""
 
@@ -230,6 +251,8 @@ class TranslationEngine:
         self.translators = self._initialize_translators()
         self.cache: TranslationCache | None = None
         self.quality_checker: TranslationQualityChecker | None = None
+        # Provider calls in progress by cache key, shared by concurrent identical requests
+        self._in_flight: dict[str, asyncio.Future[TranslationResponse]] = {}
 
     def _initialize_translators(self) -> dict[TranslationProvider, BaseTranslator]:
         translators = {}
@@ -242,14 +265,50 @@ class TranslationEngine:
         translators[TranslationProvider.LOCAL] = LocalTranslator()  # type: ignore[assignment]
         return translators  # type: ignore[return-value]
 
-    async def translate(self, request: TranslationRequest) -> TranslationResponse:
-        """Main translation method with fallback strategy"""
+    async def translate(self, request: TranslationRequest, use_cache: bool = True) -> TranslationResponse:
+        """Main translation method with fallback strategy
+
+        Concurrent calls for the same text, languages, context and domain share
+        one provider call; if the caller running it is cancelled, a waiting caller
+        runs it instead. Results are cached whether or not ``use_cache`` is set;
+        it only skips the lookup.
+        """
         cache_key = self._generate_cache_key(request)
-        if self.cache:
-            cached_result = await self.cache.get(cache_key, request.source_language, request.target_language)
+        if self.cache and use_cache:
+            cached_result = await self.cache.get(
+                request.text, request.source_language, request.target_language, request.context, request.domain
+            )
             if cached_result:
                 logger.info("Cache hit for translation: %s", cache_key)
                 return cached_result
+        while (in_flight := self._in_flight.get(cache_key)) is not None:
+            logger.debug("Joining in-flight translation: %s", cache_key)
+            try:
+                return await asyncio.shield(in_flight)
+            except _LeaderCancelled:
+                # The first waiter to wake finds no call in flight and runs it itself.
+                continue
+        future: asyncio.Future[TranslationResponse] = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            result = await self._translate_with_providers(request)
+        except asyncio.CancelledError:
+            # Only this caller went away; cancelling the future would fail every waiter.
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved: with no other waiter nobody else will.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[cache_key]
+
+    async def _translate_with_providers(self, request: TranslationRequest) -> TranslationResponse:
         preferred_providers = self._get_preferred_providers(request)
         last_error = None
         for provider in preferred_providers:
@@ -264,7 +323,15 @@ class TranslationEngine:
                     )
                     result.confidence = min(result.confidence, quality_score.overall_score)
                 if self.cache and result.confidence > 0.8:
-                    await self.cache.set(cache_key, request.target_language, result, ttl=86400)  # type: ignore[call-arg, arg-type]
+                    await self.cache.set(
+                        request.text,
+                        request.source_language,
+                        request.target_language,
+                        result,
+                        ttl=86400,
+                        context=request.context,
+                        domain=request.domain,
+                    )
                 logger.info("Translation successful using %s", provider.value)
                 return result
             except Exception as e:
@@ -309,12 +376,9 @@ class TranslationEngine:
 
     def _generate_cache_key(self, request: TranslationRequest) -> str:
         """Generate cache key for translation request"""
-        content = f"{request.text}:{request.source_language}:{request.target_language}"
-        if request.context:
-            content += f":{request.context}"
-        if request.domain:
-            content += f":{request.domain}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        return translation_cache_key(
+            request.text, request.source_language, request.target_language, request.context, request.domain
+        )
 
     def get_supported_languages(self) -> dict[str, list[str]]:
         """Get all supported languages by provider"""
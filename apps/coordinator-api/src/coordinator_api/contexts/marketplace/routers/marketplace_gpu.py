@@ -17,14 +17,18 @@ from aitbc.aitbc_logging import get_logger
 from ....auth import AuthDep, MinerDep
 from ....validators import validate_ethereum_address
 
+from ...reputation.services.reputation_snapshot import ReputationTable, get_reputation_snapshot
 from ...trading.services.market_data_collector import MarketDataCollector
 from ....storage.db import get_session
 from ...trading.services.trading_marketplace.dynamic_pricing import (
     DynamicPricingEngine,
+    PricingRequest,
     PricingStrategy,
     ResourceType,
 )
-from ..domain.gpu_marketplace import GPUBooking, GPURegistry, GPUReview
+from ..domain.gpu_marketplace import GPUBooking, GPURegistry, GPUReview, ResourceEmbedding
+from ..services.embedding_index import discard_resource_embedding
+from ..services.resource_matcher import ResourceMatcher
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["marketplace-gpu"])
@@ -43,6 +47,13 @@ async def get_pricing_engine() -> DynamicPricingEngine:
     return pricing_engine
 
 
+def _provider_reputations(session: Session) -> ReputationTable:
+    """Current normalized reputation scores of providers, from the shared reputation snapshot."""
+    snapshot = get_reputation_snapshot(session)
+    snapshot.refresh_if_stale(session)
+    return snapshot.table
+
+
 async def get_market_collector() -> MarketDataCollector:
     """Get market data collector instance"""
     global market_collector
@@ -167,6 +178,8 @@ async def register_gpu(
     session.add(gpu_record)
     session.commit()
     session.refresh(gpu_record)
+    # Makes the GPU findable by similarity search right away.
+    ResourceMatcher(session).generate_embeddings(gpu_id)
     return {
         "gpu_id": gpu_id,
         "status": "registered",
@@ -246,6 +259,7 @@ async def buy_gpu(
             base_price=gpu.price_per_hour,
             strategy=PricingStrategy.MARKET_BALANCE,
             region=gpu.region,
+            provider_reputation=_provider_reputations(session).score(gpu.miner_id),
         )
         current_price = dynamic_result.recommended_price
     except Exception:
@@ -422,6 +436,7 @@ async def book_gpu(
             base_price=gpu.price_per_hour,
             strategy=PricingStrategy.MARKET_BALANCE,
             region=gpu.region,
+            provider_reputation=_provider_reputations(session).score(gpu.miner_id),
         )
         current_price = dynamic_result.recommended_price
     except Exception:
@@ -605,8 +620,12 @@ async def delete_gpu(
             status_code=http_status.HTTP_409_CONFLICT,
             detail=f"GPU {gpu_id} is currently booked. Use force=true to delete anyway.",
         )
+    embedding = session.execute(select(ResourceEmbedding).where(ResourceEmbedding.resource_id == gpu_id)).scalars().first()
+    if embedding is not None:
+        session.delete(embedding)
     session.delete(gpu)
     session.commit()
+    discard_resource_embedding(session, gpu_id)
     return {"status": "deleted", "gpu_id": gpu_id}
 
 
@@ -735,22 +754,39 @@ async def get_pricing(
     collector: Annotated[MarketDataCollector, Depends(get_market_collector)],
 ) -> dict[str, Any]:
     """Get enhanced pricing information for a model with dynamic pricing."""
-    all_gpus = session.execute(select(GPURegistry)).scalars().all()
-    compatible = [g for g in all_gpus if model.lower() in g.model.lower()]
+    compatible = (
+        session.execute(
+            select(GPURegistry).where(func.lower(col(GPURegistry.model)).contains(model.lower(), autoescape=True))
+        )
+        .scalars()
+        .all()
+    )
     if not compatible:
         raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail=f"No GPUs found for model {model}")
     static_prices = [g.price_per_hour for g in compatible]
     cheapest = min(compatible, key=lambda g: g.price_per_hour)
+    try:
+        reputations = _provider_reputations(session)
+        dynamic_results = await engine.calculate_dynamic_prices_batch(
+            [
+                PricingRequest(
+                    resource_id=gpu.id,
+                    base_price=gpu.price_per_hour,
+                    resource_type=ResourceType.GPU,
+                    region=gpu.region,
+                    strategy=PricingStrategy.MARKET_BALANCE,
+                    provider_reputation=reputations.score(gpu.miner_id),
+                )
+                for gpu in compatible
+            ]
+        )
+    except Exception:
+        logger.warning("Dynamic pricing unavailable for model %s", model, exc_info=True)
+        dynamic_results = {}
     dynamic_prices: list[dict[str, Any]] = []
     for gpu in compatible:
-        try:
-            dynamic_result = await engine.calculate_dynamic_price(
-                resource_id=gpu.id,
-                resource_type=ResourceType.GPU,
-                base_price=gpu.price_per_hour,
-                strategy=PricingStrategy.MARKET_BALANCE,
-                region=gpu.region,
-            )
+        dynamic_result = dynamic_results.get(gpu.id)
+        if dynamic_result is not None:
             recommended = dynamic_result.recommended_price
             dynamic_prices.append(
                 {
@@ -764,7 +800,7 @@ async def get_pricing(
                     "reasoning": dynamic_result.reasoning,
                 }
             )
-        except Exception:
+        else:
             dynamic_prices.append(
                 {
                     "gpu_id": gpu.id,
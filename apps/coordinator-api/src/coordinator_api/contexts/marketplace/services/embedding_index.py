@@ -0,0 +1,287 @@
+"""
+Resident vector index of GPU resource embeddings.
+
+``ResourceMatcher.find_similar_resources`` used to load every
+``ResourceEmbedding`` row and compare it to the target one by one in Python.
+The index keeps the embeddings L2-normalized in one contiguous NumPy matrix,
+with a resource id per row. Cosine similarity to every resource is then one
+matrix-vector product, and the top k come from ``argpartition``.
+
+Embeddings are added and removed in place as GPUs register or are deleted. A
+removal moves the last row into the gap, so the matrix stays dense. The
+database stays the source of truth. The index picks up embeddings written by
+other workers from an ``updated_at`` watermark, at most every
+``_REFRESH_SECONDS``. Every ``_RESYNC_SECONDS`` it also drops resources whose
+embedding is gone.
+
+When ``COORDINATOR_EMBEDDING_INDEX_PATH`` is set, the index is saved there
+after every resync and loaded on start. A warm start then only reads the
+embeddings that changed since the snapshot.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlmodel import Session, select
+
+from aitbc.aitbc_logging import get_logger
+
+from ..domain.gpu_marketplace import ResourceEmbedding
+
+logger = get_logger(__name__)
+
+_SNAPSHOT_PATH = os.getenv("COORDINATOR_EMBEDDING_INDEX_PATH") or None
+_REFRESH_SECONDS = float(os.getenv("COORDINATOR_EMBEDDING_INDEX_REFRESH_SECONDS", "10"))
+_RESYNC_SECONDS = float(os.getenv("COORDINATOR_EMBEDDING_INDEX_RESYNC_SECONDS", "300"))
+# Embeddings committed slightly out of updated_at order are still caught by the incremental scan.
+_WATERMARK_OVERLAP = timedelta(seconds=5)
+_INITIAL_CAPACITY = 64
+
+
+class EmbeddingIndex:
+    """Normalized embeddings in a contiguous matrix, answering top-k cosine similarity queries.
+
+    Thread-safe: sync endpoints of the coordinator run in a thread pool.
+    """
+
+    def __init__(
+        self,
+        dim: int | None = None,
+        snapshot_path: str | Path | None = None,
+        refresh_seconds: float = _REFRESH_SECONDS,
+        resync_seconds: float = _RESYNC_SECONDS,
+    ) -> None:
+        self._dim = dim
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._refresh_seconds = refresh_seconds
+        self._resync_seconds = resync_seconds
+        self._lock = threading.Lock()
+        # Held by the one caller syncing; concurrent callers query the current contents.
+        self._syncing = threading.Lock()
+        self._vectors = np.zeros((_INITIAL_CAPACITY if dim else 0, dim or 0))
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._watermark: datetime | None = None
+        self._refreshed_at: float | None = None
+        self._synced_at: float | None = None
+
+    @property
+    def dim(self) -> int | None:
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, resource_id: object) -> bool:
+        return resource_id in self._positions
+
+    def add(self, resource_id: str, embedding: Sequence[float]) -> bool:
+        """Insert or replace the embedding of ``resource_id``.
+
+        Returns False, leaving the index unchanged, for an empty embedding or
+        one whose dimension differs from the others.
+        """
+        vector = np.asarray(embedding, dtype=float)
+        if vector.ndim != 1 or vector.size == 0:
+            return False
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            if self._dim is None:
+                self._dim = vector.size
+                self._vectors = np.zeros((_INITIAL_CAPACITY, self._dim))
+            if vector.size != self._dim:
+                logger.debug(
+                    "Skipping %d-dimensional embedding of %s; the index is %d-dimensional", vector.size, resource_id, self._dim
+                )
+                return False
+            position = self._positions.get(resource_id)
+            if position is None:
+                position = len(self._ids)
+                if position == len(self._vectors):
+                    grown = np.zeros((max(_INITIAL_CAPACITY, 2 * position), self._dim))
+                    grown[:position] = self._vectors[:position]
+                    self._vectors = grown
+                self._ids.append(resource_id)
+                self._positions[resource_id] = position
+            self._vectors[position] = vector
+        return True
+
+    def remove(self, resource_id: str) -> bool:
+        """Drop ``resource_id``; returns whether it was indexed."""
+        with self._lock:
+            position = self._positions.pop(resource_id, None)
+            if position is None:
+                return False
+            last = len(self._ids) - 1
+            if position != last:
+                moved = self._ids[last]
+                self._vectors[position] = self._vectors[last]
+                self._ids[position] = moved
+                self._positions[moved] = position
+            self._ids.pop()
+        return True
+
+    def top_k(self, query: Sequence[float], k: int, exclude: Iterable[str] = ()) -> list[tuple[str, float]]:
+        """The ``k`` resources most cosine-similar to ``query``, best first, as (resource id, similarity)."""
+        vector = np.asarray(query, dtype=float)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            if self._dim is None or vector.shape != (self._dim,):
+                return []
+            scores = self._vectors[: len(self._ids)] @ vector
+            excluded = [self._positions[resource_id] for resource_id in exclude if resource_id in self._positions]
+            scores[excluded] = -np.inf
+            k = min(k, len(scores) - len(excluded))
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            return [(self._ids[position], float(scores[position])) for position in best]
+
+    def similar(self, resource_id: str, k: int) -> list[tuple[str, float]]:
+        """The ``k`` resources most similar to ``resource_id``, itself excluded; empty when it is not indexed."""
+        with self._lock:
+            position = self._positions.get(resource_id)
+            if position is None:
+                return []
+            vector = self._vectors[position].copy()
+        return self.top_k(vector, k, exclude=(resource_id,))
+
+    def sync_if_stale(self, session: Session) -> None:
+        """Sync with the database when the last sync is older than ``refresh_seconds``.
+
+        Only one caller syncs at a time; the others query the current contents.
+        """
+        refreshed_at = self._refreshed_at
+        if refreshed_at is not None and time.monotonic() - refreshed_at < self._refresh_seconds:
+            return
+        if not self._syncing.acquire(blocking=False):
+            return
+        try:
+            self.sync(session)
+        finally:
+            self._syncing.release()
+
+    def sync(self, session: Session, full: bool = False) -> int:
+        """Bring the index up to date with the database; returns the number of embeddings loaded or removed.
+
+        Loads the embeddings updated since the watermark (all of them the first
+        time). On a resync (the first sync, every ``resync_seconds``, or
+        ``full=True``) it also drops resources whose embedding row is gone and
+        saves the snapshot, if configured.
+        """
+        now = time.monotonic()
+        full = full or self._synced_at is None or now - self._synced_at >= self._resync_seconds
+        changed = 0
+        try:
+            if full and self._ids:
+                stored = set(session.execute(select(ResourceEmbedding.resource_id)).scalars().all())
+                for resource_id in [resource_id for resource_id in self._ids if resource_id not in stored]:
+                    changed += self.remove(resource_id)
+            statement = select(ResourceEmbedding.resource_id, ResourceEmbedding.embedding, ResourceEmbedding.updated_at)
+            watermark = self._watermark
+            if watermark is not None:
+                since = watermark - _WATERMARK_OVERLAP
+                statement = statement.where(ResourceEmbedding.updated_at >= since)  # type: ignore[operator]
+            rows = session.execute(statement).all()
+        except Exception:
+            logger.debug("Could not sync the resource embedding index", exc_info=True)
+            self._refreshed_at = now
+            return changed
+        for resource_id, embedding, updated_at in rows:
+            changed += self.add(resource_id, embedding)
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        self._watermark = watermark
+        self._refreshed_at = now
+        if full:
+            self._synced_at = now
+            if self._snapshot_path is not None and changed:
+                self.save(self._snapshot_path)
+        return changed
+
+    def save(self, path: str | Path) -> None:
+        """Write the index (vectors, ids and sync watermark) to ``path``, atomically."""
+        path = Path(path)
+        with self._lock:
+            vectors = self._vectors[: len(self._ids)].copy()
+            ids = np.array(self._ids, dtype=str)
+            dim = self._dim or 0
+            watermark = self._watermark.isoformat() if self._watermark is not None else ""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial")
+        with partial.open("wb") as file:
+            np.savez(file, vectors=vectors, ids=ids, dim=np.array(dim), watermark=np.array(watermark))
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs: Any) -> EmbeddingIndex:
+        """Read an index written by :meth:`save`; the next :meth:`sync` catches up from its watermark."""
+        with np.load(path, allow_pickle=False) as data:
+            dim = int(data["dim"]) or None
+            index = cls(dim=dim, **kwargs)
+            ids = [str(resource_id) for resource_id in data["ids"]]
+            if dim is not None:
+                index._vectors = np.zeros((max(_INITIAL_CAPACITY, len(ids)), dim))
+                index._vectors[: len(ids)] = data["vectors"]
+            index._ids = ids
+            index._positions = {resource_id: position for position, resource_id in enumerate(ids)}
+            watermark = str(data["watermark"])
+        index._watermark = datetime.fromisoformat(watermark) if watermark else None
+        return index
+
+
+# One index per database engine, so separate databases (and test runs) never share entries.
+_indexes: weakref.WeakKeyDictionary[Any, EmbeddingIndex] = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def _engine_of(session: Session) -> Any:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _new_index() -> EmbeddingIndex:
+    if _SNAPSHOT_PATH and Path(_SNAPSHOT_PATH).exists():
+        try:
+            return EmbeddingIndex.load(_SNAPSHOT_PATH, snapshot_path=_SNAPSHOT_PATH)
+        except Exception:
+            logger.warning("Could not load the embedding index snapshot %s; rebuilding it", _SNAPSHOT_PATH, exc_info=True)
+    return EmbeddingIndex(snapshot_path=_SNAPSHOT_PATH)
+
+
+def get_embedding_index(session: Session) -> EmbeddingIndex:
+    """Return the embedding index of the database ``session`` is bound to."""
+    engine = _engine_of(session)
+    index = _indexes.get(engine)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = _new_index()
+        return index
+
+
+def discard_resource_embedding(session: Session, resource_id: str) -> None:
+    """Drop a deleted resource from the index of ``session``'s database, if one is loaded."""
+    try:
+        index = _indexes.get(_engine_of(session))
+    except Exception:
+        logger.debug("Could not drop %s from the embedding index", resource_id, exc_info=True)
+        return
+    if index is not None:
+        index.remove(resource_id)
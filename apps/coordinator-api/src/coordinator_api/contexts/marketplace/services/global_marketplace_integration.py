@@ -22,6 +22,7 @@ from ...cross_chain.services.cross_chain.bridge_client_adapter import (
 )
 from ...cross_chain.services.multi_chain_transaction_manager import ChainTransactionManager
 from ...reputation.services.reputation_engine import CrossChainReputationEngine
+from ...reputation.services.reputation_snapshot import get_reputation_snapshot
 from ..domain.global_marketplace import GlobalMarketplaceOffer
 from ..services.global_marketplace import GlobalMarketplaceService, RegionManager
 
@@ -261,11 +262,14 @@ class GlobalMarketplaceIntegrationService:
                 region=region, service_type=service_type, limit=limit, offset=offset
             )
             integrated_offers = []
+            if min_reputation:
+                snapshot = get_reputation_snapshot(self.session)
+                snapshot.refresh_if_stale(self.session)
+                reputations = snapshot.table
             for offer in offers:
-                if min_reputation:
-                    reputation_summary = await self.reputation_engine.get_agent_reputation_summary(offer.agent_id)
-                    if reputation_summary.get("trust_score", 0) < min_reputation:
-                        continue
+                # min_reputation is on the 0-1000 trust score scale; agents without a profile score 0.
+                if min_reputation and (reputations.score(offer.agent_id) or 0.0) * 1000 < min_reputation:
+                    continue
                 if chain_id and chain_id not in offer.supported_chains:
                     continue
                 integrated_offer = {
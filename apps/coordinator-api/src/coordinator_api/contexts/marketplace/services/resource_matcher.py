@@ -5,11 +5,13 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import Any
 
+import numpy as np
 from sqlmodel import Session, select
 
 from aitbc.aitbc_logging import get_logger
 
 from ..domain.gpu_marketplace import GPURegistry, ResourceEmbedding, SearchHistory, UserProfile
+from .embedding_index import get_embedding_index
 
 logger = get_logger(__name__)
 
@@ -96,41 +98,40 @@ class ResourceMatcher:
                 new_embedding = ResourceEmbedding(resource_id=resource_id, embedding=embedding)
                 self.session.add(new_embedding)
             self.session.commit()
+            get_embedding_index(self.session).add(resource_id, embedding)
             return embedding
         except Exception as e:
             logger.error("Failed to generate embeddings: %s", e)
             return []
 
     def find_similar_resources(self, resource_id: str, limit: int = 5) -> list[dict[str, Any]]:
-        """Find similar resources using embedding similarity."""
+        """Find similar resources using embedding similarity, most similar first."""
         try:
-            target_embedding = (
-                self.session.execute(select(ResourceEmbedding).where(ResourceEmbedding.resource_id == resource_id))
-                .scalars()
-                .first()
-            )
-            if not target_embedding:
+            index = get_embedding_index(self.session)
+            index.sync_if_stale(self.session)
+            similar = index.similar(resource_id, limit)
+            if not similar:
                 return []
-            embeddings = self.session.execute(select(ResourceEmbedding)).scalars().all()
-            similarities = []
-            for emb in embeddings:
-                if emb.resource_id != resource_id:
-                    similarity = self._cosine_similarity(target_embedding.embedding, emb.embedding)
-                    similarities.append((emb.resource_id, similarity))
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            similar_ids = [sid for sid, _ in similarities[:limit]]
-            similar_gpus = self.session.execute(select(GPURegistry).where(GPURegistry.id.in_(similar_ids))).scalars().all()  # type: ignore[attr-defined]
-            similarity_map = dict(similarities)
-            results = [
-                {
-                    "gpu_id": gpu.id,
-                    "model": gpu.model,
-                    "memory_gb": gpu.memory_gb,
-                    "price_per_hour": gpu.price_per_hour,
-                    "similarity_score": similarity_map.get(gpu.id, 0.0),
-                }
-                for gpu in similar_gpus
-            ]
+            similar_ids = [similar_id for similar_id, _ in similar]
+            similar_gpus = {
+                gpu.id: gpu
+                for gpu in self.session.execute(
+                    select(GPURegistry).where(GPURegistry.id.in_(similar_ids))  # type: ignore[attr-defined]
+                ).scalars()
+            }
+            results = []
+            for similar_id, similarity in similar:
+                gpu = similar_gpus.get(similar_id)
+                if gpu is not None:
+                    results.append(
+                        {
+                            "gpu_id": gpu.id,
+                            "model": gpu.model,
+                            "memory_gb": gpu.memory_gb,
+                            "price_per_hour": gpu.price_per_hour,
+                            "similarity_score": similarity,
+                        }
+                    )
             return results
         except Exception as e:
             logger.error("Failed to find similar resources: %s", e)
@@ -149,23 +150,21 @@ class ResourceMatcher:
         self, gpus: list[GPURegistry], user_id: str | None, filters: dict[str, Any]
     ) -> list[tuple[GPURegistry, float]]:
         """Rank resources using ML-based scoring."""
-        ranked = []
-        for gpu in gpus:
-            score = 0.0
-            if gpu.price_per_hour:
-                price_score = 1.0 / (1.0 + float(gpu.price_per_hour))
-                score += price_score * 0.3
-            if gpu.average_rating:
-                rating_score = gpu.average_rating / 5.0
-                score += rating_score * 0.3
-            if gpu.memory_gb:  # ponytail: was gpu.capacity (non-existent), using memory_gb as capacity proxy
-                capacity_score = min(gpu.memory_gb / 100.0, 1.0)
-                score += capacity_score * 0.2
-            if gpu.status == "available":
-                score += 0.2
-            ranked.append((gpu, score))
-        ranked.sort(key=lambda x: x[1], reverse=True)
-        return ranked
+        if not gpus:
+            return []
+        # not-money: the price only feeds a dimensionless 0-1 score.
+        price = np.array([float(gpu.price_per_hour or 0) for gpu in gpus])
+        rating = np.array([gpu.average_rating or 0.0 for gpu in gpus], dtype=float)
+        # ponytail: was gpu.capacity (non-existent), using memory_gb as capacity proxy
+        memory = np.array([gpu.memory_gb or 0 for gpu in gpus], dtype=float)
+        available = np.array([gpu.status == "available" for gpu in gpus])
+        scores = np.divide(1.0, 1.0 + price, out=np.zeros_like(price), where=price != 0) * 0.3
+        scores += rating / 5.0 * 0.3
+        scores += np.minimum(memory / 100.0, 1.0) * 0.2
+        scores += np.where(available, 0.2, 0.0)
+        # Stable, so equally scored GPUs keep their query order.
+        order = np.argsort(-scores, kind="stable")
+        return [(gpus[position], float(scores[position])) for position in order]
 
     def _get_popular_gpus(self, limit: int) -> list[dict[str, Any]]:
         """Get popular GPUs based on rating and bookings."""
@@ -207,14 +206,3 @@ class ResourceMatcher:
             len(gpu.capabilities) / 10.0,
         ]
         return embedding
-
-    def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-        dot_product = sum((a * b for a, b in zip(vec1, vec2, strict=False)))
-        magnitude1 = sum(a * a for a in vec1) ** 0.5
-        magnitude2 = sum(b * b for b in vec2) ** 0.5
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-        return dot_product / (magnitude1 * magnitude2)  # type: ignore[no-any-return]
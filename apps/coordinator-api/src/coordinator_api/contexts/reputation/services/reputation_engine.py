@@ -13,6 +13,7 @@ from aitbc.aitbc_logging import get_logger
 
 from ..domain.cross_chain_reputation import CrossChainReputationAggregation, CrossChainReputationConfig
 from ..domain.reputation import AgentReputation, ReputationEvent, ReputationLevel
+from .reputation_snapshot import publish_trust_score
 
 logger = get_logger(__name__)
 
@@ -50,6 +51,7 @@ class CrossChainReputationEngine:
                 )
                 self.session.add(new_reputation)
                 self.session.commit()
+                publish_trust_score(self.session, agent_id, new_reputation.trust_score)
             return score
         except Exception as e:
             logger.error("Error calculating reputation for agent %s on chain %s: %s", agent_id, chain_id, e)
@@ -133,6 +135,7 @@ class CrossChainReputationEngine:
             )
             self.session.add(event)
             self.session.commit()
+            publish_trust_score(self.session, agent_id, reputation.trust_score)
             await self.aggregate_cross_chain_reputation(agent_id)
             logger.info("Updated reputation for agent %s from %s event", agent_id, event_type)
             return True
@@ -221,6 +224,7 @@ class CrossChainReputationEngine:
         if "transaction_count" in transaction_data:
             reputation.transaction_count = transaction_data["transaction_count"]
         self.session.commit()
+        publish_trust_score(self.session, reputation.agent_id, reputation.trust_score)
         return new_score
 
     async def _get_chain_config(self, chain_id: int) -> CrossChainReputationConfig | None:
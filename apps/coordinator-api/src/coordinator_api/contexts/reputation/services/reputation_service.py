@@ -19,6 +19,7 @@ from ..domain.reputation import (
     ReputationLevel,
     TrustScoreCategory,
 )
+from .reputation_snapshot import publish_trust_score
 
 logger = get_logger(__name__)
 
@@ -220,6 +221,7 @@ class ReputationService:
         self.session.add(reputation)
         self.session.commit()
         self.session.refresh(reputation)
+        publish_trust_score(self.session, agent_id, reputation.trust_score)
         logger.info("Created reputation profile for agent %s", agent_id)
         return reputation
 
@@ -257,6 +259,7 @@ class ReputationService:
         reputation.reputation_history.append(history_entry)
         self.session.commit()
         self.session.refresh(reputation)
+        publish_trust_score(self.session, agent_id, new_trust_score)
         logger.info("Updated trust score for agent %s: %s -> %s", agent_id, old_trust_score, new_trust_score)
         return reputation
 
@@ -0,0 +1,197 @@
+"""
+Reputation snapshot shared by job dispatch, pricing and marketplace ranking.
+
+Hot paths used to look reputation up per miner, per job or per offer. The
+snapshot holds every agent's normalized score (``trust_score`` on its 0-1000
+scale mapped to 0-1) in an in-memory table. Each table is immutable and has a
+version. Writers build a new table and swap it in, so readers take no lock.
+
+The database stays the source of truth. Every reputation event also bumps
+``AgentReputation.updated_at``, so the snapshot refreshes incrementally from an
+``updated_at`` watermark. It refreshes at most every ``_REFRESH_SECONDS`` and
+rebuilds itself every ``_RESYNC_SECONDS``. Writes in this worker are published
+at once through :func:`publish_trust_score`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any
+
+from sqlmodel import Session, select
+
+from aitbc.aitbc_logging import get_logger
+
+from ..domain.reputation import AgentReputation
+
+logger = get_logger(__name__)
+
+_REFRESH_SECONDS = float(os.getenv("COORDINATOR_REPUTATION_REFRESH_SECONDS", "5"))
+_RESYNC_SECONDS = float(os.getenv("COORDINATOR_REPUTATION_RESYNC_SECONDS", "300"))
+# Profiles committed slightly out of updated_at order are still caught by the incremental scan.
+_WATERMARK_OVERLAP = timedelta(seconds=5)
+
+
+def normalized_trust_score(trust_score: float) -> float:
+    """Map a 0-1000 trust score onto 0-1."""
+    return max(0.0, min(1.0, trust_score / 1000.0))
+
+
+@dataclass(frozen=True, slots=True)
+class ReputationTable:
+    """One immutable version of the snapshot: agent id -> normalized score."""
+
+    version: int = 0
+    scores: MappingProxyType[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+    def score(self, agent_id: str) -> float | None:
+        """Normalized score of ``agent_id``, or None when it has no reputation profile."""
+        return self.scores.get(agent_id)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+class ReputationSnapshot:
+    """Versioned, in-memory table of every agent's normalized reputation score.
+
+    Reads are lock-free. Refreshes and published writes copy the table, which
+    costs O(agents) per change. Scores change far less often than they are read.
+    """
+
+    def __init__(self, refresh_seconds: float = _REFRESH_SECONDS, resync_seconds: float = _RESYNC_SECONDS) -> None:
+        self._refresh_seconds = refresh_seconds
+        self._resync_seconds = resync_seconds
+        # Serialises writers; readers only ever load ``_table``.
+        self._lock = threading.Lock()
+        # Held by the one caller refreshing; concurrent callers keep reading the current table.
+        self._refreshing = threading.Lock()
+        self._table = ReputationTable()
+        self._watermark: datetime | None = None
+        self._refreshed_at: float | None = None
+        self._synced_at: float | None = None
+
+    @property
+    def table(self) -> ReputationTable:
+        """The current table; hold on to it for a consistent view across several reads."""
+        return self._table
+
+    @property
+    def version(self) -> int:
+        return self._table.version
+
+    def score(self, agent_id: str) -> float | None:
+        """Normalized score of ``agent_id``, or None when it has no reputation profile."""
+        return self._table.scores.get(agent_id)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def refresh_if_stale(self, session: Session) -> None:
+        """Refresh from the database when the last refresh is older than ``refresh_seconds``.
+
+        Only one caller refreshes at a time; the others go on with the current table.
+        """
+        refreshed_at = self._refreshed_at
+        if refreshed_at is not None and time.monotonic() - refreshed_at < self._refresh_seconds:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            self.refresh(session)
+        finally:
+            self._refreshing.release()
+
+    def refresh(self, session: Session, full: bool = False) -> int:
+        """Bring the table up to date with the database; returns the number of scores that changed.
+
+        Loads the profiles updated since the watermark, or all of them on a full
+        rebuild (the first refresh, every ``resync_seconds``, or ``full=True``).
+        """
+        now = time.monotonic()
+        full = full or self._synced_at is None or now - self._synced_at >= self._resync_seconds
+        statement = select(AgentReputation.agent_id, AgentReputation.trust_score, AgentReputation.updated_at)
+        watermark = self._watermark
+        if not full and watermark is not None:
+            statement = statement.where(AgentReputation.updated_at >= watermark - _WATERMARK_OVERLAP)  # type: ignore[operator]
+        try:
+            rows = session.execute(statement.order_by(AgentReputation.updated_at.asc())).all()  # type: ignore[attr-defined]
+        except Exception:
+            logger.debug("Could not refresh the reputation snapshot", exc_info=True)
+            self._refreshed_at = now
+            return 0
+        updates: dict[str, float] = {}
+        for agent_id, trust_score, updated_at in rows:
+            if trust_score is not None:
+                # Rows come oldest first, so the latest profile of an agent wins.
+                updates[agent_id] = normalized_trust_score(trust_score)
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        with self._lock:
+            current = self._table.scores
+            if full:
+                changed = sum(1 for agent_id, score in updates.items() if current.get(agent_id) != score)
+                changed += sum(1 for agent_id in current if agent_id not in updates)
+                scores = updates
+                self._synced_at = now
+            else:
+                updates = {agent_id: score for agent_id, score in updates.items() if current.get(agent_id) != score}
+                changed = len(updates)
+                scores = {**current, **updates}
+            if changed:
+                self._table = ReputationTable(self._table.version + 1, MappingProxyType(scores))
+            self._watermark = watermark
+            self._refreshed_at = now
+        return changed
+
+    def apply(self, agent_id: str, trust_score: float) -> None:
+        """Publish a trust score this worker just committed, ahead of the next refresh."""
+        score = normalized_trust_score(trust_score)
+        with self._lock:
+            current = self._table.scores
+            if current.get(agent_id) == score:
+                return
+            self._table = ReputationTable(self._table.version + 1, MappingProxyType({**current, agent_id: score}))
+
+
+# One snapshot per database engine, so separate databases (and test runs) never share scores.
+_snapshots: weakref.WeakKeyDictionary[Any, ReputationSnapshot] = weakref.WeakKeyDictionary()
+_snapshots_lock = threading.Lock()
+
+
+def _engine_of(session: Session) -> Any:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def get_reputation_snapshot(session: Session) -> ReputationSnapshot:
+    """Return the reputation snapshot of the database ``session`` is bound to."""
+    engine = _engine_of(session)
+    snapshot = _snapshots.get(engine)
+    if snapshot is not None:
+        return snapshot
+    with _snapshots_lock:
+        snapshot = _snapshots.get(engine)
+        if snapshot is None:
+            snapshot = _snapshots[engine] = ReputationSnapshot()
+        return snapshot
+
+
+def publish_trust_score(session: Session, agent_id: str, trust_score: float) -> None:
+    """Publish a committed trust score to the snapshot of ``session``'s database, if one is loaded.
+
+    Without a snapshot there is nothing to update: the first refresh loads every profile anyway.
+    """
+    try:
+        snapshot = _snapshots.get(_engine_of(session))
+    except Exception:
+        logger.debug("Could not publish the trust score of %s", agent_id, exc_info=True)
+        return
+    if snapshot is not None:
+        snapshot.apply(agent_id, trust_score)
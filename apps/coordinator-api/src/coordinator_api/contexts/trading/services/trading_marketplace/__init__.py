@@ -4,11 +4,12 @@ Provides trading, marketplace optimization, bid strategy, and dynamic pricing se
 """
 
 from .bid_strategy import BidStrategyEngine
-from .dynamic_pricing import DynamicPricingEngine
+from .dynamic_pricing import DynamicPricingEngine, PricingRequest
 from .gpu_optimizer import MarketplaceGPUOptimizer
 
 __all__ = [
     "BidStrategyEngine",
     "DynamicPricingEngine",
     "MarketplaceGPUOptimizer",
+    "PricingRequest",
 ]
@@ -4,6 +4,7 @@ Implements sophisticated pricing algorithms based on real-time market conditions
 """
 
 import asyncio
+from collections.abc import Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
@@ -38,6 +39,7 @@ from ...domain.pricing_models import (  # noqa: E402
 from ...domain.pricing_models import (  # noqa: E402
     ResourceType as PricingResourceType,
 )
+from .price_history import PriceHistory  # noqa: E402
 
 logger = get_logger(__name__)
 
@@ -150,12 +152,52 @@ class PricingResult:
     strategy_used: PricingStrategy
 
 
+@dataclass
+class PricingRequest:
+    """One resource to price in :meth:`DynamicPricingEngine.calculate_dynamic_prices_batch`"""
+
+    resource_id: str
+    base_price: Decimal
+    resource_type: ResourceType = ResourceType.GPU
+    region: str = "global"
+    strategy: PricingStrategy | None = None
+    constraints: PriceConstraints | None = None
+    provider_reputation: float | None = None
+
+
+@dataclass(slots=True)
+class _PendingPricePoint:
+    """A calculated price waiting in the write-behind buffer to be persisted"""
+
+    resource_id: str
+    resource_type: ResourceType
+    price: Decimal
+    factors: PricingFactors
+    strategy: PricingStrategy
+    timestamp: datetime
+
+
+# Scale of the demand multiplier per strategy (1.0 for the others).
+_DEMAND_STRATEGY_SCALE = {
+    PricingStrategy.AGGRESSIVE_GROWTH: 0.9,
+    PricingStrategy.PROFIT_MAXIMIZATION: 1.3,
+}
+
+
+def _provider_reputation_factor(reputation: float | None) -> float:
+    """Map a normalized 0-1 provider reputation onto the pricing factor; 0.5 and unknown are neutral (1.0)."""
+    # not-money: reputation is dimensionless.
+    if reputation is None:
+        return 1.0
+    return 0.5 + max(0.0, min(1.0, reputation))
+
+
 class DynamicPricingEngine:
     """Core dynamic pricing engine with advanced algorithms"""
 
     def __init__(self, config: dict[str, Any]):
         self.config = config
-        self.pricing_history: dict[str, list[PricePoint]] = {}
+        self.pricing_history: dict[str, PriceHistory] = {}
         self.market_conditions_cache: dict[str, MarketConditions] = {}
         self.provider_strategies: dict[str, PricingStrategy] = {}
         self.price_constraints: dict[str, PriceConstraints] = {}
@@ -228,6 +270,13 @@ class DynamicPricingEngine:
         self.max_volatility_threshold = config.get("max_volatility_threshold", 0.3)
         self.circuit_breaker_threshold = config.get("circuit_breaker_threshold", 0.5)
         self.circuit_breakers: dict[str, bool] = {}
+        self.history_size = config.get("history_size", 1000)
+        # Write-behind buffer: price points are persisted in bulk once persist_batch_size
+        # are pending or every persist_interval seconds, whichever comes first.
+        self.persist_batch_size = config.get("persist_batch_size", 500)
+        self.persist_interval = config.get("persist_interval", 5.0)
+        self._pending_points: list[_PendingPricePoint] = []
+        self._flush_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
         """Initialize the dynamic pricing engine"""
@@ -237,6 +286,7 @@ class DynamicPricingEngine:
         create_task_with_logging(self._update_market_conditions(), name="update_market_conditions")
         create_task_with_logging(self._monitor_price_volatility(), name="monitor_price_volatility")
         create_task_with_logging(self._optimize_strategies(), name="optimize_strategies")
+        create_task_with_logging(self._flush_price_points_periodically(), name="flush_price_points")
         logger.info("Dynamic Pricing Engine initialized")
 
     async def calculate_dynamic_price(
@@ -247,8 +297,13 @@ class DynamicPricingEngine:
         strategy: PricingStrategy | None = None,
         constraints: PriceConstraints | None = None,
         region: str = "global",
+        provider_reputation: float | None = None,
     ) -> PricingResult:
-        """Calculate dynamic price for a resource"""
+        """Calculate dynamic price for a resource.
+
+        ``provider_reputation`` is the provider's normalized (0-1) score, e.g.
+        from the reputation snapshot; reputation-aware strategies price it in.
+        """
         try:
             base_price_dec = _D(base_price)
             if strategy is None:
@@ -257,6 +312,7 @@ class DynamicPricingEngine:
             factors = await self._calculate_pricing_factors(
                 resource_id, resource_type, base_price_dec, strategy, market_conditions
             )
+            factors.provider_reputation = _provider_reputation_factor(provider_reputation)
             strategy_price = await self._apply_strategy_pricing(base_price_dec, factors, strategy, market_conditions)
             final_price = await self._apply_constraints_and_risk(resource_id, strategy_price, constraints, factors)
             price_trend = await self._determine_price_trend(resource_id, final_price)
@@ -282,39 +338,171 @@ class DynamicPricingEngine:
             logger.error("Failed to calculate dynamic price for %s: %s", resource_id, e)
             raise
 
+    async def calculate_dynamic_prices_batch(self, requests: Sequence[PricingRequest]) -> dict[str, PricingResult]:
+        """Calculate dynamic prices for many resources in one pass.
+
+        Prices each resource the way :meth:`calculate_dynamic_price` does, but
+        market conditions are fetched once per (resource type, region), the
+        factor multipliers of each strategy group are computed as arrays, and
+        all price points and audit rows are persisted in one transaction.
+
+        Returns results by resource id; a resource whose pricing fails is
+        logged and left out.
+        """
+        if not requests:
+            return {}
+        market: dict[tuple[ResourceType, str], MarketConditions] = {}
+        for request in requests:
+            key = (request.resource_type, request.region)
+            if key not in market:
+                market[key] = await self._get_market_conditions(*key)
+        strategies = [
+            request.strategy or self.provider_strategies.get(request.resource_id, PricingStrategy.MARKET_BALANCE)
+            for request in requests
+        ]
+        groups: dict[PricingStrategy, list[int]] = {}
+        for position, strategy in enumerate(strategies):
+            groups.setdefault(strategy, []).append(position)
+        time_multiplier = self._calculate_time_multiplier()
+        factors: list[PricingFactors] = [PricingFactors(base_price=_D(request.base_price)) for request in requests]
+        for strategy, positions in groups.items():
+            await self._calculate_pricing_factors_batch(
+                [requests[position] for position in positions],
+                [factors[position] for position in positions],
+                [market[(requests[position].resource_type, requests[position].region)] for position in positions],
+                strategy,
+                time_multiplier,
+            )
+
+        results: dict[str, PricingResult] = {}
+        priced: list[tuple[str, ResourceType, Decimal, PricingFactors, PricingStrategy]] = []
+        next_update = datetime.now(UTC) + timedelta(seconds=self.update_interval)
+        for request, strategy, resource_factors in zip(requests, strategies, factors, strict=True):
+            market_conditions = market[(request.resource_type, request.region)]
+            try:
+                strategy_price = await self._apply_strategy_pricing(
+                    resource_factors.base_price, resource_factors, strategy, market_conditions
+                )
+                final_price = await self._apply_constraints_and_risk(
+                    request.resource_id, strategy_price, request.constraints, resource_factors
+                )
+                price_trend = await self._determine_price_trend(request.resource_id, final_price)
+                reasoning = await self._generate_pricing_reasoning(
+                    resource_factors, strategy, market_conditions, price_trend
+                )
+                confidence = await self._calculate_confidence_score(resource_factors, market_conditions)
+            except Exception as e:
+                logger.error("Failed to calculate dynamic price for %s: %s", request.resource_id, e)
+                continue
+            priced.append((request.resource_id, request.resource_type, final_price, resource_factors, strategy))
+            results[request.resource_id] = PricingResult(
+                resource_id=request.resource_id,
+                resource_type=request.resource_type,
+                current_price=resource_factors.base_price,
+                recommended_price=final_price,
+                price_trend=price_trend,
+                confidence_score=confidence,
+                factors_exposed=_serialize_decimals(asdict(resource_factors)),
+                reasoning=reasoning,
+                next_update=next_update,
+                strategy_used=strategy,
+            )
+        await self._store_price_points(priced)
+        logger.info("Calculated dynamic prices for %d of %d resources", len(results), len(requests))
+        return results
+
+    async def _calculate_pricing_factors_batch(
+        self,
+        requests: list[PricingRequest],
+        factors: list[PricingFactors],
+        market: list[MarketConditions],
+        strategy: PricingStrategy,
+        time_multiplier: Decimal,
+    ) -> None:
+        """Fill in ``factors`` for resources sharing ``strategy``, as _calculate_pricing_factors does one by one."""
+        # not-money: market levels and price ratios are dimensionless; the factors
+        # are converted to Decimal multipliers and prices stay Decimal.
+        demand = np.array([conditions.demand_level for conditions in market], dtype=float)
+        supply = np.array([conditions.supply_level for conditions in market], dtype=float)
+        demand_multipliers = np.select(
+            [demand > 0.8, demand > 0.5], [1.0 + (demand - 0.8) * 2.5, 1.0 + (demand - 0.5) * 0.5], 0.8 + demand * 0.4
+        ) * _DEMAND_STRATEGY_SCALE.get(strategy, 1.0)
+        supply_multipliers = np.clip(
+            np.select(
+                [supply < 0.3, supply < 0.7],
+                [1.0 + (0.3 - supply) * 1.5, 1.0 - (supply - 0.3) * 0.3],
+                0.9 - (supply - 0.7) * 0.3,
+            ),
+            0.5,
+            2.0,
+        )
+        # Competitor averages are per market, of which a batch has only a few.
+        competitor_averages: dict[int, float] = {}
+        for conditions in market:
+            if id(conditions) not in competitor_averages:
+                prices = conditions.competitor_prices
+                competitor_averages[id(conditions)] = float(np.mean([float(p) for p in prices])) if prices else 0.0
+        has_competitors = np.array([competitor_averages[id(conditions)] > 0 for conditions in market])
+        average_competitor = np.array([competitor_averages[id(conditions)] or 1.0 for conditions in market])
+        base = np.array([float(resource.base_price) for resource in factors], dtype=float)
+        price_ratio = base / average_competitor
+        if strategy == PricingStrategy.COMPETITIVE_RESPONSE:
+            competition = np.select([price_ratio > 1.1, price_ratio < 0.9], [0.9, 1.05], 1.0)
+        elif strategy == PricingStrategy.PROFIT_MAXIMIZATION:
+            competition = 1.0 + (price_ratio - 1) * 0.3
+        else:
+            competition = 1.0 + (price_ratio - 1) * 0.5
+        competition = np.where(has_competitors, competition, 1.0)
+
+        for position, (request, resource_factors, conditions) in enumerate(zip(requests, factors, market, strict=True)):
+            resource_factors.demand_multiplier = _D(float(demand_multipliers[position]))
+            resource_factors.supply_multiplier = _D(float(supply_multipliers[position]))
+            resource_factors.time_multiplier = time_multiplier
+            resource_factors.performance_multiplier = await self._calculate_performance_multiplier(request.resource_id)
+            resource_factors.competition_multiplier = _D(float(competition[position]))
+            resource_factors.sentiment_multiplier = self._calculate_sentiment_multiplier(conditions.market_sentiment)
+            resource_factors.regional_multiplier = self._calculate_regional_multiplier(
+                conditions.region, request.resource_type
+            )
+            resource_factors.demand_level = conditions.demand_level
+            resource_factors.supply_level = conditions.supply_level
+            resource_factors.market_volatility = conditions.price_volatility
+            resource_factors.provider_reputation = _provider_reputation_factor(request.provider_reputation)
+
     async def get_price_forecast(self, resource_id: str, hours_ahead: int = 24) -> list[PricePoint]:
         """Generate price forecast for the specified horizon"""
         try:
-            if resource_id not in self.pricing_history:
-                return []
-            historical_data = self.pricing_history[resource_id]
-            if len(historical_data) < 24:
+            history = self.pricing_history.get(resource_id)
+            if history is None or len(history) < 24 or hours_ahead <= 0:
                 return []
-            prices = [float(point.price) for point in historical_data[-48:]]
-            demand_levels = [point.demand_level for point in historical_data[-48:]]
-            supply_levels = [point.supply_level for point in historical_data[-48:]]
-            forecast_points = []
-            for hour in range(1, hours_ahead + 1):
-                price_trend = self._calculate_price_trend(prices[-12:])
-                seasonal_factor = self._calculate_seasonal_factor(hour)
-                demand_forecast = self._forecast_demand_level(demand_levels, hour)
-                supply_forecast = self._forecast_supply_level(supply_levels, hour)
-                base_forecast = prices[-1] + price_trend * hour
-                seasonal_adjusted = base_forecast * float(seasonal_factor)
-                demand_adjusted = seasonal_adjusted * (1 + (demand_forecast - 0.5) * 0.3)
-                supply_adjusted = demand_adjusted * (1 + (0.5 - supply_forecast) * 0.2)
-                forecast_price = max(float(self.min_price), min(supply_adjusted, float(self.max_price)))
-                confidence = max(0.3, 0.9 - hour / hours_ahead * 0.6)
-                forecast_point = PricePoint(
-                    timestamp=datetime.now(UTC) + timedelta(hours=hour),
-                    price=_D(forecast_price),
-                    demand_level=demand_forecast,
-                    supply_level=supply_forecast,
-                    confidence=confidence,
+            # not-money: forecast arithmetic is on the float analytics copy of the
+            # history; each forecast price is converted back through _D() below.
+            prices = history.prices(48)
+            price_trend = self._calculate_price_trend(prices[-12:])
+            hours = np.arange(1, hours_ahead + 1)
+            seasonal_factors = np.array([float(self._calculate_seasonal_factor(int(hour))) for hour in hours])
+            demand_forecast = self._forecast_demand_levels(history.demand_levels(48), hours_ahead)
+            supply_forecast = self._forecast_supply_levels(history.supply_levels(48), hours_ahead)
+            base_forecast = prices[-1] + price_trend * hours
+            forecast_prices = (
+                base_forecast * seasonal_factors * (1 + (demand_forecast - 0.5) * 0.3) * (1 + (0.5 - supply_forecast) * 0.2)
+            )
+            forecast_prices = np.clip(forecast_prices, float(self.min_price), float(self.max_price))
+            confidences = np.maximum(0.3, 0.9 - hours / hours_ahead * 0.6)
+            now = datetime.now(UTC)
+            return [
+                PricePoint(
+                    timestamp=now + timedelta(hours=hour),
+                    price=_D(float(forecast_price)),
+                    demand_level=float(demand),
+                    supply_level=float(supply),
+                    confidence=float(confidence),
                     strategy_used="forecast",
                 )
-                forecast_points.append(forecast_point)
-            return forecast_points
+                for hour, forecast_price, demand, supply, confidence in zip(
+                    hours.tolist(), forecast_prices, demand_forecast, supply_forecast, confidences, strict=True
+                )
+            ]
         except Exception as e:
             logger.error("Failed to generate price forecast for %s: %s", resource_id, e)
             return []
@@ -457,8 +645,9 @@ class DynamicPricingEngine:
         """Apply pricing constraints and risk management"""
         if self.circuit_breakers.get(resource_id, False):
             logger.warning("Circuit breaker active for %s, using last price", resource_id)
-            if resource_id in self.pricing_history and self.pricing_history[resource_id]:
-                return self.pricing_history[resource_id][-1].price
+            last_price = self._last_price(resource_id)
+            if last_price is not None:
+                return last_price
         if constraints:
             if constraints.min_price:
                 price = max(price, constraints.min_price)
@@ -466,8 +655,8 @@ class DynamicPricingEngine:
                 price = min(price, constraints.max_price)
         price = max(price, self.min_price)
         price = min(price, self.max_price)
-        if resource_id in self.pricing_history and self.pricing_history[resource_id]:
-            last_price = self.pricing_history[resource_id][-1].price
+        last_price = self._last_price(resource_id)
+        if last_price is not None:
             max_change = last_price * Decimal("0.5")
             if abs(price - last_price) > max_change:
                 price = last_price + (max_change if price > last_price else -max_change)
@@ -520,8 +709,9 @@ class DynamicPricingEngine:
 
     async def _calculate_performance_multiplier(self, resource_id: str) -> Decimal:
         """Calculate performance-based multiplier"""
-        if resource_id in self.pricing_history and len(self.pricing_history[resource_id]) > 10:
-            recent_prices = [float(p.price) for p in self.pricing_history[resource_id][-10:]]
+        history = self.pricing_history.get(resource_id)
+        if history is not None and len(history) > 10:
+            recent_prices = history.prices(10)
             price_variance = np.var(recent_prices)
             avg_price = np.mean(recent_prices)
             if price_variance < avg_price * 0.01:
@@ -576,9 +766,10 @@ class DynamicPricingEngine:
 
     async def _determine_price_trend(self, resource_id: str, current_price: Decimal) -> PriceTrend:
         """Determine price trend based on historical data"""
-        if resource_id not in self.pricing_history or len(self.pricing_history[resource_id]) < 5:
+        history = self.pricing_history.get(resource_id)
+        if history is None or len(history) < 5:
             return PriceTrend.STABLE
-        recent_prices = [float(p.price) for p in self.pricing_history[resource_id][-10:]]
+        recent_prices = history.prices(10)
         if len(recent_prices) >= 3:
             recent_avg = np.mean(recent_prices[-3:])
             older_avg = np.mean(recent_prices[-6:-3]) if len(recent_prices) >= 6 else np.mean(recent_prices[:-3])
@@ -639,6 +830,10 @@ class DynamicPricingEngine:
             confidence *= 0.9
         return max(0.3, min(0.95, confidence))
 
+    def _last_price(self, resource_id: str) -> Decimal | None:
+        history = self.pricing_history.get(resource_id)
+        return history.last_price if history is not None else None
+
     async def _store_price_point(
         self,
         resource_id: str,
@@ -647,45 +842,59 @@ class DynamicPricingEngine:
         factors: PricingFactors,
         strategy: PricingStrategy,
     ) -> None:
-        """Store price point in history (in-memory cache + durable persistence)."""
-        async with self._lock:
-            if resource_id not in self.pricing_history:
-                self.pricing_history[resource_id] = []
-            price_point = PricePoint(
-                timestamp=datetime.now(UTC),
-                price=price,
-                demand_level=factors.demand_level,
-                supply_level=factors.supply_level,
-                confidence=factors.confidence_score,
-                strategy_used=strategy.value,
-            )
-            self.pricing_history[resource_id].append(price_point)
-            if len(self.pricing_history[resource_id]) > 1000:
-                self.pricing_history[resource_id] = self.pricing_history[resource_id][-1000:]
-        await self._persist_price_point(resource_id, resource_type, price, factors, strategy)
+        """Store price point in history (in-memory ring buffer + write-behind persistence)."""
+        await self._store_price_points([(resource_id, resource_type, price, factors, strategy)])
 
-    async def _persist_price_point(
-        self,
-        resource_id: str,
-        resource_type: ResourceType,
-        price: Decimal,
-        factors: PricingFactors,
-        strategy: PricingStrategy,
+    async def _store_price_points(
+        self, points: list[tuple[str, ResourceType, Decimal, PricingFactors, PricingStrategy]]
     ) -> None:
-        """Persist a price point to the pricing_history table (best-effort).
+        """Store ``(resource_id, resource_type, price, factors, strategy)`` price points in history."""
+        if not points:
+            return
+        now = datetime.now(UTC)
+        async with self._lock:
+            for resource_id, resource_type, price, factors, strategy in points:
+                history = self.pricing_history.get(resource_id)
+                if history is None:
+                    history = self.pricing_history[resource_id] = PriceHistory(self.history_size)
+                history.append(now, price, factors.demand_level, factors.supply_level, factors.confidence_score)
+                self._pending_points.append(_PendingPricePoint(resource_id, resource_type, price, factors, strategy, now))
+            flush = len(self._pending_points) >= self.persist_batch_size
+        if flush:
+            await self.flush_price_points()
+
+    async def flush_price_points(self) -> int:
+        """Persist the price points waiting in the write-behind buffer; returns how many were written."""
+        async with self._flush_lock:
+            async with self._lock:
+                points, self._pending_points = self._pending_points, []
+            if not points:
+                return 0
+            return len(points) if await self._persist_price_points(points) else 0
+
+    async def _flush_price_points_periodically(self) -> None:
+        """Background task flushing the write-behind buffer every persist_interval seconds"""
+        while True:
+            await asyncio.sleep(self.persist_interval)
+            await self.flush_price_points()
 
-        Also records a PricingAuditLog entry so every pricing decision has an
-        auditable trail (action_source="automated").
+    async def _persist_price_points(self, points: list[_PendingPricePoint]) -> bool:
+        """Persist price points to the pricing_history table in one transaction (best-effort).
+
+        Also records a PricingAuditLog entry per point so every pricing decision
+        has an auditable trail (action_source="automated").
         """
 
         def _write() -> None:
             from .....storage.db import session_scope
 
-            with session_scope() as session:
-                session.add(
+            rows: list[PricingHistory | PricingAuditLog] = []
+            for point in points:
+                resource_id, price, factors, strategy = point.resource_id, point.price, point.factors, point.strategy
+                rows.append(
                     PricingHistory(
                         resource_id=resource_id,
-                        resource_type=PricingResourceType(resource_type.value),
+                        resource_type=PricingResourceType(point.resource_type.value),
                         price=price,
                         base_price=factors.base_price,
                         demand_level=factors.demand_level,
@@ -696,9 +905,10 @@ class DynamicPricingEngine:
                         strategy_parameters=self.strategy_configs.get(strategy, {}),
                         pricing_factors=_serialize_decimals(asdict(factors)),
                         confidence_score=factors.confidence_score,
+                        timestamp=point.timestamp,
                     )
                 )
-                session.add(
+                rows.append(
                     PricingAuditLog(
                         resource_id=resource_id,
                         action_type="price_change",
@@ -717,15 +927,20 @@ class DynamicPricingEngine:
                             "supply_level": factors.supply_level,
                             "market_volatility": factors.market_volatility,
                         },
+                        timestamp=point.timestamp,
                     )
                 )
+            with session_scope() as session:
+                session.add_all(rows)
                 session.commit()
 
         try:
             await asyncio.to_thread(_write)
+            return True
         except Exception as e:
             # Persistence is best-effort: never let a DB issue break price calculation.
-            logger.warning("Failed to persist price point for %s: %s", resource_id, e)
+            logger.warning("Failed to persist %d price points: %s", len(points), e)
+            return False
 
     async def _get_market_conditions(self, resource_type: ResourceType, region: str) -> MarketConditions:
         """Get current market conditions"""
@@ -751,35 +966,21 @@ class DynamicPricingEngine:
     async def _load_pricing_history(self) -> None:
         """Load recent historical pricing data from the pricing_history table."""
 
-        def _read() -> dict[str, list[PricePoint]]:
+        def _read() -> dict[str, PriceHistory]:
             from sqlmodel import select
 
             from .....storage.db import session_scope
 
-            history: dict[str, list[PricePoint]] = {}
             with session_scope() as session:
-                rows = (
-                    session.execute(
-                        select(PricingHistory).order_by(PricingHistory.timestamp.asc()).limit(10000)  # type: ignore[attr-defined]
-                    )
-                    .scalars()
-                    .all()
-                )
-            for row in rows:
-                points = history.setdefault(row.resource_id, [])
-                points.append(
-                    PricePoint(
-                        timestamp=row.timestamp,
-                        price=_D(row.price),
-                        demand_level=row.demand_level,
-                        supply_level=row.supply_level,
-                        confidence=row.confidence_score,
-                        strategy_used=row.strategy_used,
-                    )
-                )
-            for resource_id, points in history.items():
-                if len(points) > 1000:
-                    history[resource_id] = points[-1000:]
+                # The most recent points; the ring buffers keep the last history_size per resource.
+                statement = select(PricingHistory).order_by(PricingHistory.timestamp.desc())  # type: ignore[attr-defined]
+                rows = session.execute(statement.limit(10000)).scalars().all()
+            history: dict[str, PriceHistory] = {}
+            for row in reversed(rows):
+                points = history.get(row.resource_id)
+                if points is None:
+                    points = history[row.resource_id] = PriceHistory(self.history_size)
+                points.append(row.timestamp, _D(row.price), row.demand_level, row.supply_level, row.confidence_score)
             return history
 
         try:
@@ -844,9 +1045,9 @@ class DynamicPricingEngine:
         """Background task to monitor price volatility"""
         while True:
             try:
-                for resource_id, history in self.pricing_history.items():
+                for resource_id, history in list(self.pricing_history.items()):
                     if len(history) >= 10:
-                        recent_prices = [float(p.price) for p in history[-10:]]
+                        recent_prices = history.prices(10)
                         volatility = np.std(recent_prices) / np.mean(recent_prices) if np.mean(recent_prices) > 0 else 0
                         if volatility > self.max_volatility_threshold:
                             logger.warning("High volatility detected for %s: %s", resource_id, volatility)
@@ -872,7 +1073,7 @@ class DynamicPricingEngine:
 
     # not-money: np.polyfit over a price series, returning a slope. Same reasoning as
     # _calculate_rsi -- a dimensionless statistic, and numpy has no Decimal dtype.
-    def _calculate_price_trend(self, prices: list[float]) -> float:
+    def _calculate_price_trend(self, prices: np.ndarray) -> float:
         """Calculate simple price trend"""
         if len(prices) < 2:
             return 0.0
@@ -894,23 +1095,19 @@ class DynamicPricingEngine:
         else:
             return Decimal("0.9")
 
-    def _forecast_demand_level(self, historical: list[float], hour_ahead: int) -> float:
-        """Simple demand level forecasting"""
-        if not historical:
-            return 0.5
-        recent_avg = np.mean(historical[-6:]) if len(historical) >= 6 else np.mean(historical)
-        noise = np.random.normal(0, 0.05)
-        forecast = max(0.0, min(1.0, recent_avg + noise))
-        return float(forecast)  # type: ignore[arg-type]
-
-    def _forecast_supply_level(self, historical: list[float], hour_ahead: int) -> float:
-        """Simple supply level forecasting"""
-        if not historical:
-            return 0.5
-        recent_avg = np.mean(historical[-12:]) if len(historical) >= 12 else np.mean(historical)
-        noise = np.random.normal(0, 0.02)
-        forecast = max(0.0, min(1.0, recent_avg + noise))
-        return float(forecast)  # type: ignore[arg-type]
+    def _forecast_demand_levels(self, historical: np.ndarray, hours: int) -> np.ndarray:
+        """Simple demand level forecasting, one level per hour ahead"""
+        if len(historical) == 0:
+            return np.full(hours, 0.5)
+        recent_avg = np.mean(historical[-6:])
+        return np.clip(recent_avg + np.random.normal(0, 0.05, hours), 0.0, 1.0)
+
+    def _forecast_supply_levels(self, historical: np.ndarray, hours: int) -> np.ndarray:
+        """Simple supply level forecasting, one level per hour ahead"""
+        if len(historical) == 0:
+            return np.full(hours, 0.5)
+        recent_avg = np.mean(historical[-12:])
+        return np.clip(recent_avg + np.random.normal(0, 0.02, hours), 0.0, 1.0)
 
     async def _calculate_time_based_price(
         self, base_price: Decimal, factors: PricingFactors, config: dict[str, Any]
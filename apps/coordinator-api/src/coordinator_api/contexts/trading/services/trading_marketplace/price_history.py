@@ -0,0 +1,75 @@
+"""
+Fixed-size price history of a resource for the dynamic pricing engine.
+
+Each resource keeps its latest ``capacity`` price points in one NumPy array,
+one row per field. Every point is written twice, at ``i`` and ``i + capacity``,
+so the last ``n`` points are always a contiguous slice: trend, volatility and
+forecast code reads views, never copies, and appending never reallocates.
+"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import numpy as np
+
+_PRICE, _DEMAND, _SUPPLY, _CONFIDENCE, _TIMESTAMP = range(5)
+
+
+class PriceHistory:
+    """Ring buffer of the most recent price points of one resource.
+
+    Prices are kept as float64 for analytics only (trend, volatility,
+    forecasts); the exact Decimal of the latest price is kept alongside for
+    the pricing constraints that compare against it.
+    """
+
+    __slots__ = ("capacity", "_data", "_next", "_size", "last_price")
+
+    def __init__(self, capacity: int = 1000) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros((5, 2 * capacity), dtype=np.float64)
+        self._next = 0
+        self._size = 0
+        self.last_price: Decimal | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: datetime, price: Decimal, demand_level: float, supply_level: float, confidence: float) -> None:
+        """Add a price point, dropping the oldest one once the buffer is full."""
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=UTC)
+        # not-money: float copy of the price for statistics; last_price keeps the Decimal.
+        column = (float(price), demand_level, supply_level, confidence, timestamp.timestamp())
+        self._data[:, self._next] = column
+        self._data[:, self._next + self.capacity] = column
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.last_price = price
+
+    def _window(self, row: int, count: int | None) -> np.ndarray:
+        count = self._size if count is None else min(count, self._size)
+        # The newest point sits at _next - 1 + capacity, which never wraps past the end.
+        end = self._next + self.capacity
+        window = self._data[row, end - count : end]
+        window.flags.writeable = False
+        return window
+
+    def prices(self, count: int | None = None) -> np.ndarray:
+        """The last ``count`` prices (all when None), oldest first, as a read-only view."""
+        return self._window(_PRICE, count)
+
+    def demand_levels(self, count: int | None = None) -> np.ndarray:
+        return self._window(_DEMAND, count)
+
+    def supply_levels(self, count: int | None = None) -> np.ndarray:
+        return self._window(_SUPPLY, count)
+
+    def confidences(self, count: int | None = None) -> np.ndarray:
+        return self._window(_CONFIDENCE, count)
+
+    def timestamps(self, count: int | None = None) -> np.ndarray:
+        """POSIX timestamps (seconds, UTC) of the last ``count`` points."""
+        return self._window(_TIMESTAMP, count)
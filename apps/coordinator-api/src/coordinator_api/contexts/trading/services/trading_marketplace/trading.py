@@ -12,6 +12,7 @@ from sqlmodel import Session, or_, select
 
 from aitbc.aitbc_logging import get_logger
 
+from ....reputation.services.reputation_snapshot import get_reputation_snapshot
 from ...domain.trading import (
     NegotiationStatus,
     SettlementType,
@@ -657,9 +658,15 @@ class P2PTradingProtocol:
         return mock_sellers
 
     async def get_seller_reputations(self, seller_ids: list[str]) -> dict[str, float]:
-        """Get seller reputations (mock implementation)"""
-        mock_reputations = {"seller_001": 750.0, "seller_002": 650.0}
-        return {seller_id: mock_reputations.get(seller_id, 500.0) for seller_id in seller_ids}
+        """Get seller trust scores (0-1000) from the reputation snapshot; sellers without a profile get 500"""
+        snapshot = get_reputation_snapshot(self.session)
+        snapshot.refresh_if_stale(self.session)
+        reputations = snapshot.table
+        trust_scores = {}
+        for seller_id in seller_ids:
+            score = reputations.score(seller_id)
+            trust_scores[seller_id] = 500.0 if score is None else score * 1000
+        return trust_scores
 
     async def get_trading_summary(self, agent_id: str) -> dict[str, Any]:
         """Get comprehensive trading summary for an agent"""
@@ -222,6 +222,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
             logger.info("Waiting for in-flight requests to complete...")
             await asyncio.sleep(1)
+            try:
+                from .contexts.marketplace.routers import marketplace_gpu
+
+                if marketplace_gpu.pricing_engine is not None:
+                    flushed = await marketplace_gpu.pricing_engine.flush_price_points()
+                    logger.info("Flushed %d buffered price points", flushed)
+            except Exception as e:
+                logger.warning("Error flushing buffered price points: %s", e)
             logger.info("Closing database connections...")
             try:
                 logger.info("Database connections closed successfully")
@@ -0,0 +1,150 @@
+"""
+Tests for DynamicPricingEngine.calculate_dynamic_prices_batch.
+"""
+
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import StaticPool, create_engine
+from sqlmodel import Session, SQLModel, select
+
+from coordinator_api.contexts.trading.domain.pricing_models import PricingAuditLog, PricingHistory
+from coordinator_api.contexts.trading.services.trading_marketplace import DynamicPricingEngine, PricingRequest
+from coordinator_api.contexts.trading.services.trading_marketplace.dynamic_pricing import (
+    MarketConditions,
+    PriceConstraints,
+    PricingStrategy,
+    ResourceType,
+)
+from coordinator_api.storage import db as storage_db
+
+MARKETS = {
+    "europe": MarketConditions(
+        region="europe",
+        resource_type=ResourceType.GPU,
+        demand_level=0.91,
+        supply_level=0.22,
+        average_price=Decimal("0.05"),
+        price_volatility=0.12,
+        utilization_rate=0.7,
+        competitor_prices=[Decimal("0.045"), Decimal("0.055"), Decimal("0.048")],
+        market_sentiment=0.4,
+    ),
+    "asia": MarketConditions(
+        region="asia",
+        resource_type=ResourceType.GPU,
+        demand_level=0.35,
+        supply_level=0.81,
+        average_price=Decimal("0.04"),
+        price_volatility=0.08,
+        utilization_rate=0.5,
+        market_sentiment=-0.5,
+    ),
+}
+
+REQUESTS = [
+    PricingRequest("gpu-eu-1", Decimal("0.050"), region="europe"),
+    PricingRequest("gpu-eu-2", Decimal("0.120"), region="europe", strategy=PricingStrategy.COMPETITIVE_RESPONSE),
+    PricingRequest("gpu-eu-3", Decimal("0.030"), region="europe", strategy=PricingStrategy.PROFIT_MAXIMIZATION),
+    PricingRequest("gpu-asia-1", Decimal("0.040"), region="asia", strategy=PricingStrategy.AGGRESSIVE_GROWTH),
+    PricingRequest("gpu-asia-2", Decimal("0.080"), region="asia", strategy=PricingStrategy.MULTI_FACTOR),
+    PricingRequest(
+        "gpu-asia-3",
+        Decimal("0.060"),
+        region="asia",
+        strategy=PricingStrategy.COMPETITIVE_RESPONSE,
+        constraints=PriceConstraints(max_price=Decimal("0.055")),
+    ),
+]
+
+
+def _engine() -> DynamicPricingEngine:
+    engine = DynamicPricingEngine({})
+    for region, conditions in MARKETS.items():
+        engine.market_conditions_cache[f"{region}_{ResourceType.GPU.value}"] = conditions
+    return engine
+
+
+@pytest.fixture
+def persisted(monkeypatch):
+    """Route pricing persistence to an in-memory database; yields (engine, commits)."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[PricingHistory.__table__, PricingAuditLog.__table__])
+    commits: list[int] = []
+
+    @contextmanager
+    def session_scope():
+        with Session(engine) as session:
+            original_commit = session.commit
+
+            def commit() -> None:
+                commits.append(len(session.new))
+                original_commit()
+
+            session.commit = commit  # type: ignore[method-assign]
+            yield session
+
+    monkeypatch.setattr(storage_db, "session_scope", session_scope)
+    return engine, commits
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_prices_match_one_at_a_time_pricing(persisted):
+    batch = await _engine().calculate_dynamic_prices_batch(REQUESTS)
+
+    single_engine = _engine()
+    for request in REQUESTS:
+        single = await single_engine.calculate_dynamic_price(
+            request.resource_id,
+            request.resource_type,
+            request.base_price,
+            strategy=request.strategy,
+            constraints=request.constraints,
+            region=request.region,
+        )
+        result = batch[request.resource_id]
+        assert result.recommended_price == single.recommended_price
+        assert result.factors_exposed == single.factors_exposed
+        assert result.confidence_score == single.confidence_score
+        assert result.price_trend == single.price_trend
+        assert result.reasoning == single.reasoning
+        assert result.strategy_used == single.strategy_used
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_persists_every_price_point_in_one_commit(persisted):
+    engine, commits = persisted
+    pricing = _engine()
+
+    results = await pricing.calculate_dynamic_prices_batch(REQUESTS)
+    assert commits == []
+    assert await pricing.flush_price_points() == len(REQUESTS)
+
+    assert set(results) == {request.resource_id for request in REQUESTS}
+    assert commits == [2 * len(REQUESTS)]
+    assert all(len(pricing.pricing_history[request.resource_id]) == 1 for request in REQUESTS)
+    with Session(engine) as session:
+        history = session.exec(select(PricingHistory)).all()
+        audit = session.exec(select(PricingAuditLog)).all()
+    assert sorted(row.resource_id for row in history) == sorted(request.resource_id for request in REQUESTS)
+    assert len(audit) == len(REQUESTS)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_market_conditions_are_fetched_once_per_region(persisted, monkeypatch):
+    pricing = _engine()
+    fetched = []
+    original = pricing._get_market_conditions
+
+    async def counting(resource_type, region):
+        fetched.append((resource_type, region))
+        return await original(resource_type, region)
+
+    monkeypatch.setattr(pricing, "_get_market_conditions", counting)
+    await pricing.calculate_dynamic_prices_batch(REQUESTS)
+
+    assert fetched == [(ResourceType.GPU, "europe"), (ResourceType.GPU, "asia")]
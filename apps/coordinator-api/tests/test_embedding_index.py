@@ -0,0 +1,147 @@
+"""
+Tests for the resident GPU embedding index behind ResourceMatcher similarity search.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from itertools import pairwise
+
+import numpy as np
+import pytest
+from sqlalchemy import StaticPool, create_engine
+from sqlmodel import Session, SQLModel, select
+
+from coordinator_api.contexts.marketplace.domain.gpu_marketplace import GPURegistry, ResourceEmbedding
+from coordinator_api.contexts.marketplace.services.embedding_index import (
+    EmbeddingIndex,
+    discard_resource_embedding,
+    get_embedding_index,
+)
+from coordinator_api.contexts.marketplace.services.resource_matcher import ResourceMatcher
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database with the GPU registry and embedding tables."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[GPURegistry.__table__, ResourceEmbedding.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _gpu(session: Session, gpu_id: str, memory_gb: int, price: str, rating: float, status: str = "available") -> GPURegistry:
+    gpu = GPURegistry(
+        id=gpu_id,
+        miner_id="miner",
+        model="RTX 4090",
+        memory_gb=memory_gb,
+        cuda_version="12.1",
+        region="eu",
+        price_per_hour=Decimal(price),
+        status=status,
+        average_rating=rating,
+    )
+    session.add(gpu)
+    session.commit()
+    return gpu
+
+
+def _brute_force(vectors: dict[str, np.ndarray], query: np.ndarray, k: int, exclude: str) -> list[str]:
+    def cosine(a: np.ndarray, b: np.ndarray) -> float:
+        return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    ranked = sorted((key for key in vectors if key != exclude), key=lambda key: -cosine(vectors[key], query))
+    return ranked[:k]
+
+
+@pytest.mark.unit
+def test_top_k_matches_brute_force_through_adds_and_removes():
+    rng = np.random.default_rng(7)
+    vectors = {f"gpu-{i}": rng.random(5) for i in range(300)}
+    index = EmbeddingIndex()
+    for resource_id, vector in vectors.items():
+        assert index.add(resource_id, vector.tolist())
+    for removed in ("gpu-0", "gpu-150", "gpu-299"):
+        assert index.remove(removed)
+        del vectors[removed]
+    vectors["gpu-7"] = rng.random(5)
+    index.add("gpu-7", vectors["gpu-7"].tolist())
+
+    assert len(index) == len(vectors) == 297
+    assert not index.remove("gpu-0")
+    hits = index.similar("gpu-42", 10)
+    assert [resource_id for resource_id, _ in hits] == _brute_force(vectors, vectors["gpu-42"], 10, "gpu-42")
+    assert all(earlier[1] >= later[1] for earlier, later in pairwise(hits))
+    assert index.similar("gpu-0", 10) == []
+
+
+@pytest.mark.unit
+def test_mismatched_and_empty_embeddings_are_rejected():
+    index = EmbeddingIndex()
+    assert index.add("a", [1.0, 0.0, 0.0])
+    assert not index.add("b", [1.0, 0.0])
+    assert not index.add("c", [])
+    assert len(index) == 1 and index.dim == 3
+    assert index.top_k([1.0, 0.0], 5) == []
+
+
+@pytest.mark.unit
+def test_snapshot_warm_start_reads_only_changed_embeddings(db_session, tmp_path):
+    then = datetime.now(UTC) - timedelta(hours=1)
+    for i in range(5):
+        db_session.add(
+            ResourceEmbedding(resource_id=f"gpu-{i}", embedding=[1.0, float(i), 0.5], updated_at=then + timedelta(minutes=i))
+        )
+    db_session.commit()
+    path = tmp_path / "embeddings.npz"
+    index = EmbeddingIndex(snapshot_path=path)
+    assert index.sync(db_session) == 5
+    assert path.exists()
+
+    # While the worker is down one embedding changes and one is deleted.
+    changed = db_session.exec(select(ResourceEmbedding).where(ResourceEmbedding.resource_id == "gpu-1")).one()
+    changed.embedding = [0.0, 0.0, 1.0]
+    changed.updated_at = datetime.now(UTC)
+    db_session.delete(db_session.exec(select(ResourceEmbedding).where(ResourceEmbedding.resource_id == "gpu-4")).one())
+    db_session.commit()
+
+    warm = EmbeddingIndex.load(path, snapshot_path=path)
+    assert len(warm) == 5
+    assert warm.sync(db_session) == 2  # gpu-1 reloaded, gpu-4 dropped
+    assert len(warm) == 4 and "gpu-4" not in warm
+    assert dict(warm.similar("gpu-0", 3))["gpu-1"] == pytest.approx(0.5 / np.sqrt(1.25))
+
+
+@pytest.mark.unit
+def test_find_similar_resources_uses_the_index_and_follows_deletes(db_session):
+    matcher = ResourceMatcher(db_session)
+    _gpu(db_session, "big", 80, "2.0", 4.5)
+    _gpu(db_session, "big-too", 80, "2.2", 4.4)
+    _gpu(db_session, "small", 8, "0.1", 2.0)
+    for gpu_id in ("big", "big-too", "small"):
+        assert matcher.generate_embeddings(gpu_id)
+
+    similar = matcher.find_similar_resources("big", limit=2)
+    assert [result["gpu_id"] for result in similar] == ["big-too", "small"]
+    assert similar[0]["similarity_score"] > similar[1]["similarity_score"]
+
+    discard_resource_embedding(db_session, "big-too")
+    assert [result["gpu_id"] for result in matcher.find_similar_resources("big", limit=2)] == ["small"]
+    assert "big-too" not in get_embedding_index(db_session)
+
+
+@pytest.mark.unit
+def test_rank_resources_orders_by_score_keeping_ties_in_query_order(db_session):
+    gpus = [
+        _gpu(db_session, "cheap", 24, "0.5", 4.0),
+        _gpu(db_session, "tie-1", 40, "1.0", 3.0),
+        _gpu(db_session, "free", 0, "0", 0.0),
+        _gpu(db_session, "tie-2", 40, "1.0", 3.0),
+        _gpu(db_session, "booked", 80, "0.5", 5.0, status="booked"),
+    ]
+
+    ranked = ResourceMatcher(db_session)._rank_resources(gpus, None, {})
+
+    assert [gpu.id for gpu, _ in ranked] == ["cheap", "booked", "tie-1", "tie-2", "free"]
+    assert ranked[0][1] == pytest.approx(1 / 1.5 * 0.3 + 4.0 / 5.0 * 0.3 + 0.24 * 0.2 + 0.2)
+    assert ranked[-1][1] == pytest.approx(0.2)
@@ -0,0 +1,58 @@
+"""Benchmarks for the resident GPU embedding index.
+
+A top-k query is one matrix-vector product plus argpartition. At 100k
+resources it should take around a millisecond, orders of magnitude below the
+per-row Python cosine loop it replaced.
+
+Marked as @pytest.mark.slow so they can be deselected from the default gate.
+Run with: pytest tests/test_embedding_index_benchmark.py -q -o addopts="" -m slow -s
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from coordinator_api.contexts.marketplace.services.embedding_index import EmbeddingIndex
+
+pytestmark = pytest.mark.slow
+
+DIM = 5
+QUERIES = 50
+
+
+def _index(size: int, rng: np.random.Generator) -> EmbeddingIndex:
+    index = EmbeddingIndex(dim=DIM)
+    for position, vector in enumerate(rng.random((size, DIM))):
+        index.add(f"gpu-{position}", vector)
+    return index
+
+
+def _query_latency_ms(index: EmbeddingIndex, size: int) -> float:
+    started = time.perf_counter()
+    for query in range(QUERIES):
+        assert len(index.similar(f"gpu-{query * (size // QUERIES)}", 10)) == 10
+    return (time.perf_counter() - started) / QUERIES * 1000
+
+
+def _python_loop_ms(vectors: list[list[float]]) -> float:
+    target = vectors[0]
+    started = time.perf_counter()
+    similarities = []
+    for position, vector in enumerate(vectors[1:], 1):
+        dot = sum(a * b for a, b in zip(target, vector, strict=True))
+        similarities.append((position, dot / (sum(a * a for a in target) ** 0.5 * sum(b * b for b in vector) ** 0.5)))
+    similarities.sort(key=lambda item: item[1], reverse=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def test_top_k_latency_stays_flat_as_the_index_grows():
+    rng = np.random.default_rng(0)
+    latencies = {size: _query_latency_ms(_index(size, rng), size) for size in (1_000, 10_000, 100_000)}
+    loop_ms = _python_loop_ms(rng.random((100_000, DIM)).tolist())
+    print(
+        "\ntop-10 latency: "
+        + ", ".join(f"{size:,}: {ms:.2f} ms" for size, ms in latencies.items())
+        + f"; Python loop over 100,000: {loop_ms:.0f} ms"
+    )
+    assert latencies[100_000] < loop_ms / 10
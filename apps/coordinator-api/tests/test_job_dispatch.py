@@ -0,0 +1,162 @@
+"""
+Tests for the job dispatch index behind JobService.acquire_next_job and miner long-polling.
+"""
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import StaticPool, create_engine
+from sqlmodel import Session, SQLModel
+
+from coordinator_api.contexts.infrastructure.domain import Job, Miner
+from coordinator_api.contexts.infrastructure.services.dispatch import get_dispatch_index
+from coordinator_api.contexts.infrastructure.services.jobs import JobService
+from coordinator_api.contexts.infrastructure.services.miners import MinerService
+from coordinator_api.contexts.reputation.domain.reputation import AgentReputation
+from coordinator_api.schemas import Constraints, JobCreate
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database with just the tables dispatch touches."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Job.__table__, Miner.__table__, AgentReputation.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _miner(session: Session, miner_id: str, region: str = "eu", reputation: float = 0.5) -> Miner:
+    miner = Miner(id=miner_id, region=region, capabilities={"reputation_score": reputation}, concurrency=4)
+    session.add(miner)
+    session.commit()
+    return miner
+
+
+def _queue(service: JobService, region: str | None = None) -> Job:
+    return service.create_job("client", JobCreate(payload={"type": "inference"}, constraints=Constraints(region=region)))
+
+
+@pytest.mark.unit
+def test_constraint_checks_run_once_per_bucket(db_session, monkeypatch):
+    """Fifty queued jobs in two signatures cost two constraint checks for the polling miner."""
+    service = JobService(db_session)
+    miner = _miner(db_session, "miner-eu")
+    us_jobs = [_queue(service, region="us") for _ in range(25)]
+    eu_jobs = [_queue(service, region="eu") for _ in range(25)]
+
+    checked = []
+    original = JobService._satisfies_constraints
+
+    def counting(self, job, candidate):
+        checked.append((job.id, candidate.id))
+        return original(self, job, candidate)
+
+    monkeypatch.setattr(JobService, "_satisfies_constraints", counting)
+    job = service.acquire_next_job(miner)
+
+    assert job is not None and job.id == eu_jobs[0].id
+    assert job.state == "RUNNING" and job.assigned_miner_id == "miner-eu"
+    assert checked == [(us_jobs[0].id, "miner-eu"), (eu_jobs[0].id, "miner-eu")]
+
+
+@pytest.mark.unit
+def test_jobs_queued_by_another_worker_are_picked_up(db_session):
+    """Rows inserted behind the index's back are found by the incremental sync."""
+    service = JobService(db_session)
+    miner = _miner(db_session, "miner-1")
+    assert service.acquire_next_job(miner) is None
+
+    now = datetime.now(UTC)
+    db_session.add(Job(id="external", client_id="client", payload={}, requested_at=now, expires_at=now + timedelta(minutes=5)))
+    db_session.commit()
+
+    job = service.acquire_next_job(miner)
+    assert job is not None and job.id == "external"
+
+
+@pytest.mark.unit
+def test_a_job_is_claimed_once_even_from_a_stale_index(db_session):
+    """A second poll holding the same (now stale) entry gets nothing, not the same job."""
+    service = JobService(db_session)
+    first, second = _miner(db_session, "miner-a"), _miner(db_session, "miner-b")
+    queued = _queue(service)
+    index = get_dispatch_index(db_session)
+    stale_bucket = index.buckets()[0]
+
+    assert service.acquire_next_job(first).id == queued.id
+    assert service._claim_first(stale_bucket, second) is None
+    assert db_session.get(Job, queued.id).assigned_miner_id == "miner-a"
+    assert len(index) == 0
+
+
+@pytest.mark.unit
+def test_expired_jobs_are_expired_and_skipped(db_session):
+    service = JobService(db_session)
+    miner = _miner(db_session, "miner-1")
+    stale = _queue(service)
+    stale.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    db_session.add(stale)
+    db_session.commit()
+    get_dispatch_index(db_session).discard(stale.id)
+    fresh = _queue(service)
+
+    assert service.acquire_next_job(miner).id == fresh.id
+    db_session.refresh(stale)
+    assert stale.state == "EXPIRED"
+
+
+@pytest.mark.unit
+def test_higher_reputation_miner_is_left_the_job(db_session):
+    service = JobService(db_session)
+    low = _miner(db_session, "low", reputation=0.2)
+    _miner(db_session, "high", reputation=0.9)
+    queued = _queue(service, region="eu")
+
+    assert service.acquire_next_job(low) is None
+    assert service.acquire_next_job(db_session.get(Miner, "high")).id == queued.id
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_long_poll_is_woken_by_a_new_job(db_session):
+    """A parked poll returns the job as soon as it is queued, not at the next re-check."""
+    _miner(db_session, "miner-1")
+    engine = db_session.get_bind()
+
+    def queue_job() -> None:
+        with Session(engine) as other:
+            _queue(JobService(other), region="eu")
+
+    asyncio.get_running_loop().call_later(0.05, queue_job)
+    started = time.monotonic()
+    job = await MinerService(db_session).wait_for_job("miner-1", max_wait_seconds=10)
+
+    assert job is not None
+    assert time.monotonic() - started < 1
+    assert len(get_dispatch_index(db_session).waiters) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_long_poll_times_out_without_a_job(db_session):
+    _miner(db_session, "miner-1")
+    started = time.monotonic()
+
+    assert await MinerService(db_session).wait_for_job("miner-1", max_wait_seconds=0.1) is None
+    assert 0.1 <= time.monotonic() - started < 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_jobs_only_wake_miners_that_might_run_them(db_session):
+    index = get_dispatch_index(db_session)
+    eu_waiter = index.waiters.register(("eu", frozenset({"RTX 4090"})))
+    us_waiter = index.waiters.register(("us", frozenset()))
+
+    _queue(JobService(db_session), region="eu")
+    await asyncio.sleep(0)
+
+    assert eu_waiter.done()
+    assert not us_waiter.done()
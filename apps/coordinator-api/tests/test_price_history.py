@@ -0,0 +1,91 @@
+"""
+Tests for the dynamic pricing price history ring buffer and its write-behind persistence.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from coordinator_api.contexts.trading.services.trading_marketplace import DynamicPricingEngine
+from coordinator_api.contexts.trading.services.trading_marketplace.dynamic_pricing import (
+    PricingFactors,
+    PricingStrategy,
+    PriceTrend,
+    ResourceType,
+)
+from coordinator_api.contexts.trading.services.trading_marketplace.price_history import PriceHistory
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _fill(history: PriceHistory, prices: list[str]) -> None:
+    for price in prices:
+        history.append(START + timedelta(minutes=len(history)), Decimal(price), 0.5, 0.4, 0.8)
+
+
+@pytest.mark.unit
+def test_ring_buffer_keeps_the_latest_points_in_order():
+    history = PriceHistory(capacity=4)
+    _fill(history, ["1", "2", "3"])
+    assert len(history) == 3
+    assert history.prices().tolist() == [1.0, 2.0, 3.0]
+
+    _fill(history, ["4", "5", "6"])
+    assert len(history) == 4
+    assert history.prices().tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert history.prices(2).tolist() == [5.0, 6.0]
+    assert history.prices(10).tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert history.timestamps(1)[0] == (START + timedelta(minutes=4)).timestamp()
+    assert history.last_price == Decimal("6")
+
+
+@pytest.mark.unit
+def test_windows_are_read_only_views():
+    history = PriceHistory(capacity=8)
+    _fill(history, ["1", "2", "3"])
+    window = history.prices()
+
+    assert np.shares_memory(window, history._data)
+    with pytest.raises(ValueError):
+        window[0] = 10.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_trend_and_forecast_read_the_ring_buffer():
+    engine = DynamicPricingEngine({"history_size": 64})
+    history = engine.pricing_history["gpu-1"] = PriceHistory(64)
+    _fill(history, ["0.050"] * 5 + ["0.060"] * 3)
+
+    assert await engine._determine_price_trend("gpu-1", Decimal("0.060")) == PriceTrend.INCREASING
+
+    _fill(history, ["0.060"] * 30)
+    forecast = await engine.get_price_forecast("gpu-1", hours_ahead=6)
+    assert len(forecast) == 6
+    assert all(isinstance(point.price, Decimal) and engine.min_price <= point.price <= engine.max_price for point in forecast)
+    assert [point.timestamp for point in forecast] == sorted(point.timestamp for point in forecast)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_price_points_are_persisted_in_bulk_at_the_batch_size(monkeypatch):
+    engine = DynamicPricingEngine({"persist_batch_size": 3})
+    batches = []
+
+    async def persist(points):
+        batches.append([point.resource_id for point in points])
+        return True
+
+    monkeypatch.setattr(engine, "_persist_price_points", persist)
+    factors = PricingFactors(base_price=Decimal("0.05"))
+    for index in range(7):
+        await engine._store_price_point(
+            f"gpu-{index}", ResourceType.GPU, Decimal("0.05"), factors, PricingStrategy.MARKET_BALANCE
+        )
+
+    assert batches == [["gpu-0", "gpu-1", "gpu-2"], ["gpu-3", "gpu-4", "gpu-5"]]
+    assert await engine.flush_price_points() == 1
+    assert batches[-1] == ["gpu-6"]
+    assert await engine.flush_price_points() == 0
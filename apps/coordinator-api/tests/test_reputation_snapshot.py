@@ -0,0 +1,158 @@
+"""
+Tests for the reputation snapshot shared by job dispatch, pricing and marketplace ranking.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import StaticPool, create_engine
+from sqlmodel import Session, SQLModel
+
+from coordinator_api.contexts.infrastructure.domain import Job, Miner
+from coordinator_api.contexts.infrastructure.services.jobs import JobService
+from coordinator_api.contexts.reputation.domain.cross_chain_reputation import (
+    CrossChainReputationAggregation,
+    CrossChainReputationConfig,
+)
+from coordinator_api.contexts.reputation.domain.reputation import AgentReputation, ReputationEvent
+from coordinator_api.contexts.reputation.services.reputation_engine import CrossChainReputationEngine
+from coordinator_api.contexts.reputation.services.reputation_snapshot import (
+    ReputationSnapshot,
+    get_reputation_snapshot,
+    publish_trust_score,
+)
+from coordinator_api.contexts.trading.services.trading_marketplace import DynamicPricingEngine, PricingRequest
+from coordinator_api.contexts.trading.services.trading_marketplace.dynamic_pricing import PricingStrategy
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database with the reputation and dispatch tables."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            Job.__table__,
+            Miner.__table__,
+            AgentReputation.__table__,
+            ReputationEvent.__table__,
+            CrossChainReputationConfig.__table__,
+            CrossChainReputationAggregation.__table__,
+        ],
+    )
+    with Session(engine) as session:
+        yield session
+
+
+def _profile(session: Session, agent_id: str, trust_score: float, updated_at: datetime | None = None) -> AgentReputation:
+    reputation = AgentReputation(agent_id=agent_id, trust_score=trust_score, updated_at=updated_at or datetime.now(UTC))
+    session.add(reputation)
+    session.commit()
+    return reputation
+
+
+@pytest.mark.unit
+def test_refresh_loads_normalized_scores_and_picks_up_changes_incrementally(db_session):
+    _profile(db_session, "miner-a", 800.0)
+    reputation = _profile(db_session, "miner-b", 250.0)
+    snapshot = ReputationSnapshot(refresh_seconds=0, resync_seconds=3600)
+
+    assert snapshot.refresh(db_session) == 2
+    assert (snapshot.score("miner-a"), snapshot.score("miner-b"), snapshot.score("nobody")) == (0.8, 0.25, None)
+    first = snapshot.table
+    assert snapshot.refresh(db_session) == 0
+    assert snapshot.table is first
+
+    # Another worker updates a profile; the next (incremental) refresh sees it.
+    reputation.trust_score = 900.0
+    reputation.updated_at = datetime.now(UTC) + timedelta(seconds=1)
+    db_session.commit()
+    assert snapshot.refresh(db_session) == 1
+    assert snapshot.score("miner-b") == 0.9
+    assert snapshot.version == first.version + 1
+    # Readers holding the old table keep a consistent view.
+    assert first.score("miner-b") == 0.25
+
+
+@pytest.mark.unit
+def test_refresh_if_stale_queries_at_most_once_per_interval(db_session, monkeypatch):
+    snapshot = ReputationSnapshot(refresh_seconds=3600)
+    refreshes = []
+    original = snapshot.refresh
+    monkeypatch.setattr(snapshot, "refresh", lambda session, full=False: refreshes.append(full) or original(session, full))
+
+    for _ in range(50):
+        snapshot.refresh_if_stale(db_session)
+    assert refreshes == [False]
+
+
+@pytest.mark.unit
+def test_published_scores_are_visible_without_a_refresh(db_session):
+    publish_trust_score(db_session, "miner-a", 700.0)  # no snapshot loaded yet: nothing to update
+
+    snapshot = get_reputation_snapshot(db_session)
+    assert get_reputation_snapshot(db_session) is snapshot
+    assert len(snapshot) == 0
+
+    publish_trust_score(db_session, "miner-a", 700.0)
+    assert snapshot.score("miner-a") == 0.7
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reputation_events_are_published_to_the_snapshot(db_session):
+    _profile(db_session, "miner-a", 500.0)
+    snapshot = get_reputation_snapshot(db_session)
+    snapshot.refresh(db_session)
+
+    engine = CrossChainReputationEngine(db_session)
+    event = {"agent_id": "miner-a", "event_type": "job_completed", "impact_score": 0.2}
+    assert await engine.update_reputation_from_event(event)
+    assert snapshot.score("miner-a") == pytest.approx(0.7)
+
+
+@pytest.mark.unit
+def test_dispatch_reads_profile_scores_from_the_snapshot(db_session, monkeypatch):
+    _profile(db_session, "miner-a", 900.0)
+    miners = []
+    for index in range(20):
+        miner = Miner(id=f"miner-{'a' if index == 0 else index}", region="eu", concurrency=4)
+        db_session.add(miner)
+        miners.append(miner)
+    db_session.commit()
+    snapshot = get_reputation_snapshot(db_session)
+    queries = []
+    original = snapshot.refresh
+    monkeypatch.setattr(snapshot, "refresh", lambda session, full=False: queries.append(full) or original(session, full))
+    service = JobService(db_session)
+
+    scores = [service._get_miner_reputation(miner) for miner in miners]
+
+    assert scores[0] == 0.9
+    assert scores[1:] == [0.5] * 19
+    assert len(queries) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reputation_based_prices_follow_provider_reputation(monkeypatch):
+    engine = DynamicPricingEngine({})
+
+    async def no_persistence(points):
+        return True
+
+    monkeypatch.setattr(engine, "_persist_price_points", no_persistence)
+    requests = [
+        PricingRequest(
+            f"gpu-{reputation}", Decimal("0.05"), strategy=PricingStrategy.REPUTATION_BASED, provider_reputation=reputation
+        )
+        for reputation in (0.1, 0.5, None, 0.9)
+    ]
+
+    results = await engine.calculate_dynamic_prices_batch(requests)
+
+    low, neutral, unknown, high = (results[request.resource_id] for request in requests)
+    assert low.recommended_price < neutral.recommended_price < high.recommended_price
+    assert unknown.recommended_price == neutral.recommended_price
+    assert high.factors_exposed["provider_reputation"] == pytest.approx(1.4)
@@ -0,0 +1,177 @@
+"""
+Tests for the two-tier translation cache and request coalescing in the translation engine.
+"""
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+from coordinator_api.contexts.language.services.multi_language import translation_cache  # noqa: E402
+from coordinator_api.contexts.language.services.multi_language.translation_engine import (  # noqa: E402
+    BaseTranslator,
+    TranslationEngine,
+    TranslationProvider,
+    TranslationRequest,
+    TranslationResponse,
+    translation_cache_key,
+)
+
+TranslationCache = translation_cache.TranslationCache
+
+
+class CountingTranslator(BaseTranslator):
+    """Answers after a short delay and counts provider calls."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def translate(self, request: TranslationRequest) -> TranslationResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return TranslationResponse(
+            translated_text=f"<{request.text}>",
+            confidence=0.9,
+            provider=TranslationProvider.LOCAL,
+            processing_time_ms=int(self.delay * 1000),
+            source_language=request.source_language,
+            target_language=request.target_language,
+        )
+
+    def get_supported_languages(self) -> list[str]:
+        return ["en", "es"]
+
+
+@pytest.fixture
+async def cache():
+    translation_cache = TranslationCache("redis://unused", {"stats_flush_size": 1000, "stats_flush_interval": 3600})
+    translation_cache.redis = fakeredis.FakeAsyncRedis(decode_responses=False)
+    yield translation_cache
+    await translation_cache.close()
+
+
+def _engine(cache: TranslationCache, translator: CountingTranslator) -> TranslationEngine:
+    engine = TranslationEngine({})
+    engine.translators = {TranslationProvider.LOCAL: translator}
+    engine.cache = cache
+    return engine
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_engine_and_api_layer_share_cache_keys(cache):
+    translator = CountingTranslator()
+    engine = _engine(cache, translator)
+    request = TranslationRequest("hello", "en", "es", context="greeting", domain="Chat")
+
+    await engine.translate(request)
+    cache._l1.clear()
+
+    assert await cache.redis.exists(translation_cache_key("hello", "en", "es", "greeting", "chat"))
+    cached = await cache.get("hello", "en", "es", "greeting", "chat")
+    assert cached is not None and cached.translated_text == "<hello>"
+    assert (await engine.translate(request)).translated_text == "<hello>"
+    assert translator.calls == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_l1_hits_skip_redis_and_stats_are_flushed_in_bulk(cache, monkeypatch):
+    await _engine(cache, CountingTranslator()).translate(TranslationRequest("hello", "en", "es"))
+
+    async def unreachable(*args, **kwargs):
+        raise AssertionError("L1 hit went to Redis")
+
+    monkeypatch.setattr(cache.redis, "get", unreachable)
+    monkeypatch.setattr(cache.redis, "hset", unreachable)
+    for _ in range(5):
+        assert (await cache.get("hello", "en", "es")).translated_text == "<hello>"
+    monkeypatch.undo()
+
+    stats_key = f"{translation_cache_key('hello', 'en', 'es')}:stats"
+    assert await cache.redis.hget(stats_key, "access_count") == b"1"
+    assert await cache.flush_access_stats() == 1
+    assert await cache.redis.hget(stats_key, "access_count") == b"6"
+    assert cache.stats["l1_hits"] == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_many_fetches_l1_misses_with_one_mget(cache, monkeypatch):
+    engine = _engine(cache, CountingTranslator())
+    for text in ("one", "two"):
+        await engine.translate(TranslationRequest(text, "en", "es"))
+    cache._l1.clear()
+    mget_calls = []
+    original_mget = cache.redis.mget
+
+    async def counting_mget(keys):
+        mget_calls.append(list(keys))
+        return await original_mget(keys)
+
+    monkeypatch.setattr(cache.redis, "mget", counting_mget)
+    requests = [TranslationRequest(text, "en", "es") for text in ("one", "missing", "two", "one")]
+
+    results = await cache.get_many(requests)
+    assert [result and result.translated_text for result in results] == ["<one>", None, "<two>", "<one>"]
+    assert len(mget_calls) == 1
+
+    assert [result and result.translated_text for result in await cache.get_many(requests[:1])] == ["<one>"]
+    assert len(mget_calls) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_many_rejects_a_short_mget_reply(cache, monkeypatch):
+    """A reply missing values is a protocol fault, not a row of cache misses."""
+
+    async def short_mget(keys):
+        return [None] * (len(keys) - 1)
+
+    monkeypatch.setattr(cache.redis, "mget", short_mget)
+    with pytest.raises(ValueError):
+        await cache.get_many([TranslationRequest(text, "en", "es") for text in ("one", "two")])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_provider_call(cache):
+    translator = CountingTranslator(delay=0.05)
+    engine = _engine(cache, translator)
+    request = TranslationRequest("hello", "en", "es")
+
+    results = await asyncio.gather(*(engine.translate(request) for _ in range(20)))
+
+    assert translator.calls == 1
+    assert {result.translated_text for result in results} == {"<hello>"}
+    assert engine._in_flight == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_waiters_take_over_when_the_leading_request_is_cancelled(cache):
+    translator = CountingTranslator(delay=0.05)
+    engine = _engine(cache, translator)
+    request = TranslationRequest("hello", "en", "es")
+
+    leader = asyncio.create_task(engine.translate(request))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(engine.translate(request)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert {result.translated_text for result in results} == {"<hello>"}
+    assert translator.calls == 2
+    assert engine._in_flight == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_delete_drops_the_l1_entry(cache):
+    await _engine(cache, CountingTranslator()).translate(TranslationRequest("hello", "en", "es"))
+
+    assert await cache.delete("hello", "en", "es")
+    assert await cache.get("hello", "en", "es") is None
@@ -0,0 +1,81 @@
+"""Benchmarks for the two-tier translation cache.
+
+An L1 (in-process) hit should cost a fraction of an L2 (Redis) hit, and a
+burst of requests with many duplicates should reach the provider once per
+distinct text thanks to request coalescing.
+
+Marked as @pytest.mark.slow so they can be deselected from the default gate.
+Run with: pytest tests/test_translation_cache_benchmark.py -q -o addopts="" -m slow -s
+"""
+
+import asyncio
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+from coordinator_api.contexts.language.services.multi_language import translation_cache  # noqa: E402
+from coordinator_api.contexts.language.services.multi_language.translation_engine import (  # noqa: E402
+    BaseTranslator,
+    TranslationEngine,
+    TranslationProvider,
+    TranslationRequest,
+    TranslationResponse,
+)
+
+pytestmark = pytest.mark.slow
+
+LOOKUPS = 2_000
+BURST = 500
+DISTINCT = 25
+
+
+class SlowTranslator(BaseTranslator):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def translate(self, request: TranslationRequest) -> TranslationResponse:
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return TranslationResponse(f"<{request.text}>", 0.9, TranslationProvider.LOCAL, 20, "en", "es")
+
+    def get_supported_languages(self) -> list[str]:
+        return ["en", "es"]
+
+
+def _cache(l1_max_entries: int) -> "translation_cache.TranslationCache":
+    cache = translation_cache.TranslationCache("redis://unused", {"l1_max_entries": l1_max_entries})
+    cache.redis = fakeredis.FakeAsyncRedis(decode_responses=False)
+    return cache
+
+
+async def _hit_latency_us(cache) -> float:
+    response = TranslationResponse("hola", 0.9, TranslationProvider.LOCAL, 20, "en", "es")
+    await cache.set("hello", "en", "es", response)
+    started = time.perf_counter()
+    for _ in range(LOOKUPS):
+        assert await cache.get("hello", "en", "es") is not None
+    return (time.perf_counter() - started) / LOOKUPS * 1e6
+
+
+@pytest.mark.asyncio
+async def test_l1_hit_latency():
+    l1_us = await _hit_latency_us(_cache(l1_max_entries=10_000))
+    l2_us = await _hit_latency_us(_cache(l1_max_entries=0))
+    print(f"\nhit latency: L1 {l1_us:.1f} us, Redis {l2_us:.1f} us ({l2_us / l1_us:.1f}x)")
+    assert l1_us < l2_us
+
+
+@pytest.mark.asyncio
+async def test_provider_calls_saved_by_coalescing():
+    translator = SlowTranslator()
+    engine = TranslationEngine({})
+    engine.translators = {TranslationProvider.LOCAL: translator}
+    engine.cache = _cache(l1_max_entries=10_000)
+    requests = [TranslationRequest(f"text {i % DISTINCT}", "en", "es") for i in range(BURST)]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(engine.translate(request) for request in requests))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"\n{BURST} requests, {DISTINCT} distinct: {translator.calls} provider calls in {elapsed_ms:.0f} ms")
+    assert translator.calls == DISTINCT
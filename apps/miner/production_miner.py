@@ -14,6 +14,7 @@ import urllib.request
 from datetime import UTC, datetime
 from typing import Any
 
+import httpx
 import requests
 
 from aitbc.aitbc_logging import configure_logging, get_logger
@@ -37,6 +38,21 @@ if not AUTH_TOKEN:
 if MINER_ID == AUTH_TOKEN:
     raise RuntimeError("MINER_ID and the auth token must not be the same value; use separate MINER_ID and MINER_AUTH_TOKEN")
 HEARTBEAT_INTERVAL = 15
+# The coordinator holds a poll open until a job is assigned or this many seconds
+# pass; kept below HEARTBEAT_INTERVAL so heartbeats stay on time.
+POLL_WAIT_SECONDS = 10
+# "async" runs jobs concurrently next to independent heartbeats (AsyncJobExecutor);
+# "sync" is the original one-job-at-a-time loop.
+MINER_EXECUTOR = os.environ.get("MINER_EXECUTOR", "async").lower()
+# Jobs claimed from the coordinator at once, and the cap per job type within that:
+# Ollama serves parallel requests, a whisper or ffmpeg job saturates the GPU/CPU alone.
+JOB_CONCURRENCY = max(1, int(os.environ.get("MINER_CONCURRENCY", "2"))) if MINER_EXECUTOR == "async" else 1
+JOB_TYPE_LIMITS = {
+    "inference": int(os.environ.get("MINER_MAX_INFERENCE_JOBS", str(JOB_CONCURRENCY))),
+    "transcribe": int(os.environ.get("MINER_MAX_TRANSCRIBE_JOBS", "1")),
+    "reencode": int(os.environ.get("MINER_MAX_REENCODE_JOBS", "1")),
+}
+OLLAMA_URL = "http://localhost:11434"
 MAX_RETRIES = 10
 RETRY_DELAY = 30
 coordinator_client = AITBCHTTPClient(
@@ -177,7 +193,7 @@ def build_gpu_capabilities() -> dict:
         "region": "localhost",
         "platform": "CUDA" if gpu_info else "CPU",
         "supported_tasks": ["inference", "training", "stable-diffusion", "llama", "transcribe", "reencode"],
-        "max_concurrent_jobs": 1,
+        "max_concurrent_jobs": JOB_CONCURRENCY,
     }
 
 
@@ -247,7 +263,7 @@ async def wait_for_coordinator():
 
 def register_miner():
     """Register the miner with the coordinator"""
-    register_data = {"capabilities": build_gpu_capabilities(), "concurrency": 1, "region": "localhost"}
+    register_data = {"capabilities": build_gpu_capabilities(), "concurrency": JOB_CONCURRENCY, "region": "localhost"}
     headers = {"X-Api-Key": AUTH_TOKEN, "X-Miner-ID": MINER_ID, "Content-Type": "application/json"}
     try:
         client = AITBCHTTPClient(base_url=COORDINATOR_URL, headers=headers, timeout=10)
@@ -267,15 +283,16 @@ def register_miner():
         return None
 
 
-def send_heartbeat():
-    """Send heartbeat to coordinator with real GPU stats"""
+def build_heartbeat_data(inflight: int = 0) -> dict[str, Any]:
+    """Build the coordinator heartbeat payload: real GPU stats and the jobs in flight."""
     gpu_info = get_gpu_info()
     arch = classify_architecture(gpu_info["name"]) if gpu_info else "unknown"
     latency_ms = measure_coordinator_latency()
     if gpu_info:
-        heartbeat_data = {
+        return {
             "status": "active",
-            "current_jobs": 0,
+            "inflight": inflight,
+            "current_jobs": inflight,
             "last_seen": datetime.now(UTC).isoformat(),
             "gpu_utilization": gpu_info["utilization"],
             "memory_used": gpu_info["memory_used"],
@@ -284,24 +301,31 @@ def send_heartbeat():
             "edge_optimized": arch in {"ada_lovelace", "ampere", "turing"},
             "network_latency_ms": latency_ms,
         }
-    else:
-        heartbeat_data = {
-            "status": "active",
-            "current_jobs": 0,
-            "last_seen": datetime.now(UTC).isoformat(),
-            "gpu_utilization": 0,
-            "memory_used": 0,
-            "memory_total": 0,
-            "architecture": "unknown",
-            "edge_optimized": False,
-            "network_latency_ms": latency_ms,
-        }
+    return {
+        "status": "active",
+        "inflight": inflight,
+        "current_jobs": inflight,
+        "last_seen": datetime.now(UTC).isoformat(),
+        "gpu_utilization": 0,
+        "memory_used": 0,
+        "memory_total": 0,
+        "architecture": "unknown",
+        "edge_optimized": False,
+        "network_latency_ms": latency_ms,
+    }
+
+
+def send_heartbeat():
+    """Send heartbeat to coordinator with real GPU stats"""
+    heartbeat_data = build_heartbeat_data()
     headers = {"X-Api-Key": AUTH_TOKEN, "X-Miner-ID": MINER_ID, "Content-Type": "application/json"}
     try:
         client = AITBCHTTPClient(base_url=COORDINATOR_URL, headers=headers, timeout=5)
         response = client.post("/v1/miners/heartbeat", json=heartbeat_data)
         if response:
-            logger.info("Heartbeat sent (GPU: %s%%)", gpu_info["utilization"] if gpu_info else "N/A")
+            logger.info(
+                "Heartbeat sent (GPU: %s%%)", heartbeat_data["gpu_utilization"] if heartbeat_data["memory_total"] else "N/A"
+            )
         else:
             logger.error("Heartbeat failed")
     except NetworkError as e:
@@ -462,7 +486,8 @@ def _run_ffmpeg(input_path: str, output_path: str, output_format: str | None = N
         raise Exception(f"FFmpeg re-encode error: {e}") from e
 
 
-def _submit_success(job_id, output, execution_time, extra=None, tee_quote=None):
+def _success_result(output, execution_time, extra=None, tee_quote=None) -> dict[str, Any]:
+    """Result payload of a completed job, with the GPU stats taken right after it."""
     gpu_after = get_gpu_info()
     # Pop tee_quote from extra if it was placed there by older callers.
     extra = extra or {}
@@ -484,13 +509,28 @@ def _submit_success(job_id, output, execution_time, extra=None, tee_quote=None):
     }
     if tee_quote:
         result["tee_quote"] = tee_quote
-    submit_result(job_id, result)
+    return result
+
+
+def _failure_result(error_message) -> dict[str, Any]:
+    return {"result": {"status": "failed", "error": error_message}}
+
+
+def _submit_success(job_id, output, execution_time, extra=None, tee_quote=None):
+    submit_result(job_id, _success_result(output, execution_time, extra, tee_quote))
     logger.info("Job %s completed in %ss", job_id, execution_time)
 
 
 def _submit_failure(job_id, error_message):
     logger.error("Job execution error: %s", error_message)
-    submit_result(job_id, {"result": {"status": "failed", "error": error_message}})
+    submit_result(job_id, _failure_result(error_message))
+
+
+def _job_type(payload: dict[str, Any]) -> str | None:
+    job_type = payload.get("type")
+    if job_type is None and "model" in payload and ("prompt" in payload):
+        job_type = "inference"
+    return job_type
 
 
 def execute_job(job, available_models):
@@ -498,17 +538,13 @@ def execute_job(job, available_models):
     job_id = job.get("job_id")
     payload = job.get("payload", {})
     logger.info("Executing job %s: %s", job_id, payload)
-    job_type = payload.get("type")
-    if job_type is None and "model" in payload and ("prompt" in payload):
-        job_type = "inference"
+    job_type = _job_type(payload)
 
     try:
         if job_type == "inference":
             return _execute_inference(job, available_models)
-        if job_type == "transcribe":
-            return _execute_transcribe(job)
-        if job_type == "reencode":
-            return _execute_reencode(job)
+        if job_type in ("transcribe", "reencode"):
+            return _execute_media(job, job_type)
         logger.error("Unsupported job type: %s", job_type)
         _submit_failure(job_id, f"Unsupported job type: {job_type}")
         return False
@@ -518,78 +554,87 @@ def execute_job(job, available_models):
         return False
 
 
-def _execute_inference(job, available_models):
-    job_id = job.get("job_id")
-    payload = job.get("payload", {})
-    prompt = payload.get("prompt", "")
+# The helpers below hold the job logic both executors share; the synchronous loop and
+# AsyncJobExecutor differ only in how they move bytes and schedule the work.
+
+
+def _select_model(payload: dict[str, Any], available_models: list[str]) -> str:
     model = payload.get("model", "llama3.2:latest")
     if model not in available_models:
-        if available_models:
-            model = available_models[0]
-            logger.info("Using available model: %s", model)
-        else:
+        if not available_models:
             raise Exception("No models available in Ollama")
+        model = available_models[0]
+        logger.info("Using available model: %s", model)
     logger.info("Running inference on GPU with model: %s", model)
-    start_time = time.time()
-    ollama_client = AITBCHTTPClient(base_url="http://localhost:11434", timeout=60)
-    ollama_response = ollama_client.post("/api/generate", json={"model": model, "prompt": prompt, "stream": False})
-    if ollama_response:
-        result = ollama_response
-        output = result.get("response", "")
-        execution_time = time.time() - start_time
-        tee_quote = build_tee_quote(job)
-        extra = {"model": model, "tokens_processed": result.get("eval_count", 0)}
-        if tee_quote:
-            logger.info("Attaching TEE quote for job %s", job_id)
-        _submit_success(job_id, output, execution_time, extra, tee_quote=tee_quote)
-        return True
-    logger.error("Ollama error")
-    _submit_failure(job_id, "Ollama error")
-    return False
+    return model
 
 
-def _execute_transcribe(job):
-    job_id = job.get("job_id")
-    payload = job.get("payload", {})
+def _inference_request(payload: dict[str, Any], model: str) -> dict[str, Any]:
+    return {"model": model, "prompt": payload.get("prompt", ""), "stream": False}
+
+
+def _inference_output(response: dict[str, Any], model: str) -> tuple[str, dict[str, Any]]:
+    return response.get("response", ""), {"model": model, "tokens_processed": response.get("eval_count", 0)}
+
+
+def _media_input(job_type: str, payload: dict[str, Any], directory: str) -> tuple[str, str]:
+    """Return the media URL of a transcribe or re-encode job and where to download it."""
     url = payload.get("url") or payload.get("input")
     if not url:
-        raise Exception("Transcribe job requires 'url' or 'input' in payload")
-    model = payload.get("model", "base")
-    logger.info("Running transcription with model: %s", model)
-    start_time = time.time()
-    with tempfile.TemporaryDirectory() as tmp:
-        ext = os.path.splitext(url.split("?")[0])[1] or ".wav"
-        input_path = os.path.join(tmp, f"input{ext}")
-        _download_media(url, input_path)
+        label = "Transcribe" if job_type == "transcribe" else "Re-encode"
+        raise Exception(f"{label} job requires 'url' or 'input' in payload")
+    ext = os.path.splitext(url.split("?")[0])[1] or (".wav" if job_type == "transcribe" else ".bin")
+    return url, os.path.join(directory, f"input{ext}")
+
+
+def _process_media(job_type: str, payload: dict[str, Any], input_path: str, directory: str) -> tuple[str, dict[str, Any]]:
+    """Transcribe or re-encode a downloaded file; returns (output, extra result fields)."""
+    if job_type == "transcribe":
+        model = payload.get("model", "base")
+        logger.info("Running transcription with model: %s", model)
         text = _run_whisper(input_path, model)
-    execution_time = time.time() - start_time
+        return text, {"model": model, "transcription": text}
+    output_format = payload.get("output_format") or payload.get("format") or "mp4"
+    logger.info("Running re-encode to format: %s", output_format)
+    output_path = os.path.join(directory, f"output.{output_format}")
+    summary = _run_ffmpeg(input_path, output_path, output_format)
+    return summary["stderr"], summary
+
+
+def _attest(job) -> dict[str, Any] | None:
     tee_quote = build_tee_quote(job)
     if tee_quote:
-        logger.info("Attaching TEE quote for job %s", job_id)
-    _submit_success(job_id, text, execution_time, {"model": model, "transcription": text}, tee_quote=tee_quote)
-    return True
+        logger.info("Attaching TEE quote for job %s", job.get("job_id"))
+    return tee_quote
 
 
-def _execute_reencode(job):
+def _execute_inference(job, available_models):
+    job_id = job.get("job_id")
+    payload = job.get("payload", {})
+    model = _select_model(payload, available_models)
+    start_time = time.time()
+    ollama_client = AITBCHTTPClient(base_url=OLLAMA_URL, timeout=60)
+    ollama_response = ollama_client.post("/api/generate", json=_inference_request(payload, model))
+    if ollama_response:
+        output, extra = _inference_output(ollama_response, model)
+        execution_time = time.time() - start_time
+        _submit_success(job_id, output, execution_time, extra, tee_quote=_attest(job))
+        return True
+    logger.error("Ollama error")
+    _submit_failure(job_id, "Ollama error")
+    return False
+
+
+def _execute_media(job, job_type):
     job_id = job.get("job_id")
     payload = job.get("payload", {})
-    url = payload.get("url") or payload.get("input")
-    if not url:
-        raise Exception("Re-encode job requires 'url' or 'input' in payload")
-    output_format = payload.get("output_format") or payload.get("format") or "mp4"
-    logger.info("Running re-encode to format: %s", output_format)
     start_time = time.time()
     with tempfile.TemporaryDirectory() as tmp:
-        input_ext = os.path.splitext(url.split("?")[0])[1] or ".bin"
-        input_path = os.path.join(tmp, f"input{input_ext}")
+        url, input_path = _media_input(job_type, payload, tmp)
         _download_media(url, input_path)
-        output_path = os.path.join(tmp, f"output.{output_format}")
-        summary = _run_ffmpeg(input_path, output_path, output_format)
+        output, extra = _process_media(job_type, payload, input_path, tmp)
     execution_time = time.time() - start_time
-    tee_quote = build_tee_quote(job)
-    if tee_quote:
-        logger.info("Attaching TEE quote for job %s", job_id)
-    _submit_success(job_id, summary["stderr"], execution_time, summary, tee_quote=tee_quote)
+    _submit_success(job_id, output, execution_time, extra, tee_quote=_attest(job))
     return True
 
 
@@ -608,12 +653,12 @@ def submit_result(job_id, result):
 
 
 def poll_for_jobs():
-    """Poll for available jobs"""
-    poll_data = {"max_wait_seconds": 5}
+    """Long-poll for the next job; returns None if none was assigned within POLL_WAIT_SECONDS"""
+    poll_data = {"max_wait_seconds": POLL_WAIT_SECONDS}
     headers = {"X-Api-Key": AUTH_TOKEN, "X-Miner-ID": MINER_ID, "Content-Type": "application/json"}
     try:
         url = f"{COORDINATOR_URL}/v1/miners/poll"
-        response = requests.post(url, json=poll_data, headers=headers, timeout=10)
+        response = requests.post(url, json=poll_data, headers=headers, timeout=POLL_WAIT_SECONDS + 10)
         if response.status_code == 204:
             return None
         response.raise_for_status()
@@ -634,6 +679,191 @@ def poll_for_jobs():
         return None
 
 
+class AsyncJobExecutor:
+    """Run up to ``concurrency`` jobs at once over one shared httpx client.
+
+    Polling, heartbeats, offer publishing and every job run as separate tasks, so a
+    long whisper or ffmpeg job no longer delays the heartbeat, and heartbeats report
+    the real number of jobs in flight. Each job type has its own limit
+    (``JOB_TYPE_LIMITS``) within the overall one. Media is downloaded before a job
+    takes its type slot and the slot is freed before the result is uploaded, so
+    transfers overlap with the next job's compute.
+    """
+
+    def __init__(
+        self,
+        models: list[str],
+        concurrency: int = JOB_CONCURRENCY,
+        type_limits: dict[str, int] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self.models = models
+        self.concurrency = max(1, concurrency)
+        self.inflight = 0
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._type_slots = {
+            job_type: asyncio.Semaphore(max(1, limit)) for job_type, limit in (type_limits or JOB_TYPE_LIMITS).items()
+        }
+        self._client = client or httpx.AsyncClient(
+            timeout=30, limits=httpx.Limits(max_connections=4 * self.concurrency + 4)
+        )
+        self._owns_client = client is None
+        self._headers = {"X-Api-Key": AUTH_TOKEN, "X-Miner-ID": MINER_ID, "Content-Type": "application/json"}
+        self._jobs: set[asyncio.Task[None]] = set()
+
+    async def run(self) -> None:
+        """Poll and execute jobs until cancelled."""
+        tasks = [
+            asyncio.create_task(self._heartbeat_loop(), name="miner-heartbeat"),
+            asyncio.create_task(self._offer_loop(), name="miner-offers"),
+            asyncio.create_task(self._poll_loop(), name="miner-poll"),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in [*tasks, *self._jobs]:
+                task.cancel()
+            await asyncio.gather(*tasks, *self._jobs, return_exceptions=True)
+            if self._owns_client:
+                await self._client.aclose()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            # Only ask for a job when there is a slot to run it in.
+            await self._slots.acquire()
+            try:
+                job = await self.poll()
+            except BaseException:
+                self._slots.release()
+                raise
+            if job is None:
+                self._slots.release()
+                continue
+            self.start_job(job)
+
+    def start_job(self, job: dict[str, Any]) -> asyncio.Task[None]:
+        """Run a claimed ``job`` in the background; the caller holds one of its slots."""
+        self.inflight += 1
+        task = asyncio.create_task(self._run_job(job), name=f"miner-job-{job.get('job_id')}")
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+        return task
+
+    async def poll(self) -> dict[str, Any] | None:
+        """Long-poll the coordinator for the next job."""
+        started = time.monotonic()
+        try:
+            response = await self._client.post(
+                f"{COORDINATOR_URL}/v1/miners/poll",
+                json={"max_wait_seconds": POLL_WAIT_SECONDS},
+                headers=self._headers,
+                timeout=POLL_WAIT_SECONDS + 10,
+            )
+            if response.status_code == 204:
+                return None
+            response.raise_for_status()
+            job = response.json()
+            if job and job.get("job_id"):
+                logger.info("Received job: %s", job)
+                return job
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("Error polling for jobs: %s", e)
+        if time.monotonic() - started < 1:
+            # The poll failed rather than timed out; don't hammer the coordinator.
+            await asyncio.sleep(1)
+        return None
+
+    async def _run_job(self, job: dict[str, Any]) -> None:
+        try:
+            result = await self.execute(job)
+            await self.submit(job.get("job_id"), result)
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+    async def execute(self, job: dict[str, Any]) -> dict[str, Any]:
+        """Run ``job`` and return the result payload to submit (a failure payload on error)."""
+        job_id = job.get("job_id")
+        payload = job.get("payload", {})
+        job_type = _job_type(payload)
+        logger.info("Executing job %s: %s", job_id, payload)
+        type_slots = self._type_slots.get(job_type or "")
+        if type_slots is None:
+            logger.error("Unsupported job type: %s", job_type)
+            return _failure_result(f"Unsupported job type: {job_type}")
+        start_time = time.time()
+        try:
+            if job_type == "inference":
+                async with type_slots:
+                    output, extra = await self._run_inference(payload)
+            else:
+                with tempfile.TemporaryDirectory() as tmp:
+                    url, input_path = _media_input(job_type, payload, tmp)
+                    await self._download(url, input_path)
+                    async with type_slots:
+                        output, extra = await asyncio.to_thread(_process_media, job_type, payload, input_path, tmp)
+        except Exception as e:
+            logger.error("Job execution error: %s", e)
+            return _failure_result(str(e))
+        execution_time = time.time() - start_time
+        tee_quote = await asyncio.to_thread(_attest, job)
+        logger.info("Job %s completed in %ss", job_id, execution_time)
+        return await asyncio.to_thread(_success_result, output, execution_time, extra, tee_quote)
+
+    async def _run_inference(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        model = _select_model(payload, self.models)
+        response = await self._client.post(f"{OLLAMA_URL}/api/generate", json=_inference_request(payload, model), timeout=60)
+        response.raise_for_status()
+        return _inference_output(response.json(), model)
+
+    async def _download(self, url: str, path: str) -> None:
+        try:
+            # Media URLs are often CDN or presigned links that redirect, as urlretrieve follows.
+            async with self._client.stream("GET", url, timeout=300, follow_redirects=True) as response:
+                response.raise_for_status()
+                with open(path, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to download media from {url}: {e}") from e
+
+    async def submit(self, job_id: str | None, result: dict[str, Any]) -> None:
+        """Submit a job result to the coordinator."""
+        try:
+            response = await self._client.post(
+                f"{COORDINATOR_URL}/v1/miners/{job_id}/result", json=result, headers=self._headers, timeout=30
+            )
+            response.raise_for_status()
+            logger.info("Result submitted for job %s", job_id)
+        except httpx.HTTPError as e:
+            logger.error("Result submission error: %s", e)
+
+    async def send_heartbeat(self) -> None:
+        """Send a coordinator heartbeat carrying the jobs in flight."""
+        heartbeat_data = await asyncio.to_thread(build_heartbeat_data, self.inflight)
+        # Jobs may have started or finished while the GPU stats were collected.
+        heartbeat_data["inflight"] = heartbeat_data["current_jobs"] = self.inflight
+        try:
+            response = await self._client.post(
+                f"{COORDINATOR_URL}/v1/miners/heartbeat", json=heartbeat_data, headers=self._headers, timeout=5
+            )
+            response.raise_for_status()
+            logger.info("Heartbeat sent (%d/%d jobs in flight)", self.inflight, self.concurrency)
+        except httpx.HTTPError as e:
+            logger.error("Heartbeat error: %s", e)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await self.send_heartbeat()
+            await asyncio.to_thread(send_pool_hub_heartbeat)
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    async def _offer_loop(self) -> None:
+        while True:
+            await asyncio.sleep(OFFER_PUBLISH_INTERVAL)
+            await asyncio.to_thread(publish_default_offers, self.models)
+
+
 async def main():
     """Main miner loop"""
     logger.info("Starting Real GPU Miner Client on Host...")
@@ -668,9 +898,16 @@ async def main():
     # shop is discoverable through `aitbc market list` immediately.
     await asyncio.to_thread(publish_default_offers, models)
 
+    if MINER_EXECUTOR == "async":
+        logger.info("Running up to %d jobs concurrently (per type: %s)", JOB_CONCURRENCY, JOB_TYPE_LIMITS)
+        try:
+            await AsyncJobExecutor(models).run()
+        except KeyboardInterrupt:
+            logger.info("Shutting down miner...")
+        return
+
     last_heartbeat = 0.0
     last_pool_hub_heartbeat = 0.0
-    last_poll = 0.0
     last_offer_publish = 0.0
     try:
         while True:
@@ -684,12 +921,13 @@ async def main():
             if current_time - last_offer_publish >= OFFER_PUBLISH_INTERVAL:
                 await asyncio.to_thread(publish_default_offers, models)
                 last_offer_publish = current_time
-            if current_time - last_poll >= 3:
-                job = poll_for_jobs()
-                if job:
-                    execute_job(job, models)
-                last_poll = current_time
-            await asyncio.sleep(1)
+            poll_started = time.monotonic()
+            job = await asyncio.to_thread(poll_for_jobs)
+            if job:
+                execute_job(job, models)
+            elif time.monotonic() - poll_started < 1:
+                # The poll failed rather than timed out; don't hammer the coordinator.
+                await asyncio.sleep(1)
     except KeyboardInterrupt:
         logger.info("Shutting down miner...")
     except Exception as e:
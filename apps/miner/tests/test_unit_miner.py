@@ -1,7 +1,13 @@
 """Unit tests for miner service"""
 
+import asyncio
+import json
+import threading
+import time
 from unittest.mock import Mock, patch
 
+import httpx
+
 import production_miner
 import pytest
 from aitbc.exceptions import NetworkError
@@ -170,3 +176,113 @@ def test_measure_coordinator_latency_failure(mock_http):
     """-1.0 is the sentinel for unreachable, and NetworkError is what the client raises."""
     with mock_http(get=NetworkError("Connection error")):
         assert production_miner.measure_coordinator_latency() == -1.0
+
+
+def _executor(handler, **kwargs):
+    """An AsyncJobExecutor whose shared client is served by ``handler``."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return production_miner.AsyncJobExecutor(["llama3.2:latest"], client=client, **kwargs)
+
+
+@pytest.mark.unit
+@patch("production_miner.get_gpu_info", return_value=None)
+async def test_async_executor_caps_each_job_type(mock_gpu):
+    """Three transcriptions under a transcribe limit of one never overlap, but all complete."""
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def whisper(path, model):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return "hello"
+
+    executor = _executor(lambda request: httpx.Response(200, content=b"audio"), concurrency=3, type_limits={"transcribe": 1})
+    jobs = [{"job_id": f"job-{i}", "payload": {"type": "transcribe", "url": "http://media/a.wav"}} for i in range(3)]
+    with patch("production_miner._run_whisper", side_effect=whisper):
+        results = await asyncio.gather(*(executor.execute(job) for job in jobs))
+
+    assert peak == 1
+    assert [r["result"]["output"] for r in results] == ["hello"] * 3
+
+
+@pytest.mark.unit
+async def test_async_executor_rejects_unsupported_job_types():
+    executor = _executor(lambda request: httpx.Response(500))
+    result = await executor.execute({"job_id": "job-1", "payload": {"type": "mining"}})
+    assert result == {"result": {"status": "failed", "error": "Unsupported job type: mining"}}
+
+
+@pytest.mark.unit
+@patch("production_miner.build_heartbeat_data", side_effect=lambda inflight: {"inflight": 0, "current_jobs": 0})
+async def test_async_executor_heartbeat_reports_jobs_in_flight(mock_data):
+    """Heartbeats go out while jobs run and carry the real in-flight count."""
+    sent = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        if request.url.path.endswith("/heartbeat"):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path.endswith("/api/generate"):
+            await release.wait()
+            return httpx.Response(200, json={"response": "hi", "eval_count": 1})
+        return httpx.Response(200, json={})
+
+    executor = _executor(handler, concurrency=2)
+    tasks = [executor.start_job({"job_id": f"job-{i}", "payload": {"type": "inference", "prompt": "hi"}}) for i in range(2)]
+    await asyncio.sleep(0)
+    await executor.send_heartbeat()
+    release.set()
+    with patch("production_miner.get_gpu_info", return_value=None):
+        await asyncio.gather(*tasks)
+    await executor.send_heartbeat()
+
+    assert [beat["inflight"] for beat in sent] == [2, 0]
+
+
+@pytest.mark.unit
+@patch("production_miner.get_gpu_info", return_value=None)
+async def test_async_executor_follows_media_redirects(mock_gpu):
+    """Presigned and CDN media URLs redirect; the download follows them as urlretrieve did."""
+    downloaded = []
+
+    def handler(request):
+        if request.url.host == "media":
+            return httpx.Response(302, headers={"Location": "http://cdn/a.wav?sig=1"})
+        return httpx.Response(200, content=b"audio")
+
+    def whisper(path, model):
+        with open(path, "rb") as f:
+            downloaded.append(f.read())
+        return "hello"
+
+    executor = _executor(handler)
+    with patch("production_miner._run_whisper", side_effect=whisper):
+        result = await executor.execute({"job_id": "job-1", "payload": {"type": "transcribe", "url": "http://media/a.wav"}})
+
+    assert result["result"]["status"] == "completed"
+    assert downloaded == [b"audio"]
+
+
+@pytest.mark.unit
+@patch("production_miner.get_gpu_info", return_value=None)
+async def test_async_executor_attests_off_the_event_loop(mock_gpu):
+    """Building the TEE quote signs and hashes, so it must not run on the event loop thread."""
+    loop_thread = threading.get_ident()
+    attest_threads = []
+
+    def quote(job):
+        attest_threads.append(threading.get_ident())
+        return None
+
+    executor = _executor(lambda request: httpx.Response(200, json={"response": "hi", "eval_count": 1}))
+    with patch("production_miner.build_tee_quote", side_effect=quote):
+        result = await executor.execute({"job_id": "job-1", "payload": {"type": "inference", "prompt": "hi"}})
+
+    assert result["result"]["status"] == "completed"
+    assert attest_threads and loop_thread not in attest_threads
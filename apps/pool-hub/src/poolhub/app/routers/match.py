@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from poolhub.repositories.match_repository import MatchRepository
 from poolhub.repositories.miner_repository import MinerRepository
+from poolhub.services.capability_index import CapabilityIndex, IndexedMiner, get_capability_index
 
 from ..deps import db_session_dep, redis_dep
 from ..prometheus import (
@@ -54,8 +55,10 @@ async def match_endpoint(
             top_k=top_k,
         )
 
-        active_miners = await miner_repo.list_active_miners()
-        candidates = _select_candidates(requirements, payload.hints, active_miners, top_k)
+        index = get_capability_index()
+        if index.needs_refresh():
+            index.rebuild(await miner_repo.list_active_miners())
+        candidates = _select_candidates(requirements, payload.hints, index, top_k)
 
         await match_repo.add_results(
             request_id=uuid.UUID(str(request.id)),
@@ -78,38 +81,29 @@ async def match_endpoint(
 def _select_candidates(
     requirements: dict[str, Any],
     hints: dict[str, Any],
-    active_miners: list[tuple[Any, ...]],
+    index: CapabilityIndex,
     top_k: int,
 ) -> list[dict[str, Any]]:
-    min_vram = float(requirements.get("min_vram_gb", 0))
-    min_ram = float(requirements.get("min_ram_gb", 0))
-    capabilities_required = set(requirements.get("capabilities_any", []))
-    region_hint = hints.get("region")
-
-    ranked: list[dict[str, Any]] = []
-    for miner, miner_status, score in active_miners:
-        if miner.gpu_vram_gb and miner.gpu_vram_gb < min_vram:
-            continue
-        if miner.ram_gb and miner.ram_gb < min_ram:
-            continue
-        if capabilities_required and not capabilities_required.issubset(set(miner.capabilities or [])):
-            continue
-        if region_hint and miner.region and miner.region != region_hint:
-            continue
-
-        candidate = {
-            "miner_id": miner.miner_id,
-            "addr": miner.addr,
-            "proto": miner.proto,
-            "score": float(score),
-            "explain": _compose_explain(score, miner, miner_status),
-            "eta_ms": miner_status.avg_latency_ms if miner_status else None,
-            "price": miner.base_price,
-        }
-        ranked.append(candidate)
-
-    ranked.sort(key=lambda item: item["score"], reverse=True)
-    return ranked[:top_k]
+    matches = index.top_k(
+        top_k,
+        min_vram_gb=float(requirements.get("min_vram_gb", 0)),
+        min_ram_gb=float(requirements.get("min_ram_gb", 0)),
+        capabilities=requirements.get("capabilities_any", []),
+        region=hints.get("region"),
+    )
+    return [_candidate(entry) for entry in matches]
+
+
+def _candidate(entry: IndexedMiner) -> dict[str, Any]:
+    return {
+        "miner_id": entry.miner_id,
+        "addr": entry.addr,
+        "proto": entry.proto,
+        "score": entry.score,
+        "explain": _compose_explain(entry.score, entry, entry.status),
+        "eta_ms": entry.avg_latency_ms,
+        "price": entry.base_price,
+    }
 
 
 def _compose_explain(score: float, miner: Any, miner_status: Any) -> str:
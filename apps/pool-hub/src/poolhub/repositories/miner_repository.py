@@ -10,6 +10,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Miner, MinerStatus
+from ..services.capability_index import get_capability_index
 from ..settings import settings
 from ..storage.redis_keys import RedisKeys
 
@@ -168,6 +169,7 @@ class MinerRepository:
         await self._redis.expire(redis_key, settings.session_ttl_seconds + settings.heartbeat_grace_seconds)
 
         score = self._compute_score(miner, status)
+        get_capability_index().upsert(miner, status, score)
         ranking_key = RedisKeys.miner_rankings(miner.region)
         await self._redis.zadd(ranking_key, {miner_id: score})
         await self._redis.expire(ranking_key, settings.session_ttl_seconds + settings.heartbeat_grace_seconds)
@@ -0,0 +1,279 @@
+"""
+In-memory capability index for miner matching.
+
+``/v1/match`` used to load every miner joined with its status from Postgres on
+each request, score and filter all of them in Python and sort the full list for
+``top_k``. The index keeps a snapshot of every miner, bucketed by region, and
+per bucket:
+
+- the miners in descending score order, so an unfiltered top-k reads k entries;
+- the miners sorted by GPU VRAM and by RAM, so a minimum is one bisect;
+- a set of miners per capability.
+
+Per bucket a query either walks the score order until it has top_k hits, or
+ranks just the candidates of its most selective filter with a heap, whichever
+is expected to read fewer entries, so match latency does not grow with the
+fleet.
+
+``MinerRepository`` updates an entry whenever a miner registers, heartbeats or
+reports status. Miners registered through another worker process only show up
+here on the next rebuild from the database, every
+``settings.capability_index_refresh_seconds``. Used from the event loop only.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from ..settings import settings
+
+
+@dataclass(slots=True, frozen=True)
+class IndexedMiner:
+    """What matching needs of a miner and its status, detached from the ORM session."""
+
+    miner_id: str
+    addr: str
+    proto: str
+    region: str | None
+    gpu_vram_gb: float
+    ram_gb: float
+    capabilities: frozenset[str]
+    base_price: Decimal
+    score: float
+    has_status: bool
+    queue_len: int
+    avg_latency_ms: int | None
+
+    @classmethod
+    def from_records(cls, miner: Any, status: Any, score: float) -> IndexedMiner:
+        return cls(
+            miner_id=miner.miner_id,
+            addr=miner.addr,
+            proto=miner.proto,
+            region=miner.region,
+            gpu_vram_gb=float(miner.gpu_vram_gb or 0.0),
+            ram_gb=float(miner.ram_gb or 0.0),
+            capabilities=frozenset(miner.capabilities or ()),
+            base_price=miner.base_price,
+            score=float(score),
+            has_status=status is not None,
+            queue_len=(status.queue_len or 0) if status is not None else 0,
+            avg_latency_ms=status.avg_latency_ms if status is not None else None,
+        )
+
+    @property
+    def status(self) -> IndexedMiner | None:
+        """Stand-in for the miner's ``MinerStatus`` (queue_len, avg_latency_ms), None if it has none."""
+        return self if self.has_status else None
+
+
+class _SortedKeys:
+    """Miner ids sorted by a numeric key; ids with a zero key are kept apart.
+
+    Matching treats a miner that reports 0 (unknown) VRAM or RAM as meeting
+    any minimum, so those never need to be searched.
+    """
+
+    __slots__ = ("_keys", "_unknown")
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[float, str]] = []
+        self._unknown: set[str] = set()
+
+    def add(self, value: float, miner_id: str) -> None:
+        if value:
+            bisect.insort(self._keys, (value, miner_id))
+        else:
+            self._unknown.add(miner_id)
+
+    def remove(self, value: float, miner_id: str) -> None:
+        if value:
+            position = bisect.bisect_left(self._keys, (value, miner_id))
+            if position < len(self._keys) and self._keys[position] == (value, miner_id):
+                del self._keys[position]
+        else:
+            self._unknown.discard(miner_id)
+
+    def count_at_least(self, minimum: float) -> int:
+        return len(self._keys) - bisect.bisect_left(self._keys, (minimum, "")) + len(self._unknown)
+
+    def at_least(self, minimum: float) -> Iterator[str]:
+        start = bisect.bisect_left(self._keys, (minimum, ""))
+        yield from (miner_id for _, miner_id in itertools.islice(self._keys, start, None))
+        yield from self._unknown
+
+
+class _RegionBucket:
+    __slots__ = ("by_score", "by_vram", "by_ram", "by_capability")
+
+    def __init__(self) -> None:
+        # (-score, miner_id): ascending order is best score first.
+        self.by_score: list[tuple[float, str]] = []
+        self.by_vram = _SortedKeys()
+        self.by_ram = _SortedKeys()
+        self.by_capability: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_score)
+
+    def add(self, miner: IndexedMiner) -> None:
+        bisect.insort(self.by_score, (-miner.score, miner.miner_id))
+        self.by_vram.add(miner.gpu_vram_gb, miner.miner_id)
+        self.by_ram.add(miner.ram_gb, miner.miner_id)
+        for capability in miner.capabilities:
+            self.by_capability.setdefault(capability, set()).add(miner.miner_id)
+
+    def remove(self, miner: IndexedMiner) -> None:
+        position = bisect.bisect_left(self.by_score, (-miner.score, miner.miner_id))
+        if position < len(self.by_score) and self.by_score[position][1] == miner.miner_id:
+            del self.by_score[position]
+        self.by_vram.remove(miner.gpu_vram_gb, miner.miner_id)
+        self.by_ram.remove(miner.ram_gb, miner.miner_id)
+        for capability in miner.capabilities:
+            holders = self.by_capability.get(capability)
+            if holders is not None:
+                holders.discard(miner.miner_id)
+                if not holders:
+                    del self.by_capability[capability]
+
+
+def _region_key(region: str | None) -> str | None:
+    """Bucket key for a miner's region: an empty region means no region, like None."""
+    return region or None
+
+
+class CapabilityIndex:
+    """Miner snapshots bucketed by region, answering top-k match queries."""
+
+    def __init__(self, refresh_seconds: float | None = None) -> None:
+        self._refresh_seconds = settings.capability_index_refresh_seconds if refresh_seconds is None else refresh_seconds
+        self._miners: dict[str, IndexedMiner] = {}
+        self._buckets: dict[str | None, _RegionBucket] = {}
+        self._loaded_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._miners)
+
+    def __contains__(self, miner_id: object) -> bool:
+        return miner_id in self._miners
+
+    def needs_refresh(self) -> bool:
+        """True before the first load and once the last rebuild is older than the refresh interval."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self._refresh_seconds
+
+    def rebuild(self, records: Iterable[tuple[Any, Any, float]]) -> None:
+        """Replace the whole index with ``(miner, status, score)`` records."""
+        self._miners.clear()
+        self._buckets.clear()
+        for miner, status, score in records:
+            self._insert(IndexedMiner.from_records(miner, status, score))
+        self._loaded_at = time.monotonic()
+
+    def upsert(self, miner: Any, status: Any, score: float) -> None:
+        """Add or refresh one miner from its ORM ``miner`` and ``status`` rows."""
+        self.upsert_entry(IndexedMiner.from_records(miner, status, score))
+
+    def upsert_entry(self, entry: IndexedMiner) -> None:
+        self.remove(entry.miner_id)
+        self._insert(entry)
+
+    def remove(self, miner_id: str) -> None:
+        entry = self._miners.pop(miner_id, None)
+        if entry is None:
+            return
+        key = _region_key(entry.region)
+        bucket = self._buckets[key]
+        bucket.remove(entry)
+        if not len(bucket):
+            del self._buckets[key]
+
+    def _insert(self, entry: IndexedMiner) -> None:
+        self._miners[entry.miner_id] = entry
+        self._buckets.setdefault(_region_key(entry.region), _RegionBucket()).add(entry)
+
+    def top_k(
+        self,
+        top_k: int,
+        *,
+        min_vram_gb: float = 0.0,
+        min_ram_gb: float = 0.0,
+        capabilities: Iterable[str] = (),
+        region: str | None = None,
+    ) -> list[IndexedMiner]:
+        """The ``top_k`` best-scored miners meeting the requirements, best first.
+
+        Same filters as before the index: a miner with unknown (0) VRAM or RAM
+        passes any minimum, and one with no region passes any region hint.
+        """
+        if top_k <= 0:
+            return []
+        required = frozenset(capabilities)
+        if region:
+            # Miners without a region (None or "") share the None bucket and match any hint.
+            buckets = [bucket for key in (region, None) if (bucket := self._buckets.get(key)) is not None]
+        else:
+            buckets = list(self._buckets.values())
+        found: list[IndexedMiner] = []
+        for bucket in buckets:
+            found.extend(self._bucket_top_k(bucket, top_k, min_vram_gb, min_ram_gb, required))
+        return heapq.nsmallest(top_k, found, key=lambda entry: (-entry.score, entry.miner_id))
+
+    def _bucket_top_k(
+        self, bucket: _RegionBucket, top_k: int, min_vram_gb: float, min_ram_gb: float, required: frozenset[str]
+    ) -> list[IndexedMiner]:
+        def admits(entry: IndexedMiner) -> bool:
+            return (
+                (not entry.gpu_vram_gb or entry.gpu_vram_gb >= min_vram_gb)
+                and (not entry.ram_gb or entry.ram_gb >= min_ram_gb)
+                and required <= entry.capabilities
+            )
+
+        # Candidate sources as (size, ids); the score list is always one.
+        sources: list[tuple[int, Iterable[str]]] = []
+        if min_vram_gb > 0:
+            sources.append((bucket.by_vram.count_at_least(min_vram_gb), bucket.by_vram.at_least(min_vram_gb)))
+        if min_ram_gb > 0:
+            sources.append((bucket.by_ram.count_at_least(min_ram_gb), bucket.by_ram.at_least(min_ram_gb)))
+        for capability in required:
+            holders = bucket.by_capability.get(capability)
+            if not holders:
+                return []
+            sources.append((len(holders), holders))
+        if sources:
+            size, ids = min(sources, key=lambda source: source[0])
+            # Scanning in score order stops after top_k hits, which takes about
+            # top_k / (share of the bucket passing every filter) reads, assuming the
+            # filters are independent. Reading the narrowest source costs its size.
+            passing = 1.0
+            for source_size, _ in sources:
+                passing *= source_size / len(bucket)
+            if passing == 0 or size < top_k / passing:
+                matches = (entry for entry in map(self._miners.__getitem__, ids) if admits(entry))
+                return heapq.nsmallest(top_k, matches, key=lambda entry: (-entry.score, entry.miner_id))
+        hits: list[IndexedMiner] = []
+        for _, miner_id in bucket.by_score:
+            entry = self._miners[miner_id]
+            if admits(entry):
+                hits.append(entry)
+                if len(hits) == top_k:
+                    break
+        return hits
+
+
+_index: CapabilityIndex | None = None
+
+
+def get_capability_index() -> CapabilityIndex:
+    """The process-wide capability index."""
+    global _index
+    if _index is None:
+        _index = CapabilityIndex()
+    return _index
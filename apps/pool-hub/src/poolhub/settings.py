@@ -78,6 +78,11 @@ class Settings(ServiceSettings):
 
     default_score_weights: ScoreWeights = Field(default_factory=ScoreWeights)
 
+    # /v1/match answers from an in-memory capability index (services/capability_index.py),
+    # kept current by this worker's register/heartbeat/status writes and rebuilt from the
+    # database this often to pick up miners registered through other workers.
+    capability_index_refresh_seconds: int = Field(default=30)
+
     allowed_origins: list[AnyHttpUrl] = Field(default_factory=list)
 
     prometheus_namespace: str = Field(default="poolhub")
@@ -0,0 +1,132 @@
+"""The capability index answers /v1/match like the full scan it replaced."""
+
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from poolhub.app.routers.match import _select_candidates
+from poolhub.services.capability_index import CapabilityIndex
+
+REGIONS = ["eu", "us", "ap", None, ""]
+CAPABILITIES = ["inference", "training", "transcribe", "reencode"]
+
+
+def _records(count: int, seed: int = 7) -> list[tuple[SimpleNamespace, SimpleNamespace | None, float]]:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        miner = SimpleNamespace(
+            miner_id=f"miner-{i:05d}",
+            addr=f"10.0.0.{i % 250}",
+            proto="http",
+            region=rng.choice(REGIONS),
+            gpu_vram_gb=rng.choice([0.0, 8.0, 12.0, 16.0, 24.0, 48.0, 80.0]),
+            ram_gb=rng.choice([0.0, 16.0, 32.0, 64.0, 128.0]),
+            capabilities=rng.sample(CAPABILITIES, rng.randint(0, len(CAPABILITIES))),
+            base_price=Decimal("0.01"),
+        )
+        status = SimpleNamespace(queue_len=rng.randint(0, 4), avg_latency_ms=rng.randint(5, 500)) if i % 5 else None
+        records.append((miner, status, round(rng.random(), 3)))
+    return records
+
+
+def _full_scan(records, requirements, hints, top_k):
+    """The pre-index /v1/match selection."""
+    min_vram = float(requirements.get("min_vram_gb", 0))
+    min_ram = float(requirements.get("min_ram_gb", 0))
+    required = set(requirements.get("capabilities_any", []))
+    region_hint = hints.get("region")
+    ranked = []
+    for miner, _, score in records:
+        if miner.gpu_vram_gb and miner.gpu_vram_gb < min_vram:
+            continue
+        if miner.ram_gb and miner.ram_gb < min_ram:
+            continue
+        if required and not required.issubset(set(miner.capabilities or [])):
+            continue
+        if region_hint and miner.region and miner.region != region_hint:
+            continue
+        ranked.append((score, miner.miner_id))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return [miner_id for _, miner_id in ranked[:top_k]]
+
+
+QUERIES = [
+    ({}, {}),
+    ({"min_vram_gb": 24}, {}),
+    ({"min_vram_gb": 80, "min_ram_gb": 64}, {"region": "eu"}),
+    ({"capabilities_any": ["training"]}, {"region": "us"}),
+    ({"capabilities_any": ["training", "transcribe"], "min_ram_gb": 32}, {}),
+    ({"capabilities_any": ["quantum"]}, {}),
+    ({}, {"region": "nowhere"}),
+]
+
+
+@pytest.mark.parametrize(("requirements", "hints"), QUERIES)
+@pytest.mark.parametrize("top_k", [1, 5, 50])
+def test_matches_the_full_scan(requirements, hints, top_k):
+    records = _records(2_000)
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild(records)
+
+    candidates = _select_candidates(requirements, hints, index, top_k)
+
+    assert [c["miner_id"] for c in candidates] == _full_scan(records, requirements, hints, top_k)
+
+
+def test_updates_reorder_and_move_miners():
+    records = _records(200)
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild(records)
+    miner, status, _ = records[0]
+
+    index.upsert(miner, status, 10.0)
+    assert index.top_k(1)[0].miner_id == miner.miner_id
+
+    miner.region, miner.capabilities = "mars", ["teleport"]
+    index.upsert(miner, status, 10.0)
+    assert [m.miner_id for m in index.top_k(5, capabilities=["teleport"], region="mars")] == [miner.miner_id]
+    assert len(index) == 200
+
+    index.remove(miner.miner_id)
+    assert index.top_k(5, capabilities=["teleport"]) == []
+
+
+def test_empty_region_matches_any_region_hint():
+    records = _records(20)
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild(records)
+    miner, status, _ = records[0]
+
+    miner.region = ""
+    index.upsert(miner, status, 10.0)
+    assert index.top_k(1, region="eu")[0].miner_id == miner.miner_id
+
+    index.remove(miner.miner_id)
+    assert miner.miner_id not in {m.miner_id for m in index.top_k(20, region="eu")}
+
+
+def test_candidate_payload_carries_status_fields():
+    records = _records(10)
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild(records)
+    by_id = {miner.miner_id: status for miner, status, _ in records}
+
+    for candidate in _select_candidates({}, {}, index, 10):
+        status = by_id[candidate["miner_id"]]
+        assert candidate["eta_ms"] == (status.avg_latency_ms if status else None)
+        assert f"load={status.queue_len if status else 0}" in candidate["explain"]
+
+
+def test_needs_refresh_until_rebuilt_and_after_the_interval():
+    index = CapabilityIndex(refresh_seconds=0)
+    assert index.needs_refresh()
+    index.rebuild([])
+    assert index.needs_refresh()
+
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild([])
+    assert not index.needs_refresh()
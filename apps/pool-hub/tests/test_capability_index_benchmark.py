@@ -0,0 +1,76 @@
+"""Match latency of the capability index at 10k miners.
+
+A query reads the candidates its most selective filter leaves, not the fleet,
+so latency should stay roughly flat from 1k to 10k miners. The full scan the
+index replaced is timed alongside for reference.
+
+Marked as @pytest.mark.slow so they can be deselected from the default gate.
+Run with: pytest tests/test_capability_index_benchmark.py -q -o addopts="" -m slow -s
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from poolhub.services.capability_index import CapabilityIndex
+
+from .test_capability_index import QUERIES, _full_scan, _records
+
+pytestmark = pytest.mark.slow
+
+FLEET_SIZES = (1_000, 10_000)
+TOP_K = 5
+ROUNDS = 200
+
+
+def _measure(count: int) -> tuple[float, float]:
+    """Return (index_us, full_scan_us) per match query for a fleet of ``count`` miners."""
+    records = _records(count)
+    index = CapabilityIndex(refresh_seconds=3600)
+    index.rebuild(records)
+
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        for requirements, hints in QUERIES:
+            index.top_k(
+                TOP_K,
+                min_vram_gb=float(requirements.get("min_vram_gb", 0)),
+                min_ram_gb=float(requirements.get("min_ram_gb", 0)),
+                capabilities=requirements.get("capabilities_any", []),
+                region=hints.get("region"),
+            )
+    index_us = (time.perf_counter() - t0) / (ROUNDS * len(QUERIES)) * 1e6
+
+    scan_rounds = max(1, ROUNDS // 20)
+    t0 = time.perf_counter()
+    for _ in range(scan_rounds):
+        for requirements, hints in QUERIES:
+            _full_scan(records, requirements, hints, TOP_K)
+    scan_us = (time.perf_counter() - t0) / (scan_rounds * len(QUERIES)) * 1e6
+    return index_us, scan_us
+
+
+class TestCapabilityIndexScaling:
+    def test_match_latency_is_flat_in_fleet_size(self):
+        results = {n: _measure(n) for n in FLEET_SIZES}
+        for n, (index_us, scan_us) in results.items():
+            print(f"match n={n:>6}: index {index_us:9.1f} us/query, full scan {scan_us:9.1f} us/query")
+
+        small_index, _ = results[FLEET_SIZES[0]]
+        large_index, large_scan = results[FLEET_SIZES[-1]]
+        # 10x more miners; the full scan grows ~10x, the index should not.
+        assert large_index <= small_index * 4, f"index latency grew {large_index / small_index:.1f}x from 1k to 10k"
+        assert large_index * 10 <= large_scan, "index is not an order of magnitude faster than the full scan at 10k"
+
+    def test_heartbeat_updates_stay_cheap_at_10k(self):
+        records = _records(10_000)
+        index = CapabilityIndex(refresh_seconds=3600)
+        index.rebuild(records)
+
+        t0 = time.perf_counter()
+        for i, (miner, status, score) in enumerate(records[:2_000]):
+            index.upsert(miner, status, (score + i / 10_000) % 1)
+        upsert_us = (time.perf_counter() - t0) / 2_000 * 1e6
+        print(f"upsert n=10000: {upsert_us:.1f} us/heartbeat")
+        assert upsert_us < 1_000
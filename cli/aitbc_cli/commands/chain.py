@@ -774,6 +774,130 @@ def instances_cmd(ctx, node_url, island):
     output(rows, ctx.obj.get("output_format", "table"), title="Chain Instances")
 
 
+@chain.command(name="export")
+@click.option("--node-url", default="http://127.0.0.1:8202", help="Local node RPC URL")
+@click.option("--chain-id", default=None, help="Chain to export (default: the node's default chain)")
+@click.option("--output", "output_path", default="-", help="File for the gzip-compressed NDJSON export ('-' for stdout)")
+@click.option("--timeout", default=300, type=int, help="Seconds to wait for each chunk from the node")
+@click.pass_context
+def export_cmd(ctx, node_url, chain_id, output_path, timeout):
+    """Stream a chain export to disk as gzip-compressed NDJSON.
+
+    Reads the node's /export-chain/stream endpoint chunk by chunk, so neither the node nor
+    the CLI holds the whole chain in memory. Use ``--output -`` to pipe it elsewhere.
+    """
+    import requests
+
+    client = AITBCHTTPClient(base_url=node_url, timeout=timeout)
+    params = {"chain_id": chain_id} if chain_id else None
+    written = 0
+    try:
+        with client.session.get(
+            f"{client.base_url}/rpc/export-chain/stream", params=params, stream=True, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            with click.open_file(output_path, "wb") as sink:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    sink.write(chunk)
+                    written += len(chunk)
+    except requests.RequestException as e:
+        abort(ctx, f"Cannot export chain from {node_url}: {e}", from_exception=e)
+    finally:
+        client.close()
+
+    if output_path != "-":
+        success(f"Exported chain to {output_path} ({written} bytes)")
+
+
+@chain.command(name="import")
+@click.argument("export_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--node-url", default="http://127.0.0.1:8202", help="Local node RPC URL")
+@click.option("--chain-id", default=None, help="Chain to import into (default: the chain named in the export)")
+@click.option("--admin-address", required=True, help="Bridge admin address allowed to replace chain data")
+@click.option("--private-key", required=True, help="Admin private key hex (for signing the import request)")
+@click.option("--offset", default=0, type=int, help="Resume an interrupted import at the node's reported next_offset")
+@click.option("--timeout", default=600, type=int, help="Seconds to wait for the node to apply the import")
+@click.pass_context
+def import_cmd(ctx, export_file, node_url, chain_id, admin_address, private_key, offset, timeout):
+    """Upload a file written by ``chain export`` to a node (replaces its chain).
+
+    The file is streamed from disk, and the node commits it in chunks. If the import fails
+    part-way, the error reports ``next_offset``; rerun with ``--offset`` to continue.
+    """
+    import gzip
+    import hashlib
+    import json
+
+    import requests
+    from eth_utils import keccak
+
+    from aitbc.crypto.crypto import sign_transaction_hash
+
+    if chain_id is None:
+        try:
+            with gzip.open(export_file, "rt", encoding="utf-8") as lines:
+                chain_id = json.loads(lines.readline()).get("chain_id")
+        except (OSError, ValueError) as e:
+            abort(ctx, f"{export_file} is not a chain export: {e}", from_exception=e)
+        if not chain_id:
+            abort(ctx, f"{export_file} does not name a chain; pass --chain-id")
+
+    digest = hashlib.sha256()
+    with open(export_file, "rb") as source:
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(block)
+
+    # Canonical message, matching the node's verify_admin_signature over these fields.
+    sign_data = {
+        "action": "import-chain-stream",
+        "admin_address": admin_address,
+        "chain_id": chain_id,
+        "offset": offset,
+        "sha256": digest.hexdigest(),
+    }
+    msg = json.dumps(sign_data, sort_keys=True, separators=(",", ":")).encode()
+    signature = sign_transaction_hash("0x" + keccak(msg).hex(), private_key)
+    params = {k: v for k, v in sign_data.items() if k != "action"}
+    params["admin_signature"] = signature
+
+    client = AITBCHTTPClient(base_url=node_url, timeout=timeout)
+    try:
+        with open(export_file, "rb") as body:
+            response = client.session.post(
+                f"{client.base_url}/rpc/import-chain/stream",
+                params=params,
+                data=body,
+                headers={"Content-Type": "application/gzip"},
+                timeout=timeout,
+            )
+    except requests.RequestException as e:
+        abort(ctx, f"Cannot connect to node at {node_url}: {e}", from_exception=e)
+    finally:
+        client.close()
+
+    try:
+        result = response.json()
+    except ValueError:
+        result = {}
+    if not response.ok:
+        detail = result.get("detail", response.text)
+        if isinstance(detail, dict):
+            abort(ctx, f"Import failed: {detail.get('message')} (resume with --offset {detail.get('next_offset')})")
+        abort(ctx, f"Import failed: {detail}")
+
+    success(result.get("message", "Chain imported"))
+    output(
+        {
+            "Chain ID": result.get("chain_id", chain_id),
+            "Blocks": result.get("imported_blocks", 0),
+            "Accounts": result.get("imported_accounts", 0),
+            "Transactions": result.get("imported_transactions", 0),
+            "Records Applied": result.get("next_offset", 0),
+        },
+        ctx.obj.get("output_format", "table"),
+    )
+
+
 # ============================================================================
 # v0.7.4 §B8: Consensus CLI commands
 # ============================================================================
@@ -194,7 +194,7 @@ def poll_jobs(
 
         payload = {"max_wait_seconds": max_wait}
 
-        response = requests.post(f"{coordinator_url}/v1/miners/poll", headers=headers, json=payload, timeout=30)
+        response = requests.post(f"{coordinator_url}/v1/miners/poll", headers=headers, json=payload, timeout=max_wait + 10)
 
         if response.status_code == 200 and response.content:
             job = response.json()
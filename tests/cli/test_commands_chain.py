@@ -100,6 +100,57 @@ class TestChainCommands:
 
         assert result.exit_code == 0, result.output
 
+    @patch("aitbc_cli.commands.chain.AITBCHTTPClient")
+    def test_chain_export_streams_to_file(self, mock_client_class, runner, tmp_path):
+        """``chain export`` writes the node's stream to disk chunk by chunk."""
+        client = mock_client_class.return_value
+        client.base_url = "http://node"
+        response = client.session.get.return_value.__enter__.return_value
+        response.iter_content.return_value = [b"chunk-1", b"chunk-2"]
+
+        from aitbc_cli.commands.chain import chain
+
+        target = tmp_path / "chain.ndjson.gz"
+        result = runner.invoke(chain, ["export", "--chain-id", "ait-hub", "--output", str(target)])
+
+        assert result.exit_code == 0, result.output
+        assert target.read_bytes() == b"chunk-1chunk-2"
+        args, kwargs = client.session.get.call_args
+        assert args == ("http://node/rpc/export-chain/stream",)
+        assert kwargs["params"] == {"chain_id": "ait-hub"} and kwargs["stream"] is True
+
+    @patch("aitbc_cli.commands.chain.AITBCHTTPClient")
+    def test_chain_import_signs_upload_and_reports_resume_offset(self, mock_client_class, runner, tmp_path):
+        """``chain import`` signs the file digest and tells the user where to resume."""
+        import gzip
+        import hashlib
+        import json
+
+        from eth_account import Account as EthAccount
+
+        export_file = tmp_path / "chain.ndjson.gz"
+        export_file.write_bytes(gzip.compress(json.dumps({"type": "header", "chain_id": "ait-hub"}).encode() + b"\n"))
+        client = mock_client_class.return_value
+        client.base_url = "http://node"
+        response = client.session.post.return_value
+        response.ok = False
+        response.json.return_value = {"detail": {"message": "disk full", "next_offset": 3000}}
+        admin = EthAccount.create()
+
+        from aitbc_cli.commands.chain import chain
+
+        result = runner.invoke(
+            chain,
+            ["import", str(export_file), "--admin-address", admin.address, "--private-key", admin.key.hex()],
+        )
+
+        assert result.exit_code != 0
+        assert "--offset 3000" in result.output
+        params = client.session.post.call_args.kwargs["params"]
+        assert params["chain_id"] == "ait-hub"
+        assert params["sha256"] == hashlib.sha256(export_file.read_bytes()).hexdigest()
+        assert params["admin_signature"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,8 +4,11 @@ Tests for AITBC middleware performance
 """
 
 import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
 
-from aitbc.middleware.performance import PerformanceLoggingMiddleware
+from aitbc.middleware.performance import ROUTE_LATENCY_COLLECTOR, PerformanceLoggingMiddleware, get_route_latencies
 
 
 class TestPerformanceLoggingMiddleware:
@@ -20,6 +23,42 @@ class TestPerformanceLoggingMiddleware:
         middleware = PerformanceLoggingMiddleware(app=None)
         assert middleware is not None
 
+    def test_latency_is_aggregated_per_route_template(self):
+        """Requests are counted under their route template, not the raw path"""
+        app = FastAPI()
+        app.add_middleware(PerformanceLoggingMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int) -> dict[str, int]:
+            return {"item_id": item_id}
+
+        registry = CollectorRegistry()
+        registry.register(ROUTE_LATENCY_COLLECTOR)
+        client = TestClient(app)
+        before = len(get_route_latencies().get(("GET", "/items/{item_id}"), []))
+        for item_id in range(3):
+            assert client.get(f"/items/{item_id}").status_code == 200
+        client.get("/no-such-route")
+
+        latencies = get_route_latencies()
+        assert len(latencies[("GET", "/items/{item_id}")]) == before + 3
+        assert ("GET", "<unmatched>") in latencies
+        assert registry.get_sample_value(
+            "http_request_duration_quantiles_seconds_count", {"method": "GET", "route": "/items/{item_id}"}
+        ) == before + 3
+
+    def test_nonstandard_methods_share_one_label(self):
+        """Client-chosen methods must not create a histogram each"""
+        app = FastAPI()
+        app.add_middleware(PerformanceLoggingMiddleware)
+        client = TestClient(app)
+        for index in range(20):
+            client.request(f"MADEUP{index}", "/anything")
+
+        keys = set(get_route_latencies())
+        assert ("OTHER", "<unmatched>") in keys
+        assert not any(method.startswith("MADEUP") for method, _ in keys)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -8,6 +8,7 @@ from unittest.mock import patch
 import pytest
 
 from aitbc.profiling import (
+    LatencyHistogram,
     PerformanceProfiler,
     ProfilingResult,
     clear_profiling_data,
@@ -36,6 +37,59 @@ class TestProfilingResult:
         assert result.call_count == 10
 
 
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram"""
+
+    def test_quantiles_within_precision(self):
+        """Quantiles are within the histogram's relative precision of the exact ones"""
+        histogram = LatencyHistogram()
+        samples = [i / 10_000 for i in range(1, 10_001)]  # 0.1 ms .. 1 s
+        for sample in samples:
+            histogram.record(sample)
+
+        for quantile, value in zip((0.5, 0.95, 0.99, 0.999), histogram.quantiles(), strict=True):
+            exact = samples[int(quantile * len(samples)) - 1]
+            assert value == pytest.approx(exact, rel=2**-6)
+        assert histogram.count == 10_000
+        assert histogram.min == 0.0001
+        assert histogram.max == 1.0
+        assert histogram.total == pytest.approx(sum(samples))
+
+    def test_memory_is_bounded(self):
+        """Recording more samples does not grow the histogram"""
+        histogram = LatencyHistogram()
+        buckets = len(histogram._counts)
+        for i in range(50_000):
+            histogram.record(i * 1e-5)
+        histogram.record(10**6)  # past the range: clamped into the top bucket
+
+        assert len(histogram._counts) == buckets
+        assert histogram.max == 10**6
+        assert histogram.quantile(1.0) == 10**6
+
+    def test_merge(self):
+        """Merging equals recording everything in one histogram"""
+        combined, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 1001):
+            combined.record(i / 1000)
+            (first if i % 2 else second).record(i / 1000)
+
+        first.merge(second)
+
+        assert first.count == combined.count
+        assert first.quantiles() == combined.quantiles()
+        assert (first.min, first.max) == (combined.min, combined.max)
+
+    def test_merge_rejects_other_layouts(self):
+        """Histograms of different precision cannot be merged"""
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(precision_bits=4))
+
+    def test_empty(self):
+        """An empty histogram reports zeros"""
+        assert LatencyHistogram().quantiles() == [0.0, 0.0, 0.0, 0.0]
+
+
 class TestPerformanceProfiler:
     """Tests for PerformanceProfiler"""
 
@@ -73,7 +127,7 @@ class TestPerformanceProfiler:
         profiler.record("test_func", 0.5)
 
         assert len(profiler._stats["test_func"]) == 1
-        assert profiler._stats["test_func"][0] == 0.5
+        assert profiler.get_stats("test_func").max_time == 0.5
 
     def test_record_disabled(self):
         """Test record when disabled"""
@@ -100,6 +154,35 @@ class TestPerformanceProfiler:
         assert stats.max_time == 0.3
         assert stats.min_time == 0.1
 
+    def test_get_stats_percentiles(self):
+        """Test get_stats reports percentiles"""
+        profiler = PerformanceProfiler()
+        for i in range(1, 1001):
+            profiler.record("test_func", i / 1000)
+
+        stats = profiler.get_stats("test_func")
+
+        assert stats.p50_time == pytest.approx(0.5, rel=0.02)
+        assert stats.p95_time == pytest.approx(0.95, rel=0.02)
+        assert stats.p99_time == pytest.approx(0.99, rel=0.02)
+        assert stats.p999_time == pytest.approx(0.999, rel=0.02)
+
+    def test_global_profiler_is_exported_to_prometheus(self):
+        """Test the global profiler's quantiles are exported as a Prometheus summary"""
+        from prometheus_client import CollectorRegistry
+
+        from aitbc.profiling import FUNCTION_LATENCY_COLLECTOR
+
+        registry = CollectorRegistry()
+        registry.register(FUNCTION_LATENCY_COLLECTOR)
+        get_global_profiler().enable()
+        get_global_profiler().record("exported_func", 0.25)
+
+        assert registry.get_sample_value("aitbc_function_duration_seconds_count", {"function": "exported_func"}) >= 1
+        assert registry.get_sample_value(
+            "aitbc_function_duration_seconds", {"function": "exported_func", "quantile": "0.99"}
+        ) == pytest.approx(0.25, rel=0.02)
+
     def test_get_stats_no_data(self):
         """Test get_stats for function with no data"""
         profiler = PerformanceProfiler()
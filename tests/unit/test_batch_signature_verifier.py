@@ -0,0 +1,68 @@
+"""Unit tests for aitbc.parallel.signatures.
+
+The pool must give exactly the answers inline verification gives, in input
+order, whether the batch runs inline, across worker processes, or from async code.
+"""
+
+import asyncio
+
+import pytest
+from eth_account import Account
+from eth_utils import keccak
+
+from aitbc.parallel.signatures import BatchSignatureVerifier, verify_signature_checks
+
+
+def _checks(count: int) -> tuple[list[tuple[str, bytes, str]], list[bool]]:
+    """Signed checks where every third is signed by someone else and every fifth is garbage."""
+    signer, impostor = Account.create(), Account.create()
+    checks, expected = [], []
+    for index in range(count):
+        msg_hash = keccak(f"tx-{index}".encode())
+        key = impostor.key if index % 3 == 0 else signer.key
+        signature = Account._sign_hash(msg_hash, key).signature.hex()
+        if index % 5 == 0:
+            signature = "0xdeadbeef"
+        checks.append((signer.address, msg_hash, signature))
+        expected.append(index % 3 != 0 and index % 5 != 0)
+    return checks, expected
+
+
+@pytest.fixture(scope="module")
+def sample() -> tuple[list[tuple[str, bytes, str]], list[bool]]:
+    return _checks(60)
+
+
+def test_inline_verification_matches_expected(sample) -> None:
+    checks, expected = sample
+    assert verify_signature_checks(checks) == expected
+
+
+def test_non_string_signatures_verify_as_false(sample) -> None:
+    checks, expected = sample
+    address, msg_hash, _ = checks[1]
+    garbage = [(address, msg_hash, {"r": 1, "s": 2}), (address, msg_hash, None), (address, msg_hash, 12345)]
+    assert verify_signature_checks([*garbage, checks[1]]) == [False, False, False, expected[1]]
+
+
+def test_small_batch_runs_inline_without_starting_the_pool(sample) -> None:
+    checks, expected = sample
+    verifier = BatchSignatureVerifier(max_workers=2, min_batch=100)
+    try:
+        assert verifier.verify(checks) == expected
+        assert verifier._executor is None
+    finally:
+        verifier.close()
+
+
+def test_pool_returns_results_in_input_order(sample) -> None:
+    checks, expected = sample
+    verifier = BatchSignatureVerifier(max_workers=2, min_batch=1)
+    try:
+        assert verifier.verify(checks) == expected
+        assert verifier._executor is not None
+        assert asyncio.run(verifier.verify_async(checks)) == expected
+        assert asyncio.run(verifier.verify_async([])) == []
+    finally:
+        verifier.close()
+    assert verifier._executor is None